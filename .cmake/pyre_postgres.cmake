@@ -27,6 +27,7 @@ function(pyre_postgresModule)
     target_sources(postgresmodule PRIVATE
       postgres/postgres.cc
       postgres/connection.cc
+      postgres/copy.cc
       postgres/execute.cc
       postgres/exceptions.cc
       postgres/interlayer.cc
@@ -170,7 +170,7 @@ function(pyre_pyreBin)
     )
   # install the scripts
   install(
-    PROGRAMS pyre pyre-config merlin smith.pyre
+    PROGRAMS pyre pyre-config pyre-host merlin smith.pyre
     DESTINATION ${CMAKE_INSTALL_BINDIR}
     )
   # all done
@@ -39,6 +39,7 @@ pyre_test_python_testcase(journal.pkg/debug_example.py)
 pyre_test_python_testcase(journal.pkg/debug_example_fatal.py)
 pyre_test_python_testcase(journal.pkg/debug_file.py)
 pyre_test_python_testcase(journal.pkg/debug_flush.py)
+pyre_test_python_testcase(journal.pkg/debug_inactive.py)
 pyre_test_python_testcase(journal.pkg/debug_inject.py)
 pyre_test_python_testcase(journal.pkg/debug_instance.py)
 pyre_test_python_testcase(journal.pkg/debug_loop.py)
@@ -56,6 +57,10 @@ pyre_test_python_testcase(journal.pkg/error_loop.py)
 pyre_test_python_testcase(journal.pkg/error_quiet.py)
 pyre_test_python_testcase(journal.pkg/error_sanity.py)
 pyre_test_python_testcase(journal.pkg/file_example.py)
+pyre_test_python_testcase(journal.pkg/queue_example.py)
+pyre_test_python_testcase(journal.pkg/rotating_example.py)
+pyre_test_python_testcase(journal.pkg/structured_example.py)
+pyre_test_python_testcase(journal.pkg/structured_queue.py)
 pyre_test_python_testcase(journal.pkg/file_sanity.py)
 pyre_test_python_testcase(journal.pkg/firewall_cascade.py)
 pyre_test_python_testcase(journal.pkg/firewall_empty.py)
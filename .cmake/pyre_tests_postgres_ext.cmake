@@ -24,6 +24,10 @@ pyre_test_python_testcase(postgres.ext/postgres_database_create.py)
 pyre_test_python_testcase(postgres.ext/postgres_table.py)
 pyre_test_python_testcase(postgres.ext/postgres_reserved.py)
 pyre_test_python_testcase(postgres.ext/postgres_references.py)
+pyre_test_python_testcase(postgres.ext/postgres_copy.py)
+pyre_test_python_testcase(postgres.ext/postgres_fetch.py)
+pyre_test_python_testcase(postgres.ext/postgres_pool.py)
+pyre_test_python_testcase(postgres.ext/postgres_select.py)
 pyre_test_python_testcase(postgres.ext/postgres_database_drop.py)
 
 # make the fixture
@@ -42,5 +46,17 @@ set_property(TEST postgres.ext.postgres_reserved.py PROPERTY
 set_property(TEST postgres.ext.postgres_references.py PROPERTY
   FIXTURES_REQUIRED POSTGRES)
 
+set_property(TEST postgres.ext.postgres_copy.py PROPERTY
+  FIXTURES_REQUIRED POSTGRES)
+
+set_property(TEST postgres.ext.postgres_fetch.py PROPERTY
+  FIXTURES_REQUIRED POSTGRES)
+
+set_property(TEST postgres.ext.postgres_pool.py PROPERTY
+  FIXTURES_REQUIRED POSTGRES)
+
+set_property(TEST postgres.ext.postgres_select.py PROPERTY
+  FIXTURES_REQUIRED POSTGRES)
+
 
 # end of file
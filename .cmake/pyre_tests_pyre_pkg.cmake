@@ -41,6 +41,7 @@ pyre_test_python_testcase(pyre.pkg/patterns/extent.py)
 pyre_test_python_testcase(pyre.pkg/patterns/named.py)
 pyre_test_python_testcase(pyre.pkg/patterns/observable.py)
 pyre_test_python_testcase(pyre.pkg/patterns/pathhash.py)
+pyre_test_python_testcase(pyre.pkg/patterns/prefixtree.py)
 pyre_test_python_testcase(pyre.pkg/patterns/singleton.py)
 
 
@@ -267,6 +268,7 @@ pyre_test_python_testcase(pyre.pkg/calc/expression_resolution.py)
 pyre_test_python_testcase(pyre.pkg/calc/expression_circular.py)
 pyre_test_python_testcase(pyre.pkg/calc/expression_syntaxerror.py)
 pyre_test_python_testcase(pyre.pkg/calc/expression_typeerror.py)
+pyre_test_python_testcase(pyre.pkg/calc/expression_compiled.py)
 pyre_test_python_testcase(pyre.pkg/calc/interpolation.py)
 pyre_test_python_testcase(pyre.pkg/calc/interpolation_escaped.py)
 pyre_test_python_testcase(pyre.pkg/calc/interpolation_circular.py)
@@ -274,11 +276,14 @@ pyre_test_python_testcase(pyre.pkg/calc/memo.py)
 pyre_test_python_testcase(pyre.pkg/calc/memo_model.py)
 pyre_test_python_testcase(pyre.pkg/calc/memo_expression.py)
 pyre_test_python_testcase(pyre.pkg/calc/memo_interpolation.py)
+pyre_test_python_testcase(pyre.pkg/calc/memo_diamond.py)
+pyre_test_python_testcase(pyre.pkg/calc/memo_threads.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_patch.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_alias.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_group.py)
 pyre_test_python_testcase(pyre.pkg/calc/hierarchical_contains.py)
+pyre_test_python_testcase(pyre.pkg/calc/hierarchical_find.py)
 pyre_test_python_testcase(pyre.pkg/calc/model.py)
 
 
@@ -451,6 +456,7 @@ pyre_test_python_testcase(pyre.pkg/config/configurator_assignments.py)
 pyre_test_python_testcase(pyre.pkg/config/configurator_load_pml.py)
 pyre_test_python_testcase(pyre.pkg/config/configurator_load_cfg.py)
 pyre_test_python_testcase(pyre.pkg/config/configurator_load_pfg.py)
+pyre_test_python_testcase(pyre.pkg/config/configurator_cache.py)
 pyre_test_python_testcase(pyre.pkg/config/command.py)
 pyre_test_python_testcase(pyre.pkg/config/command_argv.py)
 pyre_test_python_testcase(pyre.pkg/config/command_config.py)
@@ -468,6 +474,7 @@ pyre_test_python_testcase(pyre.pkg/framework/slot_update.py)
 pyre_test_python_testcase(pyre.pkg/framework/nameserver.py)
 pyre_test_python_testcase(pyre.pkg/framework/nameserver_access.py)
 pyre_test_python_testcase(pyre.pkg/framework/nameserver_aliases.py)
+pyre_test_python_testcase(pyre.pkg/framework/nameserver_batch.py)
 pyre_test_python_testcase(pyre.pkg/framework/fileserver.py)
 pyre_test_python_testcase(pyre.pkg/framework/fileserver_uri.py)
 pyre_test_python_testcase(pyre.pkg/framework/fileserver_mount.py)
@@ -475,6 +482,8 @@ pyre_test_python_testcase(pyre.pkg/framework/registrar.py)
 pyre_test_python_testcase(pyre.pkg/framework/linker.py)
 pyre_test_python_testcase(pyre.pkg/framework/linker_codecs.py)
 pyre_test_python_testcase(pyre.pkg/framework/linker_shelves.py)
+pyre_test_python_testcase(pyre.pkg/framework/linker_resolutions.py)
+pyre_test_python_testcase(pyre.pkg/framework/linker_resolutions_persist.py)
 pyre_test_python_testcase(pyre.pkg/framework/externals.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive_configuration.py)
@@ -482,6 +491,7 @@ pyre_test_python_testcase(pyre.pkg/framework/executive_resolve.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive_resolve_duplicate.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive_resolve_badImport.py)
 pyre_test_python_testcase(pyre.pkg/framework/executive_resolve_syntaxError.py)
+pyre_test_python_testcase(pyre.pkg/framework/executive_lazy.py)
 
 
 #
@@ -604,11 +614,13 @@ pyre_test_python_testcase(pyre.pkg/db/table_delete.py)
 pyre_test_python_testcase(pyre.pkg/db/table_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/db/table_insert.py)
 pyre_test_python_testcase(pyre.pkg/db/table_update.py)
+pyre_test_python_testcase(pyre.pkg/db/copy_codec.py)
 pyre_test_python_testcase(pyre.pkg/db/query_star.py)
 pyre_test_python_testcase(pyre.pkg/db/query_projection.py)
 pyre_test_python_testcase(pyre.pkg/db/query_projection_expressions.py)
 pyre_test_python_testcase(pyre.pkg/db/query_projection_multitable.py)
 pyre_test_python_testcase(pyre.pkg/db/query_restriction.py)
+pyre_test_python_testcase(pyre.pkg/db/query_parameters.py)
 pyre_test_python_testcase(pyre.pkg/db/query_collation.py)
 pyre_test_python_testcase(pyre.pkg/db/query_collation_explicit.py)
 pyre_test_python_testcase(pyre.pkg/db/query_collation_expression.py)
@@ -622,18 +634,26 @@ pyre_test_python_testcase(pyre.pkg/db/persistent_declaration.py)
 pyre_test_python_testcase(pyre.pkg/ipc/sanity.py)
 pyre_test_python_testcase(pyre.pkg/ipc/pickler.py)
 pyre_test_python_testcase(pyre.pkg/ipc/pipe.py)
+pyre_test_python_testcase(pyre.pkg/ipc/pipe_offer.py)
 pyre_test_python_testcase(pyre.pkg/ipc/tcp.py)
 pyre_test_python_testcase(pyre.pkg/ipc/pickler_over_pipe.py)
 pyre_test_python_testcase(pyre.pkg/ipc/pickler_over_tcp.py)
+pyre_test_python_testcase(pyre.pkg/ipc/framer_over_pipe.py)
+pyre_test_python_testcase(pyre.pkg/ipc/framer_over_tcp.py)
+pyre_test_python_testcase(pyre.pkg/ipc/sharer_over_pipe.py)
 pyre_test_python_testcase(pyre.pkg/ipc/scheduler.py)
 pyre_test_python_testcase(pyre.pkg/ipc/scheduler_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/ipc/scheduler_alarms.py)
+pyre_test_python_testcase(pyre.pkg/ipc/scheduler_cancel.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_alarms.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_signals.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_pickler_over_pipe.py)
 pyre_test_python_testcase(pyre.pkg/ipc/selector_pickler_over_tcp.py)
+pyre_test_python_testcase(pyre.pkg/ipc/epoll.py)
+pyre_test_python_testcase(pyre.pkg/ipc/epoll_pipes.py)
+pyre_test_python_testcase(pyre.pkg/ipc/epoll_pickler_over_pipe.py)
 
 
 #
@@ -645,6 +665,17 @@ pyre_test_python_testcase(pyre.pkg/nexus/node_instantiation.py)
 pyre_test_python_testcase(pyre.pkg/nexus/node_signals.py)
 pyre_test_python_testcase(pyre.pkg/nexus/pool.py)
 pyre_test_python_testcase(pyre.pkg/nexus/pool.py --tasks=4 --team.size=2)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_prefetch.py)
+pyre_test_python_testcase(pyre.pkg/nexus/pool_payloads.py)
+pyre_test_python_testcase(pyre.pkg/nexus/workplan.py)
+
+
+#
+# pyre/http
+#
+pyre_test_python_testcase(pyre.pkg/http/request_incremental.py)
+pyre_test_python_testcase(pyre.pkg/http/server_keepalive.py)
+pyre_test_python_testcase(pyre.pkg/http/server_files.py)
 
 
 #
@@ -652,6 +683,7 @@ pyre_test_python_testcase(pyre.pkg/nexus/pool.py --tasks=4 --team.size=2)
 #
 pyre_test_python_testcase(pyre.pkg/platforms/sanity.py)
 pyre_test_python_testcase(pyre.pkg/platforms/host.py)
+pyre_test_python_testcase(pyre.pkg/platforms/facts.py)
 
 
 #
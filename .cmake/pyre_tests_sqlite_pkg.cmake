@@ -13,6 +13,11 @@ pyre_test_python_testcase(sqlite.pkg/sqlite_database.py)
 pyre_test_python_testcase(sqlite.pkg/sqlite_attach.py)
 pyre_test_python_testcase(sqlite.pkg/sqlite_table.py)
 pyre_test_python_testcase(sqlite.pkg/sqlite_references.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_insert.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_fetch.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_pool.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_select.py)
+pyre_test_python_testcase(sqlite.pkg/sqlite_pool_select.py)
 # cleanup
 add_test(NAME sqlite.clean
   WORKING_DIRECTORY "${PYRE_TESTSUITE_DIR}/sqlite.pkg"
@@ -0,0 +1,68 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+"""
+Measure the cost of injecting messages into disabled and enabled channels
+"""
+
+
+# externals
+import time
+
+
+def measure(channel, messages=100000):
+    """
+    Compute the average time it takes to inject a two line message into {channel}
+    """
+    # start the clock
+    start = time.perf_counter()
+    # inject
+    for _ in range(messages):
+        channel.line("hello")
+        channel.log("world!")
+    # stop the clock and return the average, in microseconds
+    return 1e6 * (time.perf_counter() - start) / messages
+
+
+def main():
+    # get the trash can
+    from journal.Trash import Trash as trash
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # make a channel
+    channel = debug(name="bench.journal.debug")
+    # send its output to the trash, so we only measure the cost of the channel
+    channel.device = trash()
+
+    # measure the disabled channel
+    disabled = measure(channel=channel)
+    # measure one that is active, but above the verbosity threshold
+    channel.activate()
+    channel.verbosity = 2
+    quiet = measure(channel=channel)
+    # measure the enabled channel
+    channel.verbosity = 1
+    enabled = measure(channel=channel)
+
+    # report
+    print(f"disabled: {disabled:6.2f} us/message")
+    print(f"   quiet: {quiet:6.2f} us/message")
+    print(f" enabled: {enabled:6.2f} us/message")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # do...
+    main()
+
+
+# end of file
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the cost of propagating a change through graphs of increasing depth and fan-out
+"""
+
+
+# externals
+import time
+
+
+def chain(depth):
+    """
+    Build a linear chain of {depth} nodes
+    """
+    # get the package
+    import pyre.calc
+    # the root
+    root = pyre.calc.var(value=0)
+    # build the chain
+    nodes = [root]
+    for _ in range(depth):
+        nodes.append(nodes[-1] + 1)
+    # all done
+    return root, nodes
+
+
+def fan(width):
+    """
+    Build a graph where {width} nodes observe the same root
+    """
+    # get the package
+    import pyre.calc
+    # the root
+    root = pyre.calc.var(value=0)
+    # build the observers
+    nodes = [root] + [root + n for n in range(width)]
+    # all done
+    return root, nodes
+
+
+def diamonds(depth):
+    """
+    Build a stack of {depth} diamonds, so that there are 2**{depth} paths from the root to the
+    bottom of the stack
+    """
+    # get the package
+    import pyre.calc
+    # the root
+    root = pyre.calc.var(value=0)
+    # the nodes
+    nodes = [root]
+    # build the layers
+    layer = (root, root)
+    for _ in range(depth):
+        layer = (layer[0] + layer[1], layer[0] + layer[1])
+        nodes.extend(layer)
+    # all done
+    return root, nodes
+
+
+def measure(root, nodes, rounds=20):
+    """
+    Compute the average time it takes to flush the graph rooted at {root}
+    """
+    # the total time
+    total = 0
+    # go through the rounds
+    for value in range(rounds):
+        # evaluate all nodes so that their caches are valid
+        for node in nodes: node.value
+        # start the clock
+        start = time.perf_counter()
+        # make a change
+        root.value = value
+        # stop the clock
+        total += time.perf_counter() - start
+    # return the average, in microseconds
+    return 1e6 * total / rounds
+
+
+def main():
+    # the graph builders and their sizes
+    shapes = [
+        ("chain", chain, (10, 100, 1000)),
+        ("fan-out", fan, (10, 100, 1000, 10000)),
+        ("diamonds", diamonds, (10, 100, 400)),
+        ]
+    # go through them
+    for name, builder, sizes in shapes:
+        # and each size
+        for size in sizes:
+            # build the graph
+            root, nodes = builder(size)
+            # measure and report
+            print(f"{name:>10}: size={size:6}, nodes={len(nodes):6}, "
+                  f"flush={measure(root, nodes):10.1f} us")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    main()
+
+
+# end of file
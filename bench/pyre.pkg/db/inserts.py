@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the cost of inserting table records with their values rendered into the text of the
+statement, and with a parameterized statement executed once per record
+"""
+
+
+# externals
+import sys
+import time
+# support
+import pyre.db
+
+
+# the table
+class Measurement(pyre.db.table, id="measurements"):
+    """
+    A table with a few fields of the common types
+    """
+
+    id = pyre.db.int().primary()
+    sensor = pyre.db.str().notNull()
+    value = pyre.db.float()
+    reading = pyre.db.decimal(precision=9, scale=2)
+
+
+def records(count):
+    """
+    Build {count} records
+    """
+    # easy enough
+    return [
+        Measurement.pyre_immutable(
+            id=index, sensor=f"sensor-{index % 97}", value=index/7, reading=index % 10000)
+        for index in range(count) ]
+
+
+def literal(db, rows):
+    """
+    Insert {rows} by rendering them into the text of the statement
+    """
+    # build the statement and execute it
+    db.execute(*db.sql.insertRecords(*rows))
+    # all done
+    return
+
+
+def parameterized(db, rows):
+    """
+    Insert {rows} by executing a parameterized statement once per record
+    """
+    # the server does this by default
+    db.insert(*rows)
+    # all done
+    return
+
+
+def main():
+    # the number of records
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    # make them
+    rows = records(count=count)
+    # go through the strategies
+    for index, (label, strategy) in enumerate((
+            ("literal", literal),
+            ("parameterized", parameterized),
+            )):
+        # make a database
+        db = pyre.db.sqlite(name=f"bench.db.inserts.{index}").attach()
+        # make the table
+        db.createTable(Measurement)
+        # start the clock
+        start = time.perf_counter()
+        # insert the records
+        strategy(db=db, rows=rows)
+        # stop the clock
+        elapsed = time.perf_counter() - start
+        # verify
+        (total,), = db.execute("SELECT COUNT(*) FROM measurements")
+        assert total == count
+        # clean up
+        db.detach()
+        # and report
+        print(f"{label:>14}: {count} records in {elapsed:6.2f} s, "
+              f"{count / elapsed:9.0f} records/s")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    main()
+
+
+# end of file
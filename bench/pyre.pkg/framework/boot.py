@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the time it takes to import pyre in a fresh interpreter, with and without a lazy boot
+"""
+
+
+# externals
+import statistics
+import subprocess
+import sys
+
+
+# the script each interpreter runs; it reports the time spent importing pyre, in seconds
+probe = """
+{preamble}
+import time
+start = time.perf_counter()
+import pyre
+{action}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(preamble="", action="", rounds=10):
+    """
+    Compute the median time it takes to import pyre in a fresh interpreter
+    """
+    # assemble the script
+    script = probe.format(preamble=preamble, action=action)
+    # the samples
+    samples = []
+    # go through the rounds
+    for _ in range(rounds):
+        # run the script
+        output = subprocess.run([sys.executable, "-c", script],
+                                check=True, stdout=subprocess.PIPE, universal_newlines=True)
+        # and collect the reported time
+        samples.append(float(output.stdout.split()[-1]))
+    # return the median, in milliseconds
+    return 1e3 * statistics.median(samples)
+
+
+def main():
+    # the scenarios
+    scenarios = [
+        ("eager", "", ""),
+        ("lazy", "pyre_lazy = True", ""),
+        ("lazy+host", "pyre_lazy = True", "pyre.host"),
+        ("lazy+app", "pyre_lazy = True", "pyre.application"),
+        ]
+    # go through them
+    for name, preamble, action in scenarios:
+        # measure and report
+        print(f"{name:>10}: import={measure(preamble=preamble, action=action):8.1f} ms")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    main()
+
+
+# end of file
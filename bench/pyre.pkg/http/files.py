@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the throughput and the memory footprint of the web server when it serves a large file,
+with the file read into memory for every request and with the file streamed
+"""
+
+
+# externals
+import http.client
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+# support
+import pyre
+
+
+# the application
+class Files(pyre.application, family="bench.http.files"):
+    """
+    An application that responds to every request with the file that was requested
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Fulfill a request from an HTTP {server}
+        """
+        # serve the file
+        return server.documents.File(uri=request.url, server=server, application=self)
+
+
+def serve(app, threshold, index):
+    """
+    Start a server for {app} that streams the files that are at least {threshold} bytes long;
+    return its port and the process id of the child
+    """
+    # access the server
+    from pyre.http.Server import Server
+    # make a dispatcher
+    dispatcher = pyre.ipc.newPoller(name=f"bench.http.files.dispatcher.{index}")
+    # and a server
+    server = Server(name=f"bench.http.files.server.{index}")
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # set the streaming threshold
+        server.documents.File.threshold = threshold
+        # serve until killed
+        dispatcher.watch()
+        # just in case
+        os._exit(0)
+    # in the parent, return the port and the server process id
+    return server.address.port, pid
+
+
+def measure(port, size, requests):
+    """
+    Download the file of {size} bytes {requests} times over a persistent connection
+    """
+    # open the connection
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    # start the clock
+    start = time.perf_counter()
+    # issue the requests
+    for _ in range(requests):
+        # ask for the file
+        connection.request("GET", "/www/payload.bin")
+        # get the response
+        answer = connection.getresponse()
+        # read it, a chunk at a time, so the client footprint stays small
+        got = 0
+        while True:
+            chunk = answer.read(1024*1024)
+            if not chunk: break
+            got += len(chunk)
+        # check it
+        assert got == size
+    # stop the clock
+    elapsed = time.perf_counter() - start
+    # clean up
+    connection.close()
+    # return the throughput, in MB/s
+    return size * requests / elapsed / 2**20
+
+
+def main():
+    # the file size, in MB
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    # and the number of requests
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    # make a directory with the file to serve
+    root = tempfile.mkdtemp()
+    # carefully
+    try:
+        # make the file
+        size = megabytes * 2**20
+        with open(os.path.join(root, "payload.bin"), "wb") as stream:
+            stream.write(os.urandom(size))
+        # make an application
+        app = Files(name="bench.http.files")
+        # and give it the file
+        app.pfs["www"] = pyre.filesystem.local(root=root).discover()
+        # go through the scenarios
+        for index, (label, threshold) in enumerate((
+                ("read into memory", float("inf")),
+                ("streamed", 64*1024),
+                )):
+            # start the server
+            port, pid = serve(app=app, threshold=threshold, index=index)
+            # measure
+            throughput = measure(port=port, size=size, requests=requests)
+            # shut the server down
+            os.kill(pid, signal.SIGKILL)
+            # and collect its resource usage
+            _, _, usage = os.wait4(pid, 0)
+            # report
+            print(f"{label:>17}: {throughput:8.1f} MB/s, "
+                  f"server peak memory: {usage.ru_maxrss / 1024:7.1f} MB")
+    # either way
+    finally:
+        # clean up
+        shutil.rmtree(root)
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    main()
+
+
+# end of file
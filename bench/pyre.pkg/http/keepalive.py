@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the request rate of the web server with fresh connections, persistent connections and
+pipelined requests
+"""
+
+
+# externals
+import os
+import signal
+import socket
+import sys
+import time
+# support
+import pyre
+
+
+# the application
+class Hello(pyre.application, family="bench.http.hello"):
+    """
+    An application that responds to every request with a short greeting
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Fulfill a request from an HTTP {server}
+        """
+        # build the response
+        return server.documents.Literal(server=server, value="hello")
+
+
+def serve():
+    """
+    Start the server in a child process; return its port and the process id of the child
+    """
+    # access the server
+    from pyre.http.Server import Server
+    # make an application
+    app = Hello(name="bench.http.hello")
+    # a dispatcher
+    dispatcher = pyre.ipc.newPoller(name="bench.http.dispatcher")
+    # and a server
+    server = Server(name="bench.http.server")
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # serve until killed
+        dispatcher.watch()
+        # just in case
+        os._exit(0)
+    # in the parent, return the port and the server process id
+    return server.address.port, pid
+
+
+# the request
+request = b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n"
+# the response size; measured the first time through
+size = None
+
+
+def exchange(sock, count):
+    """
+    Send {count} requests over {sock} in one go and read all the responses
+    """
+    # send the requests
+    sock.sendall(request * count)
+    # the number of bytes we expect back
+    expected = size * count
+    # the number we got
+    got = 0
+    # read until we have all of them
+    while got < expected:
+        # pull whatever is available
+        chunk = sock.recv(max(65536, expected - got))
+        # if the server hung up
+        if not chunk:
+            # complain
+            raise RuntimeError("the server hung up")
+        # update the count
+        got += len(chunk)
+    # all done
+    return
+
+
+def measure(port, requests, depth, persistent):
+    """
+    Issue {requests} requests, {depth} at a time, over a single persistent connection if
+    {persistent} is set, or a new connection per batch otherwise
+    """
+    # the server address
+    address = ("127.0.0.1", port)
+    # start the clock
+    start = time.perf_counter()
+    # if the connection is persistent
+    if persistent:
+        # open it
+        with socket.create_connection(address) as sock:
+            # disable the small packet coalescing
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # issue the requests
+            for _ in range(requests // depth): exchange(sock=sock, count=depth)
+    # otherwise
+    else:
+        # issue the requests
+        for _ in range(requests // depth):
+            # each batch on a new connection
+            with socket.create_connection(address) as sock:
+                exchange(sock=sock, count=depth)
+    # stop the clock and return the request rate
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    # the number of requests
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    # start the server
+    port, pid = serve()
+    # carefully
+    try:
+        # measure the response size
+        global size
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(request)
+            size = len(sock.recv(65536))
+        # go through the scenarios
+        for label, depth, persistent in (
+                ("new connection per request", 1, False),
+                ("persistent connection", 1, True),
+                ("persistent, 16 pipelined", 16, True),
+                ):
+            # measure
+            rate = measure(port=port, requests=requests, depth=depth, persistent=persistent)
+            # and report
+            print(f"{label:>30}: {rate:8.0f} requests/s")
+    # either way
+    finally:
+        # shut the server down
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    main()
+
+
+# end of file
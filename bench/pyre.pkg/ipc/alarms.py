@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the cost of scheduling, raising and cancelling large numbers of periodic alarms
+"""
+
+
+# externals
+import time
+
+
+def measure(alarms, rounds=5):
+    """
+    Schedule {alarms} periodic alarms and raise them {rounds} times
+    """
+    # get the package
+    import pyre.ipc
+    # and the units of time
+    from pyre.units.SI import second
+    # make a scheduler
+    scheduler = pyre.ipc.newScheduler()
+    # the period of the alarms
+    period = 1e-6*second
+    # the handler; it asks to be rescheduled every time
+    def handler(timestamp):
+        return period
+
+    # start the clock
+    start = time.perf_counter()
+    # schedule the alarms
+    handles = [scheduler.alarm(interval=period, call=handler) for _ in range(alarms)]
+    # stop the clock
+    schedule = time.perf_counter() - start
+
+    # the total time spent raising alarms
+    raised = 0
+    # go through the rounds
+    for _ in range(rounds):
+        # make sure they are all due
+        time.sleep(scheduler.poll())
+        # start the clock
+        start = time.perf_counter()
+        # raise them
+        scheduler.awaken()
+        # stop the clock
+        raised += time.perf_counter() - start
+
+    # start the clock
+    start = time.perf_counter()
+    # cancel them all
+    for handle in handles: handle.cancel()
+    # stop the clock
+    cancel = time.perf_counter() - start
+    # verify the scheduler has nothing left to do
+    assert scheduler.poll() is None
+
+    # return the per alarm costs, in microseconds
+    return 1e6 * schedule / alarms, 1e6 * raised / rounds / alarms, 1e6 * cancel / alarms
+
+
+def main():
+    # go through the sizes
+    for alarms in (1000, 10000, 100000):
+        # measure
+        schedule, raised, cancel = measure(alarms=alarms)
+        # and report
+        print(f"alarms={alarms:7}: schedule={schedule:6.2f} us, raise={raised:6.2f} us, "
+              f"cancel={cancel:6.2f} us")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    main()
+
+
+# end of file
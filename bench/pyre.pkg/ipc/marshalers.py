@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the cost of shipping large buffers to another process with each marshaler
+"""
+
+
+# externals
+import os
+import pickle
+import sys
+import time
+
+
+# the payload
+class Array:
+    """
+    A stand-in for a numpy array: under pickle protocol 5 it hands its memory over as an out of
+    band buffer and it is rebuilt without copying; under earlier protocols its memory is copied
+    into the pickle
+    """
+
+    # meta-methods
+    def __init__(self, data):
+        # save my memory
+        self.data = data
+        # all done
+        return
+
+    def __len__(self):
+        # my size in bytes
+        return memoryview(self.data).nbytes
+
+    def __reduce_ex__(self, protocol):
+        # if the pickler can handle out of band buffers
+        if protocol >= 5:
+            # hand over my memory
+            return type(self), (pickle.PickleBuffer(self.data),)
+        # otherwise, copy it
+        return type(self), (bytes(self.data),)
+
+
+def measure(factory, size, rounds):
+    """
+    Send a buffer of {size} bytes to a child process {rounds} times, using a marshaler made by
+    {factory}, and wait for an acknowledgment each time
+    """
+    # get the package
+    import pyre.ipc
+    # make a marshaler
+    marshaler = factory()
+    # and a pair of pipes
+    parent, child = pyre.ipc.pipe()
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # receive until told to stop
+        while True:
+            # get a message
+            message = marshaler.recv(channel=child)
+            # if it's the end marker
+            if message is None:
+                # bail
+                os._exit(0)
+            # otherwise, acknowledge it by sending back its size
+            marshaler.send(item=len(message), channel=child)
+
+    # make the payload
+    payload = Array(data=bytearray(size))
+    # start the clock
+    start = time.perf_counter()
+    # send it a few times
+    for _ in range(rounds):
+        # ship it
+        marshaler.send(item=payload, channel=parent)
+        # wait for the acknowledgment
+        assert marshaler.recv(channel=parent) == size
+    # stop the clock
+    elapsed = time.perf_counter() - start
+    # tell the child to stop
+    marshaler.send(item=None, channel=parent)
+    # wait for it
+    os.waitpid(pid, 0)
+    # clean up
+    parent.close()
+    child.close()
+    # return the time per message, in milliseconds
+    return 1e3 * elapsed / rounds
+
+
+def main():
+    # get the package
+    import pyre.ipc
+    # the payload sizes, in bytes
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2**10, 2**16, 2**20, 2**24, 2**27]
+    # the marshalers
+    marshalers = [
+        ("pickler", pyre.ipc.newPickler),
+        ("framer", pyre.ipc.newFramer),
+        ("sharer", pyre.ipc.newSharer),
+        ]
+    # go through the sizes
+    for size in sizes:
+        # send small payloads more often
+        rounds = max(3, min(1000, 2**27 // size))
+        # go through the marshalers
+        for name, factory in marshalers:
+            # measure
+            elapsed = measure(factory=factory, size=size, rounds=rounds)
+            # and report
+            print(f"{name:>8}: size={size:10} bytes: {elapsed:9.3f} ms/message, "
+                  f"{size / elapsed / 1e6:7.2f} GB/s")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    main()
+
+
+# end of file
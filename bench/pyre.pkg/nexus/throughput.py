@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Measure the rate at which a team of forked crew members carries out tiny tasks, for a few
+combinations of the prefetch depth and batch size
+"""
+
+
+# externals
+import sys
+import time
+# support
+import pyre
+
+
+# the task
+class Task(pyre.nexus.task):
+    """
+    A task that does nothing
+    """
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # nothing to do
+        return None
+
+
+# the team manager
+from pyre.nexus.Pool import Pool as pool
+class Pool(pool, family='bench.nexus.pool'):
+    """
+    A team manager that counts the completed tasks
+    """
+
+    # interface
+    def harvest(self, task, result):
+        """
+        Count the completed tasks
+        """
+        # update the count
+        self.completed += 1
+        # all done
+        return self
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # start out with nothing completed
+        self.completed = 0
+        # all done
+        return
+
+
+def measure(tasks, size, prefetch, batch):
+    """
+    Compute the number of tasks per second a team of {size} can carry out
+    """
+    # make a team; the name has to be unique, since teams with the same name are the same
+    team = Pool(name=f"bench.nexus.pool.{tasks}.{size}.{prefetch}.{batch}")
+    # configure it
+    team.size = size
+    team.prefetch = prefetch
+    team.batch = batch
+    # make the workplan
+    workplan = { Task() for _ in range(tasks) }
+    # start the clock
+    start = time.perf_counter()
+    # recruit
+    team.assemble(workplan=workplan)
+    # and work
+    team.run()
+    # stop the clock
+    elapsed = time.perf_counter() - start
+    # make sure everything was done
+    assert team.completed == tasks
+    # return the rate
+    return tasks / elapsed
+
+
+def main(sizes):
+    # the exchange settings to compare
+    settings = [ (1, 1), (4, 1), (16, 4), (64, 16), (256, 64) ]
+    # go through the workplan sizes
+    for tasks in sizes:
+        # and the settings
+        for prefetch, batch in settings:
+            # skip the slow ones on large workplans
+            if tasks > 100000 and batch < 16: continue
+            # measure
+            rate = measure(tasks=tasks, size=4, prefetch=prefetch, batch=batch)
+            # and report
+            print(f"tasks={tasks:8}, prefetch={prefetch:4}, batch={batch:3}: "
+                  f"{rate:10.0f} tasks/s")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # the workplan sizes; pass larger ones on the command line, e.g. 1000000
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    # do...
+    main(sizes=sizes)
+
+
+# end of file
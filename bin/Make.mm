@@ -23,6 +23,7 @@ EXPORT_BINS = \
     merlin \
     pyre \
     pyre-config \
+    pyre-host \
     python.pyre \
     smith.pyre \
     walk \
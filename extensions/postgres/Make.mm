@@ -23,6 +23,7 @@ PROJ_LIBRARIES = -ljournal
 # the sources
 PROJ_SRCS = \
     connection.cc \
+    copy.cc \
     execute.cc \
     exceptions.cc \
     interlayer.cc \
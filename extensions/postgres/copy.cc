@@ -0,0 +1,330 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis
+// orthologue
+// (c) 1998-2020 all rights reserved
+//
+
+#include <portinfo>
+
+#include <Python.h>
+#include <libpq-fe.h>
+#include <pyre/journal.h>
+#include <cstdlib>
+
+#include "copy.h"
+#include "constants.h"
+#include "interlayer.h"
+
+
+// declarations of the helpers; definitions at the bottom
+static PyObject * startCopy(PGconn *, const char *, ExecStatusType);
+static PyObject * abortCopy(PGconn *, const char *);
+static PyObject * finishCopy(PGconn *, const char *);
+// the largest piece of a chunk handed to libpq at once
+static const Py_ssize_t piece = 1 << 30;
+
+
+// stream data to the server
+const char * const
+pyre::extensions::postgres::
+copyIn__name__ = "copyIn";
+
+const char * const
+pyre::extensions::postgres::
+copyIn__doc__ =
+    "execute a COPY FROM STDIN command and send it the chunks of data from an iterable";
+
+PyObject *
+pyre::extensions::postgres::
+copyIn(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    PyObject * py_connection;
+    PyObject * py_chunks;
+    // extract the arguments
+    if (!PyArg_ParseTuple(args,
+                          "O!sO:copyIn",
+                          &PyCapsule_Type, &py_connection, &command, &py_chunks)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "copying data to the server with '" << command << "'"
+        << pyre::journal::endl;
+
+    // start the transfer
+    PyObject * status = startCopy(connection, command, PGRES_COPY_IN);
+    // if that failed, bail
+    if (!status) {
+        return 0;
+    }
+    // otherwise, we don't need the status
+    Py_DECREF(status);
+
+    // get an iterator over the chunks
+    PyObject * chunks = PyObject_GetIter(py_chunks);
+    // if that failed
+    if (!chunks) {
+        // tell the server and bail
+        return abortCopy(connection, "the data source is not iterable");
+    }
+
+    // go through the chunks
+    PyObject * chunk;
+    while ((chunk = PyIter_Next(chunks))) {
+        // get access to its bytes
+        Py_buffer view;
+        // if that failed
+        if (PyObject_GetBuffer(chunk, &view, PyBUF_SIMPLE) < 0) {
+            // clean up
+            Py_DECREF(chunk);
+            Py_DECREF(chunks);
+            // tell the server and bail
+            return abortCopy(connection, "the data source produced an invalid chunk");
+        }
+        // send it, in pieces that libpq can measure
+        const char * data = static_cast<const char *>(view.buf);
+        bool ok = true;
+        for (Py_ssize_t sent = 0; ok && sent < view.len; sent += piece) {
+            // figure out how much to send
+            Py_ssize_t size = view.len - sent < piece ? view.len - sent : piece;
+            // and send it; in blocking mode, this either queues the data or fails
+            ok = PQputCopyData(connection, data + sent, static_cast<int>(size)) == 1;
+        }
+        // clean up
+        PyBuffer_Release(&view);
+        Py_DECREF(chunk);
+        // if the transfer failed
+        if (!ok) {
+            // clean up
+            Py_DECREF(chunks);
+            // convert the error to human readable form and raise it
+            raiseOperationalError(PQerrorMessage(connection));
+            // tell the server and bail
+            return abortCopy(connection, "the transfer failed");
+        }
+    }
+    // clean up
+    Py_DECREF(chunks);
+    // if the iteration stopped because of an error
+    if (PyErr_Occurred()) {
+        // tell the server and bail
+        return abortCopy(connection, "the data source failed");
+    }
+
+    // mark the end of the data
+    if (PQputCopyEnd(connection, 0) != 1) {
+        // convert the error to human readable form and raise it
+        raiseOperationalError(PQerrorMessage(connection));
+        // clean up and bail
+        return abortCopy(connection, 0);
+    }
+
+    // collect the outcome
+    return finishCopy(connection, command);
+}
+
+
+// start streaming data from the server
+const char * const
+pyre::extensions::postgres::
+copyOut__name__ = "copyOut";
+
+const char * const
+pyre::extensions::postgres::
+copyOut__doc__ =
+    "execute a COPY TO STDOUT command; use 'copyData' to retrieve the data it generates";
+
+PyObject *
+pyre::extensions::postgres::
+copyOut(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(args, "O!s:copyOut", &PyCapsule_Type, &py_connection, &command)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "copying data from the server with '" << command << "'"
+        << pyre::journal::endl;
+
+    // start the transfer
+    return startCopy(connection, command, PGRES_COPY_OUT);
+}
+
+
+// retrieve the next piece of the data stream
+const char * const
+pyre::extensions::postgres::
+copyData__name__ = "copyData";
+
+const char * const
+pyre::extensions::postgres::
+copyData__doc__ =
+    "retrieve the next chunk of data from a COPY TO STDOUT command; None marks the end";
+
+PyObject *
+pyre::extensions::postgres::
+copyData(PyObject *, PyObject * args) {
+    // the connection specification
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(args, "O!:copyData", &PyCapsule_Type, &py_connection)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // wait for the next chunk
+    char * buffer = 0;
+    int size = PQgetCopyData(connection, &buffer, 0);
+    // if we got one
+    if (size > 0) {
+        // convert it
+        PyObject * data = PyBytes_FromStringAndSize(buffer, size);
+        // release the buffer
+        PQfreemem(buffer);
+        // and return the data
+        return data;
+    }
+    // if the transfer is complete
+    if (size == -1) {
+        // collect the outcome
+        PyObject * status = finishCopy(connection, "COPY");
+        // if the command failed, bail
+        if (!status) {
+            return 0;
+        }
+        // otherwise, we don't need the status
+        Py_DECREF(status);
+        // and mark the end of the data
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    // otherwise, something went wrong; convert the error to human readable form and raise it
+    return raiseOperationalError(PQerrorMessage(connection));
+}
+
+
+// helper definitions
+// execute a COPY command and verify that the server is ready for the transfer
+PyObject *
+startCopy(PGconn * connection, const char * command, ExecStatusType expected)
+{
+    // access the result processing and error reporting machinery
+    using namespace pyre::extensions::postgres;
+
+    // execute the command
+    PGresult * result = PQexec(connection, command);
+    // a null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form and raise it
+        return raiseOperationalError(PQerrorMessage(connection));
+    }
+    // if the server switched to the expected mode
+    if (PQresultStatus(result) == expected) {
+        // clean up
+        PQclear(result);
+        // and return None
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    // otherwise, analyze the result; on failure, this raises an exception
+    PyObject * status = processResult(command, result, buildResultTuple);
+    // if the command failed, bail
+    if (!status) {
+        return 0;
+    }
+    // otherwise, it was a valid command that doesn't transfer data the right way
+    Py_DECREF(status);
+    // complain
+    return raiseProgrammingError("the command does not transfer data in this direction", command);
+}
+
+
+// terminate a transfer after an error has been raised
+PyObject *
+abortCopy(PGconn * connection, const char * reason)
+{
+    // save the pending exception
+    PyObject * type, * value, * traceback;
+    PyErr_Fetch(&type, &value, &traceback);
+    // if there is a reason, tell the server to abandon the transfer
+    if (reason) {
+        PQputCopyEnd(connection, reason);
+    }
+    // discard the outcome, so the connection stays usable
+    PGresult * result;
+    while ((result = PQgetResult(connection))) {
+        PQclear(result);
+    }
+    // restore the exception
+    PyErr_Restore(type, value, traceback);
+    // and return an error indicator
+    return 0;
+}
+
+
+// collect the outcome of a transfer
+PyObject *
+finishCopy(PGconn * connection, const char * command)
+{
+    // access the result processing machinery
+    using namespace pyre::extensions::postgres;
+
+    // the value to return
+    PyObject * value;
+    // get the outcome
+    PGresult * result = PQgetResult(connection);
+    // if the command succeeded
+    if (result && PQresultStatus(result) == PGRES_COMMAND_OK) {
+        // return the number of rows it transferred
+        value = PyLong_FromLongLong(std::strtoll(PQcmdTuples(result), 0, 10));
+        // clean up
+        PQclear(result);
+    // otherwise
+    } else {
+        // analyze it; on failure, this raises an exception
+        value = processResult(command, result, buildResultTuple);
+    }
+    // discard whatever else is left, so the connection stays usable
+    while ((result = PQgetResult(connection))) {
+        PQclear(result);
+    }
+    // all done
+    return value;
+}
+
+
+// end of file
@@ -0,0 +1,36 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis
+// orthologue
+// (c) 1998-2020 all rights reserved
+//
+
+#if !defined(pyre_extensions_postgres_copy_h)
+#define pyre_extensions_postgres_copy_h
+
+namespace pyre {
+    namespace extensions {
+        namespace postgres {
+
+            // stream data to the server using COPY FROM STDIN
+            extern const char * const copyIn__name__;
+            extern const char * const copyIn__doc__;
+            PyObject * copyIn(PyObject *, PyObject *);
+
+            // start streaming data from the server using COPY TO STDOUT
+            extern const char * const copyOut__name__;
+            extern const char * const copyOut__doc__;
+            PyObject * copyOut(PyObject *, PyObject *);
+
+            // retrieve the next piece of a COPY TO STDOUT stream
+            extern const char * const copyData__name__;
+            extern const char * const copyData__doc__;
+            PyObject * copyData(PyObject *, PyObject *);
+
+        } // of namespace postgres
+    } // of namespace extensions
+} // of namespace pyre
+
+# endif
+
+// end of file
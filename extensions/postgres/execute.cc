@@ -10,10 +10,22 @@
 #include <Python.h>
 #include <libpq-fe.h>
 #include <pyre/journal.h>
+#include <vector>
 
 #include "execute.h"
 #include "constants.h"
 #include "interlayer.h"
+#include "exceptions.h"
+
+
+// declarations of the batch execution helpers; definitions at the bottom
+static bool executeBatch(PGconn *, const char *, const char *, PyObject *);
+static bool buildParameters(PyObject *, std::vector<PyObject *> &, std::vector<const char *> &);
+// and of the streaming helpers
+static bool harvestRows(PGresult *, PyObject *);
+static PyObject * columnTypes(PGresult *);
+// the number of rows sent to the server before waiting for their results
+static const Py_ssize_t batch = 1024;
 
 
 // execute a query synchronously
@@ -67,6 +79,179 @@ execute(PyObject *, PyObject * args) {
 }
 
 
+// execute a command once for each row of parameters
+const char * const
+pyre::extensions::postgres::
+executemany__name__ = "executemany";
+
+const char * const
+pyre::extensions::postgres::
+executemany__doc__ =
+    "execute a parameterized command once for each row in an iterable; if a statement name is "
+    "given, use the statement prepared under that name instead of preparing the command";
+
+PyObject *
+pyre::extensions::postgres::
+executemany(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    PyObject * py_connection;
+    PyObject * py_rows;
+    // the name of the prepared statement; the unnamed one by default
+    const char * name = "";
+    // extract the arguments
+    if (!PyArg_ParseTuple(args,
+                          "O!sO|s:executemany",
+                          &PyCapsule_Type, &py_connection, &command, &py_rows, &name)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // iterate over the rows, so that only one batch of them is in memory at any time
+    PyObject * rows = PyObject_GetIter(py_rows);
+    // if that failed, bail
+    if (!rows) {
+        return 0;
+    }
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "executing '" << command << "' for each row"
+        << pyre::journal::endl;
+
+    // unless the caller has prepared it already
+    if (!*name) {
+        // prepare the command as the unnamed statement; the server deduces the parameter types
+        // from the context in which they appear, and plans the statement once for all rows
+        PyObject * status =
+            processResult(command, PQprepare(connection, "", command, 0, 0), buildResultTuple);
+        // if that failed
+        if (!status) {
+            // clean up
+            Py_DECREF(rows);
+            // and bail
+            return 0;
+        }
+        // otherwise, we don't need the status
+        Py_DECREF(status);
+    }
+
+    // go through the rows in batches
+    while (true) {
+        // make a pile for the rows of this batch
+        PyObject * pile = PyList_New(0);
+        // if that failed
+        if (!pile) {
+            // clean up
+            Py_DECREF(rows);
+            // and bail
+            return 0;
+        }
+        // fill it
+        for (Py_ssize_t count = 0; count < batch; ++count) {
+            // get the next row
+            PyObject * row = PyIter_Next(rows);
+            // if there isn't one, we are done with this batch
+            if (!row) {
+                break;
+            }
+            // otherwise, add it to the pile
+            int status = PyList_Append(pile, row);
+            // we don't need our reference any more
+            Py_DECREF(row);
+            // if that failed, stop
+            if (status) {
+                break;
+            }
+        }
+        // if the iteration failed, or the row could not be stored
+        if (PyErr_Occurred()) {
+            // clean up
+            Py_DECREF(pile);
+            Py_DECREF(rows);
+            // and bail
+            return 0;
+        }
+        // if there are no more rows
+        if (PyList_GET_SIZE(pile) == 0) {
+            // clean up
+            Py_DECREF(pile);
+            // and stop
+            break;
+        }
+        // send this batch and collect the results
+        bool ok = executeBatch(connection, command, name, pile);
+        // we are done with the rows of this batch
+        Py_DECREF(pile);
+        // if it failed
+        if (!ok) {
+            // clean up
+            Py_DECREF(rows);
+            // and bail
+            return 0;
+        }
+    }
+
+    // clean up
+    Py_DECREF(rows);
+    // and return None
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// prepare a statement
+const char * const
+pyre::extensions::postgres::
+prepare__name__ = "prepare";
+
+const char * const
+pyre::extensions::postgres::
+prepare__doc__ = "prepare a parameterized command under the given name";
+
+PyObject *
+pyre::extensions::postgres::
+prepare(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * name;
+    const char * command;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(args,
+                          "O!ss:prepare",
+                          &PyCapsule_Type, &py_connection, &name, &command)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "preparing '" << command << "' as '" << name << "'"
+        << pyre::journal::endl;
+
+    // prepare the statement; it lasts until the end of the session
+    return processResult(command, PQprepare(connection, name, command, 0, 0), buildResultTuple);
+}
+
+
 // submit a query for asynchronous execution
 const char * const
 pyre::extensions::postgres::
@@ -244,4 +429,469 @@ busy(PyObject *, PyObject * args) {
 }
 
 
+// submit a query whose results are retrieved a batch at a time
+const char * const
+pyre::extensions::postgres::
+stream__name__ = "stream";
+
+const char * const
+pyre::extensions::postgres::
+stream__doc__ =
+    "submit a query whose rows are retrieved in batches of a given size by 'fetch'; the values "
+    "of its parameters, if any, are supplied as a sequence, and if a statement name is given, "
+    "the statement prepared under that name is executed instead of the command";
+
+PyObject *
+pyre::extensions::postgres::
+stream(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    PyObject * py_connection;
+    // the number of rows in a batch
+    int size;
+    // and whether the values should be in their binary form
+    int binary;
+    // the values of the parameters; none by default
+    PyObject * py_parameters = 0;
+    // the name of the prepared statement; none by default
+    const char * name = "";
+    // extract the arguments
+    if (!PyArg_ParseTuple(args,
+                          "O!sip|Os:stream",
+                          &PyCapsule_Type, &py_connection, &command, &size, &binary,
+                          &py_parameters, &name)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "streaming '" << command << "' in batches of " << size << " rows"
+        << pyre::journal::endl;
+
+    // the string representations of the parameter values, which must stay alive until the
+    // query has been sent
+    std::vector<PyObject *> strings;
+    // and the parameter values themselves
+    std::vector<const char *> values;
+    // if there are parameters, convert them
+    if (py_parameters && py_parameters != Py_None
+        && !buildParameters(py_parameters, strings, values)) {
+        // clean up
+        for (auto string : strings) {
+            Py_DECREF(string);
+        }
+        // and bail
+        return 0;
+    }
+    // the number of parameters
+    int count = static_cast<int>(values.size());
+
+    // submit the query, asking for the results in the requested format
+    int sent = *name ?
+        PQsendQueryPrepared(connection, name, count, values.data(), 0, 0, binary ? 1 : 0) :
+        PQsendQueryParams(connection, command, count, 0, values.data(), 0, 0, binary ? 1 : 0);
+    // release the string representations; libpq has copied the values
+    for (auto string : strings) {
+        Py_DECREF(string);
+    }
+    // if the query didn't make it
+    if (!sent) {
+        // convert the error to human readable form and raise it
+        return raiseOperationalError(PQerrorMessage(connection));
+    }
+
+#if defined(LIBPQ_HAS_CHUNK_MODE)
+    // ask for the rows in results of at most {size} rows each
+    int status = PQsetChunkedRowsMode(connection, size);
+#else
+    // ask for the rows one at a time
+    int status = PQsetSingleRowMode(connection);
+#endif
+    // either way, the server doesn't get to send the entire result set at once
+    if (!status) {
+        // convert the error to human readable form and raise it
+        return raiseOperationalError(PQerrorMessage(connection));
+    }
+
+    // return None
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// retrieve the next batch of rows
+const char * const
+pyre::extensions::postgres::
+fetch__name__ = "fetch";
+
+const char * const
+pyre::extensions::postgres::
+fetch__doc__ =
+    "retrieve up to a given number of rows of a streaming query, along with the type of each "
+    "column; None marks the end of the results";
+
+PyObject *
+pyre::extensions::postgres::
+fetch(PyObject *, PyObject * args) {
+    // the connection specification
+    PyObject * py_connection;
+    // the number of rows to retrieve
+    Py_ssize_t size;
+    // extract the arguments
+    if (!PyArg_ParseTuple(args, "O!n:fetch", &PyCapsule_Type, &py_connection, &size)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // the rows
+    PyObject * rows = PyList_New(0);
+    // and the types of the columns
+    PyObject * types = 0;
+    // collect rows until there are enough of them
+    while (PyList_GET_SIZE(rows) < size) {
+        // get the next result
+        PGresult * result = PQgetResult(connection);
+        // a null marks the end of the results
+        if (!result) {
+            break;
+        }
+        // get its status
+        ExecStatusType code = PQresultStatus(result);
+        // if the result has rows
+        if (code == PGRES_SINGLE_TUPLE
+#if defined(LIBPQ_HAS_CHUNK_MODE)
+            || code == PGRES_TUPLES_CHUNK
+#endif
+            || code == PGRES_TUPLES_OK) {
+            // record the column types, the first time around
+            if (!types) {
+                types = columnTypes(result);
+            }
+            // harvest the rows; the final result of a query has none
+            bool ok = types && harvestRows(result, rows);
+            // clean up
+            PQclear(result);
+            // if something went wrong
+            if (!ok) {
+                // clean up
+                Py_DECREF(rows);
+                Py_XDECREF(types);
+                // and bail
+                return 0;
+            }
+            // get the next one
+            continue;
+        }
+        // otherwise, analyze it; on failure, this raises an exception
+        PyObject * status = processResult("<stream>", result, buildResultTuple);
+        // if the query failed
+        if (!status) {
+            // discard whatever else is left, so the connection stays usable
+            while ((result = PQgetResult(connection))) {
+                PQclear(result);
+            }
+            // clean up
+            Py_DECREF(rows);
+            Py_XDECREF(types);
+            // and bail
+            return 0;
+        }
+        // otherwise, the result has no rows, so ignore it
+        Py_DECREF(status);
+    }
+
+    // if there are no rows
+    if (PyList_GET_SIZE(rows) == 0) {
+        // clean up
+        Py_DECREF(rows);
+        Py_XDECREF(types);
+        // and mark the end of the results
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    // build the batch
+    PyObject * batch = Py_BuildValue("(NN)", types, PyList_AsTuple(rows));
+    // clean up
+    Py_DECREF(rows);
+    // and return it
+    return batch;
+}
+
+
+// batch execution helper definitions
+// execute the prepared statement {name} for each row in the list {rows}
+bool
+executeBatch(PGconn * connection, const char * command, const char * name, PyObject * rows)
+{
+    // access the result processing and error reporting machinery
+    using namespace pyre::extensions::postgres;
+
+    // the string representations of the parameter values of a row, which must stay alive until
+    // the row has been sent
+    std::vector<PyObject *> strings;
+    // and the parameter values themselves
+    std::vector<const char *> values;
+
+#if defined(LIBPQ_HAS_PIPELINING)
+    // queue the rows without waiting for the server to respond to each one, so the entire batch
+    // costs a single round trip
+    if (!PQenterPipelineMode(connection)) {
+        // convert the error to human readable form and raise it
+        raiseOperationalError(PQerrorMessage(connection));
+        return false;
+    }
+#endif
+
+    // assume success
+    bool ok = true;
+    // go through the rows
+    for (Py_ssize_t index = 0; index < PyList_GET_SIZE(rows) && ok; ++index) {
+        // convert the parameters
+        ok = buildParameters(PyList_GET_ITEM(rows, index), strings, values);
+        // if that worked
+        if (ok) {
+            // the number of parameters
+            int size = static_cast<int>(values.size());
+#if defined(LIBPQ_HAS_PIPELINING)
+            // queue the row
+            if (!PQsendQueryPrepared(connection, name, size, values.data(), 0, 0, 0)) {
+                // convert the error to human readable form and raise it
+                raiseOperationalError(PQerrorMessage(connection));
+                // and stop sending rows
+                ok = false;
+            }
+#else
+            // execute the statement and check the result
+            PyObject * status = processResult(
+                command, PQexecPrepared(connection, name, size, values.data(), 0, 0, 0),
+                buildResultTuple);
+            // if it failed, stop
+            if (!status) {
+                ok = false;
+            } else {
+                Py_DECREF(status);
+            }
+#endif
+        }
+        // release the string representations; libpq has copied the values
+        for (auto string : strings) {
+            Py_DECREF(string);
+        }
+        strings.clear();
+        values.clear();
+    }
+
+#if defined(LIBPQ_HAS_PIPELINING)
+    // mark the end of the batch and push it to the server
+    bool synced = PQpipelineSync(connection);
+    // if that failed
+    if (!synced && ok) {
+        // convert the error to human readable form and raise it
+        raiseOperationalError(PQerrorMessage(connection));
+        ok = false;
+    }
+    // collect the results; once a row fails, the server skips the rest of the batch, so the
+    // remaining results are notices of aborted commands
+    while (true) {
+        // get the next result
+        PGresult * result = PQgetResult(connection);
+        // a null marks the end of the results of a row
+        if (!result) {
+            // without a sync there is no end marker to wait for, and a broken connection will
+            // never deliver one
+            if (!synced || PQstatus(connection) != CONNECTION_OK) {
+                // so report the failure
+                if (ok) {
+                    raiseOperationalError(PQerrorMessage(connection));
+                    ok = false;
+                }
+                // and stop
+                break;
+            }
+            // otherwise, move on to the results of the next row
+            continue;
+        }
+        // get its status
+        ExecStatusType code = PQresultStatus(result);
+        // if we have reached the end of the batch
+        if (code == PGRES_PIPELINE_SYNC) {
+            // clean up
+            PQclear(result);
+            // and stop
+            break;
+        }
+        // if the command was skipped because an earlier one failed
+        if (code == PGRES_PIPELINE_ABORTED || !ok) {
+            // discard it
+            PQclear(result);
+            continue;
+        }
+        // otherwise, analyze it; on failure, this raises an exception
+        PyObject * status = processResult(command, result, buildResultTuple);
+        // if the row failed
+        if (!status) {
+            // mark it, but keep draining the results so the connection stays usable
+            ok = false;
+        } else {
+            Py_DECREF(status);
+        }
+    }
+    // leave pipeline mode
+    PQexitPipelineMode(connection);
+#endif
+
+    // all done
+    return ok;
+}
+
+
+// convert a row of python values into the text representation of query parameters
+bool
+buildParameters(PyObject * row, std::vector<PyObject *> & strings,
+                std::vector<const char *> & values)
+{
+    // access the representation of {NULL}
+    using pyre::extensions::postgres::null;
+
+    // get fast access to the values
+    PyObject * items = PySequence_Fast(row, "each row must be a sequence");
+    // if that failed, bail
+    if (!items) {
+        return false;
+    }
+    // go through the items
+    Py_ssize_t size = PySequence_Fast_GET_SIZE(items);
+    for (Py_ssize_t index = 0; index < size; ++index) {
+        // get the item
+        PyObject * item = PySequence_Fast_GET_ITEM(items, index);
+        // {None} and the {NULL} representation from {pyre.db} become SQL {NULL}
+        if (item == Py_None || item == null) {
+            values.push_back(0);
+            continue;
+        }
+        // everything else is converted into a string
+        PyObject * string = PyObject_Str(item);
+        // if that failed, bail
+        if (!string) {
+            Py_DECREF(items);
+            return false;
+        }
+        // hold on to it
+        strings.push_back(string);
+        // get its contents
+        const char * value = PyUnicode_AsUTF8(string);
+        // if that failed, bail
+        if (!value) {
+            Py_DECREF(items);
+            return false;
+        }
+        // and add it to the pile
+        values.push_back(value);
+    }
+    // clean up
+    Py_DECREF(items);
+    // all done
+    return true;
+}
+
+
+// streaming helper definitions
+// convert the rows of {result} into tuples and add them to {rows}
+bool
+harvestRows(PGresult * result, PyObject * rows)
+{
+    // access the representation of {NULL}
+    using pyre::extensions::postgres::null;
+
+    // find out how many rows are in the result
+    int tuples = PQntuples(result);
+    // and how many fields in each one
+    int fields = PQnfields(result);
+    // go through the rows
+    for (int tuple = 0; tuple < tuples; ++tuple) {
+        // build a tuple to hold this row
+        PyObject * row = PyTuple_New(fields);
+        // if that failed, bail
+        if (!row) {
+            return false;
+        }
+        // go through the fields
+        for (int field = 0; field < fields; ++field) {
+            // the value
+            PyObject * item;
+            // {NULL} is represented by the registered object
+            if (PQgetisnull(result, tuple, field)) {
+                Py_INCREF(null);
+                item = null;
+            // binary values are handed over as they are, for the client to convert by type
+            } else if (PQfformat(result, field) == 1) {
+                item = PyBytes_FromStringAndSize(
+                    PQgetvalue(result, tuple, field), PQgetlength(result, tuple, field));
+            // text values become strings
+            } else {
+                item = PyUnicode_FromString(PQgetvalue(result, tuple, field));
+            }
+            // if the conversion failed
+            if (!item) {
+                // clean up and bail
+                Py_DECREF(row);
+                return false;
+            }
+            // add the value to the row
+            PyTuple_SET_ITEM(row, field, item);
+        }
+        // add the row to the pile
+        int status = PyList_Append(rows, row);
+        // the list holds a reference now
+        Py_DECREF(row);
+        // if that failed, bail
+        if (status < 0) {
+            return false;
+        }
+    }
+    // all done
+    return true;
+}
+
+
+// build a tuple with the type identifiers of the columns of {result}
+PyObject *
+columnTypes(PGresult * result)
+{
+    // find out how many fields in the result
+    int fields = PQnfields(result);
+    // build a tuple to hold their types
+    PyObject * types = PyTuple_New(fields);
+    // if that failed, bail
+    if (!types) {
+        return 0;
+    }
+    // go through the fields
+    for (int field = 0; field < fields; ++field) {
+        // record the type
+        PyTuple_SET_ITEM(types, field, PyLong_FromUnsignedLong(PQftype(result, field)));
+    }
+    // all done
+    return types;
+}
+
+
 // end of file
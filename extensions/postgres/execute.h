@@ -17,6 +17,16 @@ namespace pyre {
             extern const char * const execute__doc__;
             PyObject * execute(PyObject *, PyObject *);
 
+            // execute a parameterized command once for each row in a sequence
+            extern const char * const executemany__name__;
+            extern const char * const executemany__doc__;
+            PyObject * executemany(PyObject *, PyObject *);
+
+            // prepare a parameterized command under a given name
+            extern const char * const prepare__name__;
+            extern const char * const prepare__doc__;
+            PyObject * prepare(PyObject *, PyObject *);
+
             // submit a query for asynchronous processing
             extern const char * const submit__name__;
             extern const char * const submit__doc__;
@@ -32,6 +42,16 @@ namespace pyre {
             extern const char * const retrieve__doc__;
             PyObject * retrieve(PyObject *, PyObject *);
 
+            // submit a query whose results are retrieved a batch at a time
+            extern const char * const stream__name__;
+            extern const char * const stream__doc__;
+            PyObject * stream(PyObject *, PyObject *);
+
+            // retrieve the next batch of rows of a streaming query
+            extern const char * const fetch__name__;
+            extern const char * const fetch__doc__;
+            PyObject * fetch(PyObject *, PyObject *);
+
             // check whether a result set is available
             extern const char * const busy__name__;
             extern const char * const busy__doc__;
@@ -11,6 +11,7 @@
 
 // the module method declarations
 #include "connection.h"
+#include "copy.h"
 #include "exceptions.h"
 #include "execute.h"
 #include "metadata.h"
@@ -39,10 +40,19 @@ namespace pyre {
 
                 // SQL command execution
                 { execute__name__, execute, METH_VARARGS, execute__doc__ },
+                { executemany__name__, executemany, METH_VARARGS, executemany__doc__ },
+                { prepare__name__, prepare, METH_VARARGS, prepare__doc__ },
                 { submit__name__, submit, METH_VARARGS, submit__doc__ },
                 { busy__name__, busy, METH_VARARGS, busy__doc__ },
                 { consume__name__, consume, METH_VARARGS, consume__doc__ },
                 { retrieve__name__, retrieve, METH_VARARGS, retrieve__doc__ },
+                { stream__name__, stream, METH_VARARGS, stream__doc__ },
+                { fetch__name__, fetch, METH_VARARGS, fetch__doc__ },
+
+                // bulk transfers
+                { copyIn__name__, copyIn, METH_VARARGS, copyIn__doc__ },
+                { copyOut__name__, copyOut, METH_VARARGS, copyOut__doc__ },
+                { copyData__name__, copyData, METH_VARARGS, copyData__doc__ },
 
                 // sentinel
                 {0, 0, 0, 0}
@@ -5,7 +5,10 @@
 
 
 # externals
-import traceback       # location information
+import os              # process information
+import sys             # location information
+import threading       # thread information
+import time            # timestamps
 # framework
 import pyre            # for my superclass and {tracking}
 
@@ -138,18 +141,47 @@ class Channel(pyre.patterns.named):
 
 
     @classmethod
-    def logfile(cls, path):
+    def logfile(cls, path, **kwds):
         """
-        Send output from all channels of this severity to a log file
+        Send output from all channels of this severity to a log file; any of {size},
+        {interval}, {generations} and {compression} in {kwds} or in the chronicler {rotation}
+        defaults make it a rotating log file
         """
-        # get the file device
-        from .File import File
+        # get the file device factory
+        from .File import device
         # make one
-        log = File(path)
+        log = device(path=path, **kwds)
         # and install it as the default
         return cls.setDefaultDevice(log)
 
 
+    # access to my current entry
+    @property
+    def entry(self):
+        """
+        Return the accumulator of the current message; it is built on first use, so channels
+        that are inactive never pay for it
+        """
+        # get my entry
+        entry = self._entry
+        # if i don't have one
+        if entry is None:
+            # make one
+            entry = self._entry = self.newEntry()
+        # and return it
+        return entry
+
+    @entry.setter
+    def entry(self, entry):
+        """
+        Replace my current entry
+        """
+        # easy enough
+        self._entry = entry
+        # all done
+        return
+
+
     # access to information from my current entry
     @property
     def page(self):
@@ -194,6 +226,10 @@ class Channel(pyre.patterns.named):
         """
         Add {message} to the current page
         """
+        # if i'm not going to record anything, there is no reason to remember {message}
+        if not self.inventory.active or self.verbosity > self.chronicler.verbosity:
+            # so don't
+            return self
         # add message to my page
         self.page.append(message)
         # all done
@@ -204,15 +240,24 @@ class Channel(pyre.patterns.named):
         """
         Add {message} to the current page and then record the entry
         """
+        # if i'm not going to record anything
+        if not self.inventory.active or self.verbosity > self.chronicler.verbosity:
+            # discard whatever accumulated in my entry; the next message gets a fresh one when
+            # it needs it
+            self._entry = None
+            # and bail
+            return self
+
         # if there is a final {message} to process
         if message is not None:
             # add it to the page
             self.page.append(message)
 
-        # get a stack trace
-        trace = traceback.extract_stack(limit=2)
+        # get the frame of my caller
+        caller = sys._getframe(1)
         # so we can extract location information
-        filename, line, function, *_ = trace[0]
+        code = caller.f_code
+        filename, line, function = code.co_filename, caller.f_lineno, code.co_name
 
         # decorate my current metadata
         notes = self.notes
@@ -220,6 +265,9 @@ class Channel(pyre.patterns.named):
         notes["filename"] = filename
         notes["line"] = str(line)
         notes["function"] = function
+        # record when and where the message was logged; devices may write it much later, and
+        # from another thread, e.g. behind a {queue}
+        self.entry.stamp = self.stamp()
 
         # certain channels, e.g. errors and firewalls, raise exceptions as part of committing a
         # message to the journal. such exceptions may be caught and handled, and the channel
@@ -242,8 +290,9 @@ class Channel(pyre.patterns.named):
             raise
         # but in any case
         finally:
-            # flush my entry
-            self.entry = self.newEntry()
+            # flush my entry; devices may hold on to the old one, so it can't be reused, but
+            # there's no need to build the next one until it is needed
+            self._entry = None
 
         # all done
         return status
@@ -258,9 +307,9 @@ class Channel(pyre.patterns.named):
         self.verbosity = verbosity
         # look up my inventory
         self.inventory = self.index.lookup(name)
-        # start out with an empty entry
-        self.entry = self.newEntry()
-        # and an invalid locator
+        # my entry is built on demand
+        self._entry = None
+        # start out with an invalid locator
         self.locator = None
 
         # all done
@@ -358,6 +407,23 @@ class Channel(pyre.patterns.named):
         raise NotImplementedError(f"class '{type(self).__name__}' must implement 'record'")
 
 
+    @staticmethod
+    def stamp():
+        """
+        Capture the time, and the process and thread that are logging a message
+        """
+        # get the current thread
+        thread = threading.current_thread()
+        # and build the stamp
+        return {
+            "time": time.time(),
+            "monotonic": time.monotonic(),
+            "pid": os.getpid(),
+            "thread": thread.ident,
+            "threadname": thread.name,
+            }
+
+
     def newEntry(self):
         """
         Create a fresh message entry
@@ -388,7 +454,7 @@ class Channel(pyre.patterns.named):
     index = Index(inventory_type)  # the severity wide channel index
 
     # instance data
-    entry = None                   # the accumulator of message content and metadata
+    _entry = None                  # the accumulator of message content and metadata
     locator = None                 # location information
     inventory = None               # the state shared by all instances of the same name/severity
 
@@ -19,10 +19,12 @@ class Chronicler(metaclass=pyre.patterns.singleton):
     notes = None
     device = None
     verbosity = 1
+    rotation = None # the default {size}, {interval}, {generations} and {compression} of log files
 
 
     # metamethods
-    def __init__(self, verbosity=verbosity, device=device, notes=notes, **kwds):
+    def __init__(self, verbosity=verbosity, device=device, notes=notes, rotation=rotation,
+                 **kwds):
         # chain up
         super().__init__(**kwds)
 
@@ -34,6 +36,9 @@ class Chronicler(metaclass=pyre.patterns.singleton):
             "application": "journal",  # this key is required; applications should override
             }
 
+        # the default rotation settings of log files; any of them make log files rotate
+        self.rotation = dict(rotation) if rotation is not None else {}
+
         # if whoever initialized the journal did not expressed an opinion regarding the device
         if device is None:
             # grab the console
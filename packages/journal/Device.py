@@ -36,4 +36,12 @@ class Device(pyre.patterns.named):
         raise NotImplementedError(f"class '{type(self).__name__}' must implement 'memo'")
 
 
+    def flush(self):
+        """
+        Make sure that all messages recorded so far have reached their destination
+        """
+        # nothing to do, by default
+        return self
+
+
 # end of file
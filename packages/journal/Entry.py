@@ -14,6 +14,7 @@ class Entry:
     # public data
     page = None  # a list of lines of output
     notes = None # a dictionary with the message metadata
+    stamp = None # when, and by which process and thread, the message was logged
 
 
     # metamethods
@@ -33,4 +33,20 @@ class File(Stream):
         return
 
 
+# the device factory used by the {logfile} conveniences
+def device(path, **kwds):
+    """
+    Build a log file device at {path}; if {kwds} or the chronicler defaults contain any of the
+    rotation settings, the log file is rolled over periodically
+    """
+    # get the rotating log file factory
+    from .RotatingFile import rotatingFile, settings
+    # if any of the rotation settings are present
+    if settings(**kwds):
+        # make a rotating log file
+        return rotatingFile(path=path, **kwds)
+    # otherwise, a plain one will do
+    return File(path=path, **kwds)
+
+
 # end of file
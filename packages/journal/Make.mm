@@ -37,8 +37,11 @@ EXPORT_PYTHON_MODULES = \
     Inventory.py \
     Memo.py \
     Null.py \
+    Queue.py \
     Renderer.py \
+    RotatingFile.py \
     Stream.py \
+    Structured.py \
     Trash.py \
     Warning.py \
     exceptions.py \
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import atexit           # to drain the queue when the process exits
+import collections      # for the ring buffer
+import os               # to detect forks
+import threading        # for the writer
+# superclass
+from .Device import Device
+
+
+# hand messages to a background thread that records them
+class Queue(Device):
+    """
+    Journal device that places messages in a bounded buffer and lets a background thread
+    record them using another device
+
+    Rendering messages and writing them to a stream involve a fair amount of work, and the
+    writes serialize all threads that share the stream. {Queue} moves this work out of the way
+    of the caller: entries are appended to a ring buffer with room for {capacity} messages,
+    and a writer thread hands them to the target {device} in batches, flushing the device once
+    per batch rather than once per message.
+
+    When the buffer is full, {overflow} determines what happens to the new message:
+
+        "block": the caller waits until the writer makes room
+        "oldest": the oldest message in the buffer is discarded to make room
+        "drop": the new message is discarded
+
+    Discarded messages are tallied in {dropped}. The buffer is drained when the process exits;
+    use {flush} to wait until everything that has been queued so far is recorded. Processes
+    created by {fork} start a writer of their own the first time they record a message.
+
+    Note that messages from fatal channels reach the target device asynchronously, so they may
+    appear after the exception they raise has been reported.
+    """
+
+
+    # constants
+    policies = ("block", "oldest", "drop")
+
+
+    # public data
+    dropped = 0 # the number of messages that were discarded because the buffer was full
+
+
+    # interface
+    def alert(self, entry):
+        """
+        Generate an alert.
+
+        Alerts are user-facing; they are generated by {info}, {warning}, and {error}
+        """
+        # queue it
+        self.push(kind="alert", entry=entry)
+        # all done
+        return self
+
+
+    def memo(self, entry):
+        """
+        Issue a memo
+
+        Memos are developer-facing; they are generated by {debug} and {firewall}
+        """
+        # queue it
+        self.push(kind="memo", entry=entry)
+        # all done
+        return self
+
+
+    def flush(self):
+        """
+        Wait until all the messages that have been queued so far are recorded
+        """
+        # grab the lock
+        with self._lock:
+            # if my writer isn't running, there is nobody to wait for
+            if self._writer is None or self._pid != os.getpid():
+                # so bail
+                return self
+            # figure out the ticket of the last message
+            ticket = self._queued
+            # wait until the writer gets past it
+            while self._recorded < ticket and self._writer.is_alive():
+                # by sleeping until it makes progress
+                self._done.wait()
+        # all done
+        return self
+
+
+    def close(self):
+        """
+        Record all pending messages and stop the writer
+        """
+        # grab the lock
+        with self._lock:
+            # get my writer
+            writer = self._writer
+            # if there isn't one, or it belongs to my parent process
+            if writer is None or self._pid != os.getpid():
+                # there is nothing to do
+                return self
+            # otherwise, mark me as closing
+            self._closing = True
+            # and wake up the writer
+            self._ready.notify()
+        # wait for the writer to finish
+        writer.join()
+        # forget it
+        self._writer = None
+        # all done
+        return self
+
+
+    # metamethods
+    def __init__(self, device, capacity=1024, overflow="block", batch=64, name="queue", **kwds):
+        # chain up
+        super().__init__(name=name, **kwds)
+        # check the overflow policy
+        if overflow not in self.policies:
+            # and complain if it's not one i understand
+            raise ValueError(f"unknown overflow policy {overflow!r}; pick one of {self.policies}")
+        # the device that records the messages
+        self.device = device
+        # the size of the buffer
+        self.capacity = capacity
+        # what to do when it's full
+        self.overflow = overflow
+        # the maximum number of messages handed to the device before it is flushed
+        self.batch = batch
+        # start the writer
+        self._start()
+        # make sure the buffer is drained when the process exits
+        atexit.register(self.close)
+        # all done
+        return
+
+
+    # implementation details
+    def push(self, kind, entry):
+        """
+        Add {entry} to the buffer; {kind} is the name of the method of the target device that
+        records it
+        """
+        # if i was created by a different process
+        if self._pid != os.getpid():
+            # my writer didn't survive the fork; get a new one
+            self._start()
+        # if i've been closed
+        if self._writer is None:
+            # record the message myself
+            getattr(self.device, kind)(entry=entry)
+            # and bail
+            return
+        # grab the lock
+        with self._lock:
+            # get the buffer
+            buffer = self._buffer
+            # if it's full
+            if len(buffer) >= self.capacity:
+                # get the policy
+                overflow = self.overflow
+                # if we are supposed to wait
+                if overflow == "block":
+                    # do so, as long as there is a writer to make room
+                    while len(buffer) >= self.capacity and self._writer.is_alive():
+                        self._done.wait()
+                # if we are supposed to make room
+                elif overflow == "oldest":
+                    # by discarding the oldest message
+                    buffer.popleft()
+                    # which counts as recorded, as far as {flush} is concerned
+                    self._recorded += 1
+                    # and as dropped
+                    self.dropped += 1
+                # otherwise
+                else:
+                    # discard the new message
+                    self.dropped += 1
+                    # and bail
+                    return
+            # add the message to the buffer
+            buffer.append((kind, entry))
+            # issue it a ticket
+            self._queued += 1
+            # and wake up the writer
+            self._ready.notify()
+        # all done
+        return
+
+
+    def write(self):
+        """
+        The body of the writer thread: record messages until i'm closed
+        """
+        # get the target device
+        device = self.device
+        # the buffer
+        buffer = self._buffer
+        # and the lock
+        lock = self._lock
+        # forever
+        while True:
+            # grab the lock
+            with lock:
+                # wait for something to do
+                while not buffer and not self._closing:
+                    self._ready.wait()
+                # if there is nothing to do, i must be closing
+                if not buffer:
+                    # so bail
+                    break
+                # grab a batch
+                batch = [buffer.popleft() for _ in range(min(self.batch, len(buffer)))]
+                # and let the producers know there is room in the buffer
+                self._done.notify_all()
+
+            # record the messages, without holding the lock
+            for kind, entry in batch:
+                # carefully
+                try:
+                    # look up the recording method and invoke it
+                    getattr(device, kind)(entry=entry)
+                # if something goes wrong
+                except Exception:
+                    # there is nobody to tell; move on
+                    pass
+            # flush the device
+            try:
+                device.flush()
+            # if the device doesn't know how
+            except Exception:
+                # no worries
+                pass
+
+            # grab the lock
+            with lock:
+                # update the number of recorded messages
+                self._recorded += len(batch)
+                # and let everybody who waits know
+                self._done.notify_all()
+        # all done
+        return
+
+
+    def _start(self):
+        """
+        Build the synchronization machinery and start the writer
+        """
+        # the process that owns the writer
+        self._pid = os.getpid()
+        # the lock that protects my state
+        self._lock = threading.Lock()
+        # signaled when there are messages in the buffer
+        self._ready = threading.Condition(self._lock)
+        # signaled when the writer makes progress
+        self._done = threading.Condition(self._lock)
+        # the buffer; if we got here after a fork, whatever the parent left in it is the
+        # responsibility of the parent
+        self._buffer = collections.deque()
+        # the number of messages queued, and the number of them that have been recorded
+        self._queued = 0
+        self._recorded = 0
+        # the writer is not closing
+        self._closing = False
+        # build it
+        self._writer = threading.Thread(target=self.write, name="journal.queue", daemon=True)
+        # and start it
+        self._writer.start()
+        # all done
+        return
+
+
+    # private data
+    _pid = None
+    _lock = None
+    _ready = None
+    _done = None
+    _buffer = None
+    _queued = 0
+    _recorded = 0
+    _closing = False
+    _writer = None
+
+
+# end of file
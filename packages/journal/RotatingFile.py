@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import os               # file manipulation
+import shutil           # to copy segments into their compressed form
+import threading        # for the compressor
+import time             # for time based rotation
+# superclass
+from .File import File
+
+
+# write messages to a log file that is rolled over periodically
+class RotatingFile(File):
+    """
+    Journal device that writes messages to a log file that is rolled over when it grows past
+    {size} bytes, or when it has been in use for more than {interval} seconds
+
+    When the log file rolls over, it is renamed by appending ".1" to its name, older segments
+    are shifted by one generation, and a fresh log file is opened in its place. Only the
+    {generations} most recent segments are retained. If {compression} is set to one of
+    "gzip", "bz2", "lzma" or "zstd", closed segments are compressed on a background thread; the
+    latter requires the {zstandard} package.
+
+    Unlike {File}, {RotatingFile} appends to an existing log file by default, so that
+    processes that restart keep adding to the current segment.
+    """
+
+
+    # constants
+    mode = "a"
+    compressors = {
+        "gzip": ".gz",
+        "bz2": ".bz2",
+        "lzma": ".xz",
+        "zstd": ".zst",
+        }
+
+
+    # interface
+    def rollover(self):
+        """
+        Close the current log file, shift the older segments and start a new one
+        """
+        # close the stream
+        self.stream.close()
+        # wait for the compression of the previous segment to finish, since we are about to
+        # rename it
+        self.wait()
+        # get my path
+        path = self.path
+        # the suffix of my compressed segments
+        suffix = self.compressors.get(self.compression, "")
+        # segments whose compression failed are still around in their original form, and must be
+        # shifted along with the rest, rather than overwritten by the newest segment
+        forms = {suffix, ""}
+
+        # go through the forms of the segments
+        for form in forms:
+            # the oldest segment falls off the end
+            self.remove(self.segment(self.generations) + form)
+            # shift the rest
+            for generation in reversed(range(1, self.generations)):
+                # get the name of the segment
+                segment = self.segment(generation) + form
+                # if it exists
+                if os.path.exists(segment):
+                    # move it
+                    os.replace(segment, self.segment(generation+1) + form)
+        # if we retain any generations
+        if self.generations > 0:
+            # the current log file becomes the newest segment
+            os.replace(path, self.segment(1))
+            # if we are compressing
+            if self.compression:
+                # do it in the background
+                self._compressor = threading.Thread(
+                    target=self.compress, args=(self.segment(1),),
+                    name="journal.rotate", daemon=True)
+                self._compressor.start()
+        # otherwise
+        else:
+            # just get rid of it
+            self.remove(path)
+
+        # open a fresh log file
+        self.stream = open(path, mode="w")
+        # reset the counters
+        self.written = 0
+        self.started = time.time()
+        # all done
+        return self
+
+
+    def segment(self, generation):
+        """
+        Build the name of the segment of the given {generation}
+        """
+        # easy enough
+        return f"{self.path}.{generation}"
+
+
+    def compress(self, segment):
+        """
+        Compress {segment}
+        """
+        # figure out the name of the compressed file
+        target = segment + self.compressors[self.compression]
+        # carefully
+        try:
+            # open the segment
+            with open(segment, "rb") as source:
+                # and its compressed form
+                with self.compressor(target) as sink:
+                    # copy
+                    shutil.copyfileobj(source, sink)
+        # if anything went wrong
+        except Exception:
+            # leave the segment alone
+            self.remove(target)
+            # and bail
+            return
+        # otherwise, remove the original
+        self.remove(segment)
+        # all done
+        return
+
+
+    def compressor(self, path):
+        """
+        Open {path} for writing compressed data
+        """
+        # get the compression scheme
+        compression = self.compression
+        # gzip
+        if compression == "gzip":
+            import gzip
+            return gzip.open(path, "wb")
+        # bz2
+        if compression == "bz2":
+            import bz2
+            return bz2.open(path, "wb")
+        # lzma
+        if compression == "lzma":
+            import lzma
+            return lzma.open(path, "wb")
+        # zstd
+        if compression == "zstd":
+            import zstandard
+            return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+        # anything else is a bug
+        raise ValueError(f"unknown compression scheme {compression!r}")
+
+
+    def wait(self):
+        """
+        Wait for any pending compression to finish
+        """
+        # get the compressor
+        compressor = self._compressor
+        # if there is one
+        if compressor is not None:
+            # wait for it
+            compressor.join()
+            # and forget it
+            self._compressor = None
+        # all done
+        return self
+
+
+    def close(self):
+        """
+        Close the log file and wait for any pending compression to finish
+        """
+        # chain up
+        super().close()
+        # wait
+        self.wait()
+        # all done
+        return self
+
+
+    # metamethods
+    def __init__(self, path, size=None, interval=None, generations=5, compression=None,
+                 **kwds):
+        # check the compression scheme
+        if compression and compression not in self.compressors:
+            # and complain if it's not one i understand
+            raise ValueError(
+                f"unknown compression scheme {compression!r}; "
+                f"pick one of {tuple(self.compressors)}")
+        # zstd is not part of the standard library
+        if compression == "zstd":
+            # so make sure it is available before committing to it
+            import zstandard
+        # chain up; unless told otherwise, append to whatever is already there
+        super().__init__(path=path, mode=kwds.pop("mode", self.mode), **kwds)
+        # the maximum size of the log file, in bytes
+        self.size = size
+        # the maximum age of the log file, in seconds
+        self.interval = interval
+        # the number of segments to keep around
+        self.generations = generations
+        # the compression scheme for closed segments
+        self.compression = compression
+        # the number of bytes in the current log file; start with whatever is already there
+        self.written = self.stream.tell()
+        # the time the current log file was started
+        self.started = time.time()
+        # all done
+        return
+
+
+    # implementation details
+    def record(self, page):
+        """
+        Record a message
+        """
+        # assemble the content
+        content = "\n".join(page)
+        # if there's nothing there
+        if not content:
+            # nothing to do
+            return
+        # add the line terminator
+        content += "\n"
+        # measure it
+        nbytes = len(content.encode(self.stream.encoding or "utf-8", "replace"))
+        # if it's time to roll over
+        if self.expired(nbytes=nbytes):
+            # do it
+            self.rollover()
+        # inject the content
+        self.stream.write(content)
+        # update the byte count
+        self.written += nbytes
+        # all done
+        return
+
+
+    def expired(self, nbytes):
+        """
+        Check whether adding {nbytes} to the current log file requires a roll over
+        """
+        # if the log file is too big, and the current message isn't the only thing in it
+        if self.size is not None and self.written and self.written + nbytes > self.size:
+            # it's time
+            return True
+        # if the log file is too old
+        if self.interval is not None and time.time() - self.started >= self.interval:
+            # it's time
+            return True
+        # otherwise, keep going
+        return False
+
+
+    @staticmethod
+    def remove(path):
+        """
+        Remove {path}, if it exists
+        """
+        # carefully
+        try:
+            # remove the file
+            os.unlink(path)
+        # if it doesn't exist
+        except FileNotFoundError:
+            # no problem
+            pass
+        # all done
+        return
+
+
+    # private data
+    _compressor = None
+
+
+# the device factory
+def rotatingFile(path, **kwds):
+    """
+    Build a rotating log file device at {path}; the rotation settings that are not present in
+    {kwds} are taken from the chronicler defaults
+    """
+    # separate the rest of the options from the rotation settings
+    options = { key: value for key, value in kwds.items() if key not in rotation }
+    # make one and return it
+    return RotatingFile(path=path, **settings(**kwds), **options)
+
+
+def settings(**kwds):
+    """
+    Collect the rotation settings from {kwds}, falling back to the chronicler defaults
+    """
+    # get the keeper of the global settings
+    from .Chronicler import Chronicler
+    # start with its defaults
+    chosen = {
+        key: value for key, value in (Chronicler().rotation or {}).items() if key in rotation }
+    # override them with the ones in {kwds}
+    chosen.update((key, value) for key, value in kwds.items() if key in rotation)
+    # and return them
+    return chosen
+
+
+# the settings that make a log file rotate
+rotation = {"size", "interval", "generations", "compression"}
+
+
+# end of file
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import json             # the record payload
+import os               # file positioning
+import struct           # the binary framing
+# superclass
+from .Device import Device
+# the stamp of entries that didn't come through a channel
+from .Channel import Channel
+
+
+# write messages as machine readable records
+class Structured(Device):
+    """
+    Journal device that writes one machine readable record per message
+
+    Each record carries the wall clock and monotonic time of the message, the process and
+    thread that generated it, the message kind, the page and the complete set of notes. In
+    "json" format, records are written as JSON lines. In "binary" format, the file starts with
+    the {magic} signature, and each record is a frame that starts with a header
+
+        payload length: 4 bytes, little endian
+        severity length: 1 byte
+        channel length: 2 bytes, little endian
+
+    followed by the severity and channel names, and the JSON payload, all encoded in UTF-8.
+    {read} uses the header to skip records without decoding their payload.
+    """
+
+
+    # constants
+    formats = ("json", "binary")
+    magic = b"pyre.journal.1\n"
+    header = struct.Struct("<IBH")
+
+
+    # interface
+    def alert(self, entry):
+        """
+        Generate an alert.
+
+        Alerts are user-facing; they are generated by {info}, {warning}, and {error}
+        """
+        # record it
+        self.record(kind="alert", entry=entry)
+        # all done
+        return self
+
+
+    def memo(self, entry):
+        """
+        Issue a memo
+
+        Memos are developer-facing; they are generated by {debug} and {firewall}
+        """
+        # record it
+        self.record(kind="memo", entry=entry)
+        # all done
+        return self
+
+
+    def flush(self):
+        """
+        Flush the associated stream
+        """
+        # delegate
+        self.stream.flush()
+        # all done
+        return self
+
+
+    def close(self):
+        """
+        Close the associated stream
+        """
+        # delegate
+        self.stream.close()
+        # all done
+        return self
+
+
+    # metamethods
+    def __init__(self, path, format="json", mode="w", name="structured", **kwds):
+        # check the format
+        if format not in self.formats:
+            # and complain if it's not one i understand
+            raise ValueError(f"unknown record format {format!r}; pick one of {self.formats}")
+        # chain up
+        super().__init__(name=name, **kwds)
+        # save the path
+        self.path = path
+        # and the format
+        self.format = format
+        # open the stream
+        self.stream = open(path, mode=mode+"b")
+        # binary files start with a signature, unless we are adding to an existing one
+        if format == "binary" and self.stream.tell() == 0:
+            # write it
+            self.stream.write(self.magic)
+        # all done
+        return
+
+
+    # implementation details
+    def record(self, kind, entry):
+        """
+        Write {entry} to my stream
+        """
+        # unpack
+        page, notes = entry
+        # get the time, process and thread captured when the message was logged; entries that
+        # didn't come through a channel are stamped now
+        stamp = getattr(entry, "stamp", None) or Channel.stamp()
+        # build the record; the channel and severity go first, so {read} can filter json
+        # lines without decoding them
+        record = {
+            "channel": notes.get("channel"),
+            "severity": notes.get("severity"),
+            "kind": kind,
+            "time": stamp["time"],
+            "monotonic": stamp["monotonic"],
+            "pid": stamp["pid"],
+            "thread": stamp["thread"],
+            "threadname": stamp["threadname"],
+            "page": page,
+            "notes": notes,
+            }
+        # encode it; values that aren't JSON friendly are converted to strings
+        payload = json.dumps(
+            record, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+        # if we are writing json lines
+        if self.format == "json":
+            # write the record
+            self.stream.write(payload + b"\n")
+        # otherwise
+        else:
+            # build the header fields
+            severity = str(record["severity"]).encode("utf-8")
+            channel = str(record["channel"]).encode("utf-8")
+            # assemble the frame
+            frame = b"".join((
+                self.header.pack(len(payload), len(severity), len(channel)),
+                severity, channel, payload))
+            # and write it
+            self.stream.write(frame)
+        # all done
+        return
+
+
+# the reader
+def read(path, channels=None, severities=None):
+    """
+    Generate the records in the structured journal file at {path}, optionally restricted to
+    the given {channels} and {severities}
+    """
+    # normalize the filters
+    channels = set(channels) if channels is not None else None
+    severities = set(severities) if severities is not None else None
+    # open the file
+    with open(path, "rb") as stream:
+        # check the signature
+        signature = stream.read(len(Structured.magic))
+        # if this is a binary file
+        if signature == Structured.magic:
+            # read it frame by frame
+            yield from readFrames(stream=stream, channels=channels, severities=severities)
+        # otherwise
+        else:
+            # go back to the beginning
+            stream.seek(0)
+            # and read it line by line
+            yield from readLines(stream=stream, channels=channels, severities=severities)
+    # all done
+    return
+
+
+def readFrames(stream, channels, severities):
+    """
+    Generate the records in the binary {stream} that match the filters
+    """
+    # get the header layout
+    header = Structured.header
+    # and its size
+    size = header.size
+    # until we run out of frames
+    while True:
+        # get the header
+        raw = stream.read(size)
+        # if there isn't a complete one, we are done
+        if len(raw) < size: break
+        # unpack it
+        length, severityLength, channelLength = header.unpack(raw)
+        # read the names
+        severity = stream.read(severityLength).decode("utf-8")
+        channel = stream.read(channelLength).decode("utf-8")
+        # if the record doesn't match
+        if ((severities is not None and severity not in severities)
+            or (channels is not None and channel not in channels)):
+            # skip its payload
+            stream.seek(length, os.SEEK_CUR)
+            # and move on
+            continue
+        # otherwise, read the payload
+        payload = stream.read(length)
+        # if it was truncated
+        if len(payload) < length:
+            # we are done
+            break
+        # decode it and hand it out
+        yield json.loads(payload.decode("utf-8"))
+    # all done
+    return
+
+
+def readLines(stream, channels, severities):
+    """
+    Generate the records in the json lines {stream} that match the filters
+    """
+    # build the prefixes of the records that match; {Structured} writes the channel first and
+    # the severity second, with no whitespace
+    prefixes = None
+    # if we are filtering
+    if channels is not None or severities is not None:
+        # encode the names
+        encode = lambda name: json.dumps(name, ensure_ascii=False).encode("utf-8")
+        # build the matching channel fragments
+        chans = [b'{"channel":' + encode(channel) for channel in channels] \
+            if channels is not None else None
+        # and severity fragments
+        sevs = [b'"severity":' + encode(severity) + b',' for severity in severities] \
+            if severities is not None else None
+        # assemble the filter
+        prefixes = (chans, sevs)
+
+    # go through the lines
+    for line in stream:
+        # if we are filtering
+        if prefixes is not None:
+            # unpack
+            chans, sevs = prefixes
+            # check the channel
+            if chans is not None and not any(line.startswith(chan) for chan in chans):
+                # skip
+                continue
+            # check the severity
+            if sevs is not None and not any(sev in line for sev in sevs):
+                # skip
+                continue
+        # skip blank lines
+        if not line.strip(): continue
+        # decode the record
+        record = json.loads(line.decode("utf-8"))
+        # make sure the filters hold, in case the substring match was too generous
+        if channels is not None and record.get("channel") not in channels: continue
+        if severities is not None and record.get("severity") not in severities: continue
+        # hand it out
+        yield record
+    # all done
+    return
+
+
+# end of file
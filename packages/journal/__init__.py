@@ -41,8 +41,11 @@ if without_libjournal:
     # devices
     from .Trash import Trash as trash
     from .File import File as file
+    from .RotatingFile import RotatingFile as rotating, rotatingFile
     from .Console import Console as cout
     from .ErrorConsole import ErrorConsole as cerr
+    from .Queue import Queue as queue
+    from .Structured import Structured as structured, read as records
 
     # channels
     # developer facing
@@ -77,17 +80,33 @@ if without_libjournal:
         return
 
     # convenience function to send all output to a log file
-    def logfile(path):
+    def logfile(path, **kwds):
         """
-        Send all output to a log file
+        Send all output to a log file; any of {size}, {interval}, {generations} and
+        {compression} in {kwds} or in the chronicler {rotation} defaults make it a rotating log
+        file
         """
+        # get the file device factory
+        from .File import device
         # make a file
-        logfile = file(path=path)
+        logfile = device(path=path, **kwds)
         # set it as the default device
         chronicler.device = logfile
         # all done
         return
 
+    # convenience function to record messages in the background
+    def background(**kwds):
+        """
+        Let a background thread record the messages sent to the current default device
+        """
+        # wrap the current default device
+        queued = queue(device=chronicler.device, **kwds)
+        # and make it the default
+        chronicler.device = queued
+        # all done
+        return
+
 
 # if we have access to the bindings
 else:
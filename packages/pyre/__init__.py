@@ -109,7 +109,9 @@ def packageInfo():
 
     # the libraries
     libs = [ "pyre", "journal" ]
-    # get the host
+    # get the platform managers
+    from . import platforms
+    # and the host
     host = executive.host
     # if the host is a linux box
     if isinstance(host, platforms.linux()):
@@ -168,6 +170,64 @@ def boot():
     return framework.executive().boot()
 
 
+def lazy():
+    """
+    Check whether the user has asked for a lazy boot of the framework
+
+    Small tools that are sensitive to their start up time can create a variable {pyre_lazy} in
+    their __main__ module and set it to {True}. The framework then skips the discovery of the
+    runtime environment and the loading of most of its subsystems until they are accessed for
+    the first time. Note that the host specific configuration files are not loaded until the
+    host is discovered, which happens the first time anybody asks for {pyre.host}.
+    """
+    # deferred loading of subsystems requires module level {__getattr__}
+    if sys.version_info < (3, 7): return False
+    # check whether the user has asked for a lazy boot
+    try:
+        import __main__
+        return bool(__main__.pyre_lazy)
+    # if anything goes wrong
+    except:
+        # boot eagerly
+        return False
+
+
+def __getattr__(name):
+    """
+    Load the subsystems whose loading was deferred by a lazy boot, on first access
+    """
+    # subsystems are just imported
+    if name in _subsystems:
+        # get the import machinery
+        import importlib
+        # and import it; this also attaches it to the package
+        return importlib.import_module(f"{__name__}.{name}")
+    # the application shells
+    if name in _shells:
+        # come from the {shells} subpackage
+        from . import shells
+        # get the shell
+        shell = getattr(shells, name)
+        # attach it to the package, so i'm not consulted again
+        globals()[name] = shell
+        # and return it
+        return shell
+    # the host is built by the executive when it discovers the runtime environment
+    if name == "host" and executive is not None:
+        # so hand it out
+        return executive.host
+    # otherwise, complain
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# the subsystems that are loaded on first access after a lazy boot
+_subsystems = {
+    "externals", "platforms", "shells", "filesystem", "flow", "weaver", "ipc", "nexus", "services"
+    }
+# and the application shells
+_shells = { "application", "action", "plexus", "command", "panel" }
+
+
 def debug():
     """
     Enable debugging of pyre modules.
@@ -241,22 +301,26 @@ if executive:
     package = executive.registerPackage(name='pyre', file=__file__)
     # record its geography
     home, prefix, defaults = package.layout()
-    # package managers
-    from . import externals
-    # platform managers
-    from . import platforms
-    # discover information about the runtime environment
-    executive.discover()
-    # application shells
-    from .shells import application, action, plexus, command, panel
-    # support for filesystems
-    from . import filesystem
-    # support for workflows
-    from . import flow
-    # document rendering
-    from . import weaver
-    # the interprocess communication mechanisms
-    from . import ipc, nexus, services
+    # unless the user has asked for a lazy boot
+    if not lazy():
+        # package managers
+        from . import externals
+        # platform managers
+        from . import platforms
+        # discover information about the runtime environment
+        executive.discover()
+        # attach the host
+        host = executive.host
+        # application shells
+        from .shells import application, action, plexus, command, panel
+        # support for filesystems
+        from . import filesystem
+        # support for workflows
+        from . import flow
+        # document rendering
+        from . import weaver
+        # the interprocess communication mechanisms
+        from . import ipc, nexus, services
 
 
 # clean up the executive instance when the interpreter shuts down
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import operator
+from .. import patterns
+
+
+# declaration
+class Catalog(dict):
+    """
+    The map from node keys to node metadata maintained by hierarchical symbol tables
+
+    {Catalog} indexes the names of the nodes it stores in a {PrefixTree}, so that clients can
+    retrieve the metadata of all the nodes that live under a given name without scanning the
+    entire table. It also caches the name ordering of its contents and invalidates it whenever
+    an entry is added or removed.
+    """
+
+
+    # public data
+    separator = '.'
+
+
+    # interface
+    def find(self, prefix=''):
+        """
+        Generate the metadata of all nodes whose name starts with {prefix}
+        """
+        # if there is no prefix
+        if not prefix:
+            # everybody is a match
+            yield from self.values()
+            # all done
+            return
+        # split the prefix into the complete fragments and the partial one at the end
+        *split, partial = prefix.split(self.separator)
+        # go through the matching keys
+        for key in self._index.find(split=split, partial=partial):
+            # and hand out their metadata
+            yield self[key]
+        # all done
+        return
+
+
+    def ordered(self):
+        """
+        Build a sequence of my values sorted by name
+        """
+        # if my cached order is stale
+        if self._ordered is None:
+            # rebuild it
+            self._ordered = tuple(sorted(self.values(), key=operator.attrgetter('name')))
+        # and return it
+        return self._ordered
+
+
+    # meta-methods
+    def __init__(self, separator=separator, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my separator
+        self.separator = separator
+        # the name index
+        self._index = patterns.newPrefixTree()
+        # and the cached name ordering
+        self._ordered = None
+        # all done
+        return
+
+
+    def __setitem__(self, key, info):
+        """
+        Register {info} as the metadata of the node under {key}
+        """
+        # store it
+        super().__setitem__(key, info)
+        # get its current name
+        name = info.name
+        # index it; this also takes care of renames, since the index moves {key} to its new
+        # location; anonymous nodes are filed at the root
+        self._index.insert(key=key, split=name.split(self.separator) if name else ())
+        # and invalidate the name ordering
+        self._ordered = None
+        # all done
+        return
+
+
+    def __delitem__(self, key):
+        """
+        Remove the metadata of the node under {key}
+        """
+        # remove it from the store
+        super().__delitem__(key)
+        # and the index
+        self._index.remove(key=key)
+        # invalidate the name ordering
+        self._ordered = None
+        # all done
+        return
+
+
+    # private data
+    _index = None
+    _ordered = None
+
+
+# end of file
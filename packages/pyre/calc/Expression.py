@@ -8,6 +8,7 @@
 
 # used by the formula compiler
 import re
+import functools
 # so I can hold on to my model without making cycles
 import weakref
 
@@ -53,8 +54,9 @@ class Expression:
         """
         # attempt
         try:
-            # to evaluate my program
-            value = eval(self._program, {'model' : self._model })
+            # to evaluate my program; it is bound to the positions of my operands, so any
+            # substitutions in my graph are picked up automatically
+            value = self._program(*self._operands)
         # if i run into unresolved nodes
         except self.UnresolvedNodeError:
             # report it
@@ -105,11 +107,13 @@ class Expression:
     @classmethod
     def compile(cls, model, expression):
         """
-        Compile {expression} and build an evaluator that resolves named references to other
-        nodes against {model}.
+        Compile {expression} into an evaluator whose arguments are the nodes it refers to, as
+        resolved against {model}. Return the evaluator and the sequence of operand nodes
         """
         # initialize the symbol table
         operands = []
+        # and the map from names to their position in it
+        positions = {}
         # define the {re.sub} callback as a local function so it has access to the symbol table
         def handler(match):
             """
@@ -129,12 +133,18 @@ class Expression:
             # only one case left: a valid node reference
             # extract the name from the match
             identifier = match.group('identifier')
-            # resolve it
-            node = model.retrieve(name=identifier)
-            # add the node to the operands
-            operands.append(node)
+            # attempt to
+            try:
+                # look up the position of a name we have seen before
+                position = positions[identifier]
+            # if this is the first time
+            except KeyError:
+                # its position is the next available slot
+                position = positions[identifier] = len(operands)
+                # resolve it and add the node to the operands
+                operands.append(model.retrieve(name=identifier))
             # build and return the matching expression fragment
-            return "(model[{!r}])".format(identifier)
+            return "({}{}.value)".format(cls._prefix, position)
 
         # convert node references to legal python identifiers
         # print("Expression.parse: expression={!r}".format(expression))
@@ -144,10 +154,11 @@ class Expression:
         # if there were no symbols, the expression had no node evaluations; but since it may
         # have had escaped braces, make sure the caller has access to the processed value
         if not operands: raise cls.EmptyExpressionError(formula=normalized)
-        # now, attempt to compile the expression
+        # now, attempt to
         try:
-            # by asking python to build a code object
-            program = compile(normalized, filename='expression', mode='eval')
+            # build the evaluator; the normalized text does not depend on the names of the
+            # operands, so this is shared by all expressions with the same structure
+            program = cls.assemble(normalized=normalized, arity=len(operands))
         # if it failed
         except SyntaxError as error:
             # complain
@@ -162,14 +173,32 @@ class Expression:
         Compute the value of {expression} by expanding any references to {model} nodes
         """
         # compile {expression}
-        program, _ = cls.compile(model=model, expresion=expresion)
+        program, operands = cls.compile(model=model, expression=expression)
         # evaluate {program} and return the generated value
-        return eval(program, {'model': model})
+        return program(*operands)
+
+
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def assemble(cls, normalized, arity):
+        """
+        Build a function that takes {arity} nodes and evaluates the {normalized} expression
+        """
+        # make sure {normalized} is a valid expression on its own, so it can't escape the
+        # parentheses that wrap it below
+        compile(normalized, filename='expression', mode='eval')
+        # build the argument list
+        args = ", ".join("{}{}".format(cls._prefix, position) for position in range(arity))
+        # build the source of the evaluator; the line breaks make room for trailing comments
+        source = "lambda {}: (\n{}\n)".format(args, normalized)
+        # compile it and return the function
+        return eval(compile(source, filename='expression', mode='eval'), {})
 
 
     # private data
     _model = None # my symbol table
     _program = None # the compiled form of my expression
+    _prefix = "__operand_" # the prefix of the names of my operands in my program
     _scanner = re.compile( # the expression tokenizer
         r"(?P<esc_open>{{)"
         r"|"
@@ -11,6 +11,8 @@ import re
 import operator
 import collections
 from .. import patterns
+# the node metadata store
+from .Catalog import Catalog
 # my base class
 from .SymbolTable import SymbolTable
 
@@ -77,15 +79,28 @@ class Hierarchical(SymbolTable):
         matches the supplied {pattern}. Careful to properly escape periods and other characters
         that may occur in the name of the requested keys that are recognized by the {re}
         package. The order in which the nodes are returned is controlled by {key}.
+
+        Only the nodes whose names start with the literal prefix of {pattern} are examined, so
+        anchoring the pattern with an escaped name is much cheaper than an open-ended search
         """
         # check whether i have any nodes
         if not self._nodes: return
         # build the name recognizer
         regex = re.compile(pattern)
-        # we need a key, since slots are not orderable
-        key = operator.attrgetter('name') if key is None else key
-        # iterate over my nodes
-        for info in sorted(self._metadata.values(), key=key):
+        # extract the literal prefix of the pattern
+        prefix = self.literalPrefix(regex=regex)
+        # if there is no prefix and the caller is happy with the name ordering
+        if not prefix and key is None:
+            # use the cached order
+            candidates = self._metadata.ordered()
+        # otherwise
+        else:
+            # we need a key, since slots are not orderable
+            key = operator.attrgetter('name') if key is None else key
+            # sort the nodes that live under the prefix
+            candidates = sorted(self._metadata.find(prefix=prefix), key=key)
+        # iterate over the candidates
+        for info in candidates:
             # if the name matches
             if regex.match(info.name):
                 # yield the name and the node
@@ -94,6 +109,57 @@ class Hierarchical(SymbolTable):
         return
 
 
+    @classmethod
+    def literalPrefix(cls, regex):
+        """
+        Extract the longest string that every name that matches the compiled {regex} must start
+        with
+        """
+        # case insensitive and verbose patterns are not worth the trouble
+        if regex.flags & (re.IGNORECASE | re.VERBOSE): return ''
+        # get the pattern
+        pattern = regex.pattern
+        # an alternation anywhere in the pattern may match names with a different prefix; be
+        # conservative and don't bother checking whether it is nested inside a group
+        if '|' in cls._escapes.sub('', pattern): return ''
+        # {match} is anchored at the beginning of the name, so a leading caret is redundant
+        cursor = 1 if pattern.startswith('^') else 0
+        # initialize the pile of literal characters
+        prefix = []
+        # go through the pattern
+        while cursor < len(pattern):
+            # get the current character
+            char = pattern[cursor]
+            # if it is the start of an escape sequence
+            if char == '\\':
+                # get the escaped character
+                char = pattern[cursor+1:cursor+2]
+                # character classes, anchors and back references are not literals
+                if not char or char.isalnum(): break
+                # everything else is the character itself, occupying two spots in the pattern
+                cursor += 2
+            # if this is a regex metacharacter
+            elif char in cls._metacharacters:
+                # the literal part is over
+                break
+            # otherwise
+            else:
+                # it's a literal occupying a single spot
+                cursor += 1
+            # look ahead for a quantifier
+            quantifier = pattern[cursor:cursor+1]
+            # if the character is optional
+            if quantifier in cls._optional:
+                # the literal part is over
+                break
+            # otherwise, add it to the pile
+            prefix.append(char)
+            # if it may be repeated, we don't know what follows it
+            if quantifier == '+': break
+        # all done
+        return ''.join(prefix)
+
+
     # storing and retrieving nodes
     def alias(self, target, alias, base=None):
         """
@@ -255,8 +321,8 @@ class Hierarchical(SymbolTable):
         self.separator = separator
         # initialize my name hash
         self._hash = patterns.newPathHash()
-        # and the node metadata
-        self._metadata = {}
+        # and the node metadata, indexed by name
+        self._metadata = Catalog(separator=separator)
         # all done
         return
 
@@ -283,6 +349,10 @@ class Hierarchical(SymbolTable):
     # private data
     _hash = None
     _info = None
+    # support for extracting the literal prefix of name patterns
+    _escapes = re.compile(r'\\.')
+    _metacharacters = frozenset('.^$*+?{}[]|()')
+    _optional = frozenset('*?{')
 
 
     # aliasing
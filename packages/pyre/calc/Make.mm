@@ -13,6 +13,7 @@ PACKAGE = calc
 EXPORT_PYTHON_MODULES = \
     Average.py \
     Calculator.py \
+    Catalog.py \
     Composite.py \
     Const.py \
     Count.py \
@@ -36,6 +37,7 @@ EXPORT_PYTHON_MODULES = \
     Postprocessor.py \
     Probe.py \
     Product.py \
+    Propagator.py \
     Reactor.py \
     Reference.py \
     Sequence.py \
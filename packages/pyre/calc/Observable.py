@@ -8,7 +8,9 @@
 
 # externals
 import weakref
-# the superclas
+# the notification engine
+from .Propagator import Propagator
+# the superclass
 from .Reactor import  Reactor
 
 
@@ -24,17 +26,28 @@ class Observable(Reactor):
         """
         Return an iterable over my live observers
         """
+        # make a pile for the references to dead observers
+        dead = []
         # go through the references to my observers
-        for ref in self._observers:
+        for tag, ref in self._observers.items():
             # unwrap it
             observer = ref()
             # if it is dead
             if observer is None:
-                # skip it
+                # mark it
+                dead.append(tag)
+                # and skip it
                 continue
             # otherwise, send it along
             yield observer
-
+        # prune the dead references
+        for tag in dead:
+            # carefully, since the entry may have been reused while we were iterating
+            ref = self._observers.get(tag)
+            # if it's still dead
+            if ref is not None and ref() is None:
+                # remove it
+                del self._observers[tag]
         # all done
         return
 
@@ -44,8 +57,9 @@ class Observable(Reactor):
         """
         Add {observer} to my pile
         """
-        # build a weak reference to {observer} and add it to the pile
-        self._observers.add(weakref.ref(observer))
+        # build a weak reference to {observer} and add it to the pile; index by identity,
+        # since nodes override {__eq__}
+        self._observers[id(observer)] = weakref.ref(observer)
         # all done
         return self
 
@@ -54,8 +68,8 @@ class Observable(Reactor):
         """
         Remove {observer} from my pile
         """
-        # build a weak reference to {observer} and remove it from the pile
-        self._observers.remove(weakref.ref(observer))
+        # remove {observer} from the pile
+        del self._observers[id(observer)]
         # all done
         return self
 
@@ -86,15 +100,17 @@ class Observable(Reactor):
     def flush(self, **kwds):
         """
         Handler of the notification event from one of my observables
-       """
-        # take this opportunity to clean up my observers
-        observers = set(self.observers)
-        # go through the pile
-        for observer in observers:
-            # notify each one
-            observer.flush(observable=self)
-        # rebuild the set of references
-        self._observers = set(map(weakref.ref, observers))
+        """
+        # get the notification engine
+        propagator = self._propagator
+        # if i am being notified as part of an ongoing propagation
+        if propagator.current is self:
+            # add my observers to its pile
+            propagator.schedule(observable=self)
+        # otherwise
+        else:
+            # this is a fresh change; notify everybody downstream
+            propagator.propagate(observable=self)
         # chain up
         return super().flush(**kwds)
 
@@ -104,9 +120,13 @@ class Observable(Reactor):
         # chain up
         super().__init__(**kwds)
         # initialize the set of my observers
-        self._observers = set() # should have been a weak set, but I can do better...
+        self._observers = {} # a map from observer identities to weak references
         # all done
         return
 
 
+    # private data
+    _propagator = Propagator() # the engine that delivers change notifications; thread local
+
+
 # end of file
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import collections
+import threading
+
+
+# class declaration
+class Propagator(threading.local):
+    """
+    The engine that delivers change notifications through the graph of observers
+
+    When the value of an observable changes, {Propagator} walks the graph of its observers
+    iteratively, rather than through nested calls to {flush}, and remembers the nodes whose
+    observers it has already notified. Each observer is notified once by every one of its
+    observables that changed, but the notifications that fan out of a node are sent only once
+    per change, no matter how many paths lead to it. Memoized nodes are invalidated only once,
+    and diamond shaped graphs no longer flush the same subgraph repeatedly.
+
+    The state of the traversal is local to the thread that made the change, so a single
+    instance can be shared by all observables without threads interfering with each other's
+    notifications.
+    """
+
+
+    # public data
+    current = None # the observer that is being notified by me
+
+
+    # interface
+    def propagate(self, observable):
+        """
+        Notify everybody downstream from {observable} that its value has changed
+        """
+        # save my current state; if this change was made while i was delivering the
+        # notifications of another one, it gets a traversal of its own
+        current, queue, visited = self.current, self._queue, self._visited
+        # start a fresh one
+        self._queue = collections.deque()
+        self._visited = set()
+        # attempt to
+        try:
+            # schedule the observers of {observable}
+            self.schedule(observable=observable)
+            # grab the pile
+            pending = self._queue
+            # as long as there is work to do
+            while pending:
+                # get the next batch of notifications
+                observable, refs = pending.popleft()
+                # go through the references to the observers
+                for ref in refs:
+                    # unwrap it
+                    observer = ref()
+                    # if it is dead, skip it; its observable will prune it eventually
+                    if observer is None: continue
+                    # mark the observer as the target of this notification, so it can tell it
+                    # is being notified by me
+                    self.current = observer
+                    # and deliver it; if {observer} is itself observable, it will {schedule}
+                    # its own observers
+                    observer.flush(observable=observable)
+        # no matter what happens
+        finally:
+            # restore my state
+            self.current, self._queue, self._visited = current, queue, visited
+        # all done
+        return self
+
+
+    def schedule(self, observable):
+        """
+        Add the observers of {observable} to the pile of nodes to notify
+        """
+        # get the observers of {observable}
+        observers = observable._observers
+        # if there aren't any, there is nothing to do
+        if not observers: return self
+        # build a tag for {observable}; use its identity since nodes override {__eq__}
+        tag = id(observable)
+        # if its observers have been notified already
+        if tag in self._visited:
+            # nothing further to do
+            return self
+        # otherwise, mark it
+        self._visited.add(tag)
+        # and schedule the notification of its current observers
+        self._queue.append((observable, tuple(observers.values())))
+        # all done
+        return self
+
+
+    # private data
+    _queue = None
+    _visited = None
+
+
+# end of file
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+
+
+# declaration
+class Cache:
+    """
+    A persistent store of the configuration events harvested from configuration files
+
+    Parsing configuration files is expensive, and applications that are launched repeatedly
+    against the same configuration tree end up re-parsing the same files on every start. {Cache}
+    stores the events harvested by a codec in a binary file under {directory}, and replays them
+    as long as the size, modification time and contents of the source are unchanged. Sources
+    that aren't backed by files on disk are always handed to the codec.
+
+    The events of sources that are parsed are handed out as the codec harvests them, and
+    stored only if the codec gets through the entire source; sources with errors are parsed
+    every time, so their errors are reported every time.
+    """
+
+
+    # constants
+    version = 1 # the layout of the cache files; bump whenever the events change shape
+    suffix = ".events"
+
+
+    # public data
+    directory = None # the location of the cache files
+
+
+    # interface
+    def decode(self, codec, uri, source, locator):
+        """
+        Retrieve the configuration events in {source}, either from my store or by asking
+        {codec} to parse it
+        """
+        # attempt to
+        try:
+            # get the status of the underlying file
+            info = os.fstat(source.fileno())
+        # if {source} is not backed by a file on disk
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # there is nothing i can do
+            return codec.decode(uri, source, locator)
+
+        # read the contents
+        contents = source.read()
+        # build the fingerprint of the source
+        stamp = (info.st_size, info.st_mtime_ns)
+        # and compute the digest of its contents
+        digest = self.digest(contents)
+        # figure out where its events live
+        path = self.locate(codec=codec, uri=uri, source=source)
+        # look for them
+        events = self.load(path=path, stamp=stamp, digest=digest)
+        # if they were there
+        if events is not None:
+            # replay them
+            return events
+
+        # otherwise, build a stream with the contents for the codec
+        stream = io.StringIO(contents) if isinstance(contents, str) else io.BytesIO(contents)
+        # carry the name of the source, since some codecs build their locators out of it
+        stream.name = getattr(source, 'name', None)
+        # harvest the events
+        return self.harvest(
+            codec=codec, uri=uri, stream=stream, locator=locator,
+            path=path, stamp=stamp, digest=digest)
+
+
+    def harvest(self, codec, uri, stream, locator, path, stamp, digest):
+        """
+        Hand out the events {codec} harvests from {stream} as they are parsed, and store them
+        in {path} once the entire {stream} has been parsed
+        """
+        # the events harvested so far
+        events = []
+        # go through the events in {stream}
+        for event in codec.decode(uri, stream, locator):
+            # add each one to the pile
+            events.append(event)
+            # and hand it to my caller
+            yield event
+        # if we get this far, there were no errors; save the events
+        self.save(path=path, stamp=stamp, digest=digest, events=events)
+        # all done
+        return
+
+
+    def locate(self, codec, uri, source):
+        """
+        Build the path to the file that holds the events harvested by {codec} from {source}
+        """
+        # the locators of the events record the {uri}, so it is part of the key, along with
+        # the actual location of the file and the encoding
+        key = "\n".join((codec.encoding, str(uri), os.path.abspath(source.name)))
+        # hash it
+        tag = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        # and build the path
+        return os.path.join(self.directory, tag + self.suffix)
+
+
+    def load(self, path, stamp, digest):
+        """
+        Retrieve the events stored in {path}, provided they were harvested from a source with
+        the given {stamp} and {digest}
+        """
+        # attempt to
+        try:
+            # open the file
+            with open(path, 'rb') as store:
+                # and unpack it
+                version, oldStamp, oldDigest, events = pickle.load(store)
+        # if anything goes wrong
+        except Exception:
+            # treat it as a miss
+            return None
+        # if the store is current
+        if version == self.version and oldStamp == stamp and oldDigest == digest:
+            # hand out the events
+            return events
+        # otherwise, report a miss
+        return None
+
+
+    def save(self, path, stamp, digest, events):
+        """
+        Store {events} in {path}
+        """
+        # assemble the record
+        record = (self.version, stamp, digest, events)
+        # attempt to
+        try:
+            # make sure the cache directory exists
+            os.makedirs(self.directory, exist_ok=True)
+            # write into a temporary file, so concurrent processes never see partial stores
+            fd, scratch = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            # attempt to
+            try:
+                # fill it
+                with os.fdopen(fd, 'wb') as store:
+                    pickle.dump(record, store, protocol=pickle.HIGHEST_PROTOCOL)
+                # and move it into place
+                os.replace(scratch, path)
+            # if anything goes wrong
+            except Exception:
+                # clean up
+                os.unlink(scratch)
+                # and complain
+                raise
+        # the cache is only an optimization; failing to update it is not an error
+        except Exception:
+            # so just move on
+            pass
+        # all done
+        return
+
+
+    def digest(self, contents):
+        """
+        Compute a signature of {contents}
+        """
+        # normalize
+        if isinstance(contents, str): contents = contents.encode('utf-8')
+        # and hash
+        return hashlib.sha1(contents).hexdigest()
+
+
+    # meta-methods
+    def __init__(self, directory, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the location of my files
+        self.directory = os.path.abspath(os.path.expanduser(str(directory)))
+        # all done
+        return
+
+
+# end of file
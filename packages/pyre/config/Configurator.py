@@ -7,6 +7,7 @@
 
 
 # externals
+import os # for access to the environment
 import weakref # for access to my executive
 import collections # for defaultdict and OrderedDict
 from .. import tracking
@@ -30,6 +31,8 @@ class Configurator:
 
     # public data
     codecs = None
+    batch = None # the assignments that are waiting to be inserted in the model
+    cache = None # the optional persistent store of parsed configuration events
 
 
     # interface
@@ -59,8 +62,14 @@ class Configurator:
             # and get out of here
             return errors
 
-        # convert the input source into a stream of events
-        events = reader.decode(uri, source, locator)
+        # if i have access to a store of previously parsed sources
+        if self.cache is not None:
+            # let it convert the input source into a stream of events
+            events = self.cache.decode(codec=reader, uri=uri, source=source, locator=locator)
+        # otherwise
+        else:
+            # convert the input source into a stream of events
+            events = reader.decode(uri, source, locator)
         # process it
         errors.extend(self.processEvents(events=events, priority=priority))
         # and return the errors
@@ -102,11 +111,24 @@ class Configurator:
         """
         # error accumulator
         errors = []
-        # loop over events
-        for event in events:
-            # process the event
-            # print("pyre.config.Configurator.configure:", event)
-            event.identify(inspector=self, priority=priority)
+        # save the current batch of assignments; we may be processing the events of a source
+        # that was loaded by another one
+        batch = self.batch
+        # start a new one
+        self.batch = []
+        # attempt to
+        try:
+            # loop over events
+            for event in events:
+                # process the event
+                # print("pyre.config.Configurator.configure:", event)
+                event.identify(inspector=self, priority=priority)
+            # insert the accumulated assignments in the model
+            self.commit()
+        # no matter what happens
+        finally:
+            # restore the batch
+            self.batch = batch
         # all done
         return errors
 
@@ -124,6 +146,17 @@ class Configurator:
         # instantiate a priority ranking
         priority = priority()
 
+        # if we are processing a batch of events and this is not a default value, which
+        # requires the special handling in {insert}
+        if self.batch is not None and priority.category != priority.defaults.category:
+            # add the assignment to the pile; it will be inserted in the model along with the
+            # rest of the batch
+            self.batch.append((split, value, locator, priority))
+            # build the key and return it
+            return self.executive.nameserver.hash(name=split)
+        # otherwise, make sure the model is up to date before inserting the value directly
+        self.commit()
+
         # get the model
         nameserver = self.executive.nameserver
         # insert the value in the model
@@ -132,6 +165,24 @@ class Configurator:
         return key
 
 
+    def commit(self):
+        """
+        Insert the pending batch of assignments in the model
+        """
+        # get the batch
+        batch = self.batch
+        # if there is nothing to do
+        if not batch:
+            # bail
+            return self
+        # reset the pile
+        self.batch = []
+        # and hand the assignments to the model
+        self.executive.nameserver.insertBatch(assignments=batch)
+        # all done
+        return self
+
+
     def defer(self, assignment, priority):
         """
         Process a conditional assignment
@@ -171,6 +222,8 @@ class Configurator:
         """
         Ask the pyre executive to load the configuration settings in {source}
         """
+        # the settings in {source} may depend on the assignments we have seen so far
+        self.commit()
         # extract the source
         source = request.source
         # extract the locator
@@ -327,6 +380,8 @@ class Configurator:
 
         # initialize my codecs
         self.codecs = self._indexDefaultCodecs()
+        # and the store of parsed configuration events
+        self.cache = self._initializeCache()
 
         # configuration events
         self.commands = []
@@ -337,6 +392,23 @@ class Configurator:
 
 
     # implementation details
+    def _initializeCache(self):
+        """
+        Build the store of parsed configuration events, if the user has asked for one by
+        pointing {PYRE_CONFIG_CACHE} to a directory
+        """
+        # look for the location of the store
+        directory = os.environ.get('PYRE_CONFIG_CACHE')
+        # if it's not there
+        if not directory:
+            # the cache is disabled
+            return None
+        # otherwise, get the factory
+        from . import newCache
+        # build one and return it
+        return newCache(directory=directory)
+
+
     def _indexDefaultCodecs(self):
         """
         Initialize the codec index
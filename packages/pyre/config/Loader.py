@@ -22,6 +22,10 @@ class Loader:
     from .exceptions import LoadingError
 
 
+    # constants
+    durable = False # whether my resolution failures may be remembered across runs
+
+
     @classmethod
     def loadShelves(cls, executive, protocol, uri, scheme, context, **kwds):
         """
@@ -38,54 +42,166 @@ class Loader:
 
         # access the linker
         linker = executive.linker
-        # print(" -- priming the search for shelves")
-        # use {protocol} to build a sequence of candidate locations
-        candidates = cls.locateShelves(executive=executive, protocol=protocol,
-                                       scheme=scheme, context=context,
-                                       **kwds)
-        # print(" -- done priming the search for shelves")
-        # go through each of them
-        for candidate in candidates:
-            # show me
-            # print(" -- trying shelf={.uri!r}".format(candidate))
-            # does this uri correspond to a known shelf
-            try:
-                # if yes, grab it
-                shelf = linker.shelves[candidate.uri]
-                # show me
-                # print("    shelf {!r} previously loaded".format(candidate.uri))
-            # otherwise
-            except KeyError:
-                # show me
-                # print("    new shelf; loading")
-                # make an empty shelf and register it with the
-                # linker to prevent it from attempting to load this shelf again, in case there
-                # are loading side effects
-                linker.shelves[candidate.uri] = cls.shelf(uri=candidate)
+        # get the state of my search path
+        stamp = cls.searchpath(executive=executive)
+        # and use it to retrieve my resolution state
+        section = linker.resolutions.section(loader=cls, stamp=stamp)
+        # the known failures
+        misses = section.misses
+        # the registered application contributes its package to the resolution context
+        app = executive.dashboard.pyre_application
+        # so it is part of the key of this request, along with the request itself and the
+        # configuration folders that are searched on its behalf
+        key = (scheme, tuple(context), protocol, tuple(app.searchpath) if app else (),
+               tuple(kwds.get("cfgpath") or ()))
+        # get the tally of this request
+        record = section.record(key=key)
+        # count this resolution
+        record.resolutions += 1
+
+        # keep track of the candidates that produced shelves
+        hits = []
+        # and whether the candidates were exhausted
+        exhausted = False
+        # carefully, so the candidates that produced shelves are remembered even when my caller
+        # stops asking for more before the search is done
+        try:
+            # the candidates that are known to produce shelves
+            known = record.hits or ()
+            # replay them
+            for candidate in known:
+                # count the probe
+                record.probes += 1
                 # attempt to
                 try:
-                    # load it
-                    shelf = cls.load(executive=executive, uri=candidate)
-                # if it fails
-                except cls.LoadingError as error:
-                    # show me
-                    # print(" ## skipping: {}".format(error))
-                    # remove the bogus registration
-                    del linker.shelves[candidate.uri]
-                    # move on to the next candidate
-                    continue
-                # if the shelf was loaded correctly, replace the bogus registration
-                linker.shelves[candidate.uri] = shelf
+                    # look up the shelf
+                    shelf = linker.shelves[candidate.uri]
+                # if it's not there, it was loaded by a previous run
+                except KeyError:
+                    # count the load
+                    record.loads += 1
+                    # attempt to
+                    try:
+                        # load it again
+                        shelf = cls.loadCandidate(
+                            linker=linker, executive=executive, uri=candidate)
+                    # if it fails
+                    except cls.LoadingError:
+                        # move on
+                        continue
+                # remember this candidate
+                hits.append(candidate)
+                # and send the shelf off
+                yield shelf
+            # if the candidates of this request have been exhausted before
+            if record.complete:
+                # there is nothing else to find
+                exhausted = True
+                # so we are done
+                return
+            # otherwise, the candidates that were replayed don't need to be visited again
+            replayed = set(candidate.uri for candidate in known)
+
+            # print(" -- priming the search for shelves")
+            # use {protocol} to build a sequence of candidate locations
+            candidates = cls.locateShelves(executive=executive, protocol=protocol,
+                                           scheme=scheme, context=context,
+                                           **kwds)
+            # print(" -- done priming the search for shelves")
+            # go through each of them
+            for candidate in candidates:
                 # show me
-                # print("      success; registering {!r} with the linker".format(candidate.uri))
+                # print(" -- trying shelf={.uri!r}".format(candidate))
+                # if it was replayed
+                if candidate.uri in replayed:
+                    # move on
+                    continue
+                # count the probe
+                record.probes += 1
+                # if it is known to fail
+                if candidate.uri in misses:
+                    # count it
+                    record.skips += 1
+                    # and move on
+                    continue
+                # does this uri correspond to a known shelf
+                try:
+                    # if yes, grab it
+                    shelf = linker.shelves[candidate.uri]
+                    # show me
+                    # print("    shelf {!r} previously loaded".format(candidate.uri))
+                # otherwise
+                except KeyError:
+                    # show me
+                    # print("    new shelf; loading")
+                    # count the load
+                    record.loads += 1
+                    # attempt to
+                    try:
+                        # load it
+                        shelf = cls.loadCandidate(
+                            linker=linker, executive=executive, uri=candidate)
+                    # if it failed
+                    except cls.LoadingError as error:
+                        # remember it
+                        misses.add(candidate.uri)
+                        # if the shelf doesn't exist, as opposed to failing to load
+                        if cls.durable and error.missing:
+                            # it may be remembered across runs, as long as its location is
+                            # unchanged
+                            section.absent[candidate.uri] = cls.locus(uri=candidate)
+                        # count it
+                        record.misses += 1
+                        # move on to the next candidate
+                        continue
 
-            # yield the shelf to my caller
-            yield shelf
+                # remember this candidate
+                hits.append(candidate)
+                # yield the shelf to my caller
+                yield shelf
+
+            # if we get this far, the candidates were exhausted
+            exhausted = True
+        # no matter how the search ended
+        finally:
+            # remember the candidates that worked
+            record.hits = tuple(hits)
+            # and whether there may be more of them
+            record.complete = exhausted
 
         # no more candidates
         return
 
 
+    @classmethod
+    def loadCandidate(cls, linker, executive, uri):
+        """
+        Load the shelf at the candidate location {uri} and register it with the {linker};
+        raise a {LoadingError} if there is no shelf at {uri}
+        """
+        # make an empty shelf and register it with the linker to prevent it from attempting
+        # to load this shelf again, in case there are loading side effects
+        linker.shelves[uri.uri] = cls.shelf(uri=uri)
+        # attempt to
+        try:
+            # load it
+            shelf = cls.load(executive=executive, uri=uri)
+        # if it fails
+        except cls.LoadingError as error:
+            # show me
+            # print(" ## skipping: {}".format(error))
+            # remove the bogus registration
+            del linker.shelves[uri.uri]
+            # and report failure
+            raise
+        # if the shelf was loaded correctly, replace the bogus registration
+        linker.shelves[uri.uri] = shelf
+        # show me
+        # print("      success; registering {!r} with the linker".format(uri.uri))
+        # and return it
+        return shelf
+
+
     @classmethod
     def locateShelves(cls, executive, protocol, scheme, context, symbol, cfgpath=None, **kwds):
         """
@@ -216,6 +332,26 @@ class Loader:
         return
 
 
+    @classmethod
+    def searchpath(cls, executive):
+        """
+        Build a token that captures the state of the locations i search for shelves; the
+        resolution cache forgets what it knows about my candidates whenever it changes
+        """
+        # by default, the search path never changes
+        return None
+
+
+    @classmethod
+    def locus(cls, uri):
+        """
+        Build a token that captures the state of the location of the shelf at {uri}; misses
+        saved across runs are forgotten whenever it changes
+        """
+        # by default, the location never changes
+        return None
+
+
     # initialization
     @classmethod
     def register(cls, index):
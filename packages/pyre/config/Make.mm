@@ -19,6 +19,7 @@ RECURSE_DIRS = \
 
 # the python modules
 EXPORT_PYTHON_MODULES = \
+    Cache.py \
     Codec.py \
     CommandLineParser.py \
     Configurator.py \
@@ -13,6 +13,16 @@ configuration file formats supported by pyre.
 
 
 # factories
+def newCache(**kwds):
+    """
+    Build a new persistent store of parsed configuration events
+    """
+    # access the factory
+    from .Cache import Cache
+    # build one and return it
+    return Cache(**kwds)
+
+
 def newCommandLineParser(**kwds):
     """
     Build a new parser of command line arguments
@@ -74,6 +74,15 @@ class LoadingError(CodecError):
     Exception raised by codecs when they encounter errors in their input streams
     """
 
+    # meta-methods
+    def __init__(self, missing=True, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # mark whether the shelf does not exist, as opposed to failing to load
+        self.missing = missing
+        # all done
+        return
+
 
 class ShelfError(ConfigurationError):
 
@@ -7,6 +7,7 @@
 
 
 # externals
+import os
 import sys
 # support
 from ... import primitives, tracking
@@ -37,6 +38,10 @@ class Importer(Loader):
     from .Shelf import Shelf as shelf
 
 
+    # constants
+    durable = True # my search path can be checked across runs
+
+
     # public data
     schemes = ('import',)
 
@@ -61,9 +66,16 @@ class Importer(Loader):
         except (ImportError, TypeError) as error:
             # show me
             # print("      error: {}".format(str(error)))
+            # the module is missing only if the failure is about {source} or one of its
+            # packages, as opposed to an import that failed while executing an existing module
+            missing = (
+                isinstance(error, ModuleNotFoundError)
+                and error.name is not None
+                and (source == error.name or source.startswith(error.name + '.')))
             # complain
             raise cls.LoadingError(
-                codec=cls, uri=uri, locator=locator, description=str(error)) from error
+                codec=cls, uri=uri, locator=locator, description=str(error),
+                missing=missing) from error
         # all other exceptions are probably caused by the contents of the module; let them
         # propagate to the user; on success, look up {module} in the global list of modules and
         # return it dressed up as a shelf
@@ -90,6 +102,59 @@ class Importer(Loader):
         return
 
 
+    @classmethod
+    def searchpath(cls, executive):
+        """
+        Build a token that captures the state of the python path
+        """
+        # the entries of the python path, along with their modification times so that new
+        # top level modules and packages invalidate the failures recorded against them
+        stamp = []
+        # go through the python path
+        for entry in sys.path:
+            # attempt to
+            try:
+                # get the modification time of the entry
+                mtime = os.stat(entry or os.curdir).st_mtime_ns
+            # if it doesn't exist
+            except OSError:
+                # mark it
+                mtime = None
+            # add it to the pile
+            stamp.append((entry, mtime))
+        # all done
+        return tuple(stamp)
+
+
+    @classmethod
+    def locus(cls, uri):
+        """
+        Build a token that captures the state of the folders where the module at {uri} would
+        be found
+        """
+        # the package that would contain the module
+        package = str(uri.address).split('.')[:-1]
+        # the candidate folders of the package, along with their modification times, so that
+        # new modules added to existing packages invalidate the failures recorded against them
+        stamp = []
+        # go through the python path
+        for entry in sys.path:
+            # form the location of the package
+            folder = os.path.join(entry or os.curdir, *package)
+            # attempt to
+            try:
+                # get its modification time
+                mtime = os.stat(folder).st_mtime_ns
+            # if it doesn't exist
+            except OSError:
+                # mark it
+                mtime = None
+            # add it to the pile
+            stamp.append((folder, mtime))
+        # all done
+        return tuple(stamp)
+
+
     # context handling
     @classmethod
     def interpret(cls, request):
@@ -6,6 +6,8 @@
 #
 
 
+# externals
+import os
 # access to the locator factories
 from ... import primitives, tracking
 # and my ancestors
@@ -97,6 +99,16 @@ class ODB(Loader):
         return
 
 
+    @classmethod
+    def searchpath(cls, executive):
+        """
+        Build a token that captures the state of the virtual filesystem
+        """
+        # the fileserver keeps track of the changes to its layout; relative {file} uris also
+        # depend on the current working directory
+        return executive.fileserver.generation, os.getcwd()
+
+
     # context handling
     @classmethod
     def interpret(cls, request):
@@ -18,6 +18,10 @@ class Backup(Server, family="pyre.db.server.backup"):
     Component that saves SQL statement in a stream
     """
 
+    # constants
+    providesParameters = False # the statements are saved as text, so values must be inlined
+
+
     # public state
     database = pyre.properties.str(default="what?")
     database.doc = "the name of the database to connect to"
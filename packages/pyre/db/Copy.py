@@ -0,0 +1,832 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import datetime
+import decimal
+import re
+import struct
+import time
+from . import literals
+# the field types
+from .FieldReference import FieldReference
+from .Measure import Measure
+from .Reference import Reference
+
+
+# declaration
+class Copy:
+    """
+    Encoder and decoder of the data streams of the postgres {COPY} command
+
+    Rows travel either in the text format, as lines of tab separated values, or in the binary
+    format, where each value is in the wire representation of its type. The binary format
+    saves the server the work of parsing the values, but it requires a codec for the type of
+    each field; all the types in {pyre.db} have one
+    """
+
+
+    # public data
+    chunk = 64 * 1024 # the approximate size of the pieces of the encoded stream
+
+
+    # statements
+    def copyFrom(self, table, fields, binary=False):
+        """
+        Build the statement that streams the values of {fields} from the client into {table}
+        """
+        # easy enough
+        yield "COPY {} ({})".format(table.pyre_name, ", ".join(field.name for field in fields))
+        yield "  FROM STDIN{};".format(" WITH (FORMAT binary)" if binary else "")
+        # all done
+        return
+
+
+    def copyTo(self, table, fields, binary=False):
+        """
+        Build the statement that streams the values of {fields} of the rows of {table} to the
+        client
+        """
+        # easy enough
+        yield "COPY {} ({})".format(table.pyre_name, ", ".join(field.name for field in fields))
+        yield "  TO STDOUT{};".format(" WITH (FORMAT binary)" if binary else "")
+        # all done
+        return
+
+
+    # field selection
+    def select(self, table, fields=None):
+        """
+        Build a tuple of the descriptors of the {fields} of {table}
+
+        The {fields} may be given as descriptors, references such as {table.name}, or names;
+        if they aren't given at all, the result has all the fields of {table}
+        """
+        # if there is no selection
+        if fields is None:
+            # use all of them
+            return tuple(table.pyre_fields)
+        # index the fields by name
+        names = { field.name: field for field in table.pyre_fields }
+        # the selection
+        selection = []
+        # go through the entries
+        for field in fields:
+            # names
+            if isinstance(field, str):
+                field = names[field]
+            # references
+            elif isinstance(field, FieldReference):
+                field = field.field
+            # add it to the pile
+            selection.append(field)
+        # all done
+        return tuple(selection)
+
+
+    def match(self, table, sheet):
+        """
+        Match the fields of {sheet} to the fields of {table} by name; return the descriptors of
+        the matching fields of {table}, and the rows of {sheet} with their values
+        """
+        # index the fields of the table by name
+        names = { field.name: field for field in table.pyre_fields }
+        # find the columns of the sheet whose names are table fields
+        columns = tuple(
+            (index, names[field.name]) for index, field in enumerate(sheet.pyre_fields)
+            if field.name in names)
+        # the fields
+        fields = tuple(field for _, field in columns)
+        # the positions of their values
+        indices = tuple(index for index, _ in columns)
+        # project the rows
+        rows = (tuple(row[index] for index in indices) for row in sheet)
+        # all done
+        return fields, rows
+
+
+    # encoding
+    def encode(self, fields, rows, binary=False):
+        """
+        Convert {rows} of values of {fields} into the chunks of a {COPY} stream
+        """
+        # delegate to the format handler
+        return self.binary(fields, rows) if binary else self.text(fields, rows)
+
+
+    def text(self, fields, rows):
+        """
+        Convert {rows} of values of {fields} into the chunks of a text {COPY} stream
+        """
+        # build the value encoders
+        encoders = tuple(self.textEncoder(field) for field in fields)
+        # the lines of the current chunk
+        lines = []
+        # and its size
+        size = 0
+        # go through the rows
+        for row in rows:
+            # encode the values and assemble the line
+            line = "\t".join([encode(value) for encode, value in zip(encoders, row)]) + "\n"
+            # add it to the pile
+            lines.append(line)
+            size += len(line)
+            # if the chunk is big enough
+            if size >= self.chunk:
+                # ship it
+                yield "".join(lines).encode("utf-8")
+                # and start a new one
+                lines = []
+                size = 0
+        # if there is anything left over
+        if lines:
+            # ship it
+            yield "".join(lines).encode("utf-8")
+        # all done
+        return
+
+
+    def binary(self, fields, rows):
+        """
+        Convert {rows} of values of {fields} into the chunks of a binary {COPY} stream
+        """
+        # build the value encoders
+        encoders = tuple(self.binaryEncoder(field) for field in fields)
+        # every row starts with the number of fields
+        count = self.short.pack(len(encoders))
+        # the pieces of the current chunk start with the header
+        pieces = [self.signature, self.header]
+        # and its size
+        size = 0
+        # go through the rows
+        for row in rows:
+            # mark the beginning of the row
+            pieces.append(count)
+            # encode each value
+            for encode, value in zip(encoders, row):
+                # and add it to the pile
+                pieces.append(encode(value))
+            # update the size
+            size += sum(map(len, pieces[-len(encoders)-1:]))
+            # if the chunk is big enough
+            if size >= self.chunk:
+                # ship it
+                yield b"".join(pieces)
+                # and start a new one
+                pieces = []
+                size = 0
+        # mark the end of the stream
+        pieces.append(self.trailer)
+        # and ship what's left
+        yield b"".join(pieces)
+        # all done
+        return
+
+
+    # decoding
+    def decode(self, fields, chunks, binary=False):
+        """
+        Convert the chunks of a {COPY} stream into tuples of values of {fields}
+        """
+        # delegate to the format handler
+        return self.binaryRows(fields, chunks) if binary else self.textRows(fields, chunks)
+
+
+    def textRows(self, fields, chunks):
+        """
+        Convert the chunks of a text {COPY} stream into tuples of values of {fields}
+        """
+        # build the value decoders
+        decoders = tuple(self.textDecoder(field) for field in fields)
+        # the fragment of the line that was cut off at the end of the previous chunk
+        fragment = b""
+        # go through the chunks
+        for chunk in chunks:
+            # split into lines; the last one is incomplete, unless it is empty
+            *lines, fragment = (fragment + chunk).split(b"\n")
+            # go through the complete ones
+            for line in lines:
+                # decode the values and hand them over
+                yield tuple(
+                    decode(value)
+                    for decode, value in zip(decoders, line.decode("utf-8").split("\t")))
+        # all done
+        return
+
+
+    def binaryRows(self, fields, chunks):
+        """
+        Convert the chunks of a binary {COPY} stream into tuples of values of {fields}
+        """
+        # build the value decoders
+        decoders = tuple(self.binaryDecoder(field) for field in fields)
+        # access the integer layouts
+        short = self.short
+        long = self.long
+        # the data that haven't been decoded yet
+        buffer = b""
+        # whether i've seen the header
+        header = False
+        # go through the chunks
+        for chunk in chunks:
+            # add the chunk to the unprocessed data
+            buffer += chunk
+            # if i haven't seen the header yet
+            if not header:
+                # the fixed part is the signature, the flags and the size of the extension
+                fixed = len(self.signature) + 8
+                # if i don't have all of it
+                if len(buffer) < fixed:
+                    # get more data
+                    continue
+                # check the signature
+                if not buffer.startswith(self.signature):
+                    # and complain if it's not there
+                    raise ValueError("invalid COPY stream: missing signature")
+                # get the size of the header extension
+                extension, = long.unpack_from(buffer, fixed - 4)
+                # if i don't have all of it
+                if len(buffer) < fixed + extension:
+                    # get more data
+                    continue
+                # otherwise, skip over the header
+                buffer = buffer[fixed+extension:]
+                # and mark it as seen
+                header = True
+            # the position of the row being decoded
+            start = 0
+            # go through the complete rows in the buffer
+            while len(buffer) - start >= short.size:
+                # get the number of values
+                count, = short.unpack_from(buffer, start)
+                # if this is the trailer
+                if count == -1:
+                    # we are done
+                    return
+                # check that it is what i expect
+                if count != len(decoders):
+                    # and complain if not
+                    raise ValueError(
+                        "invalid COPY stream: expected {} values, got {}".format(
+                            len(decoders), count))
+                # the values of the row
+                values = []
+                # the position of the next value
+                position = start + short.size
+                # go through the values
+                for decode in decoders:
+                    # if the size isn't there
+                    if len(buffer) - position < long.size:
+                        # the row is incomplete
+                        break
+                    # get the size of the value
+                    size, = long.unpack_from(buffer, position)
+                    # and move past it
+                    position += long.size
+                    # a negative size marks {NULL}
+                    if size < 0:
+                        # which becomes {None}
+                        values.append(None)
+                        # move on
+                        continue
+                    # if the value isn't all there
+                    if len(buffer) - position < size:
+                        # the row is incomplete
+                        break
+                    # decode it
+                    values.append(decode(buffer[position:position+size]))
+                    # and move past it
+                    position += size
+                # if the row is incomplete
+                if len(values) < len(decoders):
+                    # get more data
+                    break
+                # otherwise, move on
+                start = position
+                # and hand the row over
+                yield tuple(values)
+            # discard the rows i have decoded
+            buffer = buffer[start:]
+        # if i get this far, the stream was cut short
+        raise ValueError("invalid COPY stream: missing trailer")
+
+
+    # implementation details
+    def resolve(self, field):
+        """
+        Find the field that determines the type of {field}
+        """
+        # references have the type of their referents
+        while isinstance(field, Reference):
+            # so look through them
+            field = field.referent
+        # all done
+        return field
+
+
+    def kind(self, field):
+        """
+        Identify the type of {field}
+        """
+        # go through the known types
+        for kind in self.kinds:
+            # if {field} is one of them
+            if isinstance(field, getattr(Measure, kind)):
+                # this is its type
+                return kind
+        # otherwise, complain
+        raise TypeError("{!r}: no COPY codec for fields of type {}".format(
+            field.name, type(field).__name__))
+
+
+    def textEncoder(self, field):
+        """
+        Build a function that converts values of {field} into their text {COPY} form
+        """
+        # get the conversion of the values of {field} into parameters
+        adapter = field.adapter
+        # the value that replaces the {default} marker
+        default = field.default
+        # and the escapes of the special characters
+        escapes = self.escapes
+
+        # the encoder
+        def encode(value):
+            """
+            Convert {value} into its text {COPY} form
+            """
+            # {COPY} can't leave out individual values, so use the default
+            if value is literals.default:
+                value = default
+            # {None} and {NULL} are {NULL}
+            if value is None or value is literals.null:
+                return r"\N"
+            # spell booleans the way postgres does
+            if value is True or value is False:
+                return "t" if value else "f"
+            # convert the value, if necessary
+            if adapter is not None:
+                value = adapter(value)
+            # render it and escape the special characters
+            return str(value).translate(escapes)
+
+        # all done
+        return encode
+
+
+    def binaryEncoder(self, field):
+        """
+        Build a function that converts values of {field} into their binary {COPY} form
+        """
+        # get the field that determines the type
+        typed = self.resolve(field)
+        # and the encoder for its values
+        convert = getattr(self, "encode_" + self.kind(typed))
+        # the value that replaces the {default} marker
+        default = field.default
+        # the layout of the size of the value
+        long = self.long
+        # and the marker of {NULL}
+        null = long.pack(-1)
+
+        # the encoder
+        def encode(value):
+            """
+            Convert {value} into its binary {COPY} form, prefixed by its size
+            """
+            # {COPY} can't leave out individual values, so use the default
+            if value is literals.default:
+                value = default
+            # {None} and {NULL} are {NULL}
+            if value is None or value is literals.null:
+                return null
+            # convert the value
+            data = convert(typed, value)
+            # and prefix it with its size
+            return long.pack(len(data)) + data
+
+        # all done
+        return encode
+
+
+    def textDecoder(self, field):
+        """
+        Build a function that converts the text {COPY} form of a value of {field} into a value
+        """
+        # get the field that determines the type
+        typed = self.resolve(field)
+        # and the decoder for its values
+        convert = getattr(self, "parse_" + self.kind(typed))
+        # the special characters
+        unescape = self.unescape
+        escaped = self.escaped
+
+        # the decoder
+        def decode(text):
+            """
+            Convert {text} into a value
+            """
+            # {NULL} becomes {None}
+            if text == r"\N":
+                return None
+            # replace the escaped characters, if there are any
+            if "\\" in text:
+                text = unescape.sub(escaped, text)
+            # and convert
+            return convert(typed, text)
+
+        # all done
+        return decode
+
+
+    def binaryDecoder(self, field):
+        """
+        Build a function that converts the binary {COPY} form of a value of {field} into a
+        value
+        """
+        # get the field that determines the type
+        typed = self.resolve(field)
+        # and the decoder for its values
+        convert = getattr(self, "decode_" + self.kind(typed))
+        # bind it to the field
+        return lambda data: convert(typed, data)
+
+
+    def typeDecoder(self, oid):
+        """
+        Build a function that converts the binary form of a value of the postgres type {oid}
+        into a value; this is how query results in binary form are converted
+        """
+        # look up the type
+        kind = self.oids.get(oid)
+        # if it's not one i know
+        if kind is None:
+            # leave its values alone
+            return lambda data: data
+        # otherwise, get the decoder
+        convert = getattr(self, "decode_" + kind)
+        # there is no field to bind it to
+        return lambda data: convert(None, data)
+
+
+    # the binary encoders
+    def encode_bool(self, field, value):
+        """
+        Encode a boolean
+        """
+        # a single byte
+        return b"\x01" if value else b"\x00"
+
+
+    def encode_date(self, field, value):
+        """
+        Encode a date as the number of days since the postgres epoch
+        """
+        # normalize
+        value = self.date(field, value)
+        # and measure
+        return self.long.pack((value - self.epoch.date()).days)
+
+
+    def encode_decimal(self, field, value):
+        """
+        Encode a fixed point number as a sequence of base 10000 digits
+        """
+        # normalize
+        value = decimal.Decimal(value)
+        # get its parts
+        sign, digits, exponent = value.as_tuple()
+        # the special values have no digits
+        if not value.is_finite():
+            # just a special sign
+            flag = 0xc000 if value.is_nan() else (0xf000 if sign else 0xd000)
+            # build the representation
+            return self.numeric.pack(0, 0, flag, 0)
+        # the number of digits after the decimal point
+        scale = max(0, -exponent)
+        # put the digits in a string
+        text = "".join(map(str, digits)) + "0" * max(0, exponent)
+        # make sure there are enough of them to cover the fractional part
+        text = "0" * max(0, scale - len(text)) + text
+        # the number of digits before the decimal point
+        integral = len(text) - scale
+        # pad both parts to a whole number of base 10000 digits
+        text = "0" * (-integral % 4) + text + "0" * (-scale % 4)
+        # the weight of the first digit
+        weight = (integral + (-integral % 4)) // 4 - 1
+        # convert to base 10000
+        groups = [int(text[index:index+4]) for index in range(0, len(text), 4)]
+        # drop the leading zeros, adjusting the weight
+        while groups and groups[0] == 0:
+            groups.pop(0)
+            weight -= 1
+        # and the trailing ones
+        while groups and groups[-1] == 0:
+            groups.pop()
+        # zero has no digits
+        if not groups:
+            weight = 0
+        # build the representation
+        return (
+            self.numeric.pack(len(groups), weight, 0x4000 if sign else 0, scale) +
+            struct.pack("!{}H".format(len(groups)), *groups))
+
+
+    def encode_float(self, field, value):
+        """
+        Encode a floating point number
+        """
+        # double precision
+        return self.double.pack(value)
+
+
+    def encode_int(self, field, value):
+        """
+        Encode an integer
+        """
+        # {INTEGER} is four bytes
+        return self.long.pack(value)
+
+
+    def encode_str(self, field, value):
+        """
+        Encode a string
+        """
+        # as its utf-8 bytes
+        return value.encode("utf-8")
+
+
+    def encode_time(self, field, value):
+        """
+        Encode a timestamp as the number of microseconds since the postgres epoch
+        """
+        # normalize
+        value = self.timestamp(field, value)
+        # values with a timezone are measured in utc; the others are taken as they are
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        # measure
+        delta = value - self.epoch
+        # and pack
+        return self.quad.pack(
+            (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+    # the binary decoders
+    def decode_bool(self, field, data):
+        """
+        Decode a boolean
+        """
+        # a single byte
+        return data != b"\x00"
+
+
+    def decode_date(self, field, data):
+        """
+        Decode a date
+        """
+        # the number of days since the postgres epoch
+        days, = self.long.unpack(data)
+        # convert
+        return self.epoch.date() + datetime.timedelta(days=days)
+
+
+    def decode_decimal(self, field, data):
+        """
+        Decode a fixed point number
+        """
+        # get the header
+        count, weight, sign, scale = self.numeric.unpack_from(data)
+        # the special values
+        if sign == 0xc000:
+            return decimal.Decimal("NaN")
+        if sign in (0xd000, 0xf000):
+            return decimal.Decimal("-Infinity" if sign == 0xf000 else "Infinity")
+        # get the base 10000 digits
+        groups = struct.unpack_from("!{}H".format(count), data, self.numeric.size)
+        # convert them to decimal digits
+        digits = "".join("{:04d}".format(group) for group in groups)
+        # the exponent of the last one
+        exponent = (weight - count + 1) * 4
+        # adjust the digits so there are exactly {scale} of them after the decimal point
+        if exponent > -scale:
+            digits += "0" * (exponent + scale)
+        else:
+            digits = digits[:len(digits) + exponent + scale]
+        # build the value
+        return decimal.Decimal((1 if sign else 0, tuple(map(int, digits or "0")), -scale))
+
+
+    def decode_float(self, field, data):
+        """
+        Decode a floating point number
+        """
+        # single or double precision
+        value, = (self.double if len(data) == 8 else self.single).unpack(data)
+        # all done
+        return value
+
+
+    def decode_int(self, field, data):
+        """
+        Decode an integer
+        """
+        # two, four or eight bytes
+        value, = self.integers[len(data)].unpack(data)
+        # all done
+        return value
+
+
+    def decode_str(self, field, data):
+        """
+        Decode a string
+        """
+        # from its utf-8 bytes
+        return data.decode("utf-8")
+
+
+    def decode_time(self, field, data):
+        """
+        Decode a timestamp
+        """
+        # values with a timezone are in utc
+        decode = self.decode_timestamptz if field.timezone else self.decode_timestamp
+        # delegate
+        return decode(field, data)
+
+
+    def decode_timestamp(self, field, data):
+        """
+        Decode a timestamp without a timezone
+        """
+        # the number of microseconds since the postgres epoch
+        microseconds, = self.quad.unpack(data)
+        # convert
+        return self.epoch + datetime.timedelta(microseconds=microseconds)
+
+
+    def decode_timestamptz(self, field, data):
+        """
+        Decode a timestamp with a timezone
+        """
+        # these are in utc
+        return self.decode_timestamp(field, data).replace(tzinfo=datetime.timezone.utc)
+
+
+    # the text decoders
+    def parse_bool(self, field, text):
+        """
+        Parse a boolean
+        """
+        # postgres spells them 't' and 'f'
+        return text == "t"
+
+
+    def parse_date(self, field, text):
+        """
+        Parse a date
+        """
+        # postgres uses the iso format
+        return datetime.date.fromisoformat(text)
+
+
+    def parse_decimal(self, field, text):
+        """
+        Parse a fixed point number
+        """
+        # easy enough
+        return decimal.Decimal(text)
+
+
+    def parse_float(self, field, text):
+        """
+        Parse a floating point number
+        """
+        # easy enough
+        return float(text)
+
+
+    def parse_int(self, field, text):
+        """
+        Parse an integer
+        """
+        # easy enough
+        return int(text)
+
+
+    def parse_str(self, field, text):
+        """
+        Parse a string
+        """
+        # nothing to do
+        return text
+
+
+    def parse_time(self, field, text):
+        """
+        Parse a timestamp
+        """
+        # postgres uses the iso format, but leaves out the minutes of whole hour offsets
+        return datetime.datetime.fromisoformat(self.offset.sub(r"\1:00", text))
+
+
+    # normalization of dates and times
+    def date(self, field, value):
+        """
+        Convert {value} into a {datetime.date}
+        """
+        # time structs
+        if isinstance(value, time.struct_time):
+            return datetime.date(*value[:3])
+        # strings are parsed using the format of {field}
+        if isinstance(value, str):
+            return datetime.datetime.strptime(value, field.format).date()
+        # timestamps
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        # everything else had better be a date
+        return value
+
+
+    def timestamp(self, field, value):
+        """
+        Convert {value} into a {datetime.datetime}
+        """
+        # time structs
+        if isinstance(value, time.struct_time):
+            return datetime.datetime(*value[:6])
+        # strings are parsed using the format of {field}
+        if isinstance(value, str):
+            return datetime.datetime.strptime(value, field.format)
+        # everything else had better be a timestamp
+        return value
+
+
+    # private data
+    # the types with codecs
+    kinds = ("bool", "date", "decimal", "float", "int", "str", "time")
+    # the postgres types whose binary form i can decode, by their identifiers
+    oids = {
+        16: "bool", # boolean
+        18: "str", # "char"
+        19: "str", # name
+        20: "int", # bigint
+        21: "int", # smallint
+        23: "int", # integer
+        25: "str", # text
+        700: "float", # real
+        701: "float", # double precision
+        1042: "str", # character
+        1043: "str", # character varying
+        1082: "date", # date
+        1114: "timestamp", # timestamp without time zone
+        1184: "timestamptz", # timestamp with time zone
+        1700: "decimal", # numeric
+        }
+    # the beginning of the binary format
+    signature = b"PGCOPY\n\xff\r\n\x00"
+    # followed by the flags and the size of the header extension
+    header = struct.pack("!ii", 0, 0)
+    # the end of the binary format
+    trailer = struct.pack("!h", -1)
+    # the zero point of dates and timestamps
+    epoch = datetime.datetime(2000, 1, 1)
+    # the layouts of the binary values
+    short = struct.Struct("!h")
+    long = struct.Struct("!i")
+    quad = struct.Struct("!q")
+    single = struct.Struct("!f")
+    double = struct.Struct("!d")
+    numeric = struct.Struct("!hhHH")
+    integers = { 2: short, 4: long, 8: quad }
+    # the special characters of the text format and their escapes
+    escapes = str.maketrans({ "\\": r"\\", "\t": r"\t", "\n": r"\n", "\r": r"\r" })
+    unescape = re.compile(r"\\([0-7]{1,3}|x[0-9a-fA-F]{1,2}|.)")
+    # whole hour timezone offsets
+    offset = re.compile(r"([+-]\d\d)$")
+
+
+    @staticmethod
+    def escaped(match):
+        """
+        Convert an escape sequence from the text format into the character it represents
+        """
+        # get the sequence
+        sequence = match.group(1)
+        # octal
+        if sequence[0] in "01234567":
+            return chr(int(sequence, 8))
+        # hexadecimal
+        if sequence[0] == "x":
+            return chr(int(sequence[1:], 16))
+        # the named ones; everything else stands for itself
+        return { "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v" }.get(
+            sequence, sequence)
+
+
+# end of file
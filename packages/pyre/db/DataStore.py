@@ -36,5 +36,18 @@ class DataStore(pyre.protocol, family="pyre.db.server"):
         Execute the sequence of SQL statements in {sql} as a single command
         """
 
+    @pyre.provides
+    def executemany(self, sql, rows):
+        """
+        Execute the parameterized SQL statement {sql} once for each tuple of values in {rows}
+        """
+
+    @pyre.provides
+    def fetch(self, *sql, parameters=None):
+        """
+        Execute the sequence of SQL statements in {sql} and generate the rows of the result;
+        if {parameters} is not {None}, it holds the values of the statement parameters
+        """
+
 
 # end of file
@@ -14,6 +14,7 @@ EXPORT_PYTHON_MODULES = \
     Backup.py \
     Client.py \
     Collation.py \
+    Copy.py \
     DataStore.py \
     FieldReference.py \
     FieldSelector.py \
@@ -21,6 +22,7 @@ EXPORT_PYTHON_MODULES = \
     Measure.py \
     Object.py \
     Persistent.py \
+    Pool.py \
     Postgres.py \
     Query.py \
     Reference.py \
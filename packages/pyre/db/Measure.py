@@ -97,6 +97,10 @@ class Measure(records.measure):
             # for the rest, chain up...
             return super().coerce(value=value, **kwds)
 
+        # the conversion of values into statement parameters; most values can be handed to
+        # the database driver as they are, so by default there isn't one
+        adapter = None
+
 
 
     # mixins for the various supported types
@@ -130,6 +134,15 @@ class Measure(records.measure):
             # make sure the result is quoted in an SQL compliant way
             return "'{}'".format(value)
 
+        def adapter(self, value):
+            """Convert {value} into a statement parameter"""
+            # if {value} is a time struct
+            if isinstance(value, time.struct_time):
+                # use my format to convert it a string
+                return time.strftime(self.format, value)
+            # other types of values just get passed along
+            return value
+
         # meta-methods
         def __init__(self, default=None, **kwds):
             # chain up
@@ -154,6 +167,11 @@ class Measure(records.measure):
             # convert the decimal into a string
             return str(value)
 
+        def adapter(self, value):
+            """Convert {value} into a statement parameter"""
+            # not all drivers understand decimals, but they all understand their text form
+            return str(value)
+
         # meta-methods
         def __init__(self, precision, scale, **kwds):
             # chain up
@@ -208,8 +226,8 @@ class Measure(records.measure):
             """SQL rendering of my value"""
             # if the value is None
             if value is None:
-                # convert it
-                return "'None'"
+                # it is {NULL}, just as when it is passed as a statement parameter
+                return "NULL"
             # otherwise, escape any embedded single quotes
             return "'{}'".format(value.replace("'", "''"))
 
@@ -244,6 +262,15 @@ class Measure(records.measure):
             # make sure the result is quoted in an SQL compliant way
             return "'{}'".format(value)
 
+        def adapter(self, value):
+            """Convert {value} into a statement parameter"""
+            # if {value} is a time struct
+            if isinstance(value, time.struct_time):
+                # use my format to convert it a string
+                return time.strftime(self.format, value)
+            # other types of values just get passed along
+            return value
+
         # meta-methods
         def __init__(self, default=None, timezone=False, **kwds):
             # chain up
@@ -0,0 +1,540 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import contextlib
+import threading
+import time
+import pyre
+# my protocol
+from . import datastore
+# the default server
+from .SQLite import SQLite
+
+
+# declaration
+class Pool(pyre.component, family="pyre.db.pool"):
+    """
+    A collection of connections to a database server that are handed out to their users one
+    at a time
+
+    The connections are instances of the component class of {server}, configured the same
+    way, so anything that works with {server} works with the connections. Each one is a
+    separate session with the back end, with its own statement caches, so they can be used
+    concurrently by threads or by the handlers of a server. Connections are made on demand,
+    up to {maximum} of them; once they are all in use, callers wait up to {timeout} seconds
+    for one to be returned. The first checkout opens {minimum} connections, and connections
+    that have been idle for more than {check} seconds are probed before they are handed out;
+    the ones idle for more than {idle} seconds are closed, as long as there are at least
+    {minimum} left. Once the pool is shut down, it refuses further checkouts, and the
+    connections that are returned to it are closed.
+
+    Note that connections to a sqlite database in memory are each attached to a database of
+    their own
+    """
+
+
+    # user configurable state
+    server = datastore(default=SQLite)
+    server.doc = "the database server whose configuration the pooled connections share"
+
+    minimum = pyre.properties.int(default=1)
+    minimum.doc = "the number of connections to keep open, even when idle"
+
+    maximum = pyre.properties.int(default=8)
+    maximum.doc = "the largest number of connections to have open at the same time"
+
+    timeout = pyre.properties.float(default=30)
+    timeout.doc = "the number of seconds to wait for a connection to become available"
+
+    idle = pyre.properties.float(default=300)
+    idle.doc = "the number of seconds a connection can stay idle before it is closed"
+
+    check = pyre.properties.float(default=30)
+    check.doc = "the number of idle seconds after which a connection is probed before use"
+
+    probe = pyre.properties.str(default="SELECT 1;")
+    probe.doc = "the statement that verifies a connection is still usable"
+
+
+    # types
+    from .exceptions import InterfaceError, OperationalError, PoolTimeoutError
+
+    class metrics:
+        """
+        The usage statistics of a pool
+        """
+
+        # interface
+        @property
+        def utilization(self):
+            """
+            The average fraction of the open connections that were in use
+            """
+            # easy enough
+            return self.busy / self.open if self.open else 0
+
+        @property
+        def wait(self):
+            """
+            The average time it took to check out a connection
+            """
+            # easy enough
+            return self.waiting / self.checkouts if self.checkouts else 0
+
+        # meta-methods
+        def __init__(self):
+            # the number of connections handed out
+            self.checkouts = 0
+            # the number of them that had to wait for another user to return one
+            self.waits = 0
+            # the total and the longest time it took to check out a connection
+            self.waiting = 0
+            self.longest = 0
+            # the number of requests that timed out
+            self.timeouts = 0
+            # the number of connections opened
+            self.created = 0
+            # the number of connections closed because they were broken
+            self.discarded = 0
+            # and the number of connections closed because they were idle
+            self.evicted = 0
+            # the number of connections in use and open, integrated over time
+            self.busy = 0
+            self.open = 0
+            # all done
+            return
+
+        def __repr__(self):
+            # easy enough
+            return (f"metrics(checkouts={self.checkouts}, waits={self.waits}, "
+                    f"wait={self.wait:.6f}, longest={self.longest:.6f}, "
+                    f"timeouts={self.timeouts}, utilization={self.utilization:.3f})")
+
+        __slots__ = ("checkouts", "waits", "waiting", "longest", "timeouts",
+                     "created", "discarded", "evicted", "busy", "open")
+
+
+    # interface
+    def checkout(self, timeout=None):
+        """
+        Get a connection, waiting up to {timeout} seconds for one to become available; the
+        default is my {timeout}
+        """
+        # if this is the first checkout
+        if not self._filled:
+            # open the minimum number of connections
+            self.fill()
+            # and remember that this was done
+            self._filled = True
+        # figure out how long to wait
+        timeout = self.timeout if timeout is None else timeout
+        # start the clock
+        start = time.monotonic()
+        # and compute the deadline
+        deadline = start + timeout
+        # my statistics
+        metrics = self.statistics
+        # whether i had to wait for another user
+        waited = False
+        # with exclusive access to my state
+        with self._lock:
+            # until a connection becomes available
+            while True:
+                # if i have been shut down
+                if self._closed:
+                    # complain
+                    raise self.InterfaceError(description="the pool is shut down")
+                # if there is one that's idle
+                if self._idle:
+                    # grab the one used most recently, so the others can age out
+                    server, since = self._idle.pop()
+                    # and stop looking
+                    break
+                # if there is room for another one
+                if self._size < self.maximum:
+                    # reserve its spot; it gets made after the lock is released
+                    self._advance()
+                    self._size += 1
+                    server = None
+                    # and stop looking
+                    break
+                # otherwise, figure out how much longer i can wait
+                remaining = deadline - time.monotonic()
+                # if i'm out of time
+                if remaining <= 0:
+                    # update the statistics
+                    metrics.timeouts += 1
+                    # and complain
+                    raise self.PoolTimeoutError(timeout=timeout)
+                # otherwise, update the statistics, the first time around
+                if not waited: metrics.waits += 1
+                waited = True
+                # and wait for a connection to be returned
+                self._lock.wait(remaining)
+
+        # if i picked an idle connection that might have gone stale
+        if server is not None and time.monotonic() - since > self.check:
+            # if it is not usable any more
+            if not self.healthy(server):
+                # close it
+                self.close(server)
+                # and replace it
+                server = None
+                # update the statistics
+                with self._lock: metrics.discarded += 1
+        # if i need a new connection
+        if server is None:
+            # carefully
+            try:
+                # make one
+                server = self.connect()
+            # if anything goes wrong
+            except Exception:
+                # with exclusive access to my state
+                with self._lock:
+                    # give up the spot
+                    self._advance()
+                    self._size -= 1
+                    # let someone else try
+                    self._lock.notify()
+                # and complain
+                raise
+
+        # stop the clock
+        elapsed = time.monotonic() - start
+        # with exclusive access to my state
+        with self._lock:
+            # bring the statistics up to date
+            self._advance()
+            # if i was shut down while the connection was being made
+            if self._closed:
+                # give up its spot
+                self._size -= 1
+            # otherwise
+            else:
+                # update the statistics
+                metrics.checkouts += 1
+                metrics.waiting += elapsed
+                metrics.longest = max(metrics.longest, elapsed)
+                # mark the connection as in use
+                self._busy[id(server)] = server
+                # and hand it over
+                return server
+        # close the connection outside the lock
+        self.close(server)
+        # and complain
+        raise self.InterfaceError(description="the pool is shut down")
+
+
+    def checkin(self, server, discard=False):
+        """
+        Return {server} to the pool; if {discard} is set, the connection is closed instead of
+        being made available to the next user
+        """
+        # the connections to close
+        closing = []
+        # with exclusive access to my state
+        with self._lock:
+            # bring the statistics up to date
+            self._advance()
+            # if the connection isn't one of mine
+            if self._busy.pop(id(server), None) is None:
+                # complain
+                raise self.InterfaceError(description="the connection is not checked out")
+            # if it's not to be reused, or i have been shut down
+            if discard or self._closed:
+                # give up its spot
+                self._size -= 1
+                # close it
+                closing.append(server)
+                # and update the statistics, unless it was healthy
+                if discard: self.statistics.discarded += 1
+            # otherwise
+            else:
+                # make it available
+                self._idle.append((server, time.monotonic()))
+            # look for connections that have been idle too long
+            closing.extend(self._expired())
+            # let a waiting user know
+            self._lock.notify()
+        # close the connections outside the lock
+        for connection in closing: self.close(connection)
+        # all done
+        return
+
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        """
+        Check out a connection for the duration of a {with} block
+
+        Connections are returned to the pool when the block is done, unless an
+        {OperationalError} escapes from it, in which case they are assumed to be broken and
+        are closed
+        """
+        # get a connection
+        server = self.checkout(timeout=timeout)
+        # carefully
+        try:
+            # hand it over
+            yield server
+        # if the connection failed
+        except self.OperationalError:
+            # close it
+            self.checkin(server=server, discard=True)
+            # and let the caller know
+            raise
+        # for any other reason
+        except BaseException:
+            # return it to the pool
+            self.checkin(server=server)
+            # and let the exception through
+            raise
+        # if all went well
+        else:
+            # return it to the pool
+            self.checkin(server=server)
+        # all done
+        return
+
+
+    def fill(self):
+        """
+        Open enough connections to have at least {minimum} of them
+        """
+        # until there are enough connections
+        while True:
+            # with exclusive access to my state
+            with self._lock:
+                # if i have been shut down
+                if self._closed:
+                    # complain
+                    raise self.InterfaceError(description="the pool is shut down")
+                # if there are enough of them
+                if self._size >= min(self.minimum, self.maximum):
+                    # we are done
+                    return self
+                # otherwise, reserve a spot
+                self._advance()
+                self._size += 1
+            # carefully
+            try:
+                # make a connection
+                server = self.connect()
+            # if anything goes wrong
+            except Exception:
+                # with exclusive access to my state
+                with self._lock:
+                    # give up the spot
+                    self._advance()
+                    self._size -= 1
+                # and complain
+                raise
+            # with exclusive access to my state
+            with self._lock:
+                # if i was shut down while the connection was being made
+                if self._closed:
+                    # give up its spot
+                    self._advance()
+                    self._size -= 1
+                # otherwise
+                else:
+                    # make it available
+                    self._idle.append((server, time.monotonic()))
+                    # let a waiting user know
+                    self._lock.notify()
+                    # and move on
+                    continue
+            # close the connection outside the lock
+            self.close(server)
+
+
+    def evict(self):
+        """
+        Close the connections that have been idle for more than {idle} seconds, as long as
+        there are at least {minimum} of them left; return the number of connections closed
+        """
+        # with exclusive access to my state
+        with self._lock:
+            # bring the statistics up to date
+            self._advance()
+            # find the connections to close
+            closing = self._expired()
+        # close them outside the lock
+        for server in closing: self.close(server)
+        # and report
+        return len(closing)
+
+
+    def shutdown(self):
+        """
+        Close all idle connections and refuse any further checkouts; the connections in use
+        are closed when they are returned
+        """
+        # with exclusive access to my state
+        with self._lock:
+            # bring the statistics up to date
+            self._advance()
+            # mark me as shut down
+            self._closed = True
+            # let the waiting users know
+            self._lock.notify_all()
+            # grab the idle connections
+            closing = [ server for server, _ in self._idle ]
+            # forget them
+            self._idle.clear()
+            self._size -= len(closing)
+        # close them outside the lock
+        for server in closing: self.close(server)
+        # all done
+        return
+
+
+    @property
+    def size(self):
+        """
+        The number of open connections
+        """
+        # easy enough
+        return self._size
+
+
+    @property
+    def busy(self):
+        """
+        The number of connections in use
+        """
+        # easy enough
+        return len(self._busy)
+
+
+    # implementation details
+    def connect(self):
+        """
+        Make a new connection configured like {server}
+        """
+        # get the template
+        template = self.server
+        # with exclusive access to my state
+        with self._lock:
+            # make up a unique name
+            self._serial += 1
+            name = "{}.connection.{}".format(self.pyre_name or "pyre.db.pool", self._serial)
+        # make a new instance of the server component
+        server = type(template)(name=name)
+        # give it the configuration of the template
+        for trait in template.pyre_configurables():
+            setattr(server, trait.name, getattr(template, trait.name))
+        # connect it
+        server.attach()
+        # update the statistics
+        with self._lock: self.statistics.created += 1
+        # and return it
+        return server
+
+
+    def close(self, server):
+        """
+        Close the connection to {server}, ignoring any errors
+        """
+        # carefully
+        try:
+            # disconnect
+            server.detach()
+        # if anything goes wrong
+        except Exception:
+            # there's nothing more to do
+            pass
+        # all done
+        return
+
+
+    def healthy(self, server):
+        """
+        Check whether {server} is still usable
+        """
+        # carefully
+        try:
+            # run the probe
+            server.execute(self.probe)
+        # if anything goes wrong
+        except Exception:
+            # it's not
+            return False
+        # otherwise, it is
+        return True
+
+
+    def _expired(self):
+        """
+        Remove from the idle pile the connections that have been idle too long; must be called
+        while holding the lock
+        """
+        # the cutoff
+        cutoff = time.monotonic() - self.idle
+        # the connections that can go, oldest first
+        expired = []
+        # as long as there are more than the minimum and the oldest one is too old
+        while self._idle and self._size > self.minimum and self._idle[0][1] < cutoff:
+            # retire it
+            server, _ = self._idle.pop(0)
+            self._size -= 1
+            # and add it to the pile
+            expired.append(server)
+        # update the statistics
+        self.statistics.evicted += len(expired)
+        # and return the connections to close
+        return expired
+
+
+    def _advance(self):
+        """
+        Integrate the number of busy and open connections up to now; must be called while
+        holding the lock, before the numbers change
+        """
+        # get the time
+        now = time.monotonic()
+        # and the time since the last update
+        elapsed = now - self._stamp
+        # update the integrals
+        self.statistics.busy += elapsed * len(self._busy)
+        self.statistics.open += elapsed * self._size
+        # and the timestamp
+        self._stamp = now
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the guard of my state
+        self._lock = threading.Condition()
+        # the idle connections, along with the time they were returned, oldest first
+        self._idle = []
+        # the connections in use, indexed by their identity
+        self._busy = {}
+        # the number of open connections, including the ones being made
+        self._size = 0
+        # the number of connections ever made, for naming them
+        self._serial = 0
+        # whether the minimum number of connections have been opened
+        self._filled = False
+        # whether i have been shut down
+        self._closed = False
+        # the usage statistics
+        self.statistics = self.metrics()
+        # and the time they were last updated
+        self._stamp = time.monotonic()
+        # all done
+        return
+
+
+# end of file
@@ -10,6 +10,8 @@
 import pyre
 # superclass
 from .Server import Server
+# the codec of bulk transfers
+from .Copy import Copy
 
 
 # declaration
@@ -19,7 +21,11 @@ class Postgres(Server, family="pyre.db.server.postgres"):
     """
 
     # exceptions
-    from pyre.db.exceptions import OperationalError
+    from pyre.db.exceptions import InterfaceError, OperationalError
+
+
+    # constants
+    providesParameters = True # the extension binds statement parameters
 
 
     # public state
@@ -38,6 +44,9 @@ class Postgres(Server, family="pyre.db.server.postgres"):
     quiet = pyre.properties.bool(default=True)
     quiet.doc = "control whether certain postgres informationals are shown"
 
+    binary = pyre.properties.bool(default=False)
+    binary.doc = "retrieve streamed query results in binary form and convert them by type"
+
 
     # interface
     @pyre.export
@@ -62,6 +71,10 @@ class Postgres(Server, family="pyre.db.server.postgres"):
 
         # establish the connection
         self.connection = self.postgres.connect(spec)
+        # prepared statements belong to the session, so start with none
+        self._prepared = {}
+        # and there are no results streaming in yet
+        self._streaming = None
 
         # if the user asked for {quiet} operation
         if self.quiet:
@@ -88,6 +101,8 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         status = self.postgres.disconnect(self.connection)
         # invalidate the member
         self.connection = None
+        # along with anything that was streaming through it
+        self._streaming = None
 
         # and return the status
         return status
@@ -98,10 +113,231 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         """
         Execute the sequence of SQL statements in {sql} as a single command
         """
+        # make sure the connection is not busy
+        self.guard()
         # assemble the command and pass it on to the connection
         return self.postgres.execute(self.connection, "\n".join(sql))
 
 
+    @pyre.export
+    def executemany(self, sql, rows):
+        """
+        Execute the parameterized SQL statement {sql} once for each tuple of values in {rows}
+        """
+        # make sure the connection is not busy
+        self.guard()
+        # get the name under which the statement is prepared
+        name = self.prepare(sql)
+        # the extension pulls the rows from {rows} as it needs them, and sends them in pipelined
+        # batches
+        return self.postgres.executemany(self.connection, sql, rows, name)
+
+
+    @pyre.export
+    def fetch(self, *sql, parameters=None):
+        """
+        Execute the sequence of SQL statements in {sql} and generate the rows of the result;
+        if {parameters} is not {None}, it holds the values of the statement parameters
+
+        The server sends the rows as they are produced, and they are retrieved {batch} at a
+        time, so the memory footprint does not depend on the size of the result. If {binary}
+        is set, the values arrive in binary form and are converted according to their types;
+        otherwise they are strings, as with {execute}. Parameterized statements are prepared
+        once per session
+
+        While the rows are streaming in, the connection can't be used for anything else: any
+        other statement raises an {InterfaceError} until the rows are exhausted or the
+        generator is closed. Use a different connection, or collect the rows first, in order
+        to issue statements while iterating over the results of a query
+        """
+        # the size of the batches
+        batch = max(1, self.batch)
+        # assemble the command
+        command = "\n".join(sql)
+        # make sure the connection is not busy
+        self.guard()
+        # if there are no parameters
+        if parameters is None:
+            # submit the query
+            self.postgres.stream(self.connection, command, batch, self.binary)
+        # otherwise
+        else:
+            # get the name under which the statement is prepared
+            name = self.prepare(command)
+            # and submit the query
+            self.postgres.stream(self.connection, command, batch, self.binary, parameters, name)
+        # the connection is now busy
+        self._streaming = command
+        # the value converters, indexed by the column types
+        converters = {}
+        # the marker of {NULL}
+        from . import null
+        # carefully
+        try:
+            # retrieve the rows a batch at a time
+            for types, rows in iter(lambda: self.postgres.fetch(self.connection, batch), None):
+                # if the values are strings
+                if not self.binary:
+                    # hand them over
+                    yield from rows
+                    # and get the next batch
+                    continue
+                # otherwise, look up the converters for these types
+                try:
+                    decoders = converters[types]
+                # if they aren't there
+                except KeyError:
+                    # build them
+                    decoders = converters[types] = tuple(map(self.copy.typeDecoder, types))
+                # go through the rows
+                for row in rows:
+                    # convert the values and hand them over
+                    yield tuple(
+                        value if value is null else decode(value)
+                        for decode, value in zip(decoders, row))
+        # either way
+        finally:
+            # attempt to
+            try:
+                # drain whatever is left, so the connection is usable again even if the caller
+                # stopped early, or something went wrong while the rows were being processed
+                for _ in iter(lambda: self.postgres.fetch(self.connection, batch), None): pass
+            # no matter what
+            finally:
+                # the connection is no longer busy
+                self._streaming = None
+        # all done
+        return
+
+
+    # bulk transfers
+    def load(self, table, records, fields=None, binary=False):
+        """
+        Stream {records} into {table} using {COPY}; return the number of rows loaded
+
+        The {records} can be any iterable of rows whose values are in the order of {fields},
+        which defaults to all the fields of {table}; this includes instances of {table}, the
+        record generators of {pyre.records.csv}, and plain tuples. Worksheets from
+        {pyre.tabular} are matched to {table} by field name. The records are encoded and sent
+        a chunk at a time, so they don't have to fit in memory. Since {COPY} can't leave out
+        individual values, the {default} marker is replaced by the default of its field
+        """
+        # access the worksheets
+        from .. import tabular
+        # if {records} is a worksheet
+        if isinstance(records, tabular.sheet):
+            # match its fields to mine
+            fields, records = self.copy.match(table=table, sheet=records)
+        # otherwise
+        else:
+            # normalize the field selection
+            fields = self.copy.select(table=table, fields=fields)
+        # build the statement
+        sql = "\n".join(self.copy.copyFrom(table=table, fields=fields, binary=binary))
+        # encode the records
+        chunks = self.copy.encode(fields=fields, rows=records, binary=binary)
+        # make sure the connection is not busy
+        self.guard()
+        # and stream them to the server
+        return self.postgres.copyIn(self.connection, sql, chunks)
+
+
+    def export(self, table, fields=None, binary=False):
+        """
+        Stream the rows of {table} from the server using {COPY}
+
+        Generate a tuple with the values of {fields}, which defaults to all the fields of
+        {table}, for each row; {NULL} becomes {None}
+        """
+        # normalize the field selection
+        fields = self.copy.select(table=table, fields=fields)
+        # build the statement
+        sql = "\n".join(self.copy.copyTo(table=table, fields=fields, binary=binary))
+        # make sure the connection is not busy
+        self.guard()
+        # start the transfer
+        self.postgres.copyOut(self.connection, sql)
+        # the connection is now busy
+        self._streaming = sql
+        # get the data as they arrive
+        chunks = self.chunks()
+        # carefully
+        try:
+            # decode them
+            yield from self.copy.decode(fields=fields, chunks=chunks, binary=binary)
+        # either way
+        finally:
+            # attempt to
+            try:
+                # drain whatever is left, so the connection is usable again even if the caller
+                # stopped early
+                for _ in chunks: pass
+            # no matter what
+            finally:
+                # the connection is no longer busy
+                self._streaming = None
+        # all done
+        return
+
+
+    def chunks(self):
+        """
+        Retrieve the data of a {COPY TO} command as they arrive
+        """
+        # until the end of the data
+        while True:
+            # get the next chunk
+            chunk = self.postgres.copyData(self.connection)
+            # if there isn't one
+            if chunk is None:
+                # we are done
+                return
+            # otherwise, hand it over
+            yield chunk
+
+
+    def prepare(self, sql):
+        """
+        Prepare the parameterized statement {sql}, unless it has been prepared already in this
+        session; return the name under which it is prepared
+        """
+        # look up the name under which the statement was prepared
+        name = self._prepared.get(sql)
+        # if this is the first time it's been seen in this session
+        if name is None:
+            # make up a name
+            name = "pyre_{}".format(len(self._prepared))
+            # prepare it, so the server parses and plans it only once per session
+            self.postgres.prepare(self.connection, name, sql)
+            # and remember it
+            self._prepared[sql] = name
+        # all done
+        return name
+
+
+    def guard(self):
+        """
+        Make sure my connection is not busy streaming the results of an earlier statement
+        """
+        # if it is
+        if self._streaming is not None:
+            # complain
+            raise self.InterfaceError(
+                description=(
+                    "the connection is busy streaming the results of {!r}; exhaust or close "
+                    "that iterator first, or use another connection").format(self._streaming))
+        # all done
+        return self
+
+
+    def placeholder(self, index):
+        """
+        Build the marker of the statement parameter at {index}
+        """
+        # postgres numbers its parameters, starting with one
+        return "${}".format(index+1)
+
+
     # meta methods
     def __new__(cls, **kwds):
         # if necessary
@@ -144,6 +380,9 @@ class Postgres(Server, family="pyre.db.server.postgres"):
     # implementation details
     postgres = None # the handle to the extension module
     connection = None # the handle to the session with the back-end
+    copy = Copy() # the codec of bulk transfers
+    _prepared = None # the names of the statements prepared in the current session
+    _streaming = None # the statement whose results are streaming in, if any
 
 
     # helper routine to initialize the extension module
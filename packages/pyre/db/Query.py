@@ -25,6 +25,7 @@ class Query(records.record, hidden=True, metaclass=Selector):
 
     # metaclass decorations; treat as read-only
     pyre_tables = {} # a map of local names to referenced tables
+    pyre_statements = {} # compiled statements, indexed by the server that built them
 
 
 # end of file
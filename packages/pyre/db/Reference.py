@@ -26,6 +26,15 @@ class Reference(Measure):
         return self.referent.decl
 
 
+    @property
+    def adapter(self):
+        """
+        The conversion of values into statement parameters
+        """
+        # my referent knows
+        return self.referent.adapter
+
+
     # interface
     def sql(self, value):
         """
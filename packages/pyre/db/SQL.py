@@ -8,6 +8,8 @@
 
 # iterator tools
 import itertools
+# so compiling statements is thread safe
+import threading
 # so i can check for sequences
 import collections
 # my base class
@@ -32,13 +34,21 @@ class SQL(Mill, family="pyre.db.sql"):
     # the base classes for tables and queries
     from .Table import Table as table
     from .Query import Query as query
+    # statement parameters
+    from .expressions import Parameter as parameter
 
 
     # queries
-    def select(self, query):
+    def select(self, query, placeholder=None, parameters=None):
         """
         Generate the SELECT statement described by {query}
+
+        If {parameters} is a list, the statement parameters in the {where} clause are replaced
+        by the markers built by {placeholder}, and their names are added to {parameters} in
+        the order their values are bound; otherwise, they are rendered by name
         """
+        # the state of the rendering of statement parameters, if any
+        bindings = {"placeholder": placeholder, "parameters": parameters}
         # start
         yield "SELECT"
         # prepare to render the field projection
@@ -113,7 +123,7 @@ class SQL(Mill, family="pyre.db.sql"):
                 # push out
                 self.outdent()
                 # build the filtering expression
-                predicate = self.expression(root=query.where, context=query)
+                predicate = self.expression(root=query.where, context=query, **bindings)
                 # render the {WHERE} marker
                 yield self.place("WHERE")
                 # push in
@@ -136,7 +146,8 @@ class SQL(Mill, family="pyre.db.sql"):
                 # push in
                 self.indent()
                 # build the collation expression
-                collation = (self.expression(root=spec, context=query) for spec in order)
+                collation = (
+                    self.expression(root=spec, context=query, **bindings) for spec in order)
                 # and render it
                 yield self.place("{};".format(", ".join(collation)))
 
@@ -149,6 +160,24 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
+    def compile(self, query, placeholder):
+        """
+        Render the SELECT statement described by {query} with its parameters replaced by the
+        markers built by {placeholder}, a callable that takes the index of a parameter; return
+        the statement and the names of the parameters in the order their values are bound
+        """
+        # make a pile for the parameter names; it is local to this call, since the mill may be
+        # shared by connections in different threads
+        names = []
+        # the indentation level is mine, though, so render the statement while holding my lock
+        with self._lock:
+            # render the statement
+            sql = "\n".join(
+                self.select(query=query, placeholder=placeholder, parameters=names))
+        # return the statement and the binding plan
+        return sql, tuple(names)
+
+
     # transaction support
     def transaction(self):
         """
@@ -366,6 +395,40 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
+    def insertTemplate(self, table, fields, placeholder):
+        """
+        Build a statement that inserts a single row into {table}, with the values of {fields}
+        supplied as statement parameters; the rest of the fields get their default values
+
+        The database driver decides how parameters are marked in the statement text;
+        {placeholder} is a callable that builds the marker of a parameter given its index
+        """
+        # if there are no fields with values
+        if not fields:
+            # all of them get their defaults
+            yield self.place("INSERT INTO {} DEFAULT VALUES;".format(table.pyre_name))
+            # all done
+            return
+        # otherwise, initiate the statement
+        yield self.place("INSERT INTO {}".format(table.pyre_name))
+        # indent
+        self.indent(increment=2)
+        # the field names in declaration order
+        yield self.place("({})".format(", ".join(field.name for field in fields)))
+        # start the section with the values
+        self.outdent()
+        yield self.place("VALUES")
+        # further in
+        self.indent()
+        # render the placeholders
+        yield self.place("({});".format(
+                ", ".join(placeholder(index) for index in range(len(fields)))))
+        # bounce out to top level
+        self.outdent(decrement=2)
+        # all done
+        return
+
+
     def deleteRecords(self, table, condition):
         """
         Remove all {table} records that match {condition}
@@ -476,12 +539,34 @@ class SQL(Mill, family="pyre.db.sql"):
         self._renderers[cast] = self._primitiveSQLExpressionRenderer
         self._renderers[like] = self._primitiveSQLExpressionRenderer
 
+        # the guard of my indentation level while statements are compiled
+        self._lock = threading.RLock()
+
         # all done
         return
 
 
     # implementation details
-    def _collationRenderer(self, order, context=None, **kwds):
+    def _literalRenderer(self, node, placeholder=None, parameters=None, **kwds):
+        """
+        Render {node} as a literal, unless it is a statement parameter
+        """
+        # get the value of the node
+        value = node._value
+        # if it is not a parameter, or there is no statement being compiled
+        if not isinstance(value, self.parameter) or parameters is None:
+            # render it normally
+            return super()._literalRenderer(node, **kwds)
+        # otherwise, build the marker of the parameter
+        marker = placeholder(len(parameters))
+        # add its name to the binding plan
+        parameters.append(value.name)
+        # and return the marker
+        return marker
+
+
+    def _collationRenderer(self, order, context=None, placeholder=None, parameters=None,
+                           **kwds):
         """
         Render the collation order specification
         """
@@ -489,7 +574,8 @@ class SQL(Mill, family="pyre.db.sql"):
         return order.sql(context=context, **kwds)
 
 
-    def _fieldReferenceRenderer(self, node, context=None, **kwds):
+    def _fieldReferenceRenderer(self, node, context=None, placeholder=None, parameters=None,
+                                **kwds):
         """
         Render {node} as reference to a field
         """
@@ -497,7 +583,8 @@ class SQL(Mill, family="pyre.db.sql"):
         return node.sql(context=context, **kwds)
 
 
-    def _primitiveSQLExpressionRenderer(self, node, context=None, **kwds):
+    def _primitiveSQLExpressionRenderer(self, node, context=None, placeholder=None,
+                                        parameters=None, **kwds):
         """
         Render {node} as a unary postfix operator
         """
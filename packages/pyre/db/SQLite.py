@@ -22,6 +22,7 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
 
     # constants
     providesHeaders = False # sqlite queries do not return column headers
+    providesParameters = True # the driver binds statement parameters
 
 
     # public state
@@ -37,8 +38,9 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         """
         # if i have an existing connection to the database, do nothing
         if self.connection is not None: return
-        # otherwise, make a connection
-        self.connection = sqlite3.connect(self.database)
+        # otherwise, make a connection; it may be handed from one thread to another, e.g. by a
+        # connection pool, but it is never used by more than one thread at a time
+        self.connection = sqlite3.connect(self.database, check_same_thread=False)
         # and a cursor
         self.cursor = self.connection.cursor()
         # and return
@@ -74,6 +76,44 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         return self.cursor
 
 
+    @pyre.export
+    def executemany(self, sql, rows):
+        """
+        Execute the parameterized SQL statement {sql} once for each tuple of values in {rows}
+        """
+        # hand the statement and the rows to my cursor; it compiles the statement once
+        self.cursor.executemany(sql, rows)
+        # return the cursor
+        return self.cursor
+
+
+    @pyre.export
+    def fetch(self, *sql, parameters=None):
+        """
+        Execute the sequence of SQL statements in {sql} and generate the rows of the result;
+        if {parameters} is not {None}, it holds the values of the statement parameters
+        """
+        # assemble the statement
+        statement = '\n'.join(sql)
+        # use a cursor of its own, so other statements can be executed while the rows are
+        # retrieved; sqlite keeps the statements it has parsed in a cache of its own
+        cursor = (
+            self.connection.execute(statement) if parameters is None
+            else self.connection.execute(statement, parameters))
+        # carefully
+        try:
+            # retrieve the rows a batch at a time
+            for rows in iter(lambda: cursor.fetchmany(self.batch), []):
+                # and hand them over
+                yield from rows
+        # either way
+        finally:
+            # release the cursor
+            cursor.close()
+        # all done
+        return
+
+
     # implementation details
     cursor = None
     connection = None
@@ -62,6 +62,8 @@ class Schemer(records.templater):
         table._pyre_foreignKeys = foreign
         # save my constraints
         table._pyre_constraints = constraints
+        # make room for the statements compiled from me
+        table.pyre_statements = {}
 
         # and return the table record
         return table
@@ -74,6 +74,10 @@ class Selector(records.templater):
         # if this is an internal class, do no more
         if hidden: return query
 
+        # make room for the statements compiled from this query; they are not inherited, since
+        # subclasses can change the projection and the clauses
+        query.pyre_statements = {}
+
         # pile of tables referenced by this query
         tables = {}
 
@@ -7,6 +7,8 @@
 
 
 # packages
+import itertools
+import operator
 import pyre
 import pyre.weaver
 from . import datastore, sql
@@ -30,12 +32,16 @@ class Server(pyre.component, implements=datastore):
 
     # constants
     providesHeaders = True
+    providesParameters = False # whether {executemany} can bind statement parameters
 
 
     # traits
     sql = pyre.weaver.language(default=sql)
     sql.doc = "the generator of the SQL statements"
 
+    batch = pyre.properties.int(default=1024)
+    batch.doc = "the number of rows of a query result to retrieve from the server at a time"
+
 
     # required interface
     @pyre.export
@@ -64,6 +70,36 @@ class Server(pyre.component, implements=datastore):
             "class {.__name__!r} must override 'execute'".format(type(self)))
 
 
+    @pyre.export
+    def executemany(self, sql, rows):
+        """
+        Execute the parameterized SQL statement {sql} once for each tuple of values in {rows}
+        """
+        raise NotImplementedError(
+            "class {.__name__!r} must override 'executemany'".format(type(self)))
+
+
+    @pyre.export
+    def fetch(self, *sql, parameters=None):
+        """
+        Execute the sequence of SQL statements in {sql} and generate the rows of the result;
+        if {parameters} is not {None}, it holds the values of the statement parameters
+        """
+        # if there are parameters
+        if parameters is not None:
+            # i don't know how to bind them
+            raise self.exceptions.NotSupportedError(
+                description="{.__name__!r} can't bind statement parameters".format(type(self)))
+        # execute the statements
+        results = iter(self.execute(*sql))
+        # skip the headers, if the server provides them
+        if self.providesHeaders: next(results)
+        # and hand over the rows
+        yield from results
+        # all done
+        return
+
+
     # convenience
     def createDatabase(self, name):
         """
@@ -108,13 +144,122 @@ class Server(pyre.component, implements=datastore):
     def insert(self, *records):
         """
         Insert {records} into the database
+
+        Records are grouped by table and by the fields that have values other than {DEFAULT},
+        wherever they appear in {records}; each group is inserted by executing a single
+        parameterized statement once per record, so the database back end parses and plans it
+        only once. The groups are inserted in the order in which their first record appears.
+        Servers that can't bind statement parameters get the records rendered into the text of
+        the statement
         """
         # if there are no records to insert, bail
         if not records: return
-        # build the sql statements
-        sql = self.sql.insertRecords(*records)
-        # and execute
-        return self.execute(*sql)
+        # if i can't bind parameters
+        if not self.providesParameters:
+            # build the sql statements
+            sql = self.sql.insertRecords(*records)
+            # and execute
+            return self.execute(*sql)
+
+        # otherwise, sort the records into groups with the same layout
+        groups = {}
+        # go through the records
+        for record in records:
+            # and add each one to the group of its layout
+            groups.setdefault(self.layout(record), []).append(record)
+        # go through the groups
+        for (table, mask), group in groups.items():
+            # get the fields that have values and the statement that inserts them
+            fields, sql = self.template(table=table, mask=mask)
+            # convert the records into rows of parameters
+            rows = self.parameters(table=table, fields=fields, mask=mask, records=group)
+            # and insert them
+            result = self.executemany(sql, rows)
+        # all done
+        return result
+
+
+    def placeholder(self, index):
+        """
+        Build the marker of the statement parameter at {index}
+        """
+        # the marker from the python database api standard
+        return "?"
+
+
+    def template(self, table, mask):
+        """
+        Build, or retrieve from my cache, the statement that inserts a row into {table} with
+        the values of the fields selected by {mask} as parameters; return the selected fields
+        and the statement
+        """
+        # build the key
+        key = (table, mask)
+        # attempt to
+        try:
+            # look up the statement
+            return self._templates[key]
+        # if it's not there
+        except KeyError:
+            # move on
+            pass
+        # get the fields
+        fields = tuple(itertools.compress(table.pyre_fields, mask))
+        # build the statement
+        sql = "\n".join(
+            self.sql.insertTemplate(table=table, fields=fields, placeholder=self.placeholder))
+        # cache them
+        self._templates[key] = fields, sql
+        # and return them
+        return fields, sql
+
+
+    def parameters(self, table, fields, mask, records):
+        """
+        Convert the values of the {fields} selected by {mask} in each of the {records} of
+        {table} into a row of statement parameters
+
+        The rows are generated on demand, so the driver can consume them as it goes, without
+        all of them having to be in memory at the same time
+        """
+        # the marker for {NULL}
+        null = table.null
+        # the fields whose values need conversion, and their adapters
+        adapters = [
+            (index, field.adapter) for index, field in enumerate(fields)
+            if field.adapter is not None ]
+        # if all fields are selected, there's no need to filter the values
+        select = (lambda record: record) if all(mask) else (
+            lambda record: itertools.compress(record, mask))
+        # go through the records
+        for record in records:
+            # get the values
+            values = list(select(record))
+            # if any of them are {NULL}
+            if any(map(operator.is_, values, itertools.repeat(null))):
+                # replace them with the marker the drivers understand
+                values = [ None if value is null else value for value in values ]
+            # convert the values that need it
+            for index, adapter in adapters:
+                # unless they are {NULL}
+                value = values[index]
+                if value is not None: values[index] = adapter(value)
+            # hand the row over
+            yield values
+        # all done
+        return
+
+
+    @staticmethod
+    def layout(record):
+        """
+        Identify the table of {record} and the fields that have values other than {DEFAULT}
+        """
+        # get the table
+        table = record.pyre_layout
+        # build the key; the values are compared by identity, since their equality operators
+        # build expressions
+        return table, tuple(map(operator.is_not, record, itertools.repeat(table.default)))
 
 
     def update(self, *specifications):
@@ -146,28 +291,91 @@ class Server(pyre.component, implements=datastore):
         return self.execute(*sql)
 
 
-    def select(self, query):
+    def select(self, query, **parameters):
         """
-        Execute the given {query} and return the retrieved data
-        """
-        # build the sql statements
-        sql = self.sql.select(query=query)
-        # execute them
-        results = iter(self.execute(*sql))
+        Execute the given {query} and return the retrieved data; the values of the parameters
+        in its {where} clause are supplied by name in {parameters}
 
-        # get the headers, if the server provides them; ignore them, for now, since the order
-        # of the results matches exactly the field order, by construction
-        if self.providesHeaders: headers = next(results)
-
-        # for each row with actual data
-        for row in results:
+        The statement is compiled the first time {query} is executed by a server of my kind,
+        and cached with {query}, so subsequent executions only bind the parameter values. The
+        rows are retrieved as they are needed; servers that stream them, such as {postgres},
+        can't execute other statements until they are exhausted or the generator is closed
+        """
+        # get the statement and its binding plan
+        sql, names = self.compile(query=query)
+        # bind the parameter values, if there are any
+        values = self.bind(names=names, parameters=parameters) if names else None
+        # execute the statement and retrieve the rows as they are needed; there are no headers
+        # to worry about, since the order of the results matches exactly the field order, by
+        # construction
+        for row in self.fetch(sql, parameters=values):
             # build a named tuple
             yield query.pyre_immutable(data=row)
         # all done
         return
 
 
+    def compile(self, query):
+        """
+        Build, or retrieve from the cache of {query}, the statement that retrieves its rows;
+        return the statement and the names of its parameters in the order they are bound
+
+        Statements are cached with the query class, indexed by the kinds of server and SQL
+        generator that built them; changes to the declaration of {query} after it has been
+        compiled are not noticed, unless its {pyre_statements} are cleared
+        """
+        # build the key
+        key = (type(self), type(self.sql))
+        # attempt to
+        try:
+            # look up the statement
+            return query.pyre_statements[key]
+        # if it's not there
+        except KeyError:
+            # move on
+            pass
+        # render the statement
+        statement = self.sql.compile(query=query, placeholder=self.placeholder)
+        # cache it, unless another thread got there first, so everybody uses the same one
+        return query.pyre_statements.setdefault(key, statement)
+
+
+    def bind(self, names, parameters):
+        """
+        Look up in {parameters} the value of each of the statement parameters in {names}
+        """
+        # the marker for {NULL}
+        from . import null
+        # the names of the parameters that have no values
+        missing = [ name for name in names if name not in parameters ]
+        # if there are any
+        if missing:
+            # complain
+            raise self.exceptions.InterfaceError(
+                description="missing values for the query parameters {}".format(
+                    ", ".join(map(repr, missing))))
+        # the ones that are not used
+        extra = [ name for name in parameters if name not in names ]
+        # if there are any
+        if extra:
+            # complain
+            raise self.exceptions.InterfaceError(
+                description="unknown query parameters {}".format(", ".join(map(repr, extra))))
+        # collect the values in binding order, with {NULL} replaced by the driver marker
+        return tuple(
+            None if parameters[name] is null else parameters[name] for name in names)
+
+
     # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the cache of parameterized insert statements
+        self._templates = {}
+        # all done
+        return
+
+
     # context manager support
     def __enter__(self):
         """
@@ -77,6 +77,8 @@ class Table(records.record, metaclass=Schemer):
     _pyre_uniqueFields = None
     _pyre_foreignKeys = None
     _pyre_constraints = None
+    # the compiled statements that retrieve my rows, indexed by the server that built them
+    pyre_statements = None
 
 
 # end of file
@@ -41,6 +41,7 @@ from .expressions import (
     IsNotNull as isNotNull,
     Cast as cast,
     Like as like,
+    Parameter as parameter,
     )
 
 # field declarations
@@ -76,6 +77,8 @@ from .Client import Client as client
 from .Backup import Backup as backup
 from .SQLite import SQLite as sqlite
 from .Postgres import Postgres as postgres
+# connection pools
+from .Pool import Pool as pool
 
 
 # templates: table rows with all fields set to None; used to update table entries
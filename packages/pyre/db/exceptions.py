@@ -56,6 +56,24 @@ class OperationalError(DatabaseError):
     """
 
 
+class PoolTimeoutError(OperationalError):
+    """
+    Exception raised when no connection becomes available in a pool within the allotted time
+    """
+
+    # public data
+    description = "no connection became available within {0.timeout} seconds"
+
+    # meta-methods
+    def __init__(self, timeout, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the error info
+        self.timeout = timeout
+        # all done
+        return
+
+
 class IntegrityError(DatabaseError):
     """
     Exception raised when an operation violates the referential integrity of the data store
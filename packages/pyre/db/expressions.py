@@ -101,4 +101,31 @@ class Like:
         return
 
 
+# statement parameters
+class Parameter:
+    """
+    A placeholder for a value that is supplied when the statement is executed
+
+    Parameters can appear in the {where} clause of queries; compiled statements replace them
+    with the markers of the database driver, and bind their values by name
+    """
+
+    # interface
+    def sql(self, **kwds):
+        """
+        SQL rendering of the expression I represent
+        """
+        # render as a named parameter
+        return ":{}".format(self.name)
+
+    # meta-methods
+    def __init__(self, name, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my name
+        self.name = name
+        # all done
+        return
+
+
 # end of file
@@ -6,10 +6,14 @@
 #
 
 
+# externals
+import time
+
+
 # declaration
 class InfoZip:
     """
-    Mixin that knows how to pull information from {stat} structures
+    Mixin that knows how to pull information from {zipfile.ZipInfo} structures
     """
 
     # meta methods
@@ -18,6 +22,10 @@ class InfoZip:
         super().__init__(**kwds)
         # save the metadata
         self.info = info
+        # file attributes
+        self.size = info.file_size
+        # timestamps; the archive records them in local time, with no daylight savings hint
+        self.modificationTime = time.mktime(info.date_time + (0, 0, -1))
         # all done
         return
 
@@ -27,15 +27,17 @@ class Zip(Filesystem):
 
 
     # interface
-    def open(self, node, **kwds):
+    def open(self, node, mode='r', **kwds):
         """
         Open the file associate with {node}
         """
         # get the node metadata
         metadata = self.vnodes[node]
-        # and call the {zipfile} file factory, which accepts {ZipInfo} instances as well as
-        # archive data members
-        return self.zipfile.open(metadata.info, **kwds)
+        # archive members are always binary, and the {zipfile} file factory doesn't understand
+        # the binary mode flag
+        mode = mode.replace('b', '')
+        # call the factory, which accepts {ZipInfo} instances as well as archive data members
+        return self.zipfile.open(metadata.info, mode=mode, **kwds)
 
 
     def discover(self, root=None, **kwds):
@@ -6,6 +6,10 @@
 #
 
 
+# externals
+from .Discovered import Discovered
+
+
 # declaration
 class Dashboard:
     """
@@ -29,9 +33,9 @@ class Dashboard:
     pyre_registrar = None # the component registrar
     pyre_schema = None # the database schema
 
-    # information about the runtime environment
-    pyre_host = None # the current host
-    pyre_user = None # the current user
+    # information about the runtime environment; discovered on first access
+    pyre_host = Discovered() # the current host
+    pyre_user = Discovered() # the current user
     pyre_application = None # the current application
 
 
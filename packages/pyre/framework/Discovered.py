@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# declaration
+class Discovered:
+    """
+    Descriptor for the parts of the runtime environment that the executive builds when it
+    discovers the host, such as the host itself, the user and the terminal
+
+    The first access triggers the discovery, which deposits the actual values in the executive
+    and attaches proxies to them to the dashboard, shadowing the descriptor. This makes it
+    possible to skip discovery entirely for processes that never ask about the host.
+    """
+
+
+    # meta-methods
+    def __set_name__(self, client, name):
+        """
+        Record the class that owns me and the name i am bound to
+        """
+        # save both
+        self.client = client
+        self.name = name
+        # all done
+        return
+
+
+    def __get__(self, instance, cls):
+        """
+        Trigger the discovery of the runtime environment and return the value it built
+        """
+        # the dashboard holds a reference to the executive; everybody else is the executive
+        executive = getattr(self.client, 'pyre_executive', instance)
+        # if there is no executive, there is nothing to discover
+        if executive is None: return None
+        # make sure the discovery has taken place
+        executive.discover()
+        # the executive keeps the value among its attributes, the dashboard in its class record
+        store = vars(instance) if executive is instance else vars(self.client)
+        # look it up; if the discovery is still in progress, i'm still there
+        value = store.get(self.name)
+        # so be careful
+        return None if value is self else value
+
+
+    # private data
+    client = None
+    name = None
+
+
+# end of file
@@ -10,6 +10,8 @@
 import re, weakref, operator, itertools
 # primitives, locators
 from .. import primitives, tracking
+# the lazy parts of the runtime environment
+from .Discovered import Discovered
 
 
 #  the class declaration
@@ -42,11 +44,12 @@ class Executive:
     linker = None # the pyre plug-in manager
     timekeeper = None # the timer registry
 
-    # the runtime environment; patched during discovery
-    host = None
-    user = None
-    terminal = None
-    environ = None
+    # the runtime environment; patched during discovery, which happens on first access
+    host = Discovered()
+    user = Discovered()
+    terminal = Discovered()
+    environ = Discovered()
+    discovered = False # whether the runtime environment has been discovered
 
     # bookkeeping
     errors = None # the pile of exceptions raised during booting and configuration
@@ -499,6 +502,14 @@ class Executive:
         """
         Discover what is known about the runtime environment
         """
+        # if i have done this before
+        if self.discovered:
+            # nothing further to do
+            return self
+        # otherwise, mark me; discovery loads configuration files that may instantiate
+        # components that ask about the host before it is ready
+        self.discovered = True
+
         # grab my nameserver
         nameserver = self.nameserver
         # and my fileserver
@@ -518,8 +529,10 @@ class Executive:
         # attempt to load any matching configuration files
         self.configure(stem=stem, priority=self.priority.user, locator=here)
 
-        # set up an iterator over the map of known hosts, in priority order
-        knownHosts = nameserver.find(pattern=self.hostmapkey, key=operator.attrgetter('priority'))
+        # set up an iterator over the map of known hosts, in priority order; escape the key so
+        # the nameserver can restrict the search to the nodes under it
+        knownHosts = nameserver.find(
+            pattern=re.escape(self.hostmapkey), key=operator.attrgetter('priority'))
         # go through them
         for info, slot in knownHosts:
             # get the regular expression from the slot value
@@ -601,6 +614,10 @@ class Executive:
         """
         # my error pile is probably full of circular references
         self.errors = []
+        # if i have a linker
+        if self.linker is not None:
+            # let it save its state
+            self.linker.shutdown()
         # all done
         return self
 
@@ -49,6 +49,8 @@ class FileServer(Filesystem):
 
 
     # public data
+    generation = 0 # bumped every time my layout changes
+
     @property
     def systemFolders(self):
         """
@@ -179,6 +181,8 @@ class FileServer(Filesystem):
 
         # sign in
         # print("pyre.framework.FileServer:")
+        # the package contents are about to be explored, which may change my layout
+        self.generation += 1
         # get the package name
         name = package.name
         # show me
@@ -276,6 +280,16 @@ class FileServer(Filesystem):
 
 
     # implementation details
+    def _insert(self, **kwds):
+        """
+        Attach a node to my layout
+        """
+        # mark the change
+        self.generation += 1
+        # and chain up
+        return super()._insert(**kwds)
+
+
     def retrieveFilesystem(self, root, levels=1):
         """
         Retrieve {root} if it is an already mounted filesystem; if not, mount it and return it
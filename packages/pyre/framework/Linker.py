@@ -7,6 +7,7 @@
 
 
 # externals
+import os
 import collections
 
 
@@ -19,12 +20,14 @@ class Linker:
 
     # types
     from .exceptions import FrameworkError, ComponentNotFoundError, BadResourceLocatorError
+    from .ResolutionCache import ResolutionCache
     from ..schemata import uri
 
 
     # public data
     codecs = None
     shelves = None
+    resolutions = None # the memory of previous attempts to locate shelves
 
 
     # support for framework requests
@@ -130,6 +133,11 @@ class Linker:
         # save them
         self.codecs = codecs
         self.schemes = schemes
+        # build the resolution cache; it can remember failures across runs if the user
+        # points {PYRE_RESOLUTION_CACHE} to a file
+        self.resolutions = self.ResolutionCache(path=os.environ.get('PYRE_RESOLUTION_CACHE'))
+        # and seed it
+        self.resolutions.load(loaders=codecs)
 
         # go through the set of registered codecs
         for codec in codecs:
@@ -140,6 +148,16 @@ class Linker:
         return
 
 
+    def shutdown(self):
+        """
+        Save my resolution cache
+        """
+        # easy enough
+        self.resolutions.save(loaders=self.codecs)
+        # all done
+        return self
+
+
     # implementation details
     def indexDefaultCodecs(self):
         """
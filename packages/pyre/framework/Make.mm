@@ -12,6 +12,7 @@ PACKAGE = framework
 # the python modules
 EXPORT_PYTHON_MODULES = \
     Dashboard.py \
+    Discovered.py \
     Environ.py \
     Executive.py \
     FileServer.py \
@@ -20,6 +21,7 @@ EXPORT_PYTHON_MODULES = \
     Package.py \
     Priority.py \
     Pyre.py \
+    ResolutionCache.py \
     Schema.py \
     Slot.py \
     SlotInfo.py \
@@ -248,6 +248,111 @@ class NameServer(Hierarchical):
         return key, None, old
 
 
+    def insertBatch(self, assignments):
+        """
+        Add a batch of {assignments} to the store
+
+        Each assignment is a tuple ({split}, {value}, {locator}, {priority}). The priorities are
+        resolved in a single pass, so only the winning assignment to each key builds a slot.
+        The slots are built after the entire batch has been registered, and references among
+        the members of the batch are resolved by building the referenced slots first, rather
+        than by creating unresolved placeholders that have to be replaced and rewired later.
+
+        Return a list of ({key}, {new}, {old}) tuples, one for each slot that was built
+        """
+        # the winning assignment for each key
+        winners = {}
+        # go through the assignments
+        for split, value, locator, priority in assignments:
+            # figure out the node info
+            name, split, key = self.info.fillNodeId(model=self, split=split)
+            # look for an earlier assignment to the same key in this batch
+            current = winners.get(key)
+            # if there is one and it has higher priority
+            if current is not None and not priority > current[-1]:
+                # this one loses
+                continue
+            # otherwise, record it
+            winners[key] = (name, split, value, locator, priority)
+
+        # make a pile for the slots we build
+        pending = {}
+        # go through the winners
+        for key, assignment in winners.items():
+            # look for existing meta-data
+            meta = self._metadata.get(key)
+            # if there is and it has higher priority than the assignment
+            if meta is not None and not assignment[-1] > meta.priority:
+                # the existing setting stays
+                continue
+            # otherwise, schedule the slot
+            pending[key] = assignment
+
+        # save the current pile of pending assignments and the results of their insertion, in
+        # case this batch was triggered while building the slots of another one
+        saved = self._pending, self._built
+        # and install the new ones, so {retrieve} can find them
+        self._pending, self._built = pending, []
+        # attempt to
+        try:
+            # go through the keys of the slots
+            for key in tuple(pending):
+                # skip the ones that were built already while resolving references
+                if key not in pending: continue
+                # build the slot
+                self.buildPendingSlot(key=key)
+            # grab the results
+            results = self._built
+        # no matter what happens
+        finally:
+            # restore the piles
+            self._pending, self._built = saved
+
+        # all done
+        return results
+
+
+    def buildPendingSlot(self, key):
+        """
+        Build the slot for the pending assignment to {key}
+        """
+        # remove the assignment from the pile; this also guards against circular references
+        name, split, value, locator, priority = self._pending.pop(key)
+        # look for existing meta-data
+        meta = self._metadata.get(key)
+        # to figure out which slot factory to use
+        factory = properties.identity(name=name).instanceSlot if meta is None else meta.factory
+        # build the slot; this resolves any references to other nodes, which may build their
+        # pending slots as well
+        new = factory(key=key, value=value)
+
+        # references to {key} may have been resolved while building the slot, so look up the
+        # node and its meta-data now
+        old = self._nodes.get(key, None)
+        meta = self._metadata.get(key)
+        # if this is the first time this name was encountered
+        if meta is None:
+            # build the info node and attach it to the meta-data store
+            self._metadata[key] = self.info(name=name, split=split, key=key,
+                                            priority=priority, locator=locator, factory=factory)
+        # otherwise
+        else:
+            # record the assignment priority and its locator
+            meta.priority = priority
+            meta.locator = locator
+        # if there is an existing node
+        if old is not None:
+            # replace it in its evaluation graph
+            new.replace(obsolete=old)
+        # register the new node
+        self._nodes[key] = new
+        # and record the result
+        self._built.append((key, new, old))
+
+        # all done
+        return key, new, old
+
+
     def retrieve(self, name):
         """
         Retrieve the node registered under {name}. If no such node exists, an error marker will
@@ -255,6 +360,10 @@ class NameServer(Hierarchical):
         """
         # hash the {name}
         key = self.hash(name)
+        # if this is a reference to a member of a batch of assignments that is being processed
+        if self._pending and key in self._pending:
+            # build its slot now
+            self.buildPendingSlot(key=key)
         # if a node is already registered under this key
         try:
             # grab it
@@ -373,6 +482,10 @@ class NameServer(Hierarchical):
         super().__init__(**kwds)
         # record my name
         self._modelName = name
+        # the assignments of the batch being processed
+        self._pending = None
+        # and the slots that were built for them
+        self._built = None
         # all done
         return
 
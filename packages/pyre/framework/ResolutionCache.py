@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import pickle
+import tempfile
+
+
+# declaration
+class ResolutionCache:
+    """
+    The memory of the linker: the outcome of the attempts to resolve component requests into
+    shelves
+
+    Resolving a component request involves forming many candidate shelf locations and probing
+    each one of them, and most probes fail. {ResolutionCache} remembers the candidates that
+    could not be loaded, so they are not probed again, and the shelves that satisfied each
+    request, so that repeated requests replay them; the search resumes past them only if the
+    previous resolutions were cut short by their callers. Everything it knows about a
+    loader is forgotten as soon as the search path of the loader changes.
+
+    The misses of durable loaders can be saved across runs, but only for candidates that do
+    not exist, rather than ones that failed while loading. Each saved miss carries the state
+    of its location, and it is discarded as soon as that location changes.
+
+    The outcome of each resolution is tallied in a {Record}, indexed by the loader, the uri
+    scheme, the resolution context, the protocol of the request and the folders that are
+    searched on its behalf.
+    """
+
+
+    # constants
+    version = 2 # the layout of the persistent store
+
+
+    # public data
+    path = None # the optional location of the persistent store
+
+
+    # interface
+    def section(self, loader, stamp):
+        """
+        Retrieve the resolution state of {loader}, given the current {stamp} of its search path
+        """
+        # get the name of the loader
+        name = loader.__name__
+        # attempt to
+        try:
+            # look up its section
+            section = self.sections[name]
+        # if it's not there
+        except KeyError:
+            # make a new one
+            section = self.sections[name] = self.Section(stamp=stamp)
+        # if it is there but its search path has changed
+        if section.stamp != stamp:
+            # forget everything it knows
+            section = self.sections[name] = self.Section(stamp=stamp)
+        # all done
+        return section
+
+
+    def invalidate(self):
+        """
+        Forget everything
+        """
+        # clear out the state of the loaders
+        self.sections = {}
+        # all done
+        return self
+
+
+    def records(self):
+        """
+        Generate the resolution keys along with their tallies
+        """
+        # go through the sections
+        for name, section in self.sections.items():
+            # and their records
+            for key, record in section.records.items():
+                # hand them out
+                yield (name,) + key, record
+        # all done
+        return
+
+
+    # persistence
+    def load(self, loaders):
+        """
+        Seed the sections of the durable {loaders} from my persistent store
+        """
+        # if i don't have one, there is nothing to do
+        if not self.path: return self
+        # attempt to
+        try:
+            # open the file
+            with open(self.path, 'rb') as store:
+                # and unpack it
+                version, misses = pickle.load(store)
+        # if anything goes wrong
+        except Exception:
+            # treat it as empty
+            return self
+        # if the store was written by an incompatible version
+        if version != self.version:
+            # ignore it
+            return self
+        # go through the {loaders}
+        for loader in loaders:
+            # skip the ones whose misses are not meant to survive the process
+            if not loader.durable: continue
+            # look up the saved misses
+            try:
+                stamp, saved = misses[loader.__name__]
+            # if there aren't any
+            except KeyError:
+                # move on
+                continue
+            # keep the ones whose location has not changed since they were recorded
+            absent = {
+                uri: locus for uri, locus in saved
+                if loader.locus(uri=loader.uri.parse(uri)) == locus
+                }
+            # install them; they are discarded the first time {loader} asks for its section
+            # if its search path is different
+            self.sections[loader.__name__] = self.Section(stamp=stamp, absent=absent)
+        # all done
+        return self
+
+
+    def save(self, loaders):
+        """
+        Save the misses of the durable {loaders} in my persistent store
+        """
+        # if i don't have a store, there is nothing to do
+        if not self.path: return self
+        # collect the misses
+        misses = {
+            loader.__name__: (section.stamp, tuple(section.absent.items()))
+            for loader in loaders if loader.durable
+            for section in [self.sections.get(loader.__name__)] if section is not None
+            }
+        # get the location of the store
+        folder = os.path.dirname(os.path.abspath(self.path))
+        # attempt to
+        try:
+            # make sure it exists
+            os.makedirs(folder, exist_ok=True)
+            # write into a temporary file, so concurrent processes never see partial stores
+            fd, scratch = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            # attempt to
+            try:
+                # fill it
+                with os.fdopen(fd, 'wb') as store:
+                    pickle.dump((self.version, misses), store,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                # and move it into place
+                os.replace(scratch, self.path)
+            # if anything goes wrong
+            except Exception:
+                # clean up
+                os.unlink(scratch)
+                # and complain
+                raise
+        # the store is only an optimization; failing to update it is not an error
+        except Exception:
+            # so just move on
+            pass
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, path=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the location of my persistent store
+        self.path = path
+        # initialize the map from loader names to their resolution state
+        self.sections = {}
+        # all done
+        return
+
+
+    # implementation details
+    class Section:
+        """
+        The resolution state of a loader
+        """
+
+        def record(self, key):
+            """
+            Retrieve the tally of the resolutions under {key}
+            """
+            # attempt to
+            try:
+                # look it up
+                return self.records[key]
+            # if it's not there
+            except KeyError:
+                # make one
+                record = self.records[key] = ResolutionCache.Record()
+            # and return it
+            return record
+
+        def __init__(self, stamp, absent=None):
+            # the state of the search path of the loader
+            self.stamp = stamp
+            # the candidate shelves that do not exist, along with the state of their location
+            self.absent = dict(absent or {})
+            # the uris of the candidate shelves that failed to load, for whatever reason
+            self.misses = set(self.absent)
+            # the map from resolution keys to their tallies
+            self.records = {}
+            # all done
+            return
+
+        __slots__ = ["stamp", "absent", "misses", "records"]
+
+
+    class Record:
+        """
+        The tally of the resolutions of a request
+        """
+
+        def __init__(self):
+            # the shelves that satisfied the last resolution, in the order they were found;
+            # {None} until this request has been resolved at least once
+            self.hits = None
+            # whether the last resolution exhausted the candidates of this request, in which
+            # case {hits} are all the shelves there are to find
+            self.complete = False
+            # the number of times this request was resolved
+            self.resolutions = 0
+            # the number of candidates that were examined
+            self.probes = 0
+            # the number of candidates that had to be loaded
+            self.loads = 0
+            # the number of candidates skipped because they were known to fail
+            self.skips = 0
+            # the number of candidates that failed to load
+            self.misses = 0
+            # all done
+            return
+
+        def __str__(self):
+            # easy enough
+            return (
+                f"resolutions={self.resolutions}, probes={self.probes}, loads={self.loads}, "
+                f"skips={self.skips}, misses={self.misses}")
+
+        __slots__ = ["hits", "complete", "resolutions", "probes", "loads", "skips", "misses"]
+
+
+# end of file
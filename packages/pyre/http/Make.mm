@@ -15,6 +15,7 @@ EXPORT_PYTHON_MODULES = \
     Request.py \
     Response.py \
     Server.py \
+    Stream.py \
     documents.py \
     exceptions.py \
     responses.py \
@@ -29,57 +29,121 @@ class Request:
 
     headers = None # dictionary of request headers
     payload = None # the request payload
+    leftover = b'' # the bytes that arrived after the end of the request
+
+
+    @property
+    def keepalive(self):
+        """
+        Check whether the client expects the connection to persist after the response
+        """
+        # get the connection options
+        options = {
+            option.strip().lower() for option in self.header('Connection', '').split(',') }
+        # starting with HTTP/1.1, connections persist unless the client says otherwise
+        if self.version and self.version >= (1,1): return 'close' not in options
+        # before that, they persist only if the client asks for it
+        return 'keep-alive' in options
 
 
     # interface
     def extract(self, server, chunk):
         """
-        Process a {chunk} of bytes
+        Process a {chunk} of bytes; return {True} when the request is complete
+
+        Clients that pipeline their requests may send the beginning of the next request along
+        with the end of this one; these bytes are set aside in {leftover}
+        """
+        # if i am still doing headers
+        if not self.described:
+            # add the chunk to the bytes i have been holding on to
+            self.pending += chunk
+            # pull the headers
+            offset = self.extractHeaders(server=server, chunk=self.pending)
+            # if they have not all arrived yet
+            if not self.described:
+                # wait for more
+                return False
+            # otherwise, whatever follows the headers is payload
+            chunk = bytes(self.pending[offset:])
+            # and i'm done with the header bytes
+            self.pending = None
+        # process the payload
+        return self.extractPayload(server=server, chunk=chunk, offset=0)
+
+
+    def header(self, name, default=None):
+        """
+        Look up the value of the header {name}, ignoring case
         """
-        # if we are still doing headers, pull them from the chunk
-        offset = self.extractHeaders(server=server, chunk=chunk)
-        # whatever is left is request payload
-        return self.extractPayload(server=server, chunk=chunk, offset=offset)
+        # normalize the name
+        name = name.lower()
+        # go through my headers
+        for key, value in (self.headers or {}).items():
+            # if this is the one
+            if key.lower() == name:
+                # return its value
+                return value
+        # otherwise
+        return default
 
 
     # implementation details
     def extractHeaders(self, server, chunk):
         """
         Extract RFC2822 headers from the bytes sent by the peer
+
+        The headers are parsed only after the blank line that terminates them has arrived;
+        until then, {chunk} holds all the bytes received so far, and the search for the
+        terminator resumes from where the previous one left off
         """
         # if i am done processing headers
         if self.described:
             # bail and indicate that no bytes from {chunk} were consumed
             return 0
 
+        # clients may send blank lines ahead of the request line; skip them
+        start = 0
+        while chunk[start:start+1] in (b'\r', b'\n'): start += 1
+        # look for the end of the headers, backing up a bit in case the terminator straddles
+        # the boundary between the old bytes and the new ones
+        terminator = self.terminator.search(chunk, max(start, self.scanned - 3))
+        # if it's not there yet
+        if not terminator:
+            # remember how far we looked
+            self.scanned = len(chunk)
+            # if the headers are getting out of hand
+            if len(chunk) > self.MAX_HEADER_BYTES:
+                # complain
+                raise self.responses.RequestHeaderFieldsTooLarge(server=server)
+            # otherwise, wait for more
+            return 0
+
         # get my header encoding
         encoding = self.HEADER_ENCODING
-
-        # a cursor into {chunk}
-        offset = 0
-        # if i don't know my command yet
-        if not self.command:
-            # this is a brand new request
-            match = self.protocol.match(chunk)
-            # if it didn't match
-            if not match:
-                # complain
-                raise self.responses.BadRequestSyntax(server=server)
-            # otherwise, unpack
-            command, url, major, minor = match.groups()
-            # and store
-            self.command = command.decode(encoding)
-            self.url = urllib.parse.unquote(url.decode(encoding))
-            self.version = (int(major), int(minor))
-            # initialize my headers
-            self.headers = {}
-            # update the cursor
-            offset = match.end()
+        # the headers end here; anything beyond belongs to the payload
+        end = terminator.end()
+        # the request line should be right at the top
+        match = self.protocol.match(chunk, start, end)
+        # if it didn't match
+        if not match:
+            # complain
+            raise self.responses.BadRequestSyntax(server=server)
+        # otherwise, unpack
+        command, url, major, minor = match.groups()
+        # and store
+        self.command = command.decode(encoding)
+        self.url = urllib.parse.unquote(url.decode(encoding))
+        self.version = (int(major), int(minor))
+        # initialize my headers
+        self.headers = {}
+        # update the cursor
+        offset = match.end()
 
         # until something happens
         while True:
             # look for a header
-            match = self.keyval.match(chunk, offset)
+            match = self.keyval.match(chunk, offset, end)
             # if it didn't match
             if not match:
                 # bail
@@ -95,14 +159,31 @@ class Request:
             offset = match.end()
 
         # the next entry must be a blank line
-        match = self.blank.match(chunk, offset)
+        match = self.blank.match(chunk, offset, end)
         # if it doesn't match
         if not match:
             # complain
             raise self.responses.BadRequestSyntax(server=server)
+
+        # i don't know how to receive payloads in pieces
+        if self.header('Transfer-Encoding', 'identity').lower() != 'identity':
+            # so ask for the size up front
+            raise self.responses.LengthRequired(server=server)
+        # figure out the size of the payload
+        try:
+            # the client specified it
+            self.length = int(self.header('Content-Length', 0))
+        # if it's not an integer
+        except ValueError as error:
+            # complain
+            raise self.responses.BadRequestSyntax(server=server) from error
+        # if it's negative
+        if self.length < 0:
+            # complain
+            raise self.responses.BadRequestSyntax(server=server)
+
         # mark me as having processed success
         self.described = True
-
         # and pass on how much of {chunk} i took care of
         return match.end()
 
@@ -111,53 +192,43 @@ class Request:
         """
         Extract a {chunk} of bytes and store them
         """
-        # if i am done, i am done
-        if self.complete: return True
-
-        # compute the actual size of the unprocessed part of {chunk}
-        actual = len(chunk) - offset
-
-        # check whether
-        try:
-            # the client specified what my payload size is
-            size = self.headers['Content-Length']
-        # if not
-        except (KeyError, TypeError) as error:
-            # the only option is that this is the end of the chunk
-            if actual == 0:
-                # in which case mark me as done
-                self.complete = True
-                # normalize my payload, if necessary
-                if self.payload is None: self.payload = []
-                # and get out of here
-                return True
-            # otherwise, complain
-            raise self.responses.BadRequestSyntax(server=server) from error
-        # if all goes well
-        else:
-            # convert into an integer
-            size = int(size)
+        # if i am done, whatever is in the chunk belongs to the next request
+        if self.complete:
+            # set it aside
+            self.leftover += chunk[offset:]
+            # and get out of here
+            return True
 
         # initialize the storage for my payload
         if self.payload is None: self.payload = []
-
-        # compute the total payload size, including what I have gathered so far
-        for portion in self.payload:
-            # by adding the length of each portion to the unprocessed {chunk}
-            actual += len(portion)
-
-        # if storing this chunk would go over the limit
-        if actual > size:
-            # complain
-            raise self.responses.RequestEntityTooLarge(server=server)
-        # otherwise, store
-        self.payload.append(chunk if offset == 0 else chunk[offset:])
+        # figure out how many more bytes i need
+        needed = self.length - self.received
+        # get the portion of {chunk} that belongs to me
+        portion = chunk[offset:offset+needed]
+        # if there is anything there
+        if portion:
+            # store it
+            self.payload.append(portion)
+            # and update the running byte count
+            self.received += len(portion)
+        # anything beyond what i need belongs to the next request
+        self.leftover = chunk[offset+needed:]
         # check whether this was enough bytes
-        self.complete = True if actual == size else False
+        self.complete = self.received == self.length
         # and pass this info on
         return self.complete
 
 
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the bytes that have arrived while i'm still looking for the end of my headers
+        self.pending = bytearray()
+        # all done
+        return
+
+
     # debugging support
     def dump(self, channel, indent='', showHeaders=True, showPayload=True):
         """
@@ -194,12 +265,18 @@ class Request:
     # state
     described = False # am i done processing the request meta-data
     complete = False # have i received everything i expect from the client?
+    scanned = 0 # how far into the pending bytes i have looked for the end of the headers
+    length = 0 # the size of my payload
+    received = 0 # the number of payload bytes received so far
 
     # constants
     # the expected encoding of the headers
     HEADER_ENCODING = 'iso-8859-1'
+    # the largest header block i'm willing to hold on to
+    MAX_HEADER_BYTES = 64 * 1024
     # scanners
     blank = re.compile(b"\r?\n")
+    terminator = re.compile(b"\n\r?\n")
     keyval = re.compile(
         br"(?P<key>[^:]+):\s+(?P<value>[^\r\n]+)" +
         b"\r?\n")
@@ -7,6 +7,8 @@
 
 
 # externals
+import collections
+import socket
 import pyre
 
 
@@ -20,6 +22,7 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
     # types
     from .Request import Request as request
     from .Response import Response as response
+    from .Stream import Stream as stream
     # exceptions
     from . import exceptions, responses, documents
 
@@ -61,72 +64,101 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
         # - this the first time this peer connects
         # - more data that for an existing request have arrived
         # - this is a known peer whose previous request was handled but has kept the connection
-        #   alive; this case may not survive as it can be handled by starting a new request
-        #   every time without closing the connection
-        # - the client has pipelined its requests; currently, this case is not handled
-        #   correctly because it involves saving the local buffers
+        #   alive
+        # - the client has pipelined its requests, so the chunk may contain any number of
+        #   them, followed by the beginning of the next one; the requests are fulfilled in
+        #   order, and their responses are sent back together
 
         # get the application context
         application = self.application
-        # show me
-        application.debug.log('reading data from {}'.format(channel.peer))
+        # show me; carefully, since looking up the peer address is not free
+        if application.debug: application.debug.log(f'reading data from {channel.peer}')
         # get whatever data is available at this point
-        chunk = channel.read(maxlen=self.MAX_BYTES)
+        try:
+            chunk = channel.read(maxlen=self.MAX_BYTES)
+        # if the connection was reset
+        except OSError:
+            # treat it as closed
+            chunk = b''
 
         # if there was nothing to read
         if len(chunk) == 0:
             # show me
-            application.debug.log('connection from {} was closed'.format(channel.peer))
-            # close the connection
-            channel.close()
-            # check whether we know this peer
+            if application.debug:
+                application.debug.log(f'connection from {channel.peer} was closed')
+            # hang up
+            return self.hangup(channel=channel)
+
+        # well, there is data to process; if we have a pending request, get it; otherwise,
+        # make a new one
+        request = self.requests.pop(channel, None) or self.request()
+        # the rendered responses
+        buffers = []
+        # whether the connection should persist
+        keepalive = True
+
+        # as long as there are bytes to process
+        while chunk:
+            # attempt to
             try:
-                # in which case, forget him
-                del self.requests[channel]
-            # if not
-            except KeyError:
-                # no problem
-                pass
-            # stop listening
-            return False
-
-        # well, there is data to process; if we have a pending request
-        try:
-            # get it
-            request = self.requests[channel]
-        # otherwise
-        except KeyError:
-            # make a new one
+                # hand the chunk to the request
+                complete = request.extract(server=self, chunk=chunk)
+            # if something wrong happened
+            except self.exceptions.ProtocolError as error:
+                # send an error report to the client
+                buffers += self.render(response=error)
+                # and hang up
+                keepalive = False
+                break
+
+            # if request assembly is not finished yet
+            if not complete:
+                # we expect more data to arrive later; register this request so we can
+                # continue the processing next time there are data for it
+                self.requests[channel] = request
+                # and wait for it
+                break
+
+            # figuring out what the client is asking for is now complete; try to
+            try:
+                # fulfill the request
+                response = self.fulfill(request)
+            # if something bad happened
+            except self.exceptions.ProtocolError as error:
+                # send an error report to the client
+                response = error
+
+            # if the response doesn't insist on closing the connection
+            if response.headers.get('Connection') != 'close':
+                # honor the client preference
+                keepalive = request.keepalive
+                # and let it know
+                response.headers['Connection'] = 'keep-alive' if keepalive else 'close'
+            # otherwise
+            else:
+                # hang up after responding
+                keepalive = False
+
+            # render the response
+            buffers += self.render(response=response, request=request)
+            # if we are hanging up
+            if not keepalive:
+                # ignore anything else the client sent
+                break
+            # otherwise, whatever is left over is the beginning of the next request
+            chunk = request.leftover
             request = self.request()
 
-        # attempt to
-        try:
-            # hand the chunk to the request
-            complete = request.extract(server=self, chunk=chunk)
-        # if something wrong happened
-        except self.exceptions.ProtocolError as error:
-            # send an error report to the client
-            return self.respond(channel=channel, response=error)
-
-        # if request assembly is not finished yet
-        if not complete:
-            # we expect more data to arrive later; register this request so we can continue the
-            # processing next time there are data for it
-            self.requests[channel] = request
-            # and reschedule this channel
-            return True
-
-        # figuring out what the client is asking for is now complete; try to
-        try:
-            # fulfill the request
-            response = self.fulfill(request)
-        # if something bad happened
-        except self.exceptions.ProtocolError as error:
-            # send an error report to the client
-            return self.respond(channel=channel, response=error)
-
-        # if all goes well, respond
-        return self.respond(channel=channel, response=response)
+        # if there is anything to send
+        if buffers:
+            # send it
+            self.transmit(channel=channel, buffers=buffers)
+        # if we are done with this client
+        if not keepalive:
+            # hang up
+            return self.hangup(channel=channel)
+        # otherwise, keep listening
+        return True
 
 
     # interface
@@ -139,19 +171,192 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
 
 
     def respond(self, channel, response):
+        """
+        Render {response} and send it to the client over {channel}
+        """
+        # render and send
+        self.transmit(channel=channel, buffers=self.render(response=response))
+        # keep the channel alive
+        return True
+
+
+    def render(self, response, request=None):
+        """
+        Render {response} to the client {request} into a list of buffers that are ready to be
+        sent to the client; large payloads are represented by streams
+        """
         # attempt to
         try:
-            # ask the renderer to put together the byte stream
-            stream = b'\r\n'.join(self.renderer.render(server=self, document=response))
+            # ask the renderer to put together the pieces of the response
+            parts = self.renderer.render(server=self, document=response, request=request)
+            # and assemble them
+            buffers = self.splice(parts)
         # if something goes wrong
         except self.exceptions.ProtocolError as error:
             # render the error
-            stream = b'\r\n'.join(self.renderer.render(server=self, document=error))
+            buffers = self.splice(self.renderer.render(server=self, document=error))
+        # all done
+        return buffers
 
-        # either way, send the bytes to the client
-        channel.write(stream)
-        # keep the channel alive
-        return True
+
+    def splice(self, parts):
+        """
+        Place line terminators between the {parts} of a rendered response
+        """
+        # the pile
+        buffers = []
+        # go through the parts
+        for part in parts:
+            # add each one, followed by the terminator
+            buffers.append(part)
+            buffers.append(b'\r\n')
+        # drop the last terminator
+        if buffers: buffers.pop()
+        # and return the pile; the payload is never copied
+        return buffers
+
+
+    def transmit(self, channel, buffers):
+        """
+        Send {buffers} to the client over {channel}
+
+        Plain buffers are written right away; once a stream shows up, it and everything after
+        it are placed in the outbox of {channel}, and shipped whenever the channel is ready
+        """
+        # get the outbox of this channel
+        outbox = self.outbox.get(channel)
+        # if there isn't one
+        if outbox is None:
+            # look for the first stream
+            for index, buffer in enumerate(buffers):
+                # if this is it
+                if isinstance(buffer, self.stream):
+                    # stop looking
+                    break
+            # if there are no streams
+            else:
+                # send everything
+                channel.writev(buffers)
+                # and bail
+                return
+            # otherwise, send everything in front of the stream
+            channel.writev(buffers[:index])
+            # make an outbox for the rest
+            outbox = collections.deque()
+            self.outbox[channel] = outbox
+            # and ask to be notified when the channel can take more
+            self.dispatcher.whenWriteReady(channel=channel, call=self.flush)
+            # the stream and whatever follows it go in the outbox
+            buffers = buffers[index:]
+        # add the buffers to the outbox
+        outbox.extend(buffers)
+        # all done
+        return
+
+
+    def flush(self, channel):
+        """
+        Ship the next piece of the contents of the outbox of {channel}
+        """
+        # get the outbox
+        outbox = self.outbox[channel]
+        # and the item at the front
+        item = outbox[0]
+        # if it's the marker that the connection should be closed
+        if item is None:
+            # forget the outbox
+            del self.outbox[channel]
+            # close the connection
+            channel.close()
+            # and stop watching
+            return False
+        # carefully
+        try:
+            # if it's a stream
+            if isinstance(item, self.stream):
+                # ship a chunk; if that was the last one
+                if not item.pump(channel=channel):
+                    # discard the stream
+                    outbox.popleft().close()
+            # otherwise
+            else:
+                # collect the plain buffers at the front of the outbox
+                buffers = []
+                while outbox and self.plain(outbox[0]):
+                    buffers.append(outbox.popleft())
+                # and send them
+                channel.writev(buffers)
+        # if the client is gone, or the file couldn't be read
+        except (OSError, EOFError) as error:
+            # show me
+            if self.application.debug:
+                self.application.debug.log(f'while sending to {channel}: {error}')
+            # forget the outbox
+            self.drain(channel=channel)
+            # if we were going to hang up anyway
+            if None in outbox:
+                # do it now
+                channel.close()
+            # otherwise
+            else:
+                # shut the connection down, so the reader notices and hangs up
+                try:
+                    channel.shutdown(socket.SHUT_RDWR)
+                # if the client beat us to it
+                except OSError:
+                    # no worries
+                    pass
+            # either way, stop watching
+            return False
+        # if there is more to send
+        if outbox:
+            # keep watching
+            return True
+        # otherwise, forget the outbox
+        del self.outbox[channel]
+        # and stop watching
+        return False
+
+
+    def plain(self, item):
+        """
+        Check whether the outbox {item} is a buffer that can be written out directly
+        """
+        # it's neither the hang up marker nor a stream
+        return item is not None and not isinstance(item, self.stream)
+
+
+    def drain(self, channel):
+        """
+        Discard the contents of the outbox of {channel}
+        """
+        # get the outbox
+        outbox = self.outbox.pop(channel, ())
+        # go through its contents
+        for item in outbox:
+            # close the streams
+            if isinstance(item, self.stream): item.close()
+        # all done
+        return
+
+
+    def hangup(self, channel):
+        """
+        Close the connection over {channel} and forget its pending request
+        """
+        # forget any partial request
+        self.requests.pop(channel, None)
+        # if there is output waiting to be sent
+        outbox = self.outbox.get(channel)
+        if outbox:
+            # close the connection after it's gone
+            outbox.append(None)
+        # otherwise
+        else:
+            # close the connection now
+            channel.close()
+        # either way, stop listening
+        return False
 
 
     # meta-methods
@@ -160,6 +365,8 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
         super().__init__(**kwds)
         # initialize my connectionn index
         self.requests = {}
+        # and the output waiting for each connection to be ready
+        self.outbox = {}
         # all done
         return
 
@@ -167,8 +374,9 @@ class Server(pyre.nexus.server, family='pyre.nexus.servers.http'):
     # implementation details
     # private data
     requests = None
+    outbox = None
     # constants
-    MAX_BYTES = 1024 * 1024
+    MAX_BYTES = 64 * 1024 # the maximum number of bytes to read from a client at a time
 
 
 # end of file
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import errno
+import io
+import os
+
+
+# class declaration
+class Stream:
+    """
+    A response payload that is read from a file and shipped to the client a piece at a time,
+    whenever the connection is ready to accept more
+
+    Files that live on the local disk are handed to the kernel with {os.sendfile}, so their
+    contents never pass through the server; everything else, e.g. the members of zip archives,
+    is read and written in chunks. Either way, the server never holds more than one chunk of
+    the file in memory
+    """
+
+
+    # public data
+    chunk = 256 * 1024 # the maximum number of bytes to ship at a time
+
+
+    # interface
+    def pump(self, channel):
+        """
+        Send the next chunk of the payload over {channel}; return {True} if there is more left
+        """
+        # figure out how much to send
+        count = min(self.chunk, self.remaining)
+        # if i can hand the file to the kernel
+        if self.descriptor is not None:
+            # attempt to
+            try:
+                # ship the chunk
+                sent = os.sendfile(self.target(channel), self.descriptor, self.offset, count)
+            # if something goes wrong
+            except OSError as error:
+                # and it's something other than the kernel refusing this pair of descriptors
+                if error.errno not in self.unsupported:
+                    # complain
+                    raise
+                # otherwise, fall back to reading the file; position it
+                self.seek(self.offset)
+                # and stop trying
+                self.descriptor = None
+                # try again
+                return self.pump(channel=channel)
+        # otherwise
+        else:
+            # read the chunk
+            data = self.file.read(count)
+            # and send it
+            sent = channel.write(bstr=data) if data else 0
+        # if nothing was sent, the file is shorter than promised
+        if sent == 0:
+            # and there is no way to honor the length the client was given
+            raise EOFError(f"{self.file}: file is shorter than expected")
+        # update my state
+        self.offset += sent
+        self.remaining -= sent
+        # and let the caller know whether there is more to send
+        return self.remaining > 0
+
+
+    def close(self):
+        """
+        Release the file
+        """
+        # easy enough
+        self.file.close()
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, file, offset=0, length=0, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the file
+        self.file = file
+        # the position of the next byte to send
+        self.offset = offset
+        # the total number of bytes to send
+        self.length = length
+        # and the number still left to send
+        self.remaining = length
+        # get the file descriptor, if the file has one and the kernel can ship it for me
+        self.descriptor = self.fileno(file) if hasattr(os, 'sendfile') else None
+        # if i'll be reading the file myself and the payload doesn't start at the beginning
+        if self.descriptor is None and offset > 0:
+            # position it
+            self.seek(offset)
+        # all done
+        return
+
+
+    def __len__(self):
+        # the size of the payload
+        return self.length
+
+
+    # implementation details
+    def seek(self, offset):
+        """
+        Position my file at {offset}
+        """
+        # if the file can move around
+        if self.file.seekable():
+            # go there
+            self.file.seek(offset)
+            # all done
+            return
+        # otherwise, skip over the bytes before {offset}, a chunk at a time; this only happens
+        # to freshly opened files, so they are positioned at the beginning
+        while offset > 0:
+            # read a chunk
+            data = self.file.read(min(self.chunk, offset))
+            # if there is nothing left
+            if not data:
+                # bail; {pump} will notice
+                break
+            # otherwise, update the count
+            offset -= len(data)
+        # all done
+        return
+
+
+    @staticmethod
+    def fileno(file):
+        """
+        Retrieve the file descriptor of {file}, if it has one
+        """
+        # attempt to
+        try:
+            # ask for it
+            return file.fileno()
+        # if the file is not backed by a descriptor
+        except (AttributeError, io.UnsupportedOperation):
+            # no luck
+            return None
+
+
+    @staticmethod
+    def target(channel):
+        """
+        Retrieve the file descriptor of the writable end point of {channel}
+        """
+        # get the end point
+        outbound = channel.outbound
+        # which is either a descriptor or something that has one
+        return outbound if isinstance(outbound, int) else outbound.fileno()
+
+
+    # private data
+    unsupported = { errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSOCK }
+
+
+# end of file
@@ -7,9 +7,14 @@
 
 
 # externals
+import email.utils
 import json
+import os
+import re
 # the base class
 from .Response import Response
+# the payload of streamed documents
+from .Stream import Stream
 
 
 # base class for all normal responses
@@ -105,15 +110,21 @@ class Document(OK):
 class File(Document):
     """
     A document response built out of a file in the application private document root
+
+    Files are tagged with their size and modification time, so clients can validate the copies
+    they have cached with conditional requests, and can ask for a single range of bytes. Small
+    files are read into memory; larger ones are streamed to the client as the connection
+    becomes ready to accept them
     """
 
     # public data
     uri = None # the file to serve
+    threshold = 64 * 1024 # files smaller than this are read into memory rather than streamed
 
     # interface
-    def render(self, server, **kwds):
+    def render(self, server, request=None, **kwds):
         """
-        Pack the contents of the file into a binary buffer
+        Pack the contents of the file into a binary buffer, or a stream for large files
         """
         # get the uri
         uri = self.uri
@@ -121,14 +132,186 @@ class File(Document):
         app = self.application
         # attempt to
         try:
-            # open the file
-            stream = app.pfs[uri].open(mode='rb')
+            # look up the file
+            node = app.pfs[uri]
+            # and open it
+            stream = node.open(mode='rb')
         # if something goes wrong
         except app.pfs.GenericError:
             # raise something bad
             raise server.responses.NotFound(server=server)
-        # all is well, send it along
-        return stream.read()
+
+        # get the size of the file and its modification time
+        size, mtime = self.stat(node=node, stream=stream)
+        # if they are not known
+        if size is None:
+            # there is nothing to validate; send the whole thing
+            return self.slurp(stream=stream)
+
+        # build the validators
+        tag = '"{:x}-{:x}"'.format(size, int(mtime * 1e6))
+        modified = self.timestamp(mtime)
+        # decorate the headers
+        headers = self.headers
+        headers['ETag'] = tag
+        headers['Last-Modified'] = modified
+        headers['Accept-Ranges'] = 'bytes'
+
+        # the part of the file to send; by default, all of it
+        start, end = 0, size
+        # if there is a client request to examine
+        if request is not None:
+            # if the client has a fresh copy
+            if self.fresh(request=request, tag=tag, mtime=mtime):
+                # let it know
+                self.adjust(status=server.responses.NotModified)
+                # and send nothing
+                stream.close()
+                return b''
+            # check whether it asked for part of the file
+            span = self.span(request=request, tag=tag, modified=modified, size=size)
+            # if it asked for bytes that aren't there
+            if span is False:
+                # let it know
+                self.adjust(status=server.responses.RequestedRangeNotSatisfiable)
+                headers['Content-Range'] = 'bytes */{}'.format(size)
+                # and send nothing
+                stream.close()
+                return b''
+            # if it asked for a range that can be satisfied
+            if span is not None:
+                # unpack
+                start, end = span
+                # and mark the response as partial
+                self.adjust(status=server.responses.PartialContent)
+                headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, end-1, size)
+
+        # if the payload is small
+        if end - start < self.threshold:
+            # position the file
+            stream.seek(start)
+            # and read it
+            return self.slurp(stream=stream, count=end-start)
+        # otherwise, stream it
+        return Stream(file=stream, offset=start, length=end-start)
+
+    # implementation details
+    def stat(self, node, stream):
+        """
+        Retrieve the size and modification time of the open file {stream} that is the contents
+        of {node}
+        """
+        # if the file lives on a local disk
+        fd = Stream.fileno(stream)
+        if fd is not None:
+            # ask the kernel, since it may have changed since its filesystem was explored
+            info = os.fstat(fd)
+            # and return what we found
+            return info.st_size, info.st_mtime
+        # otherwise, use the metadata from the filesystem
+        info = node.info
+        # and return whatever it knows
+        return getattr(info, 'size', None), getattr(info, 'modificationTime', None)
+
+    def fresh(self, request, tag, mtime):
+        """
+        Check whether the client that issued {request} already has the current contents
+        """
+        # if the client has entity tags for its copies
+        match = request.header('If-None-Match')
+        if match is not None:
+            # collect them
+            tags = { candidate.strip() for candidate in match.split(',') }
+            # weak comparison is good enough for this purpose
+            return '*' in tags or tag in tags or 'W/' + tag in tags
+        # if the client knows the modification time of its copy
+        since = request.header('If-Modified-Since')
+        if since is not None:
+            # attempt to
+            try:
+                # parse it
+                since = email.utils.parsedate_to_datetime(since).timestamp()
+            # if it's garbage
+            except (TypeError, ValueError, IndexError):
+                # ignore it
+                return False
+            # the copy is fresh if the file hasn't changed since; timestamps have one second
+            # resolution
+            return int(mtime) <= since
+        # otherwise, the client has nothing cached
+        return False
+
+    def span(self, request, tag, modified, size):
+        """
+        Extract the range of bytes the client asked for; return {None} if it asked for the
+        whole file, or {False} if the range can't be satisfied
+        """
+        # get the range specification
+        spec = request.header('Range')
+        # if there isn't one
+        if spec is None:
+            # send the whole file
+            return None
+        # if the range is conditional
+        condition = request.header('If-Range')
+        # and its condition is not met
+        if condition is not None and condition.strip() not in {tag, modified}:
+            # the client's partial copy is stale; send the whole file
+            return None
+        # parse the range; requests for more than one range, or in units other than bytes, are
+        # answered with the whole file
+        match = self.ranger.fullmatch(spec)
+        if match is None:
+            # send the whole file
+            return None
+        # unpack
+        first, last = match.group('first'), match.group('last')
+        # if the client asked for the last few bytes
+        if not first:
+            # if it didn't say how many
+            if not last:
+                # the range is malformed; send the whole file
+                return None
+            # get the count
+            count = int(last)
+            # if it's zero, or the file is empty
+            if count == 0 or size == 0:
+                # there's nothing to send
+                return False
+            # otherwise, send the tail of the file
+            return max(0, size - count), size
+        # convert the range boundaries
+        start = int(first)
+        end = int(last) + 1 if last else max(size, start + 1)
+        # if they are out of order
+        if end <= start:
+            # the range is malformed; send the whole file
+            return None
+        # if the range starts past the end of the file
+        if start >= size:
+            # it can't be satisfied
+            return False
+        # otherwise, clip it
+        return start, min(end, size)
+
+    def adjust(self, status):
+        """
+        Switch my status line to the one of the response class {status}
+        """
+        # grab the code and the status description
+        self.code = status.code
+        self.status = status.status
+        # all done
+        return
+
+    def slurp(self, stream, count=-1):
+        """
+        Read {count} bytes from {stream}, or all of it, and close it
+        """
+        # make sure the stream gets closed
+        with stream:
+            # read and return the bytes
+            return stream.read(count)
 
     # meta-methods
     def __init__(self, uri, **kwds):
@@ -139,5 +322,9 @@ class File(Document):
         # all done
         return
 
+    # private data
+    ranger = re.compile(
+        r"\s*bytes\s*=\s*(?P<first>\d*)\s*-\s*(?P<last>\d*)\s*", re.IGNORECASE)
+
 
 # end of file
@@ -15,6 +15,10 @@ class Channel:
     """
 
 
+    # constants
+    iovmax = 1024 # the maximum number of buffers handed to the scatter/gather system calls
+
+
     # interface
     # channel life cycle management
     @classmethod
@@ -66,4 +70,77 @@ class Channel:
             "class {.__name__!r} must implement 'write'".format(type(self)))
 
 
+    def offer(self, bstr):
+        """
+        Write as much of {bstr} to my output channel as it can take without blocking; return
+        the number of bytes written
+        """
+        # by default, there is no way to avoid blocking, so write all of it
+        self.write(bstr=bstr)
+        # and report it
+        return len(bstr)
+
+
+    # scatter/gather input/output
+    def readv(self, buffers):
+        """
+        Fill each of the writable {buffers} in turn with bytes from my input channel; return
+        the number of bytes read, which falls short of their total size only if the channel
+        was closed
+        """
+        # reset the byte count
+        total = 0
+        # go through the buffers
+        for view in self.views(buffers):
+            # get the size of the buffer
+            size = view.nbytes
+            # read exactly that many bytes
+            data = self.read(minlen=size, maxlen=size)
+            # copy them over
+            view[:len(data)] = data
+            # update the total
+            total += len(data)
+            # if we came up short, the channel is closed; bail
+            if len(data) < size: break
+        # return the byte count
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the bytes in each of the {buffers} in turn to my output channel
+        """
+        # assemble them and write them out; subclasses that have access to the scatter/gather
+        # system calls should do better than this
+        return self.write(bstr=b''.join(buffers))
+
+
+    # implementation details
+    @staticmethod
+    def views(buffers):
+        """
+        Build flat byte views of the non-empty {buffers}
+        """
+        # cast each buffer into a sequence of bytes and skip the empty ones
+        return [ view for view in (memoryview(buffer).cast('B') for buffer in buffers)
+                 if view.nbytes ]
+
+
+    @staticmethod
+    def advance(views, count):
+        """
+        Drop {count} bytes from the front of the sequence of {views}
+        """
+        # go through the views
+        for index, view in enumerate(views):
+            # if this one has some bytes left over
+            if count < view.nbytes:
+                # keep them, along with the views that follow
+                return [ view[count:] ] + views[index+1:]
+            # otherwise, this one is exhausted
+            count -= view.nbytes
+        # if we get this far, all views are exhausted
+        return []
+
+
 # end of file
@@ -24,7 +24,7 @@ class Dispatcher(pyre.protocol, family="pyre.ipc.dispatchers"):
         """
         The suggested implementation of the {Dispatcher} protocol
         """
-        # currently, {Selector} is the only choice
+        # {Selector} works everywhere; hosts with many channels should switch to {Poller}
         from .Selector import Selector
         # so publish it
         return Selector
@@ -49,7 +49,8 @@ class Dispatcher(pyre.protocol, family="pyre.ipc.dispatchers"):
     def alarm(self, interval, call):
         """
         Schedule {call} to be invoked after {interval} elapses. {interval} is expected to be
-        a dimensional quantity from {pyre.units} with units of time
+        a dimensional quantity from {pyre.units} with units of time. Returns a handle whose
+        {cancel} method prevents the alarm from ringing
         """
 
     @pyre.export
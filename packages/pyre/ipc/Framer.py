@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import pyre
+import pickle
+import struct
+# my protocol
+from . import marshaler
+
+
+# class declaration
+class Framer(pyre.component, family="pyre.ipc.marshalers.framer", implements=marshaler):
+    """
+    A marshaler that uses pickle protocol 5 to serialize python objects, and ships their large
+    buffers without copying them
+
+    Objects that support protocol 5, such as {bytearray} instances and {numpy} arrays, hand
+    their contents to the pickler as separate buffers rather than copying them into the
+    pickle. {send} writes a frame made of a header with the length of the pickle and the
+    number of buffers, a table with the size of each buffer, the pickle, and the buffers
+    themselves using a single scatter/gather write, so none of them are copied on their way
+    to the channel. {recv} reads the header and the table, allocates the pickle and the buffers
+    at their final size and reads the rest of the frame directly into them. Buffers smaller
+    than {threshold} bytes are cheaper to copy than to ship separately, so they stay in the
+    pickle, and frames that end up with a pickle smaller than {threshold} and no buffers are
+    sent with plain reads and writes.
+
+    {Framer} and {Pickler} produce different byte streams; both ends of a channel must use the
+    same marshaler.
+    """
+
+
+    # user configurable state
+    threshold = pyre.properties.int(default=16*1024)
+    threshold.doc = "buffers smaller than this many bytes are copied into the pickle"
+
+
+    # public data
+    header = struct.Struct("<QL") # the length of the pickle and the number of buffers
+    size = struct.Struct("<Q") # the size of a buffer
+
+
+    # interface
+    @pyre.export
+    def send(self, item, channel):
+        """
+        Pack and ship {item} over {channel}
+        """
+        # the out of band buffers
+        buffers = []
+        # and the size of the smallest one
+        threshold = self.threshold
+        # pickle the item
+        body = pickle.dumps(
+            item, protocol=5,
+            buffer_callback=lambda buffer: self.collect(
+                buffer=buffer, buffers=buffers, threshold=threshold))
+        # build the header
+        header = self.header.pack(len(body), len(buffers))
+        # if everything fits in a small pickle
+        if not buffers and len(body) < threshold:
+            # it's cheaper to assemble the frame than to gather it
+            return channel.write(bstr=header + body)
+        # otherwise, build the table of buffer sizes
+        table = struct.pack(f"<{len(buffers)}Q", *(buffer.nbytes for buffer in buffers))
+        # send everything off
+        return channel.writev(buffers=[header, table, body] + buffers)
+
+
+    @pyre.export
+    def recv(self, channel):
+        """
+        Extract and return a single item from {channel}
+        """
+        # get the header; ask for exactly its size, since the channel may already hold the
+        # rest of the frame
+        size = self.header.size
+        header = channel.read(minlen=size, maxlen=size)
+        # unpack it
+        length, count = self.header.unpack(header)
+        # if there are out of band buffers
+        if count:
+            # get the table with their sizes
+            size = count * self.size.size
+            table = struct.unpack(f"<{count}Q", channel.read(minlen=size, maxlen=size))
+        # otherwise
+        else:
+            # there is nothing to read
+            table = ()
+        # if there are no buffers and the pickle is small
+        if not count and length < self.threshold:
+            # read it
+            body = channel.read(minlen=length, maxlen=length)
+            # extract the object and return it
+            return pickle.loads(body)
+        # otherwise, allocate the pickle
+        body = bytearray(length)
+        # and the buffers
+        buffers = [ bytearray(size) for size in table ]
+        # fill them
+        channel.readv(buffers=[body] + buffers)
+        # extract the object and return it
+        return pickle.loads(body, buffers=buffers)
+
+
+    # implementation details
+    def collect(self, buffer, buffers, threshold):
+        """
+        Add the contents of {buffer} to the pile of {buffers} that travel out of band, unless
+        it is smaller than {threshold} bytes
+
+        This is the {buffer_callback} of the pickler, so returning {True} keeps {buffer} in
+        band, and returning {False} moves it out of band
+        """
+        # attempt to
+        try:
+            # get a flat view of the buffer
+            raw = buffer.raw()
+        # if it's not contiguous
+        except BufferError:
+            # leave it in band
+            return True
+        # if it's too small to bother
+        if raw.nbytes < threshold:
+            # leave it in band
+            return True
+        # otherwise, add it to the pile
+        buffers.append(raw)
+        # and move it out of band
+        return False
+
+
+# end of file
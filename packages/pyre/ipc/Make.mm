@@ -13,13 +13,16 @@ PACKAGE = ipc
 EXPORT_PYTHON_MODULES = \
     Channel.py \
     Dispatcher.py \
+    Framer.py \
     Marshaler.py \
     Pickler.py \
     Pipe.py \
+    Poller.py \
     Port.py \
     PortTCP.py \
     Scheduler.py \
     Selector.py \
+    Sharer.py \
     Socket.py \
     SocketTCP.py \
     __init__.py
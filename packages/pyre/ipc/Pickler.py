@@ -53,12 +53,13 @@ class Pickler(pyre.component, family="pyre.ipc.marshalers.pickler", implements=m
         """
         Extract and return a single item from {channel}
         """
-        # get the length
-        header = channel.read(maxlen=self.headerSize)
+        # get the header; ask for exactly its size, since the channel may already hold the
+        # beginning of the next message
+        header = channel.read(minlen=self.headerSize, maxlen=self.headerSize)
         # unpack it
         length, = struct.unpack(self.packing, header)
-        # get the body
-        body = channel.read(minlen=length)
+        # get the body, and nothing past it
+        body = channel.read(minlen=length, maxlen=length)
         # extract the object and return it
         return pickle.loads(body)
 
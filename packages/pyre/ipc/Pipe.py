@@ -105,6 +105,71 @@ class Pipe(Channel):
         return os.write(self.outfd, bstr)
 
 
+    def offer(self, bstr):
+        """
+        Write as much of {bstr} to my output channel as it can take without blocking; return
+        the number of bytes written
+        """
+        # switch my output channel to non-blocking mode
+        os.set_blocking(self.outfd, False)
+        # attempt to
+        try:
+            # write
+            return os.write(self.outfd, bstr)
+        # if the channel is full
+        except BlockingIOError:
+            # nothing was written
+            return 0
+        # either way
+        finally:
+            # restore the mode
+            os.set_blocking(self.outfd, True)
+
+
+    def readv(self, buffers):
+        """
+        Fill each of the writable {buffers} in turn with bytes from my input channel; return
+        the number of bytes read, which falls short of their total size only if the channel
+        was closed
+        """
+        # get views of the buffers
+        views = self.views(buffers)
+        # reset the byte count
+        total = 0
+        # as long as there are bytes to read
+        while views:
+            # read as much as the kernel is willing to give us
+            got = os.readv(self.infd, views[:self.iovmax])
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+            # and skip over the bytes we got
+            views = self.advance(views, got)
+        # return the byte count
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the bytes in each of the {buffers} in turn to my output channel
+        """
+        # get views of the buffers
+        views = self.views(buffers)
+        # reset the byte count
+        total = 0
+        # as long as there are bytes to write
+        while views:
+            # write as much as the kernel is willing to take
+            sent = os.writev(self.outfd, views[:self.iovmax])
+            # update the total
+            total += sent
+            # and skip over the bytes that were written
+            views = self.advance(views, sent)
+        # return the byte count
+        return total
+
+
     # meta methods
     def __init__(self, infd, outfd, **kwds):
         # chain up
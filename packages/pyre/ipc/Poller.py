@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import pyre
+import selectors
+# my interface
+from . import dispatcher
+# my base class
+from .Scheduler import Scheduler
+
+
+# declaration
+class Poller(Scheduler, family='pyre.ipc.dispatchers.epoll', implements=dispatcher):
+    """
+    An event demultiplexer implemented using the {epoll} facility, through the {selectors}
+    package of the standard library
+
+    {Poller} is a drop in replacement for {Selector} that scales to large numbers of channels.
+    Rather than handing the complete set of descriptors to the kernel on every pass through
+    the event loop, it keeps its interest set registered with the kernel and updates it
+    incrementally as handlers are added and retired, so each pass costs time proportional to
+    the number of channels that are actually ready. There is no limit on the value of the
+    descriptors it can watch. On hosts without {epoll}, it falls back to the best mechanism
+    {selectors} can find.
+
+    {Poller} uses level triggered notifications: handlers are free to read or write as much as
+    they want, and {Poller} keeps reporting a channel for as long as it is ready. Edge
+    triggered notifications require every handler to drain its channel, which is not part of
+    the {dispatcher} contract.
+
+    The kernel always reports errors and hang ups on watched descriptors, and {selectors}
+    folds them into readiness. Exception handlers are therefore attached to the input side of
+    their channel, and invoked when it becomes ready and there are no read handlers waiting on
+    it; otherwise the read handlers discover the condition when they access the channel.
+    """
+
+
+    # interface
+    @pyre.export
+    def whenReadReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be read
+        """
+        # add it to the pile
+        self._watch(index=self._read, descriptor=channel.inbound, channel=channel, call=call)
+        # and return
+        return
+
+
+    @pyre.export
+    def whenWriteReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be written
+        """
+        # add it to the pile
+        self._watch(index=self._write, descriptor=channel.outbound, channel=channel, call=call)
+        # and return
+        return
+
+
+    @pyre.export
+    def whenException(self, channel, call):
+        """
+        Add {call} to the list of routines to call when something exceptional has happened
+        to {channel}
+        """
+        # add it to the pile
+        self._watch(index=self._exception, descriptor=channel.inbound, channel=channel, call=call)
+        # and return
+        return
+
+
+    @pyre.export
+    def stop(self):
+        """
+        Request the poller to stop watching for further events
+        """
+        # adjust my state
+        self._watching = False
+        # and return
+        return
+
+
+    @pyre.export
+    def watch(self):
+        """
+        Enter an indefinite loop of monitoring all registered event sources and invoking the
+        registered event handlers
+        """
+        # reset my state
+        self._watching = True
+        # grab a channel
+        channel = self._debug
+        # and my kernel interface
+        selector = self._selector
+        # until someone says otherwise
+        while self._watching:
+            # compute how long i am allowed to be asleep
+            timeout = self.poll()
+            # show me
+            channel.log(f"watching {len(self._interest)} descriptors; max sleep: {timeout}")
+
+            # check for indefinite block
+            if not self._interest and timeout is None:
+                channel.log("** no registered handlers left; exiting")
+                return
+
+            # wait for an event; interruptions by signals are retried by {selectors}, after
+            # the signal handlers have had a chance to run
+            ready = selector.select(timeout)
+            # show me
+            channel.log(f"activity detected: {len(ready)} descriptors")
+
+            # go through the descriptors that are ready
+            for key, events in ready:
+                # get the descriptor
+                descriptor = key.fileobj
+                # if it is ready to be written
+                if events & selectors.EVENT_WRITE:
+                    # invoke the write handlers
+                    self.dispatch(index=self._write, descriptor=descriptor)
+                # if it is ready to be read
+                if events & selectors.EVENT_READ:
+                    # invoke the read handlers, if there are any; otherwise, the descriptor
+                    # is being watched for exceptional conditions
+                    index = self._read if descriptor in self._read else self._exception
+                    # dispatch
+                    self.dispatch(index=index, descriptor=descriptor)
+                # adjust the interest in this descriptor
+                self._update(descriptor=descriptor)
+
+            # raise the overdue alarms
+            self.awaken()
+
+        # sign off
+        channel.log("done watching")
+        # all done
+        return
+
+
+    def dispatch(self, index, descriptor):
+        """
+        Invoke the handlers registered in {index} that are associated with {descriptor}
+        """
+        # grab the events, if they are still there
+        events = index.pop(descriptor, None)
+        # if not, there is nothing to do
+        if not events: return
+        # invoke the event handlers and save the events whose handlers return {True}
+        events = [event for event in events if event.handler(channel=event.channel)]
+        # if any handlers requested to be rescheduled
+        if events:
+            # put them back, ahead of any handlers that were registered while dispatching
+            index[descriptor] = events + index.get(descriptor, [])
+        # all done
+        return
+
+
+    # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+
+        # my file descriptor event indices
+        self._read = {}
+        self._write = {}
+        self._exception = {}
+        # the events each descriptor is currently registered for
+        self._interest = {}
+        # my interface to the kernel; prefer {epoll} when available
+        factory = getattr(selectors, 'EpollSelector', selectors.DefaultSelector)
+        self._selector = factory()
+
+        # my debug aspect
+        import journal
+        self._debug = journal.debug('pyre.ipc.poller')
+
+        # all done
+        return
+
+
+    # implementation details
+    def _watch(self, index, descriptor, channel, call):
+        """
+        Add a handler that invokes {call} with {channel} to the pile in {index} associated with
+        {descriptor}
+        """
+        # add the event to the pile
+        index.setdefault(descriptor, []).append(self._event(channel=channel, handler=call))
+        # and make sure the kernel knows about it
+        self._update(descriptor=descriptor)
+        # all done
+        return
+
+
+    def _update(self, descriptor):
+        """
+        Bring the registration of {descriptor} with the kernel in sync with its handlers
+        """
+        # figure out the events that have handlers
+        events = 0
+        # input and exceptional conditions are both reported as read readiness
+        if descriptor in self._read or descriptor in self._exception:
+            events |= selectors.EVENT_READ
+        # output
+        if descriptor in self._write:
+            events |= selectors.EVENT_WRITE
+        # look up the current registration
+        current = self._interest.get(descriptor, 0)
+        # if nothing has changed
+        if events == current:
+            # we are done
+            return
+        # get my kernel interface
+        selector = self._selector
+        # if there are no more handlers
+        if not events:
+            # forget the descriptor
+            del self._interest[descriptor]
+            # attempt to
+            try:
+                # remove it from the kernel interest set
+                selector.unregister(descriptor)
+            # if it was closed by one of its handlers
+            except (KeyError, ValueError, OSError):
+                # the kernel has forgotten about it already
+                pass
+            # all done
+            return
+        # if the descriptor is registered
+        if current:
+            # modify its registration
+            selector.modify(descriptor, events)
+        # otherwise
+        else:
+            # register it
+            selector.register(descriptor, events)
+        # record the new state
+        self._interest[descriptor] = events
+        # all done
+        return
+
+
+    # private types
+    class _event:
+        """Encapsulate a channel and the associated call-back"""
+
+        def __init__(self, channel, handler):
+            self.channel = channel
+            self.handler = handler
+            return
+
+        __slots__ = ('channel', 'handler')
+
+
+    # private data
+    _watching = True # controls whether to continue monitoring the event sources
+
+
+# end of file
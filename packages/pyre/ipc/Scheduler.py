@@ -8,8 +8,10 @@
 
 # externals
 import pyre
-import operator
-from time import time as now
+import heapq
+import itertools
+import weakref
+from time import monotonic as now
 
 
 # declaration
@@ -22,9 +24,15 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
     to be a dimensional quantity with units of time.
 
     The current implementation converts the time interval before the alarm comes due into an
-    absolute time, and pairs it with the handler into an {_alarm} instance. The {_alarm} is
-    then stored into a list of such {_alarms}, and the list is sorted in reverse order,
-    i.e. with the alarm that is due next at the end of the list.
+    absolute time on the monotonic clock, and pairs it with the handler into an {_alarm}
+    instance. The {_alarm} is then pushed onto a heap of such {_alarms}, ordered by the time
+    they come due and, among alarms that are due at the same time, by the order in which they
+    were scheduled. Scheduling an alarm costs time proportional to the logarithm of the number
+    of pending alarms.
+
+    {alarm} returns the {_alarm} instance, which can be used to {cancel} it. Cancelled alarms
+    stay in the heap until they reach its top, unless they start to outnumber the live ones, in
+    which case the heap is rebuilt without them.
     """
 
 
@@ -41,14 +49,43 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         parameters:
            {call}: a function that takes the current time and returns a reschedule interval
            {interval}: a dimensional quantity from {pyre.units} with units of time
+
+        The return value is a handle to the new alarm that can be used to cancel it.
         """
         # create a new alarm instance
-        alarm = self._alarm(time=now()+interval/self.second, handler=call)
-        # add it to my list
-        self._alarms.append(alarm)
-        # sort
-        self._alarms.sort(key=operator.attrgetter('time'), reverse=True)
-        # and return
+        alarm = self._alarm(time=now()+self.seconds(interval), handler=call, scheduler=self)
+        # add it to the pile
+        self._schedule(alarm)
+        # and return it
+        return alarm
+
+
+    def cancel(self, alarm):
+        """
+        Prevent {alarm} from ringing
+        """
+        # if it has been cancelled already
+        if alarm.handler is None:
+            # there is nothing to do
+            return
+        # otherwise, disable it
+        alarm.handler = None
+        # if it is ringing, it has been removed from the heap already
+        if alarm.ringing:
+            # so there is nothing else to do
+            return
+        # get my alarms
+        alarms = self._alarms
+        # update the tally of the dead entries
+        alarms.cancelled += 1
+        # if they have started to outnumber the live ones
+        if 2 * alarms.cancelled > len(alarms):
+            # rebuild the heap without them
+            alarms[:] = [entry for entry in alarms if entry[2].handler is not None]
+            heapq.heapify(alarms)
+            # and reset the tally
+            alarms.cancelled = 0
+        # all done
         return
 
 
@@ -60,21 +97,22 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         returns 0. This slightly strange logic is designed to satisfy the requirements for
         calling {select}.
         """
-        # the necessary information is in the last entry in my {_alarms}, since they are
-        # always in descending order
-        try:
-            # try to grab it
-            alarm = self._alarms[-1]
-        # if there is nothing there
-        except IndexError:
-            # we have no scheduled alarms
-            return None
-        # if it succeeded
-        else:
-            # get the scheduled time
-            due = alarm.time
-        # return the number of seconds until it comes due, bound from below
-        return max(0, due - now())
+        # get my alarms
+        alarms = self._alarms
+        # the necessary information is at the top of the heap
+        while alarms:
+            # grab it
+            due, _, alarm = alarms[0]
+            # if it is live
+            if alarm.handler is not None:
+                # return the number of seconds until it comes due, bound from below
+                return max(0, due - now())
+            # otherwise, discard it
+            heapq.heappop(alarms)
+            # and adjust the tally of the dead entries
+            alarms.cancelled -= 1
+        # if we get this far, there are no scheduled alarms
+        return None
 
 
     def awaken(self):
@@ -88,28 +126,37 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         # get the time
         time = now()
 
-        # iterate through my alarms
-        while 1:
-            # attempt
+        # as long as the alarm at the top of the heap is overdue
+        while alarms and alarms[0][0] <= time:
+            # grab it
+            _, _, alarm = heapq.heappop(alarms)
+            # get its handler
+            handler = alarm.handler
+            # if the alarm was cancelled
+            if handler is None:
+                # adjust the tally of the dead entries
+                alarms.cancelled -= 1
+                # and move on
+                continue
+            # otherwise, mark it as ringing, since it is no longer in the heap
+            alarm.ringing = True
+            # carefully
             try:
-                # to grab one
-                alarm = alarms.pop()
-            # if none are left
-            except IndexError:
-                # we are all done raising alarms
-                break
-            # if this alarm is not due yet
-            if time < alarm.time:
-                # put it back at the end of the list
-                alarms.append(alarm)
-                # no need to look any further
-                break
-            # otherwise, this alarm is overdue; invoke the handler
-            delta = alarm.handler(timestamp=time)
-            # if the handler indicated that it wants to reschedule this alarm
-            if delta:
+                # invoke the handler
+                delta = handler(timestamp=time)
+            # no matter what happens
+            finally:
+                # the alarm is done ringing
+                alarm.ringing = False
+            # if the handler indicated that it wants to reschedule this alarm, and didn't
+            # cancel it in the process
+            if delta and alarm.handler is not None:
                 # save it
-                reschedule.append((delta, alarm.handler))
+                reschedule.append((delta, alarm))
+            # if the handler is done with it
+            else:
+                # disable it, so that attempts to cancel it are harmless
+                alarm.handler = None
 
         # if there is nothing to reschedule
         if not reschedule:
@@ -119,46 +166,102 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         # otherwise, get a fresh timestamp
         time = now()
         # go through the pile
-        for interval, call in reschedule:
-            # create a new alarm instance
-            alarm = self._alarm(time=time+interval/self.second, handler=call)
-            # add it to my list
-            self._alarms.append(alarm)
-        # sort
-        self._alarms.sort(key=operator.attrgetter('time'), reverse=True)
+        for interval, alarm in reschedule:
+            # compute the new due time
+            alarm.time = time + self.seconds(interval)
+            # and put the alarm back on the heap
+            self._schedule(alarm)
 
         # all done
         return
 
 
+    def seconds(self, interval):
+        """
+        Convert {interval} into a number of seconds
+        """
+        # attempt to
+        try:
+            # take the shortcut for quantities with units of time
+            if interval.derivation == self._time: return interval.value
+        # if {interval} is not a dimensional quantity
+        except AttributeError:
+            # no worries; let the units package sort it out
+            pass
+        # do it the hard way
+        return interval / self.second
+
+
     # meta methods
     def __init__(self, **kwds):
         # chain up
         super().__init__(**kwds)
-        # the list of alarms; kept sorted in descending order by alarm time, i.e. with the next
-        # alarm to go off at the end of the list
-        self._alarms = []
+        # the heap of alarms; each entry is a triplet with the time the alarm comes due, a
+        # sequence number that breaks ties, and the alarm itself
+        self._alarms = self._heap()
         # all done
         return
 
 
     # implementation details
+    def _schedule(self, alarm):
+        """
+        Add {alarm} to my heap
+        """
+        # get my alarms
+        alarms = self._alarms
+        # push
+        heapq.heappush(alarms, (alarm.time, next(alarms.sequence), alarm))
+        # all done
+        return
+
+
     # private types
+    class _heap(list):
+        """
+        The pile of alarms, along with its bookkeeping; this is kept out of the component
+        itself, since its attributes are expensive to modify
+        """
+
+        def __init__(self):
+            # the source of sequence numbers
+            self.sequence = itertools.count()
+            # the number of cancelled alarms still in the heap
+            self.cancelled = 0
+            return
+
     class _alarm:
         """Encapsulate the time and event handler of an alarm"""
 
-        def __init__(self, time, handler):
+        def cancel(self):
+            """Prevent this alarm from ringing"""
+            # get my scheduler
+            scheduler = self.scheduler()
+            # if it's gone, there is no one left to ring me
+            if scheduler is None:
+                # so just disable me
+                self.handler = None
+                return
+            # otherwise, ask it to cancel me
+            return scheduler.cancel(self)
+
+        def __init__(self, time, handler, scheduler):
             self.time = time
             self.handler = handler
+            # the scheduler owns its alarms, so refer to it weakly to avoid a cycle
+            self.scheduler = weakref.ref(scheduler)
+            # set while the handler is being invoked
+            self.ringing = False
             return
 
         def __str__(self): return "alarm: {.time}".format(self)
 
-        __slots__ = ('time', 'handler')
+        __slots__ = ('time', 'handler', 'scheduler', 'ringing')
 
 
     # private data
     _alarms = None
+    _time = second.derivation
 
 
 # end of file
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import itertools
+import mmap
+import os
+import pickle
+import tempfile
+# support
+import pyre
+# my base class
+from .Pickler import Pickler
+
+
+# class declaration
+class Sharer(Pickler, family="pyre.ipc.marshalers.sharer"):
+    """
+    A marshaler for processes on the same host that moves large buffers through shared memory
+
+    Objects are pickled using protocol 5, which lets objects that support it, such as
+    {bytearray} instances and {numpy} arrays, hand their contents over as separate buffers.
+    Buffers that are at least {threshold} bytes long are copied into files in the {arena}
+    directory, a memory backed file system by default, and only their names and sizes travel
+    through the channel along with the rest of the pickle. The receiving side maps each file
+    into its address space and removes its name, so the memory is returned to the system as
+    soon as the reconstructed object lets go of it. The mappings are private, so the receiver
+    may modify the objects it gets without affecting anybody else.
+
+    Both ends of the channel must have access to the {arena}; objects that are sent but never
+    received leave their files behind.
+    """
+
+
+    # user configurable state
+    threshold = pyre.properties.int(default=64*1024)
+    threshold.doc = "buffers of at least this many bytes are moved through shared memory"
+
+    arena = pyre.properties.path(default=None)
+    arena.doc = "the directory for the shared memory segments; defaults to /dev/shm, if present"
+
+
+    # interface
+    @pyre.export
+    def send(self, item, channel):
+        """
+        Pack and ship {item} over {channel}
+        """
+        # the segments that hold the large buffers
+        segments = []
+        # pickle the item, keeping its large buffers out of band
+        body = pickle.dumps(
+            item, protocol=5,
+            buffer_callback=lambda buffer: self.share(buffer=buffer, segments=segments))
+        # ship the segment handles and the body
+        return super().send(item=(segments, body), channel=channel)
+
+
+    @pyre.export
+    def recv(self, channel):
+        """
+        Extract and return a single item from {channel}
+        """
+        # get the segment handles and the body
+        segments, body = super().recv(channel=channel)
+        # map the segments
+        buffers = [ self.attach(path=path, size=size) for path, size in segments ]
+        # extract the object and return it
+        return pickle.loads(body, buffers=buffers)
+
+
+    # implementation details
+    def share(self, buffer, segments):
+        """
+        Decide whether to move {buffer} through shared memory; if so, copy it into a new
+        segment and add its handle to the pile of {segments}
+
+        This is the {buffer_callback} of the pickler, so returning {True} keeps {buffer} in
+        band, and returning {False} moves it out of band
+        """
+        # attempt to
+        try:
+            # get a flat view of the buffer
+            raw = buffer.raw()
+        # if it's not contiguous
+        except BufferError:
+            # leave it in band
+            return True
+        # get its size
+        size = raw.nbytes
+        # if it's too small to bother
+        if size < max(1, self.threshold):
+            # leave it in band
+            return True
+        # make a segment
+        path, fd = self.segment()
+        # carefully
+        try:
+            # copy the buffer into it; {os.write} may not take all of it in one call
+            written = 0
+            while written < size:
+                written += os.write(fd, raw[written:])
+        # if anything goes wrong
+        except Exception:
+            # get rid of the segment
+            os.unlink(path)
+            # and complain
+            raise
+        # either way
+        finally:
+            # we are done with the descriptor
+            os.close(fd)
+        # record the segment handle
+        segments.append((path, size))
+        # and move the buffer out of band
+        return False
+
+
+    def segment(self):
+        """
+        Create a new shared memory segment and return its path and an open file descriptor
+        """
+        # get the arena
+        arena = self.folder()
+        # try until we find a name that's not taken
+        while True:
+            # build a name
+            path = os.path.join(arena, f"pyre-{os.getpid()}-{next(self._serial)}")
+            # attempt to
+            try:
+                # create it; make sure we don't clobber anybody else's segment
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            # if the name is taken
+            except FileExistsError:
+                # try another one
+                continue
+            # all done
+            return path, fd
+
+
+    def attach(self, path, size):
+        """
+        Map the segment at {path} into my address space and remove its name
+        """
+        # open the file
+        fd = os.open(path, os.O_RDONLY)
+        # carefully
+        try:
+            # map it; copy on write, so the receiver gets a writable object
+            segment = mmap.mmap(fd, size, access=mmap.ACCESS_COPY)
+        # either way
+        finally:
+            # the mapping doesn't need the descriptor
+            os.close(fd)
+            # or the name
+            os.unlink(path)
+        # all done
+        return segment
+
+
+    def folder(self):
+        """
+        Figure out where to place the shared memory segments
+        """
+        # if i have an arena
+        if self.arena:
+            # use it
+            return str(self.arena)
+        # otherwise, use the memory backed file system, if there is one
+        if os.path.isdir(self.shm): return self.shm
+        # or the temporary directory
+        return tempfile.gettempdir()
+
+
+    # private data
+    shm = "/dev/shm"
+    _serial = itertools.count()
+
+
+# end of file
@@ -62,6 +62,65 @@ class SocketTCP(Socket):
         return len(bstr)
 
 
+    def offer(self, bstr):
+        """
+        Write as much of {bstr} to my output channel as it can take without blocking; return
+        the number of bytes written
+        """
+        # attempt to
+        try:
+            # send without waiting for room in the kernel buffers
+            return self.send(bstr, socket.MSG_DONTWAIT)
+        # if there isn't any
+        except BlockingIOError:
+            # nothing was written
+            return 0
+
+
+    def readv(self, buffers):
+        """
+        Fill each of the writable {buffers} in turn with bytes from my input channel; return
+        the number of bytes read, which falls short of their total size only if the channel
+        was closed
+        """
+        # get views of the buffers
+        views = self.views(buffers)
+        # reset the byte count
+        total = 0
+        # as long as there are bytes to read
+        while views:
+            # read as much as is available
+            got, *_ = self.recvmsg_into(views[:self.iovmax])
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+            # and skip over the bytes we got
+            views = self.advance(views, got)
+        # return the byte count
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the bytes in each of the {buffers} in turn to my output channel
+        """
+        # get views of the buffers
+        views = self.views(buffers)
+        # reset the byte count
+        total = 0
+        # as long as there are bytes to write
+        while views:
+            # send as much as the kernel is willing to take
+            sent = self.sendmsg(views[:self.iovmax])
+            # update the total
+            total += sent
+            # and skip over the bytes that were sent
+            views = self.advance(views, sent)
+        # return the byte count
+        return total
+
+
     # meta-methods
     def __str__(self):
         return "tcp socket to {.peer}".format(self)
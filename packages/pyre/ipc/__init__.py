@@ -68,6 +68,26 @@ from .Dispatcher import Dispatcher as dispatcher
 from .Marshaler import Marshaler as marshaler
 
 # my component foundries
+@foundry(implements=dispatcher)
+def epoll():
+    """
+    A scheduler that can listen to large numbers of file objects
+    """
+    # grab the component class record
+    from .Poller import Poller as poller
+    # and return it
+    return poller
+
+@foundry(implements=marshaler)
+def framer():
+    """
+    A marshaler that ships large buffers without copying them
+    """
+    # grab the component class record
+    from .Framer import Framer as framer
+    # and return it
+    return framer
+
 @foundry(implements=marshaler)
 def pickler():
     """
@@ -98,8 +118,27 @@ def selector():
     # and return it
     return selector
 
+@foundry(implements=marshaler)
+def sharer():
+    """
+    A marshaler that moves large buffers through shared memory
+    """
+    # grab the component class record
+    from .Sharer import Sharer as sharer
+    # and return it
+    return sharer
+
 
 # my component factories; use to build an actual instance
+def newFramer(**kwds):
+    """
+    A marshaler that ships large buffers without copying them
+    """
+    # grab the component class record
+    from .Framer import Framer as framer
+    # and return it
+    return framer(**kwds)
+
 def newPickler(**kwds):
     """
     A marshaler that uses native python services to serialize objects
@@ -109,6 +148,15 @@ def newPickler(**kwds):
     # and return it
     return pickler(**kwds)
 
+def newPoller(**kwds):
+    """
+    A scheduler that can listen to large numbers of file objects
+    """
+    # grab the component class record
+    from .Poller import Poller as poller
+    # and return it
+    return poller(**kwds)
+
 def newScheduler(**kwds):
     """
     A component that enables the construction of applications with event loops
@@ -127,5 +175,14 @@ def newSelector(**kwds):
     # and return it
     return selector(**kwds)
 
+def newSharer(**kwds):
+    """
+    A marshaler that moves large buffers through shared memory
+    """
+    # grab the component class record
+    from .Sharer import Sharer as sharer
+    # and return it
+    return sharer(**kwds)
+
 
 # end of file
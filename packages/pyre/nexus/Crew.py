@@ -7,7 +7,9 @@
 
 
 # externals
+import collections
 import functools
+import time
 # my base class
 from .Peer import Peer
 
@@ -30,6 +32,14 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
     schedules the execution of a {task} by invoking the team side interface. The crew instance
     serializes the task and sends it off to its remote twin for execution, monitors progress,
     and reports the task result back to the host application.
+
+    Tasks travel in batches, and the team may send further batches before the results of the
+    earlier ones come back. The worker side executes the batches in the order they arrive, and
+    reports the status of the tasks in each batch in a single message; the team side keeps
+    track of the batches in flight and matches each report with the oldest one. The team side
+    never blocks while sending batches: they are serialized into an outbox that is written out
+    whenever the channel can take more bytes, so the team keeps harvesting reports while its
+    twin is busy writing them, no matter how large the messages get in either direction.
     """
 
     # types
@@ -75,48 +85,137 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return False
 
 
-    def execute(self, team, task):
+    @property
+    def load(self):
         """
-        Send my twin the {task} to be executed
+        The number of tasks i have in flight
         """
-        # send the task
-        self.marshaler.send(channel=self.channel, item=task)
-        # schedule the harvesting of the result
-        self.dispatcher.whenReadReady(
-            channel = self.channel,
-            call = functools.partial(self.assess, team=team, task=task))
+        # add up the sizes of my outstanding batches
+        return sum(map(len, self.inflight))
+
+
+    def execute(self, team, tasks):
+        """
+        Send my twin the batch of {tasks} to be executed
+        """
+        # get my batches in flight
+        inflight = self.inflight
+        # serialize the tasks into my outbox
+        self.marshaler.send(channel=self.outbox, item=tasks)
+        # and arrange for them to be sent
+        self.post()
+        # if this is the only batch in flight, nobody is listening for results
+        if not inflight:
+            # so schedule the harvesting
+            self.dispatcher.whenReadReady(
+                channel = self.channel,
+                call = functools.partial(self.assess, team=team))
+        # add the batch to the pile
+        inflight.append(tasks)
         # all done
         return self
 
 
-    def assess(self, channel, team, task, **kwds):
+    def post(self):
         """
-        Harvest the task completion status
+        Arrange for the contents of my outbox to be sent whenever my channel can take them
+        """
+        # if this is already taken care of
+        if self.posting:
+            # nothing further to do
+            return self
+        # otherwise, mark it
+        self.posting = True
+        # and flush my outbox when my channel is ready
+        self.dispatcher.whenWriteReady(channel=self.channel, call=self.flush)
+        # all done
+        return self
+
+
+    def flush(self, channel, **kwds):
+        """
+        Send as much of my outbox as my channel can take without blocking
+
+        N.B.: this is an event handler; careful with its return value
+        """
+        # get the pending bytes
+        pending = self.outbox.pending
+        # if there are any
+        if pending:
+            # send what the channel can take
+            sent = channel.offer(bstr=pending)
+            # and forget about them
+            del pending[:sent]
+        # if there is more to send
+        if pending:
+            # reschedule
+            return True
+        # otherwise, i'm done posting
+        self.posting = False
+        # if i have resigned while there was still a flush pending
+        if self.finish is not None:
+            # i'm in charge of closing my communication channel
+            channel.close()
+        # don't reschedule
+        return False
+
+
+    def recall(self):
+        """
+        Withdraw the tasks i have in flight
+        """
+        # collect them
+        tasks = [task for batch in self.inflight for task in batch]
+        # forget them
+        self.inflight.clear()
+        # and return them
+        return tasks
+
+
+    def assess(self, channel, team, **kwds):
+        """
+        Harvest the completion status of the oldest batch of tasks in flight
         """
         # grab the report
-        memberstatus, taskstatus, result = self.marshaler.recv(channel=channel)
+        memberstatus, reports = self.marshaler.recv(channel=channel)
+        # and the batch it is about
+        tasks = self.inflight.popleft()
         # show me on the debug channel
-        self.debug.log('{me.pid}: {member}, {task}, {result}'.format(
-            me=self, member=memberstatus, task=taskstatus, result=result))
-
-        # first, let's figure out what to do with the task; if it failed due to some temporary
-        # condition
-        if taskstatus is self.taskcodes.failed:
-            # tell me
-            self.reportRecoverableError(team=team, task=task, error=result)
-            # put the task back in the workplan
-            team.workplan.add(task)
+        if self.debug: self.debug.log(f'{self.pid}: {memberstatus}, {reports}')
+
+        # go through the tasks that were attempted
+        for task, (taskstatus, result, elapsed) in zip(tasks, reports):
+            # if the task completed successfully
+            if taskstatus is self.taskcodes.completed:
+                # record its execution time
+                team.workplan.complete(task=task, elapsed=elapsed)
+                # hand the result to the team
+                team.harvest(task=task, result=result)
+            # if the task failed due to some temporary condition
+            elif taskstatus is self.taskcodes.failed:
+                # tell me
+                self.reportRecoverableError(team=team, task=task, error=result)
+                # put the task back in the workplan
+                team.workplan.add(task)
+        # the tasks my twin didn't get to go back in the workplan
+        team.workplan.update(tasks[len(reports):])
 
         # now, let's figure out what to do with me; if i'm healthy
         if memberstatus is self.crewcodes.healthy:
             # put me back in the work queue
             team.schedule(crew=self)
-        # otherwise
-        else:
-            # tell me
-            self.reportUnrecoverableError(team=team, task=task, error=result)
-            # dismiss me
-            team.dismiss(crew=self)
+            # and keep listening as long as i have work in flight
+            return bool(self.inflight)
+
+        # otherwise, the last report is about the task that damaged me
+        task = tasks[len(reports)-1]
+        _, result, _ = reports[-1]
+        # tell me
+        self.reportUnrecoverableError(team=team, task=task, error=result)
+        # the task will not be attempted again
+        team.workplan.abandon(task)
+        # dismiss me
+        team.dismiss(crew=self)
 
         # all done
         return False
@@ -126,8 +225,12 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         """
         My team manager has dismissed me
         """
-        # send the end-of-tasks marker
-        self.marshaler.send(channel=self.channel, item=None)
+        # append the end-of-tasks marker to my outbox
+        self.marshaler.send(channel=self.outbox, item=None)
+        # my twin is reading whatever is left, so it's safe to wait for all of it to go out
+        pending = self.outbox.pending
+        self.channel.write(bstr=bytes(pending))
+        pending.clear()
         # clean up
         self.resign()
         # leave a note
@@ -183,53 +286,58 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
 
     def perform(self, channel, **kwds):
         """
-        A notification has arrived that indicates there is a task waiting to be executed
+        A notification has arrived that indicates there is a batch of tasks waiting to be
+        executed
         """
-        # extract the task from the channel
-        task = self.marshaler.recv(channel=channel)
+        # extract the tasks from the channel
+        tasks = self.marshaler.recv(channel=channel)
         # leave a note
-        self.debug.log('{me.pid}: got {task}'.format(me=self, task=task))
+        if self.debug: self.debug.log(f'{self.pid}: got {tasks}')
         # if it's a quit marker
-        if task is None:
+        if tasks is None:
             # we are all done
             self.stop()
             # don't reschedule this handler
             return False
-
-        # otherwise, try to
-        try:
-            # execute the task and collect its result
-            result = self.engage(task=task, **kwds)
-        # if the task failure is recoverable
-        except self.RecoverableError as error:
-            # prepare a report with an error code for the task
-            taskstatus = self.taskcodes.failed
-            # a clean bill of health for me
-            crewstatus = self.crewcodes.healthy
-            # and attach the error description
-            result = error
-        # if anything else goes wrong
-        except Exception as error:
-            # prepare a report with an error code for the task
-            taskstatus = self.taskcodes.aborted
-            # mark me as damaged
-            crewstatus = self.crewcodes.damaged
-            # and attach the error description
-            result = error
-        # if all goes well
-        else:
-            # indicate task success
-            taskstatus = self.taskcodes.completed
-            # and a clean bill of health for me
-            crewstatus = self.crewcodes.healthy
-
-        # schedule the reporting of the execution of this task
+        # if i was damaged by an earlier task
+        if self.damaged:
+            # my team has stopped listening to me; discard the tasks and wait to be dismissed
+            return True
+
+        # start out healthy
+        crewstatus = self.crewcodes.healthy
+        # the status of the tasks i attempted
+        reports = []
+        # go through the tasks
+        for task in tasks:
+            # start the clock
+            start = time.perf_counter()
+            # try to
+            try:
+                # execute the task and collect its result
+                result = self.engage(task=task, **kwds)
+            # if the task failure is recoverable
+            except self.RecoverableError as error:
+                # prepare a report with an error code for the task and the error description
+                reports.append((self.taskcodes.failed, error, time.perf_counter() - start))
+            # if anything else goes wrong
+            except Exception as error:
+                # prepare a report with an error code for the task and the error description
+                reports.append((self.taskcodes.aborted, error, time.perf_counter() - start))
+                # mark me as damaged
+                crewstatus = self.crewcodes.damaged
+                self.damaged = True
+                # and don't attempt any more tasks
+                break
+            # if all goes well
+            else:
+                # indicate task success, along with the time it took
+                reports.append((self.taskcodes.completed, result, time.perf_counter() - start))
+
+        # schedule the reporting of the execution of this batch
         self.dispatcher.whenWriteReady(
             channel = channel,
-            call = functools.partial(self.report,
-                                     result = result,
-                                     crewstatus = crewstatus,
-                                     taskstatus = taskstatus))
+            call = functools.partial(self.report, reports=reports, crewstatus=crewstatus))
 
         # and go back to waiting for more
         return True
@@ -243,14 +351,14 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return task(**kwds)
 
 
-    def report(self, channel, crewstatus, taskstatus, result, **kwds):
+    def report(self, channel, crewstatus, reports, **kwds):
         """
-        Post the task completion {report}
+        Post the completion {reports} of a batch of tasks
         """
         # make a report
-        report = (crewstatus, taskstatus, result)
+        report = (crewstatus, reports)
         # tell me
-        self.debug.log('{me.pid}: sending report {report}'.format(me=self, report=report))
+        if self.debug: self.debug.log(f'{self.pid}: sending report {report}')
         # serialize and send
         self.marshaler.send(channel=channel, item=report)
         # all done; don't reschedule
@@ -260,8 +368,9 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
     def resign(self):
         # record my finish time; don't mess with the timer too much as it might not belong to me
         self.finish = self.timer.lap()
-        # close my communication channel
-        self.channel.close()
+        # close my communication channel, unless a flush is pending; it is registered with the
+        # dispatcher, so it gets to close the channel when it runs
+        if not self.posting: self.channel.close()
         # all done
         return self
 
@@ -274,8 +383,49 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         self.pid = pid
         # save the communication channel to my twin
         self.channel = channel
+        # the batches of tasks i have in flight
+        self.inflight = collections.deque()
+        # and the serialized batches that are waiting to be sent
+        self.outbox = self.Outbox()
         # all done
         return
 
 
+    # implementation details
+    class Outbox:
+        """
+        A stand-in for a channel that collects the bytes written to it by a marshaler
+        """
+
+        def write(self, bstr):
+            """
+            Save the bytes in {bstr}
+            """
+            # add them to the pile
+            self.pending += bstr
+            # and report them as written
+            return len(bstr)
+
+        def writev(self, buffers):
+            """
+            Save the bytes in each of the {buffers} in turn
+            """
+            # add them up
+            return sum(self.write(bstr=buffer) for buffer in buffers)
+
+        def __init__(self):
+            # the bytes waiting to be sent
+            self.pending = bytearray()
+            # all done
+            return
+
+        __slots__ = ["pending"]
+
+
+    # private data
+    damaged = False # set on the worker side when a task fails in a way that compromises me
+    finish = None # the time i resigned
+    posting = False # set on the team side while my outbox is waiting for my channel
+
+
 # end of file
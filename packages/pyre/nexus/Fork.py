@@ -54,6 +54,8 @@ class Fork(pyre.component, family='pyre.nexus.recruiters.fork', implements=Recru
         if pid == 0:
             # make a team member
             crew = team.crew(pid=os.getpid(), channel=parent, **kwds)
+            # it must speak the same language as the team
+            crew.marshaler = team.marshaler
             # ask it to register with the team
             crew.register()
             # spin up and carry out tasks until there is nothing more to do
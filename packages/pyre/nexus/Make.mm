@@ -25,6 +25,7 @@ EXPORT_PYTHON_MODULES = \
     Task.py \
     TaskStatus.py \
     Team.py \
+    Workplan.py \
     exceptions.py \
     __init__.py
 
@@ -16,12 +16,23 @@ from .Peer import Peer
 from .Team import Team
 # my user configurable state
 from .Recruiter import Recruiter
+# the pending tasks
+from .Workplan import Workplan
 
 
 # declaration
 class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     """
     A process collective that coöperate to carry out a work plan
+
+    Each crew member is sent up to {batch} tasks per message, and may have up to {prefetch}
+    tasks in flight, so it can start on its next batch while the results of the previous one
+    are making their way back to the team. The defaults send one task at a time and wait for
+    its result before sending the next one; raise them when the tasks are short compared to
+    the time it takes to exchange messages with the crew.
+
+    The order in which tasks are handed out is determined by the scheduling {policy}; see
+    {Workplan} for the available choices, and for the latency statistics it collects.
     """
 
 
@@ -36,6 +47,16 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     recruiter = Recruiter()
     recruiter.doc = 'the strategy for recruiting crew members'
 
+    prefetch = pyre.properties.int(default=1)
+    prefetch.doc = 'the maximum number of tasks each crew member can have in flight'
+
+    batch = pyre.properties.int(default=1)
+    batch.doc = 'the maximum number of tasks sent to a crew member in a single message'
+
+    policy = pyre.properties.str(default='fifo')
+    policy.doc = 'the order in which tasks are handed out: fifo, priority, lpt, or affinity'
+    policy.validators = pyre.constraints.isMember(*Workplan.policies)
+
 
     # interface
     @pyre.export
@@ -53,6 +74,8 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         channel.line('  registered crew members: {}'.format(len(self.registered)))
         channel.line('  active crew members: {}'.format(len(self.active)))
 
+        # make sure the workplan follows the current policy
+        if self.workplan.policy != self.policy: self.workplan.adopt(policy=self.policy)
         # add the new tasks to the workplan
         self.workplan |= workplan
         # tell me
@@ -103,9 +126,11 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         self.registered = set()
         self.active = set()
         self.retired = set()
+        # the crew members that are waiting for their channel to become ready for more tasks
+        self.scheduled = set()
 
-        # my workplan is the set of tasks that are pending
-        self.workplan = set()
+        # my workplan holds the tasks that are pending
+        self.workplan = Workplan(policy=self.policy)
 
         # all done
         return
@@ -140,7 +165,13 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         Add the given {crew} member to the execution schedule
         """
-        # start sending tasks when the worker is ready to listen
+        # if it's already there
+        if crew in self.scheduled:
+            # nothing further to do
+            return self
+        # otherwise, mark it
+        self.scheduled.add(crew)
+        # and start sending tasks when the worker is ready to listen
         self.dispatcher.whenWriteReady(
             channel = crew.channel,
             call = functools.partial(self.submit, crew=crew))
@@ -152,36 +183,63 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         A crew member has reported ready to accept tasks
         """
-        # N.B.: {channel} is ready to write, because that's how we got here; so write away...
+        # N.B.: {channel} is ready to write, because that's how we got here; the crew member
+        # queues the tasks in its outbox and sends them without blocking, as the channel allows
 
-        # tell me
-        self.debug.log('sending a task to {.pid}'.format(crew))
+        # this crew member is no longer waiting
+        self.scheduled.discard(crew)
         # get my workplan
         workplan = self.workplan
-        # and my marshaler
-        marshaler = self.marshaler
+        # and the tasks the crew member is already working on
+        load = crew.load
 
         # if there is nothing left to do
         if not workplan:
-            # notify this worker we are done
-            self.dismiss(crew=crew)
-            # and don't send it any further work
+            # and the crew member is idle
+            if not load:
+                # notify this worker we are done
+                self.dismiss(crew=crew)
+            # either way, don't send it any further work
             return False
 
-        # otherwise, grab a task
-        task = workplan.pop()
-        # and send it to the worker
-        crew.execute(team=self, task=task)
+        # figure out how many more tasks this crew member can take on
+        capacity = max(1, self.prefetch) - load
+        # and how many to send in each message
+        batch = max(1, self.batch)
+        # as long as there is room and there are tasks to send
+        while capacity > 0 and workplan:
+            # grab a batch
+            tasks = [workplan.pop(crew=crew) for _ in range(min(batch, capacity, len(workplan)))]
+            # tell me
+            if self.debug: self.debug.log(f'sending {len(tasks)} tasks to {crew.pid}')
+            # send it to the worker
+            crew.execute(team=self, tasks=tasks)
+            # and update the capacity
+            capacity -= len(tasks)
 
         # don't reschedule me; let the handler that harvests the task status decide the fate of
         # this worker
         return False
 
 
+    def harvest(self, task, result):
+        """
+        A crew member reports that {task} completed successfully and produced {result}
+        """
+        # nothing to do, by default; subclasses that care about the results should override
+        return self
+
+
     def dismiss(self, crew):
         """
         Dismiss the {crew} member from the team
         """
+        # return the tasks it was still working on to the workplan
+        self.workplan.update(crew.recall())
+        # and forget its task preferences
+        self.workplan.retire(crew=crew)
+        # it is no longer waiting for work
+        self.scheduled.discard(crew)
         # notify this crew member it is dismissed
         crew.dismissed()
         # let the recruiter know
@@ -195,8 +253,9 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
 
 
     # private data
-    active = None   # the set of currently deployed crew members
-    retired = None  # the set of retired crew members
+    active = None    # the set of currently deployed crew members
+    retired = None   # the set of retired crew members
+    scheduled = None # the set of crew members that are waiting to be sent tasks
 
 
 # end of file
@@ -20,6 +20,13 @@ class Task:
     from .TaskStatus import TaskStatus as taskcodes
 
 
+    # scheduling hints; see {Workplan} for how they are used
+    priority = 0 # tasks with higher priority are handed out first
+    deadline = None # among tasks of equal priority, the ones with earlier deadlines go first
+    kind = None # the key that groups tasks with similar execution times; defaults to the type
+    affinity = None # the key of the data the task works on
+
+
     # interface
     def execute(self, **kwds):
         """
@@ -0,0 +1,513 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import collections
+import heapq
+import itertools
+import time
+
+
+# declaration
+class Workplan:
+    """
+    The tasks a team has yet to carry out, in the order its scheduling {policy} prefers
+
+    The supported policies are
+
+        "fifo": tasks are handed out in the order they were added
+        "priority": tasks with higher {priority} go first; ties go to the task with the
+            earliest {deadline}, and then to the one that was added first
+        "lpt": longest processing time first; tasks whose {kind} has taken the longest to
+            execute so far go first; kinds without a history are assumed to take as long as
+            the average known kind
+        "affinity": crew members are handed the tasks whose {affinity} key matches that of a
+            task they executed before, if there are any; otherwise, the oldest task whose key
+            no other crew member has claimed; otherwise, the oldest task
+
+    Both "lpt" and "affinity" make their choice when a task is handed out, so they take into
+    account the tasks completed, and the keys claimed, since the task was added.
+
+    {Workplan} also keeps track of the time each task spends waiting to be handed out, and the
+    number of times it was handed out, in {timings}. Once a task is completed, its record is
+    folded into the totals of its kind in {latency}, and its execution time into {history};
+    both persist as long as the workplan does
+    """
+
+
+    # constants
+    policies = ("fifo", "priority", "lpt", "affinity")
+    _ungrouped = object() # the group of tasks under policies that don't group them
+
+
+    # types
+    class timing:
+        """
+        The latency statistics of a task
+        """
+
+        # meta-methods
+        def __init__(self):
+            # the time the task was last added to the workplan
+            self.queued = None
+            # the total time it has spent in the workplan
+            self.waiting = 0
+            # the number of times it has been handed out
+            self.attempts = 0
+            # all done
+            return
+
+        def __repr__(self):
+            # easy enough
+            return f"timing(waiting={self.waiting:.6f}, attempts={self.attempts})"
+
+        __slots__ = ("queued", "waiting", "attempts")
+
+
+    # interface
+    def add(self, task):
+        """
+        Add {task} to the pile of pending tasks
+        """
+        # if it's already there
+        if task in self._pending:
+            # nothing to do
+            return self
+        # get the time
+        now = time.monotonic()
+        # look up the task timing record
+        timing = self.timings.get(task)
+        # if there isn't one
+        if timing is None:
+            # make one
+            timing = self.timing()
+            # and attach it
+            self.timings[task] = timing
+        # mark the time the task was queued
+        timing.queued = now
+        # build its entry
+        entry = (self._key(task), next(self._sequence), task)
+        # add it to the pile
+        self._pending[task] = entry
+        heapq.heappush(self._heap, entry)
+        # if my policy groups tasks
+        group = self._group(task)
+        if group is not self._ungrouped:
+            # add it to its group
+            self._groups.setdefault(group, collections.deque()).append(entry)
+            # and, under affinity scheduling, to the candidates for crew members without claims
+            if self.policy == "affinity": heapq.heappush(self._unclaimed, (entry[1], group))
+        # all done
+        return self
+
+
+    def update(self, tasks):
+        """
+        Add all {tasks} to the pile of pending tasks
+        """
+        # go through the tasks
+        for task in tasks:
+            # and add each one
+            self.add(task)
+        # all done
+        return self
+
+
+    def pop(self, crew=None):
+        """
+        Remove and return the next task to be handed to {crew}
+        """
+        # get the pile of pending tasks
+        pending = self._pending
+        # get my policy
+        policy = self.policy
+        # pick a task from the groups, if my policy has any
+        entry = (
+            self._longest() if policy == "lpt" else
+            self._closest(crew=crew) if policy == "affinity" else
+            None)
+        # if there wasn't one
+        if entry is None:
+            # get the heap
+            heap = self._heap
+            # go through it
+            while heap:
+                # get the candidate
+                candidate = heapq.heappop(heap)
+                # if it is still pending, under this very entry
+                if pending.get(candidate[-1]) is candidate:
+                    # grab it
+                    entry = candidate
+                    # and stop looking
+                    break
+            # if we ran out of tasks
+            else:
+                # complain
+                raise KeyError("pop from an empty workplan")
+
+        # unpack the entry
+        task = entry[-1]
+        # remove the task from the pile
+        del pending[task]
+        # update its timing record
+        timing = self.timings[task]
+        timing.waiting += time.monotonic() - timing.queued
+        timing.attempts += 1
+        # if we are keeping track of affinities and the task has a key
+        if policy == "affinity" and crew is not None:
+            # get it
+            key = self.affinity(task)
+            # if it's non-trivial
+            if key is not None:
+                # find the crew member that touched it last
+                owner = self._owners.get(key)
+                # if it's someone else
+                if owner is not crew:
+                    # take the key away from them
+                    if owner is not None: self._claims[owner].discard(key)
+                    # and give it to {crew}
+                    self._owners[key] = crew
+                    self._claims.setdefault(crew, set()).add(key)
+        # compact the heaps if most of them are made up of tasks that are no longer pending
+        if max(len(self._heap), len(self._unclaimed)) > 2 * len(pending) + 64: self._compact()
+        # all done
+        return task
+
+
+    def complete(self, task, elapsed):
+        """
+        Record that {task} was carried out successfully in {elapsed} seconds
+        """
+        # get the kind of the task
+        kind = self.kind(task)
+        # update its history
+        count, total = self.history.get(kind, (0, 0))
+        self.history[kind] = (count + 1, total + elapsed)
+        # retrieve the task timing record, since the task is done with me
+        timing = self.timings.pop(task, None)
+        # if it passed through me
+        if timing is not None:
+            # fold it into the totals of its kind
+            count, waiting, attempts = self.latency.get(kind, (0, 0, 0))
+            self.latency[kind] = (count + 1, waiting + timing.waiting, attempts + timing.attempts)
+        # all done
+        return self
+
+
+    def abandon(self, task):
+        """
+        Forget {task}, which will not be carried out
+        """
+        # discard its timing record
+        self.timings.pop(task, None)
+        # all done
+        return self
+
+
+    def retire(self, crew):
+        """
+        Forget the task preferences of {crew}
+        """
+        # go through its claims on affinity keys
+        for key in self._claims.pop(crew, ()):
+            # skip the ones it no longer owns
+            if self._owners.get(key) is not crew: continue
+            # release the others
+            del self._owners[key]
+            # and, if they have pending tasks, make them available to the rest of the crew
+            head = self._head(key)
+            if head is not None: heapq.heappush(self._unclaimed, (head[1], key))
+        # all done
+        return self
+
+
+    def adopt(self, policy):
+        """
+        Switch to a different scheduling {policy}
+        """
+        # check it
+        if policy not in self.policies:
+            # and complain if it's not one i understand
+            raise ValueError(f"unknown scheduling policy {policy!r}; pick one of {self.policies}")
+        # record it
+        self.policy = policy
+        # and rebuild the heap and the groups with the new ordering, keeping the insertion
+        # order for ties
+        self._heap = []
+        self._groups = {}
+        self._unclaimed = []
+        for _, sequence, task in sorted(self._pending.values(), key=lambda entry: entry[1]):
+            # build the new entry
+            entry = (self._key(task), sequence, task)
+            # and record it
+            self._pending[task] = entry
+            self._heap.append(entry)
+            # if my policy groups tasks
+            group = self._group(task)
+            if group is not self._ungrouped:
+                # add it to its group
+                self._groups.setdefault(group, collections.deque()).append(entry)
+                # and, under affinity scheduling, to the candidates for crew members without
+                # claims
+                if policy == "affinity": self._unclaimed.append((sequence, group))
+        heapq.heapify(self._heap)
+        heapq.heapify(self._unclaimed)
+        # all done
+        return self
+
+
+    def expected(self, task):
+        """
+        Estimate how long {task} will take to execute, based on the history of its kind
+        """
+        # get my history
+        history = self.history
+        # look up the kind of the task
+        record = history.get(self.kind(task))
+        # if we've seen it before
+        if record is not None:
+            # use its average
+            count, total = record
+            return total / count
+        # if we know nothing
+        if not history:
+            # assume it's trivial
+            return 0
+        # otherwise, use the average of the known kinds
+        return sum(total/count for count, total in history.values()) / len(history)
+
+
+    # task attributes
+    @staticmethod
+    def kind(task):
+        """
+        Build the key that groups {task} with others that take similar time to execute
+        """
+        # use the one the task provides, or its type
+        return getattr(task, "kind", None) or type(task)
+
+
+    @staticmethod
+    def affinity(task):
+        """
+        Retrieve the key of the data {task} works on
+        """
+        # easy enough
+        return getattr(task, "affinity", None)
+
+
+    # meta-methods
+    def __init__(self, policy="fifo", tasks=(), **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the latency statistics of the tasks that are still in my care
+        self.timings = {}
+        # the number of successful executions and their total duration, by task kind
+        self.history = {}
+        # the number of completed tasks, their total waiting time and number of attempts, by
+        # task kind
+        self.latency = {}
+        # the pending tasks, and their entries in the heap
+        self._pending = {}
+        self._heap = []
+        # the entries of the pending tasks by kind, or by affinity key, depending on the policy
+        self._groups = {}
+        # under affinity scheduling, the sequence numbers of the pending tasks along with their
+        # keys, for finding the oldest task whose key is not claimed; an entry is stale unless
+        # its task is the oldest of its group and its key has no owner
+        self._unclaimed = []
+        # the source of sequence numbers that break ties
+        self._sequence = itertools.count()
+        # the crew member that last executed a task with a given affinity key
+        self._owners = {}
+        # and the keys claimed by each crew member
+        self._claims = {}
+        # record the policy
+        self.policy = None
+        self.adopt(policy)
+        # add the tasks
+        self.update(tasks)
+        # all done
+        return
+
+
+    def __len__(self):
+        # the number of pending tasks
+        return len(self._pending)
+
+
+    def __bool__(self):
+        # i'm non-trivial when there are tasks pending
+        return bool(self._pending)
+
+
+    def __contains__(self, task):
+        # check whether {task} is pending
+        return task in self._pending
+
+
+    def __iter__(self):
+        # the pending tasks, in no particular order
+        return iter(list(self._pending))
+
+
+    def __ior__(self, tasks):
+        # add the {tasks}
+        return self.update(tasks)
+
+
+    # implementation details
+    def _key(self, task):
+        """
+        Build the sort key of {task} under my policy
+        """
+        # get my policy
+        policy = self.policy
+        # priority scheduling
+        if policy == "priority":
+            # higher priorities go first, then earlier deadlines
+            deadline = getattr(task, "deadline", None)
+            return (-(getattr(task, "priority", 0) or 0),
+                    float("inf") if deadline is None else deadline)
+        # otherwise, the sequence number decides; "lpt" ranks the kinds of tasks when they are
+        # handed out
+        return ()
+
+
+    def _group(self, task):
+        """
+        Identify the group of {task} under my policy
+        """
+        # get my policy
+        policy = self.policy
+        # longest processing time first groups tasks by kind
+        if policy == "lpt": return self.kind(task)
+        # affinity groups them by their key
+        if policy == "affinity": return self.affinity(task)
+        # the rest don't group them
+        return self._ungrouped
+
+
+    def _head(self, group):
+        """
+        Find the oldest pending task in {group}
+        """
+        # get the group
+        queue = self._groups.get(group)
+        # if there isn't one
+        if queue is None:
+            # nothing to do
+            return None
+        # get the pile of pending tasks
+        pending = self._pending
+        # discard the entries of tasks that were handed out, or added again
+        while queue and pending.get(queue[0][-1]) is not queue[0]: queue.popleft()
+        # if there's anything left
+        if queue:
+            # that's the one
+            return queue[0]
+        # otherwise, forget the group
+        del self._groups[group]
+        # and report that it's empty
+        return None
+
+
+    def _longest(self):
+        """
+        Find the oldest pending task of the kind with the longest expected execution time
+        """
+        # compute the average execution time of the known kinds
+        averages = { kind: total / count for kind, (count, total) in self.history.items() }
+        # and the estimate for the others
+        fallback = sum(averages.values()) / len(averages) if averages else 0
+        # the best candidate so far, and its rank
+        best = rank = None
+        # go through the groups
+        for kind in list(self._groups):
+            # get the oldest task
+            head = self._head(kind)
+            # if there isn't one, move on
+            if head is None: continue
+            # rank it: longer tasks first, then older ones
+            candidate = (-averages.get(kind, fallback), head[1])
+            # if it's better than the best so far
+            if best is None or candidate < rank:
+                # replace it
+                best, rank = head, candidate
+        # all done
+        return best
+
+
+    def _closest(self, crew):
+        """
+        Find the task to hand to {crew} based on the affinity keys it has claimed
+        """
+        # if there's no crew member
+        if crew is None:
+            # the oldest task will do
+            return None
+        # the best candidate so far
+        best = None
+        # go through the keys {crew} has claimed
+        for key in list(self._claims.get(crew, ())):
+            # get the oldest task
+            head = self._head(key)
+            # if it's older than the best so far
+            if head is not None and (best is None or head[1] < best[1]):
+                # replace it
+                best = head
+        # if there was one
+        if best is not None:
+            # it's the one
+            return best
+        # otherwise, get the key owners
+        owners = self._owners
+        # and the candidates whose keys are not claimed, oldest first
+        unclaimed = self._unclaimed
+        # go through them
+        while unclaimed:
+            # get the oldest one
+            sequence, key = unclaimed[0]
+            # if its key is not claimed by another crew member
+            if key not in owners:
+                # get the oldest task with this key
+                head = self._head(key)
+                # if the candidate is still it
+                if head is not None and head[1] == sequence:
+                    # it's the one; leave it in place, since the task is still pending
+                    return head
+            # otherwise, the candidate is stale; discard it; keys that are released get theirs
+            # back when their owner retires
+            heapq.heappop(unclaimed)
+        # all done; if there's still nothing, the oldest task will do
+        return None
+
+
+    def _compact(self):
+        """
+        Discard the entries of tasks that are no longer pending from the heaps
+        """
+        # get the pile of pending tasks
+        pending = self._pending
+        # keep only the live entries
+        self._heap = [entry for entry in self._heap if pending.get(entry[-1]) is entry]
+        # and restore the heap property
+        heapq.heapify(self._heap)
+        # under affinity scheduling
+        if self.policy == "affinity":
+            # rebuild the candidates for crew members without claims from the live entries
+            self._unclaimed = [
+                (entry[1], key) for key, queue in self._groups.items()
+                for entry in queue if pending.get(entry[-1]) is entry ]
+            # and restore the heap property
+            heapq.heapify(self._unclaimed)
+        # all done
+        return
+
+
+# end of file
@@ -20,6 +20,7 @@ from .Server import Server as server
 from .Task import Task as task
 from .TaskStatus import TaskStatus as taskcodes
 from .CrewStatus import CrewStatus as crewcodes
+from .Workplan import Workplan as workplan
 # task distribution protocols
 from .Team import Team as team
 from .Recruiter import Recruiter as recruiter
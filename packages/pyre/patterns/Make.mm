@@ -19,6 +19,7 @@ EXPORT_PYTHON_MODULES = \
     Named.py \
     Observable.py \
     PathHash.py \
+    PrefixTree.py \
     Printer.py \
     Singleton.py \
     Tee.py \
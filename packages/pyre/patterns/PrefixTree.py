@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+class PrefixTree:
+    """
+    An index of hierarchical names that supports the retrieval of all entries whose name
+    starts with a given prefix without visiting the rest of the index.
+
+    {PrefixTree} is meant to live alongside a {PathHash}: clients register the keys generated
+    by the hash under the sequence of name fragments they want to be found by, and then ask
+    for all the keys that live below a given name. Unlike {PathHash}, the tree knows nothing
+    about aliases; each key is indexed under exactly one name, and re-registering a key moves
+    it to its new location.
+    """
+
+
+    # interface
+    def insert(self, key, split):
+        """
+        Index {key} under the sequence of name fragments in {split}
+        """
+        # if {key} is already indexed
+        if key in self.paths:
+            # remove it from its current location
+            self.remove(key=key)
+        # starting at the root
+        level = self.root
+        # walk down the tree
+        for part in split:
+            # attempt to
+            try:
+                # find the next level
+                level = level.children[part]
+            # if it's not there
+            except KeyError:
+                # make it
+                level.children[part] = level = self.Level()
+        # attach the key
+        level.keys[key] = None
+        # and remember where i put it
+        self.paths[key] = tuple(split)
+        # all done
+        return key
+
+
+    def remove(self, key):
+        """
+        Remove {key} from the index; it is not an error if {key} is not present
+        """
+        # attempt to
+        try:
+            # retrieve the location of {key}
+            split = self.paths.pop(key)
+        # if it's not there
+        except KeyError:
+            # nothing to do
+            return
+        # walk down the tree, remembering the path so we can prune empty levels
+        trail = []
+        level = self.root
+        # go through the fragments
+        for part in split:
+            # save the current level
+            trail.append((level, part))
+            # and move on
+            level = level.children[part]
+        # detach the key
+        del level.keys[key]
+        # prune the levels that are now empty, from the bottom up
+        for parent, part in reversed(trail):
+            # grab the child
+            child = parent.children[part]
+            # if it still holds keys or has children of its own
+            if child.keys or child.children:
+                # we are done
+                break
+            # otherwise, remove it
+            del parent.children[part]
+        # all done
+        return
+
+
+    def find(self, split=(), partial=''):
+        """
+        Generate all the keys indexed under names that start with the fragments in {split},
+        followed by a fragment that starts with {partial}
+        """
+        # starting at the root
+        level = self.root
+        # walk down the tree through the complete fragments
+        for part in split:
+            # attempt to
+            try:
+                # find the next level
+                level = level.children[part]
+            # if it's not there
+            except KeyError:
+                # there is nothing under this prefix
+                return
+        # if there is no partial fragment
+        if not partial:
+            # everything under this level is a match, including the level itself
+            yield from level.walk()
+            # all done
+            return
+        # otherwise, go through the children
+        for part, child in level.children.items():
+            # whose name starts with {partial}
+            if part.startswith(partial):
+                # and generate their contents
+                yield from child.walk()
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the top level of the tree
+        self.root = self.Level()
+        # the map from keys to the fragments they are indexed under
+        self.paths = {}
+        # all done
+        return
+
+
+    def __contains__(self, key):
+        """
+        Check whether {key} is in the index
+        """
+        # easy enough
+        return key in self.paths
+
+
+    def __len__(self):
+        """
+        Compute the number of keys in the index
+        """
+        # easy enough
+        return len(self.paths)
+
+
+    # implementation details
+    class Level:
+        """
+        A node in the tree: the keys registered at this level and the map of its sublevels
+        """
+
+        def walk(self):
+            """
+            Generate all the keys in the subtree rooted at this level
+            """
+            # start with mine
+            yield from self.keys
+            # and visit my children
+            for child in self.children.values():
+                # recursively
+                yield from child.walk()
+            # all done
+            return
+
+        def __init__(self):
+            # ordered, so that keys come out in the order they were registered
+            self.keys = {}
+            self.children = {}
+            # all done
+            return
+
+        __slots__ = ["keys", "children"]
+
+
+    __slots__ = ["root", "paths"]
+
+
+# end of file
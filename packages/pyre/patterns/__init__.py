@@ -77,6 +77,16 @@ def newPathHash(**kwds):
     return PathHash(**kwds)
 
 
+def newPrefixTree(**kwds):
+    """
+    Build an index of name hierarchies that supports retrieval by name prefix
+    """
+    # get the factory
+    from .PrefixTree import PrefixTree
+    # and invoke it
+    return PrefixTree(**kwds)
+
+
 # cofunctors
 from .CoFunctor import CoFunctor as cofunctor
 from .Accumulator import Accumulator as accumulator
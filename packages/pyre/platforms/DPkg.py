@@ -12,6 +12,8 @@ import re, subprocess
 import pyre
 # superclass
 from .Managed import Managed
+# the store of host facts
+from .Facts import Facts
 
 
 # declaration
@@ -25,6 +27,7 @@ class DPkg(Managed, family='pyre.platforms.packagers.dpkg'):
     name = 'dpkg'
     client = 'dpkg-query'
     defaultLocation = pyre.primitives.path('/usr/bin')
+    database = pyre.primitives.path('/var/lib/dpkg/status')
 
 
     # meta-methods
@@ -153,11 +156,14 @@ class DPkg(Managed, family='pyre.platforms.packagers.dpkg'):
         installed = self._installed
         # if it has not been initialized
         if installed is None:
-            # prime it
-            installed = {
-                package: (version, revision)
-                for package, version, revision in self.retrieveInstalledPackages()
-            }
+            # prime it, unless the inventory is known from a previous run and the package
+            # database hasn't changed since
+            installed = Facts().lookup(
+                section=self.name, key=Facts().stamp(self.database),
+                survey=lambda: {
+                    package: (version, revision)
+                    for package, version, revision in self.retrieveInstalledPackages()
+                })
             # attach it
             self._installed = installed
         # ask it
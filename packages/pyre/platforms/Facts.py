@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# externals
+import os
+import pickle
+import tempfile
+# support
+from ..patterns.Singleton import Singleton
+# the cpu info object
+from .CPUInfo import CPUInfo
+
+
+# declaration
+class Facts(metaclass=Singleton):
+    """
+    A persistent store of the facts about the host that are expensive to discover
+
+    Surveying the CPU topology, the OS distribution or the inventory of installed packages
+    involves spawning external programs and parsing their output, and the answers rarely
+    change. {Facts} keeps each answer along with a key that captures the state of the host it
+    was derived from, such as the boot id of the machine or the modification time of the
+    package database, and hands it out as long as the key is unchanged. Answers whose key is
+    {None} are never stored.
+
+    The store is off by default, so that merely importing pyre never writes to the file
+    system; point {PYRE_HOST_FACTS} to a file to enable it. Without a store, the facts are
+    still remembered for the lifetime of the process.
+    """
+
+
+    # constants
+    version = 1 # the layout of the store
+    bootid = '/proc/sys/kernel/random/boot_id'
+
+
+    # public data
+    path = None # the location of the store
+
+
+    # interface
+    def cpus(self, survey):
+        """
+        Retrieve the CPU topology of the host; use {survey} to discover it if necessary
+        """
+        # the topology only changes when the machine reboots
+        sockets, cores, cpus = self.lookup(
+            section='cpus', key=self.boot(),
+            survey=lambda: self.flatten(info=survey()))
+        # make a cpu info object
+        info = CPUInfo()
+        # decorate it
+        info.sockets = sockets
+        info.cores = cores
+        info.cpus = cpus
+        # and return it
+        return info
+
+
+    def lookup(self, section, key, survey):
+        """
+        Retrieve the facts in {section}; if they were derived from a host state other than
+        {key}, invoke {survey} to rediscover them
+        """
+        # if the facts are not cacheable
+        if key is None:
+            # just survey them
+            return survey()
+        # get the store
+        facts = self.load()
+        # attempt to
+        try:
+            # look up the section
+            stored, value = facts[section]
+        # if it's not there
+        except KeyError:
+            # no problem
+            pass
+        # if it is there
+        else:
+            # and it is current
+            if stored == key:
+                # hand it out
+                return value
+        # otherwise, discover
+        value = survey()
+        # update the store
+        facts[section] = (key, value)
+        # save it
+        self.save()
+        # and return the value
+        return value
+
+
+    def refresh(self):
+        """
+        Forget everything i know about the host, both in memory and on disk
+        """
+        # clear out my memory
+        self._facts = {}
+        # if i have a store
+        if self.path:
+            # attempt to
+            try:
+                # remove it
+                os.unlink(self.path)
+            # if it's not there
+            except FileNotFoundError:
+                # no worries
+                pass
+        # all done
+        return self
+
+
+    def sections(self):
+        """
+        Generate the sections of facts i know about, along with the keys they were derived from
+        """
+        # go through the store
+        for section, (key, _) in self.load().items():
+            # hand out the pair
+            yield section, key
+        # all done
+        return
+
+
+    # helpers
+    def boot(self):
+        """
+        Retrieve the boot id of the host, if available
+        """
+        # attempt to
+        try:
+            # open the file
+            with open(self.bootid) as stream:
+                # read the id and return it
+                return stream.read().strip()
+        # if anything goes wrong
+        except OSError:
+            # the boot id is not available on this host
+            return None
+
+
+    def stamp(self, *paths):
+        """
+        Build a key out of the modification times of the files in {paths}; return {None} if
+        none of them exist
+        """
+        # the pile
+        stamp = []
+        # go through the paths
+        for path in paths:
+            # attempt to
+            try:
+                # get the modification time
+                mtime = os.stat(str(path)).st_mtime_ns
+            # if it doesn't exist
+            except OSError:
+                # mark it
+                mtime = None
+            # add it to the pile
+            stamp.append((str(path), mtime))
+        # if nothing was found, the key is useless
+        if all(mtime is None for _, mtime in stamp): return None
+        # otherwise, return the key
+        return tuple(stamp)
+
+
+    def flatten(self, info):
+        """
+        Convert the CPU {info} into a form that is suitable for storing
+        """
+        # easy enough
+        return info.sockets, info.cores, info.cpus
+
+
+    # persistence
+    def load(self):
+        """
+        Retrieve my store
+        """
+        # if i've done this before
+        if self._facts is not None:
+            # hand out the in-memory copy
+            return self._facts
+        # otherwise, start out empty
+        self._facts = {}
+        # if i don't have a store
+        if not self.path:
+            # that's all there is
+            return self._facts
+        # attempt to
+        try:
+            # open the file
+            with open(self.path, 'rb') as store:
+                # and unpack it
+                version, facts = pickle.load(store)
+        # if anything goes wrong
+        except Exception:
+            # treat it as empty
+            return self._facts
+        # if the store was written by a compatible version
+        if version == self.version:
+            # use it
+            self._facts = facts
+        # all done
+        return self._facts
+
+
+    def save(self):
+        """
+        Update my store
+        """
+        # if i don't have a store, there is nothing to do
+        if not self.path: return self
+        # get the location of the store
+        folder = os.path.dirname(self.path)
+        # attempt to
+        try:
+            # make sure it exists
+            os.makedirs(folder, exist_ok=True)
+            # write into a temporary file, so concurrent processes never see partial stores
+            fd, scratch = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            # attempt to
+            try:
+                # fill it
+                with os.fdopen(fd, 'wb') as store:
+                    pickle.dump((self.version, self._facts), store,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                # and move it into place
+                os.replace(scratch, self.path)
+            # if anything goes wrong
+            except Exception:
+                # clean up
+                os.unlink(scratch)
+                # and complain
+                raise
+        # the store is only an optimization; failing to update it is not an error
+        except Exception:
+            # so just move on
+            pass
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, path=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # if i were not given an explicit location for my store
+        if path is None:
+            # look for one in the environment; if there isn't one, the store is disabled
+            path = os.environ.get('PYRE_HOST_FACTS')
+        # save the location of my store
+        self.path = os.path.abspath(os.path.expanduser(path)) if path else None
+        # the in-memory copy of the store
+        self._facts = None
+        # all done
+        return
+
+
+# end of file
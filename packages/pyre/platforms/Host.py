@@ -15,6 +15,8 @@ import pyre
 from .Platform import Platform
 # cpu info
 from .CPUInfo import CPUInfo
+# the store of host facts
+from .Facts import Facts
 
 
 # declaration
@@ -42,11 +44,19 @@ class Host(pyre.component, family='pyre.platforms.generic', implements=Platform)
         """
         # if we haven't done this before
         if self._cpus is None:
-            # find out
-            self._cpus = self.cpuSurvey()
+            # find out, unless the answer is known from a previous run
+            self._cpus = self.facts.cpus(survey=self.cpuSurvey)
         # all done
         return self._cpus
 
+    @property
+    def facts(self):
+        """
+        The store of the facts about this host that survive across runs
+        """
+        # it's a singleton
+        return Facts()
+
     # user configurable state
     externals = pyre.properties.dict(schema=pyre.properties.str())
     externals.doc = 'a map of package categories to installation instances'
@@ -65,6 +75,22 @@ class Host(pyre.component, family='pyre.platforms.generic', implements=Platform)
         return
 
 
+    # interface
+    def refresh(self):
+        """
+        Forget the stored facts about this host and discover them again on first access
+        """
+        # clear out the store
+        self.facts.refresh()
+        # my cached CPU info
+        self._cpus = None
+        # and the inventory of my package manager, if it keeps one
+        refresh = getattr(self.packager, 'refresh', None)
+        if refresh is not None: refresh()
+        # all done
+        return self
+
+
     # implementation details: explorers
     @classmethod
     def cpuSurvey(cls):
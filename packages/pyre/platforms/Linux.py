@@ -14,6 +14,8 @@ import subprocess
 from .POSIX import POSIX
 # the cpu info object
 from .CPUInfo import CPUInfo
+# the store of host facts
+from .Facts import Facts
 
 
 # declaration
@@ -42,35 +44,17 @@ class Linux(POSIX, family='pyre.platforms.linux'):
         Return a suitable default encapsulation of the runtime host
         """
 
-        # in python 3.8, {platform} doesn't have {linux_distribution} any more; the
-        # functionality has been delegated to the {distro} package
-
-        # so let's try
-        try:
-            # to get {distro}
-            import distro
+        # identify the distribution, unless it is known from a previous run
+        survey = Facts().lookup(
+            section='distribution', key=Facts().stamp(*cls.releaseFiles),
+            survey=cls.distributionSurvey)
         # if that fails
-        except ImportError:
-            # fallback to the native  python package; this is silly in the long term, but it's a
-            # reasonable workaround for current 3.7 users that don't have {distro}
-            import platform
-            # if it still has the deprecated function
-            try:
-                # identify the platform characteristics; careful not to set the {distribution}
-                # attribute here; the subclasses set the distribution name to the pyre
-                # canonical nickname
-                distribution, cls.release, cls.codename = platform.linux_distribution()
-            # if this also fails
-            except AttributeError:
-                # there isn't much else to do; act like a generic linux system
-                return cls
-        # if {distro} is available
-        else:
-            # identify the platform characteristics; again, careful not to set the
-            # {distribution} attribute here; the subclasses set the distribution name to the
-            # pyre canonical nickname
-            distribution, cls.release, cls.codename = distro.linux_distribution(
-                full_distribution_name=False)
+        if survey is None:
+            # there isn't much else to do; act like a generic linux system
+            return cls
+        # careful not to set the {distribution} attribute here; the subclasses set the
+        # distribution name to the pyre canonical nickname
+        distribution, cls.release, cls.codename = survey
 
         # check for ubuntu
         if distribution.lower().startswith('ubuntu'):
@@ -101,7 +85,50 @@ class Linux(POSIX, family='pyre.platforms.linux'):
         return cls
 
 
+    # interface
+    def refresh(self):
+        """
+        Forget the stored facts about this host and discover them again
+        """
+        # chain up
+        super().refresh()
+        # identify the distribution again, so its facts go back into the store
+        self.flavor()
+        # all done
+        return self
+
+
     # implementation details: explorers
+    @classmethod
+    def distributionSurvey(cls):
+        """
+        Identify the distribution, its release and its codename; return {None} if the
+        distribution could not be identified
+        """
+        # in python 3.8, {platform} doesn't have {linux_distribution} any more; the
+        # functionality has been delegated to the {distro} package
+
+        # so let's try
+        try:
+            # to get {distro}
+            import distro
+        # if that fails
+        except ImportError:
+            # fallback to the native  python package; this is silly in the long term, but it's a
+            # reasonable workaround for current 3.7 users that don't have {distro}
+            import platform
+            # if it still has the deprecated function
+            try:
+                # identify the platform characteristics
+                return platform.linux_distribution()
+            # if this also fails
+            except AttributeError:
+                # we don't know
+                return None
+        # if {distro} is available, identify the platform characteristics
+        return distro.linux_distribution(full_distribution_name=False)
+
+
     @classmethod
     def cpuSurvey(cls):
         """
@@ -268,6 +295,8 @@ class Linux(POSIX, family='pyre.platforms.linux'):
     # implementation constants
     issue = '/etc/issue'
     cpuinfo = '/proc/cpuinfo'
+    # the files that identify the distribution
+    releaseFiles = ('/etc/os-release', '/etc/lsb-release', '/etc/redhat-release')
 
 
 # end of file
@@ -16,6 +16,7 @@ EXPORT_PYTHON_MODULES = \
     CentOS.py \
     DPkg.py \
     Darwin.py \
+    Facts.py \
     Debian.py \
     Host.py \
     Linux.py \
@@ -100,6 +100,16 @@ class Managed(pyre.component, implements=PackageManager):
         return self.getInstalledPackages()
 
 
+    def refresh(self):
+        """
+        Forget the inventory of installed packages, so it is retrieved again on first access
+        """
+        # easy enough
+        self._installed = None
+        # all done
+        return self
+
+
     @pyre.export
     def info(self, package):
         """
@@ -231,6 +241,8 @@ class Managed(pyre.component, implements=PackageManager):
     # private data
     # the installation location of the package manager
     _prefix = None
+    # the inventory of installed packages
+    _installed = None
 
 
 # end of file
@@ -29,7 +29,8 @@ class HTTP(pyre.component, implements=Language):
 
 
     # public data
-    version = 1,0 # my preferred protocol version
+    version = 1,1 # my preferred protocol version
+    bodiless = { 204, 304 } # the response codes that are not allowed to have a payload
 
 
     # mill obligations
@@ -40,9 +41,15 @@ class HTTP(pyre.component, implements=Language):
         """
         # the string used to assemble the output
         splicer = '\r\n'
+        # assemble the payload first, since documents may adjust their status and their headers
+        # while rendering themselves
+        page = self.body(document=document, **kwds)
+
         # unpack
         code = document.code
-        status = document.status
+        # the status descriptions are typically docstrings; clean them up, since they must fit
+        # on the response line
+        status = " ".join(document.status.split())
         headers = document.headers
         version = document.version
 
@@ -53,10 +60,10 @@ class HTTP(pyre.component, implements=Language):
         # start the response
         yield "HTTP/{} {} {}".format(protocol, code, status).encode(self.encoding, 'strict')
 
-        # assemble the payload
-        page = self.body(document=document, **kwds)
-        # inform the client about the size of the payload
-        headers['Content-Length'] = len(page)
+        # responses that never have a payload don't get to describe it
+        if code not in self.bodiless:
+            # inform the client about the size of the payload
+            headers['Content-Length'] = len(page)
 
         # assemble the headers and send them off
         yield splicer.join(self.header(document=document)).encode(self.encoding, 'strict')
@@ -66,6 +66,7 @@ channels:
 	${PYTHON} ./debug_example_fatal.py
 	${PYTHON} ./debug_file.py
 	${PYTHON} ./debug_flush.py
+	${PYTHON} ./debug_inactive.py
 	${PYTHON} ./debug_inject.py
 	${PYTHON} ./debug_instance.py
 	${PYTHON} ./debug_loop.py
@@ -118,5 +119,9 @@ renderers:
 devices:
 	${PYTHON} ./null_inject.py
 	${PYTHON} ./file_example.py
+	${PYTHON} ./queue_example.py
+	${PYTHON} ./rotating_example.py
+	${PYTHON} ./structured_example.py
+	${PYTHON} ./structured_queue.py
 
 # end of file
@@ -0,0 +1,99 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+def test():
+    """
+    Verify that inactive channels discard their messages without building entries
+    """
+    # get the trash can
+    from journal.Trash import Trash as trash
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # make a channel
+    channel = debug(name="tests.journal.debug")
+    # send the output to trash
+    channel.device = trash()
+
+    # inject a few messages
+    for _ in range(10):
+        channel.line("hello")
+        channel.log("world!")
+    # verify that the channel never built an entry
+    assert channel._entry is None
+    # and that nothing accumulated
+    assert channel.page == []
+
+    # activate it
+    channel.activate()
+    # add some content
+    channel.line("hello")
+    # verify it was recorded
+    assert channel.page == ["hello"]
+    # deactivate it
+    channel.deactivate()
+    # and flush; the content is discarded
+    channel.log("world!")
+    # verify that the next message starts out fresh
+    assert channel.page == []
+
+    # activate it again
+    channel.activate()
+    # inject
+    channel.log("hello world!")
+    # verify that the entry was flushed
+    assert channel._entry is None
+
+    # all done
+    return
+
+
+def location():
+    """
+    Verify that active channels record the location of the caller
+    """
+    # get the trash can
+    from journal.Trash import Trash as trash
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # a device that remembers the entries it records
+    class keeper(trash):
+        def memo(self, entry):
+            self.entries.append(entry)
+        entries = []
+
+    # make a channel
+    channel = debug(name="tests.journal.debug")
+    # activate it
+    channel.activate()
+    # send the output to the keeper
+    channel.device = device = keeper()
+    # inject
+    channel.log("hello world!")
+
+    # get the entry
+    entry = device.entries[0]
+    # verify the location information
+    assert entry.notes["filename"] == __file__
+    assert entry.notes["function"] == "location"
+    assert entry.page == ["hello world!"]
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the tests
+    test()
+    location()
+
+
+# end of file
@@ -0,0 +1,174 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import threading
+
+
+# a device that remembers what it records
+def keeper():
+    # get the trash can
+    from journal.Trash import Trash as trash
+
+    # the device
+    class Keeper(trash):
+        """
+        A device that keeps the pages of the entries it records; it can be told to stall so
+        the tests can fill up the queue
+        """
+
+        def memo(self, entry):
+            # wait until i'm allowed to proceed
+            self.gate.wait()
+            # record the page
+            self.pages.append(entry.page)
+            # all done
+            return self
+
+        def flush(self):
+            # count
+            self.flushes += 1
+            # all done
+            return self
+
+        def __init__(self, **kwds):
+            # chain up
+            super().__init__(**kwds)
+            # initialize my state
+            self.pages = []
+            self.flushes = 0
+            self.gate = threading.Event()
+            self.gate.set()
+            # all done
+            return
+
+    # make one and return it
+    return Keeper()
+
+
+def test():
+    """
+    Verify that the queue device records all messages, in order
+    """
+    # get the device
+    from journal.Queue import Queue as queue
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # make a target
+    target = keeper()
+    # and a queue
+    device = queue(device=target)
+
+    # make a channel
+    channel = debug(name="tests.journal.debug")
+    # activate it
+    channel.activate()
+    # send the output to the queue
+    channel.device = device
+
+    # inject
+    for n in range(100):
+        channel.log(f"message {n}")
+    # wait for the writer
+    device.flush()
+
+    # verify that everything was recorded, in order
+    assert target.pages == [[f"message {n}"] for n in range(100)]
+    # in batches
+    assert 1 <= target.flushes <= 100
+
+    # shut down the writer
+    device.close()
+    # messages sent after the queue is closed are recorded synchronously
+    channel.log("late")
+    assert target.pages[-1] == ["late"]
+
+    # all done
+    return
+
+
+def overflow(policy):
+    """
+    Verify that the queue device handles overflow according to {policy}
+    """
+    # get the device
+    from journal.Queue import Queue as queue
+    # and the channel
+    from journal.Debug import Debug as debug
+
+    # make a target
+    target = keeper()
+    # and a queue with a small buffer
+    device = queue(device=target, capacity=4, batch=1, overflow=policy)
+
+    # make a channel
+    channel = debug(name="tests.journal.debug")
+    # activate it
+    channel.activate()
+    # send the output to the queue
+    channel.device = device
+
+    # stall the writer
+    target.gate.clear()
+    # let it take the first message
+    channel.log("message 0")
+    # and wait until it is holding it
+    while device._buffer: pass
+    # if the policy is to block
+    if policy == "block":
+        # arrange for the writer to be released after a while, or we will wait forever
+        threading.Timer(interval=0.1, function=target.gate.set).start()
+    # fill up the buffer and then some
+    for n in range(1, 10):
+        channel.log(f"message {n}")
+    # let the writer go
+    target.gate.set()
+    # and wait for it
+    device.close()
+
+    # collect the recorded messages
+    recorded = [page[0] for page in target.pages]
+    # the first one always makes it
+    assert recorded[0] == "message 0"
+
+    # if the policy is to block
+    if policy == "block":
+        # nothing was discarded
+        assert device.dropped == 0
+        # and everything is there
+        assert recorded[1:] == [f"message {n}" for n in range(1, 10)]
+        # all done
+        return
+
+    # otherwise, five messages were discarded
+    assert device.dropped == 5
+    # if the policy is to drop the oldest messages
+    if policy == "oldest":
+        # the last four should be there
+        assert recorded[1:] == [f"message {n}" for n in range(6, 10)]
+    # otherwise
+    else:
+        # the first four should be there
+        assert recorded[1:] == [f"message {n}" for n in range(1, 5)]
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the tests
+    test()
+    overflow(policy="block")
+    overflow(policy="oldest")
+    overflow(policy="drop")
+
+
+# end of file
@@ -0,0 +1,213 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import gzip
+import os
+import tempfile
+
+
+def test():
+    """
+    Verify that rotating log files roll over when they grow too big
+    """
+    # get the device
+    from journal.RotatingFile import RotatingFile
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, "rotating.log")
+        # make a device that holds three of our messages per segment
+        device = RotatingFile(path=filename, size=30, generations=2)
+
+        # record seven messages, ten bytes each
+        for n in range(7):
+            device.record(page=[f"message {n}"])
+        # close the file
+        device.close()
+
+        # verify that only two segments were retained
+        assert sorted(os.listdir(scratch)) == ["rotating.log", "rotating.log.1", "rotating.log.2"]
+        # verify their contents
+        assert open(filename).read() == "message 6\n"
+        assert open(filename + ".1").read() == "message 3\nmessage 4\nmessage 5\n"
+        assert open(filename + ".2").read() == "message 0\nmessage 1\nmessage 2\n"
+
+    # all done
+    return
+
+
+def compressed():
+    """
+    Verify that rotating log files can compress closed segments
+    """
+    # get the device factory
+    from journal.RotatingFile import rotatingFile
+    # and a channel
+    from journal.Debug import Debug
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, "rotating.log")
+        # make a device that rolls over every time it is used
+        device = rotatingFile(path=filename, interval=0, generations=3, compression="gzip")
+
+        # make a debug channel
+        channel = Debug(name="tests.journal.debug")
+        # activate it
+        channel.activate()
+        # send the output to the file
+        channel.device = device
+
+        # inject some messages
+        for n in range(5):
+            channel.log(f"message {n}")
+        # close the file
+        device.close()
+
+        # verify that the closed segments were compressed
+        assert sorted(os.listdir(scratch)) == [
+            "rotating.log", "rotating.log.1.gz", "rotating.log.2.gz", "rotating.log.3.gz"]
+        # and that they have the right contents
+        assert "message 3" in gzip.open(filename + ".1.gz", "rt").read()
+        assert "message 1" in gzip.open(filename + ".3.gz", "rt").read()
+
+    # all done
+    return
+
+
+def append():
+    """
+    Verify that rotating log files pick up where they left off
+    """
+    # get the device
+    from journal.RotatingFile import RotatingFile
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, "rotating.log")
+        # put something in it
+        with open(filename, "w") as stream:
+            stream.write("x" * 25 + "\n")
+        # open it
+        device = RotatingFile(path=filename, size=30)
+        # verify it knows how big the log file is
+        assert device.written == 26
+        # add a line; it doesn't fit, so the log file rolls over
+        device.record(page=["hello"])
+        # close it
+        device.close()
+        # verify
+        assert open(filename).read() == "hello\n"
+        assert open(filename + ".1").read() == "x" * 25 + "\n"
+
+        # get the channel
+        from journal.Debug import Debug
+        # ask it to send its output to a rotating log file
+        old = Debug.logfile(path=filename, size=1024)
+        # verify it got one
+        assert isinstance(Debug.getDefaultDevice(), RotatingFile)
+        # close it
+        Debug.getDefaultDevice().close()
+        # and restore the previous default
+        Debug.setDefaultDevice(old)
+
+    # all done
+    return
+
+
+def failed():
+    """
+    Verify that segments whose compression failed are retained
+    """
+    # get the device
+    from journal.RotatingFile import RotatingFile
+
+    # a device whose compressor is broken
+    class Broken(RotatingFile):
+        def compressor(self, path):
+            raise OSError("no room")
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, "rotating.log")
+        # make a device that holds one message per segment
+        device = Broken(path=filename, size=10, generations=3, compression="gzip")
+        # record three messages
+        for n in range(3):
+            device.record(page=[f"message {n}"])
+        # close the file
+        device.close()
+
+        # verify that the segments are still there, in their original form
+        assert sorted(os.listdir(scratch)) == ["rotating.log", "rotating.log.1", "rotating.log.2"]
+        assert open(filename + ".1").read() == "message 1\n"
+        assert open(filename + ".2").read() == "message 0\n"
+
+    # all done
+    return
+
+
+def defaults():
+    """
+    Verify that the chronicler defaults make log files rotate
+    """
+    # get the devices
+    from journal.File import File, device
+    from journal.RotatingFile import RotatingFile
+    # and the keeper of the global settings
+    from journal.Chronicler import Chronicler
+    chronicler = Chronicler()
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, "rotating.log")
+        # without any rotation settings, log files are plain
+        plain = device(path=filename)
+        assert type(plain) is File
+        plain.close()
+
+        # set the defaults
+        chronicler.rotation = {"size": 30, "generations": 2}
+        # carefully
+        try:
+            # now, log files rotate
+            log = device(path=filename)
+            assert isinstance(log, RotatingFile)
+            assert (log.size, log.generations) == (30, 2)
+            log.close()
+            # and explicit settings override the defaults
+            log = device(path=filename, generations=4)
+            assert (log.size, log.generations) == (30, 4)
+            log.close()
+        # no matter what
+        finally:
+            # restore the defaults
+            chronicler.rotation = {}
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the tests
+    test()
+    compressed()
+    failed()
+    defaults()
+    append()
+
+
+# end of file
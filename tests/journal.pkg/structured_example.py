@@ -0,0 +1,91 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import os
+import tempfile
+
+
+def test(format):
+    """
+    Verify that the structured device writes records that its reader can filter
+    """
+    # get the device and its reader
+    from journal.Structured import Structured, read
+    # and some channels
+    from journal.Debug import Debug
+    from journal.Warning import Warning
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, f"structured.{format}")
+        # make a device
+        device = Structured(path=filename, format=format)
+
+        # make a few channels
+        parser = Debug(name="tests.journal.parser").activate()
+        solver = Debug(name="tests.journal.solver").activate()
+        warning = Warning(name="tests.journal.solver")
+        # send their output to the device
+        for channel in (parser, solver, warning):
+            channel.device = device
+
+        # inject
+        for n in range(5):
+            parser.log(f"parsing {n}")
+            solver.notes["step"] = n
+            solver.line(f"solving {n}")
+            solver.log("done")
+        warning.log("diverging")
+        # close the file
+        device.close()
+
+        # read everything back
+        records = list(read(filename))
+        # verify the count
+        assert len(records) == 11
+        # check the structure of the first record
+        record = records[0]
+        assert record["channel"] == "tests.journal.parser"
+        assert record["severity"] == "debug"
+        assert record["kind"] == "memo"
+        assert record["page"] == ["parsing 0"]
+        assert record["pid"] == os.getpid()
+        assert record["notes"]["function"] == "test"
+        # the monotonic clock never runs backwards
+        stamps = [record["monotonic"] for record in records]
+        assert stamps == sorted(stamps)
+
+        # filter by channel
+        solving = list(read(filename, channels=["tests.journal.solver"]))
+        assert len(solving) == 6
+        assert [record["notes"]["step"] for record in solving[:5]] == list(range(5))
+        assert solving[0]["page"] == ["solving 0", "done"]
+        # by severity
+        warnings = list(read(filename, severities=["warning"]))
+        assert len(warnings) == 1
+        assert warnings[0]["kind"] == "alert"
+        assert warnings[0]["page"] == ["diverging"]
+        # and both
+        assert len(list(read(filename, channels=["tests.journal.solver"], severities=["debug"]))) == 5
+        assert list(read(filename, channels=["tests.journal.parser"], severities=["warning"])) == []
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the tests
+    test(format="json")
+    test(format="binary")
+
+
+# end of file
@@ -0,0 +1,86 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2020 all rights reserved
+
+
+# externals
+import os
+import tempfile
+import threading
+import time
+
+
+def test():
+    """
+    Verify that structured records behind a queue describe the thread that logged the message,
+    not the one that wrote it
+    """
+    # get the devices and the reader
+    from journal.Structured import Structured, read
+    from journal.Queue import Queue
+    # and a channel
+    from journal.Debug import Debug
+
+    # in a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        # pick a file name
+        filename = os.path.join(scratch, "structured.json")
+        # make a device
+        device = Structured(path=filename)
+        # and put a queue in front of it
+        queue = Queue(device=device)
+
+        # make a channel
+        channel = Debug(name="tests.journal.structured.queue").activate()
+        # send its output to the queue
+        channel.device = queue
+
+        # the times just before and after the worker logs its messages
+        window = []
+        # the work
+        def work():
+            # mark the time
+            window.append(time.monotonic())
+            # log a few messages
+            for n in range(5):
+                channel.log(f"message {n}")
+            # mark the time
+            window.append(time.monotonic())
+        # make a worker
+        worker = threading.Thread(target=work, name="worker")
+        # run it
+        worker.start()
+        worker.join()
+        # wait a bit before letting the queue write the records
+        time.sleep(0.05)
+        # write them
+        queue.close()
+        device.close()
+
+        # read them back
+        records = list(read(filename))
+        # check
+        assert len(records) == 5
+        for record in records:
+            # the records are tagged with the thread that logged them
+            assert record["threadname"] == "worker"
+            assert record["thread"] == worker.ident
+            assert record["pid"] == os.getpid()
+            # and the time they were logged, not the time they were written
+            assert window[0] <= record["monotonic"] <= window[1]
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # prohibit the journal bindings
+    journal_no_libjournal = True
+    # run the test
+    test()
+
+
+# end of file
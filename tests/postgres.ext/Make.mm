@@ -33,6 +33,10 @@ components:
 	${PYTHON} ./postgres_table.py
 	${PYTHON} ./postgres_reserved.py
 	${PYTHON} ./postgres_references.py
+	${PYTHON} ./postgres_copy.py
+	${PYTHON} ./postgres_fetch.py
+	${PYTHON} ./postgres_pool.py
+	${PYTHON} ./postgres_select.py
 	${PYTHON} ./postgres_database_drop.py
 
 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Load records into a table and export them using COPY
+"""
+
+
+import decimal
+import pyre.db
+
+class Weather(pyre.db.table, id="weather"):
+
+    city = pyre.db.str()
+    city.doc = "the city name"
+
+    state = pyre.db.str(maxlen=2)
+    state.doc = "the state name"
+
+    date = pyre.db.date()
+    date.doc = "the date of the measurement"
+
+    low = pyre.db.decimal(precision=5, scale=2)
+    low.doc = "the temperature low"
+
+    high = pyre.db.decimal(precision=5, scale=2)
+    high.doc = "the temperature low"
+
+
+def test():
+    # build a database component and connect to the database specified in the local
+    # configuration file
+    db = pyre.db.postgres(name="test").attach()
+
+    # some records
+    records = [
+        Weather.pyre_immutable(
+            city="Los Angeles", state="CA", date="2020-06-21", low=58.5, high=77),
+        Weather.pyre_immutable(
+            city="Pasadena", state="CA", date="2020-06-21", low=61, high=Weather.null),
+        Weather.pyre_immutable(
+            city="Tab\tNewline\nCity", state="CA", date="2020-06-22", low=60, high=80.25),
+        ]
+
+    # in a transaction block
+    with db:
+        # create the table
+        db.createTable(Weather)
+        # go through both formats
+        for binary in (False, True):
+            # load the records
+            assert db.load(table=Weather, records=records, binary=binary) == len(records)
+            # export them
+            rows = list(db.export(table=Weather, binary=binary))
+            # check
+            assert [row[0] for row in rows] == [record.city for record in records]
+            assert rows[0][4] == decimal.Decimal("77.00")
+            assert rows[1][4] is None
+            # export only some of the fields, but stop early
+            for city, low in db.export(table=Weather, fields=("city", Weather.low)):
+                assert city == "Los Angeles"
+                assert low == decimal.Decimal("58.50")
+                break
+            # verify that the connection is still usable
+            db.execute("DELETE FROM weather")
+        # drop the table
+        db.dropTable(Weather)
+
+    # and return the connection and the table
+    return db, Weather
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Retrieve the results of a query a batch at a time, in both text and binary form
+"""
+
+
+import datetime
+import decimal
+import pyre.db
+
+class Sample(pyre.db.table, id="samples"):
+
+    id = pyre.db.int().primary()
+    label = pyre.db.str()
+    amount = pyre.db.decimal(precision=9, scale=2)
+    day = pyre.db.date()
+
+
+class Labels(pyre.db.query, sample=Sample):
+
+    id = sample.id
+    label = sample.label
+
+
+def test():
+    # build a database component and connect to the database specified in the local
+    # configuration file
+    db = pyre.db.postgres(name="test").attach()
+    # retrieve the rows a few at a time
+    db.batch = 7
+
+    # in a transaction block
+    with db:
+        # create the table
+        db.createTable(Sample)
+        # populate it
+        db.insert(*(
+            Sample.pyre_immutable(
+                id=index, label=f"sample-{index}", amount=index/4,
+                day=datetime.date(2020, 1, 1) + datetime.timedelta(days=index))
+            for index in range(100)))
+
+        # go through both forms
+        for binary in (False, True):
+            # set the form
+            db.binary = binary
+            # run a query
+            records = list(db.select(Labels))
+            # check
+            assert [ record.id for record in records ] == list(range(100))
+            assert records[-1].label == "sample-99"
+
+            # stop a query early
+            for row in db.fetch("SELECT * FROM samples ORDER BY id"):
+                break
+            # verify that the connection is still usable
+            assert len(db.execute("SELECT id FROM samples")) == 101
+
+            # while a query is streaming in
+            rows = db.fetch("SELECT * FROM samples ORDER BY id")
+            next(rows)
+            # other statements are refused
+            try:
+                db.execute("SELECT id FROM samples")
+                assert False
+            except db.InterfaceError:
+                pass
+            # until the generator fails for reasons other than being closed
+            try:
+                rows.throw(ValueError)
+                assert False
+            except ValueError:
+                pass
+            # at which point the rest of the rows are drained, and the connection is usable
+            assert len(db.execute("SELECT id FROM samples")) == 101
+
+        # binary results are converted by type
+        db.binary = True
+        # retrieve a row
+        row, = db.fetch("SELECT * FROM samples WHERE id = 10")
+        # check
+        assert row == (10, "sample-10", decimal.Decimal("2.50"), datetime.date(2020, 1, 11))
+        # {NULL} is represented by the marker
+        (value,), = db.fetch("SELECT NULL::integer")
+        assert value is pyre.db.null
+
+        # drop the table
+        db.dropTable(Sample)
+
+    # and return the connection
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
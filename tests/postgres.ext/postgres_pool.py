@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Share a database among threads through a pool of connections
+"""
+
+
+import threading
+import pyre.db
+
+class Sample(pyre.db.table, id="samples"):
+
+    id = pyre.db.int().primary()
+    label = pyre.db.str()
+
+
+def test():
+    # build a pool of connections to the database specified in the local configuration file
+    pool = pyre.db.pool(name="test.pool")
+    pool.server = pyre.db.postgres(name="test")
+    # with a few of them
+    pool.maximum = 3
+
+    # create the table
+    with pool.connection() as db:
+        # the connection is configured like the template
+        assert isinstance(db, pyre.db.postgres)
+        assert db.database == pool.server.database
+        db.createTable(Sample)
+
+    # have a few threads insert records at the same time
+    def work(first):
+        # a few times
+        for index in range(first, first+10):
+            # get a connection
+            with pool.connection() as db:
+                # insert a record; each connection prepares the statement once
+                db.insert(Sample.pyre_immutable(id=index, label=f"sample-{index}"))
+    # make the threads
+    workers = [ threading.Thread(target=work, args=(first,)) for first in range(0, 60, 10) ]
+    # start them
+    for worker in workers: worker.start()
+    # and wait for them to finish
+    for worker in workers: worker.join()
+
+    # the pool never grew past its maximum
+    assert pool.size <= 3
+    # and every connection handed out was returned
+    assert pool.busy == 0
+    assert pool.statistics.checkouts == 61
+
+    # check
+    with pool.connection() as db:
+        assert db.execute("SELECT COUNT(*) FROM samples")[1] == ("60",)
+        # drop the table
+        db.dropTable(Sample)
+
+    # close the connections
+    pool.shutdown()
+    # and return the pool
+    return pool
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
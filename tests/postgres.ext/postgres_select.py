@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Run a compiled query repeatedly with different parameter values
+"""
+
+
+import pyre.db
+
+class Sample(pyre.db.table, id="samples"):
+
+    id = pyre.db.int().primary()
+    label = pyre.db.str()
+    weight = pyre.db.float()
+
+
+class Heavy(pyre.db.query, sample=Sample):
+
+    id = sample.id
+    label = sample.label
+
+    where = (sample.weight >= pyre.db.parameter("weight")) & (sample.id < pyre.db.parameter("id"))
+    order = pyre.db.descending(id)
+
+
+def test():
+    # build a database component and connect to the database specified in the local
+    # configuration file
+    db = pyre.db.postgres(name="test").attach()
+
+    # in a transaction block
+    with db:
+        # create the table
+        db.createTable(Sample)
+        # populate it
+        db.insert(*(
+            Sample.pyre_immutable(id=index, label=f"sample-{index}", weight=index/10)
+            for index in range(100)))
+
+        # go through both forms
+        for binary in (False, True):
+            # set the form
+            db.binary = binary
+            # run the query with a few sets of parameters
+            for weight in range(10):
+                # retrieve the records
+                records = list(db.select(Heavy, weight=weight, id=50))
+                # check
+                assert [ int(record.id) for record in records ] == list(range(49, weight*10-1, -1))
+
+        # the statement was compiled once
+        assert len(Heavy.pyre_statements) == 1
+        # and it marks the parameters the postgres way
+        sql, names = db.compile(query=Heavy)
+        assert "$1" in sql and "$2" in sql
+        assert names == ("weight", "id")
+
+        # drop the table
+        db.dropTable(Sample)
+
+    # and return the connection
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
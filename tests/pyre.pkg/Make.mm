@@ -33,6 +33,7 @@ RECURSE_DIRS = \
     db \
     ipc \
     nexus \
+    http \
     platforms \
     shells \
     flow \
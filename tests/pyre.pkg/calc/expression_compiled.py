@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that expressions are bound to their operands and share their compiled programs
+"""
+
+
+def test():
+    import pyre.calc
+
+    # set up the model
+    model = pyre.calc.model()
+
+    # register some nodes
+    model["production"] = 80.
+    model["shipping"] = 20.
+    model["tax"] = 5.
+    # and two expressions with the same structure
+    cost = model.expression("{production}+{shipping}")
+    total = model.expression("{cost}+{tax}")
+    model["cost"] = cost
+    model["total"] = total
+
+    # check the values
+    assert model["cost"] == 100.
+    assert model["total"] == 105.
+    # the expressions have the same structure, so they share their program
+    assert cost._program is total._program
+
+    # repeated references resolve to a single operand
+    twice = model.expression("{production}*{production} + {shipping}")
+    assert len(twice.operands) == 2
+    assert twice.value == 80.*80. + 20.
+
+    # replace one of the operands with a new node
+    model["production"] = model.expression("2*{tax}")
+    # and verify the expressions were rebound to it
+    assert model["cost"] == 30.
+    assert model["total"] == 35.
+    assert twice.value == 10.*10. + 20.
+
+    # make sure expressions can't break out of their parentheses
+    try:
+        model.expression("{production}), (1")
+        assert False
+    except model.ExpressionSyntaxError:
+        pass
+
+    # evaluate an expression without building a node
+    assert model.node.expression.expand(model=model, expression="{tax}+1") == 6.
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the prefix index used by {find} returns the same nodes as an exhaustive scan
+"""
+
+
+def test():
+    import re
+    import pyre.calc
+
+    # create a model
+    model = pyre.calc.model()
+
+    # register some nodes
+    model["user.name"] = "Michael Aïvázis"
+    model["user.email"] = "michael.aivazis@orthologue.com"
+    model["user.affiliation"] = "orthologue"
+    model["users"] = "everybody"
+    model["host.name"] = "localhost"
+    model["host.user"] = "{user.name}"
+
+    # the exhaustive search
+    def scan(pattern):
+        # build the regex
+        regex = re.compile(pattern)
+        # and check every node
+        return [name for name in sorted(info.name for info in model._metadata.values())
+                if regex.match(name)]
+
+    # go through some patterns
+    for pattern in [
+            "", "user", r"user\.", "user.", r"user\.name", r"users?\.", r"^user\.e",
+            "u[s]er", r"host\.(name|user)", "host|user", r"(?i)USER\.", r"\w+\.name",
+            "user.*", "uz?ser", r"host\..*e$",
+            ]:
+        # get the names the model finds
+        names = [info.name for info, node in model.find(pattern=pattern)]
+        # and compare against the exhaustive search
+        assert names == scan(pattern), pattern
+
+    # check the extraction of literal prefixes
+    prefix = lambda pattern: model.literalPrefix(regex=re.compile(pattern))
+    assert prefix(r"user\.name") == "user.name"
+    assert prefix("user.name") == "user"
+    assert prefix(r"^user\.") == "user."
+    assert prefix("users?") == "user"
+    assert prefix("users+") == "users"
+    assert prefix(r"user\d") == "user"
+    assert prefix("user|host") == ""
+    assert prefix("(?i)user") == ""
+
+    # nodes registered after a search must show up in the next one
+    model["user.phone"] = "555-1212"
+    names = [info.name for info, node in model.find(pattern=r"user\.")]
+    assert names == ["user.affiliation", "user.email", "user.name", "user.phone"]
+    # and so should the cached ordering used by open-ended searches
+    names = [info.name for info, node in model.find()]
+    assert names == scan("")
+
+    # all done
+    return model
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that change notifications traverse diamond shaped graphs only once
+"""
+
+
+class Recorder:
+    """
+    An observer that counts the notifications it receives
+    """
+
+    def flush(self, observable=None, **kwds):
+        # record the notification
+        self.notifications.append(observable)
+        # all done
+        return self
+
+    def __init__(self):
+        self.notifications = []
+        return
+
+
+def test():
+    import pyre.calc
+
+    # the root of the graph
+    root = pyre.calc.var(value=1)
+    # build a stack of diamonds: every node in a layer depends on both nodes in the layer
+    # above it, so the number of paths from the root doubles with every layer
+    layer = (root, root)
+    # make a pile of all the nodes
+    nodes = []
+    # build the layers
+    for _ in range(20):
+        # each new node is the sum of the two nodes above it
+        layer = (layer[0] + layer[1], layer[0] + layer[1])
+        # save them
+        nodes.extend(layer)
+    # the bottom of the stack
+    bottom = layer[0]
+
+    # evaluate
+    assert bottom.value == 2**20
+    # attach a recorder to the bottom node, and another to the root
+    recorder = Recorder()
+    bottom.addObserver(recorder)
+    watcher = Recorder()
+    root.addObserver(watcher)
+
+    # make a change
+    root.value = 2
+    # the recorders were notified exactly once by their observables
+    assert len(recorder.notifications) == 1
+    assert recorder.notifications[0] is bottom
+    assert len(watcher.notifications) == 1
+    # all the nodes got invalidated
+    assert all(node.dirty for node in nodes)
+    # and the new value is correct
+    assert bottom.value == 2**21
+
+    # once evaluated, another change notifies everybody again
+    root.value = 3
+    assert len(recorder.notifications) == 2
+    assert bottom.value == 3 * 2**20
+
+    # dead observers are pruned
+    del recorder
+    assert len(tuple(bottom.observers)) == 0
+    assert len(bottom._observers) == 0
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
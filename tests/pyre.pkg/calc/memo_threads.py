@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that threads that modify separate graphs at the same time don't interfere with each
+other's change notifications
+"""
+
+
+# externals
+import threading
+import time
+
+
+class Recorder:
+    """
+    An observer that counts the notifications it receives, and takes its time doing it
+    """
+
+    def flush(self, observable=None, **kwds):
+        # give the other threads a chance to run in the middle of the propagation
+        time.sleep(0.0005)
+        # record the notification
+        self.notifications.append(observable)
+        # all done
+        return self
+
+    def __init__(self):
+        self.notifications = []
+        return
+
+
+def test(threads=4, changes=20):
+    import pyre.calc
+
+    # the failures, if any
+    failures = []
+    # make sure the threads make their changes at the same time
+    barrier = threading.Barrier(threads)
+
+    # the work of each thread
+    def work():
+        # carefully
+        try:
+            # build a small stack of diamonds
+            root = pyre.calc.var(value=1)
+            layer = (root, root)
+            # and remember one of the nodes in the middle
+            for index in range(4):
+                layer = (layer[0] + layer[1], layer[0] + layer[1])
+                if index == 1: node = layer[1]
+            bottom = layer[0]
+            # evaluate it
+            assert bottom.value == 2**4
+            # watch the node in the middle and the bottom
+            middle = Recorder()
+            node.addObserver(middle)
+            recorder = Recorder()
+            bottom.addObserver(recorder)
+            # wait for the others
+            barrier.wait()
+            # make some changes
+            for value in range(2, changes+2):
+                # modify the root
+                root.value = value
+                # the recorders were notified exactly once per change, by their own nodes
+                assert len(middle.notifications) == value - 1
+                assert len(recorder.notifications) == value - 1
+                assert recorder.notifications[-1] is bottom
+                # and the new value is correct
+                assert bottom.value == value * 2**4
+        # if anything goes wrong
+        except Exception as error:
+            # save it
+            failures.append(error)
+            # and let the other threads go
+            barrier.abort()
+        # all done
+        return
+
+    # make the threads
+    workers = [ threading.Thread(target=work) for _ in range(threads) ]
+    # start them
+    for worker in workers: worker.start()
+    # and wait for them to finish
+    for worker in workers: worker.join()
+
+    # check
+    assert not failures, failures
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the persistent store of parsed configuration events replays current sources and
+refreshes stale ones
+"""
+
+
+def test():
+    # externals
+    import os
+    import shutil
+    import tempfile
+    import pyre.config
+
+    # make a scratch area
+    scratch = tempfile.mkdtemp()
+    # attempt to
+    try:
+        # make a copy of the sample configuration, so we can modify it
+        sample = os.path.join(scratch, "sample.pfg")
+        shutil.copy("sample.pfg", sample)
+        # build the cache
+        cache = pyre.config.newCache(directory=os.path.join(scratch, "cache"))
+        # and get the codec
+        codec = pyre.executive.configurator.codec("pfg")
+
+        # a helper that decodes the sample
+        def decode():
+            # open the file
+            with open(sample) as source:
+                # harvest the events
+                events = cache.decode(codec=codec, uri=sample, source=source, locator=None)
+                # and collect the assignments
+                return [(".".join(event.key), event.value, str(event.locator)) for event in events]
+
+        # the first time, the events are harvested by the codec
+        original = decode()
+        # and stored
+        assert len(os.listdir(cache.directory)) == 1
+        # check the contents
+        assert original[0][:2] == ("sample.user.name", "michael a.g. aïvázis")
+        # the second time, they are replayed with the same values and locators
+        assert decode() == original
+
+        # modify the source
+        with open(sample, "a") as source:
+            source.write("sample.user.shell = tcsh\n")
+        # verify the stale events were not replayed
+        refreshed = decode()
+        assert len(refreshed) == len(original) + 1
+        assert refreshed[-1][:2] == ("sample.user.shell", "tcsh")
+        # and the store was updated in place
+        assert len(os.listdir(cache.directory)) == 1
+        assert decode() == refreshed
+
+        # a codec that fails after harvesting the events in its source
+        class Broken:
+            # the encoding it is registered under
+            encoding = "broken"
+            # the parser
+            def decode(self, uri, source, locator):
+                # harvest the events
+                yield from codec.decode(uri, source, locator)
+                # and then complain
+                raise pyre.config.exceptions.DecodingError(codec=self, uri=uri)
+        # decode the sample with it
+        events = []
+        with open(sample) as source:
+            # carefully
+            try:
+                # collect the events
+                for event in cache.decode(codec=Broken(), uri=sample, source=source, locator=None):
+                    events.append(event)
+                # the error should have been reported
+                assert False, "unreachable"
+            # when it is
+            except pyre.config.exceptions.DecodingError:
+                # move on
+                pass
+        # verify that the events before the error reached the caller
+        assert len(events) == len(refreshed)
+        # but were not stored
+        assert len(os.listdir(cache.directory)) == 1
+    # no matter what happens
+    finally:
+        # clean up
+        shutil.rmtree(scratch)
+
+    # all done
+    return cache
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
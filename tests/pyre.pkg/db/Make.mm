@@ -28,6 +28,7 @@ tables:
 	${PYTHON} ./table_instantiation.py
 	${PYTHON} ./table_insert.py
 	${PYTHON} ./table_update.py
+	${PYTHON} ./copy_codec.py
 
 queries:
 	${PYTHON} ./query_star.py
@@ -35,6 +36,7 @@ queries:
 	${PYTHON} ./query_projection_expressions.py
 	${PYTHON} ./query_projection_multitable.py
 	${PYTHON} ./query_restriction.py
+	${PYTHON} ./query_parameters.py
 	${PYTHON} ./query_collation.py
 	${PYTHON} ./query_collation_explicit.py
 	${PYTHON} ./query_collation_expression.py
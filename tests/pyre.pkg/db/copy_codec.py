@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise the encoding and decoding of the data streams of the postgres COPY command
+"""
+
+
+def test():
+    # externals
+    import datetime
+    import decimal
+    # access the package
+    import pyre.db
+    # and the codec
+    from pyre.db.Copy import Copy
+
+    # declare a table with a field of every type
+    class Reading(pyre.db.table, id='readings'):
+
+        id = pyre.db.int().primary()
+        sensor = pyre.db.str()
+        active = pyre.db.bool()
+        value = pyre.db.float()
+        amount = pyre.db.decimal(precision=12, scale=4).setDefault(decimal.Decimal("1.5"))
+        day = pyre.db.date()
+        stamp = pyre.db.time(timezone=True)
+
+    # some rows
+    rows = [
+        (1, "plain", True, 0.5, decimal.Decimal("12345.6"),
+         datetime.date(2020, 1, 2),
+         datetime.datetime(2020, 1, 2, 3, 4, 5, 6000, tzinfo=datetime.timezone.utc)),
+        (2, "tab\tnew\nline\\back", False, -1e-7, decimal.Decimal("-0.0010"),
+         datetime.date(1999, 12, 31),
+         datetime.datetime(1999, 12, 31, 23, 59, 59, tzinfo=datetime.timezone.utc)),
+        (3, None, None, None, pyre.db.null, None, None),
+        (4, "ünïcödé", True, 1e300, decimal.Decimal("0"),
+         datetime.date(2000, 1, 1),
+         datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)),
+        (5, "", False, 0.0, pyre.db.default,
+         datetime.date(2038, 1, 19),
+         datetime.datetime(2038, 1, 19, 3, 14, 8, tzinfo=datetime.timezone.utc)),
+        ]
+    # what they look like when they come back
+    expected = [
+        rows[0],
+        rows[1],
+        (3, None, None, None, None, None, None),
+        rows[3],
+        rows[4][:4] + (decimal.Decimal("1.5"),) + rows[4][5:],
+        ]
+
+    # build a codec
+    copy = Copy()
+    # make the chunks small, so the rows span them
+    copy.chunk = 16
+    # get the fields
+    fields = copy.select(table=Reading)
+    assert fields == Reading.pyre_fields
+    # select by name and by reference
+    assert copy.select(table=Reading, fields=("id", Reading.sensor)) == (
+        Reading.pyre_fields[0], Reading.pyre_fields[1])
+
+    # check the statements
+    assert "\n".join(copy.copyFrom(table=Reading, fields=fields[:2], binary=True)) == (
+        "COPY readings (id, sensor)\n  FROM STDIN WITH (FORMAT binary);")
+    assert "\n".join(copy.copyTo(table=Reading, fields=fields[:2])) == (
+        "COPY readings (id, sensor)\n  TO STDOUT;")
+
+    # check the text form of a row
+    line, = copy.text(fields=fields[:3], rows=[rows[1][:3]])
+    assert line == b"2\ttab\\tnew\\nline\\\\back\tf\n"
+
+    # check the binary form of a few values against the postgres wire format
+    assert copy.encode_decimal(None, decimal.Decimal("12345.6")) == bytes.fromhex(
+        "0003" "0001" "0000" "0001" "0001" "0929" "1770")
+    assert copy.encode_decimal(None, decimal.Decimal("-0.0010")) == bytes.fromhex(
+        "0001" "ffff" "4000" "0004" "000a")
+    assert copy.encode_date(Reading.pyre_fields[5], datetime.date(2000, 1, 2)) == (
+        bytes.fromhex("00000001"))
+
+    # query results in binary form are decoded by the type identifiers of their columns
+    assert copy.typeDecoder(23)(bytes.fromhex("ffffffff")) == -1
+    assert copy.typeDecoder(1700)(copy.encode_decimal(None, decimal.Decimal("-0.0010"))) == (
+        decimal.Decimal("-0.0010"))
+    assert copy.typeDecoder(1114)(bytes.fromhex("0000000000000001")) == (
+        datetime.datetime(2000, 1, 1, 0, 0, 0, 1))
+    # and the values of unknown types are left alone
+    assert copy.typeDecoder(17)(b"raw") == b"raw"
+
+    # go through both formats
+    for binary in (False, True):
+        # encode the rows
+        chunks = list(copy.encode(fields=fields, rows=rows, binary=binary))
+        # there should be more than one chunk
+        assert len(chunks) > 1
+        # cut the stream into pieces that don't line up with the rows
+        stream = b"".join(chunks)
+        pieces = (stream[offset:offset+7] for offset in range(0, len(stream), 7))
+        # decode them
+        decoded = list(copy.decode(fields=fields, chunks=pieces, binary=binary))
+        # and check
+        assert decoded == expected, (binary, decoded)
+
+    # worksheets are matched to the table by field name
+    import pyre.tabular
+    class Sensors(pyre.tabular.sheet):
+        name = pyre.tabular.str()
+        sensor = pyre.tabular.str()
+        id = pyre.tabular.int()
+    # make one
+    sheet = Sensors(name="sensors").pyre_immutable(data=[("a", "left", 7), ("b", "right", 8)])
+    # match it
+    matched, projected = copy.match(table=Reading, sheet=sheet)
+    # check
+    assert matched == (Reading.pyre_fields[1], Reading.pyre_fields[0])
+    assert list(projected) == [("left", 7), ("right", 8)]
+
+    # all done
+    return copy
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
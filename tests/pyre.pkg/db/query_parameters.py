@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Compile a query with parameters in its restriction
+"""
+
+
+def test():
+    # access to the package
+    import pyre.db
+
+    # declare a simple table
+    class Weather(pyre.db.table, id="weather"):
+        """
+        The sample table from the postgres tutorial
+        """
+        # the fields
+        city = pyre.db.str()
+        date = pyre.db.date()
+        low = pyre.db.int()
+        high = pyre.db.int()
+        precipitation = pyre.db.float()
+
+    # and a query with parameters
+    class measurements(pyre.db.query, weather=Weather):
+        # the fields
+        city = weather.city
+        date = weather.date
+        # the restriction
+        where = (
+            (city == pyre.db.parameter("city")) &
+            (pyre.db.parameter("low") < weather.low) &
+            (weather.high < pyre.db.parameter("high") + weather.low))
+
+    # get a server
+    server = pyre.db.server()
+    # compile the SELECT statement
+    stmt, names = server.sql.compile(
+        query=measurements, placeholder=lambda index: "${}".format(index+1))
+    # print(stmt)
+    assert stmt == "\n".join((
+        "SELECT",
+        "    weather.city AS city,",
+        "    weather.date AS date",
+        "  FROM",
+        "    weather",
+        "  WHERE",
+        "    ((((weather.city) = ($1)) AND ((weather.low) > ($2))) AND "
+        "((weather.high) < (($3) + (weather.low))));"
+        ))
+    # the parameters are bound in the order they appear
+    assert names == ("city", "low", "high")
+
+    # outside a compiled statement, parameters are rendered by name
+    stmt = tuple(server.sql.select(measurements))
+    assert stmt[-1] == (
+        "    ((((weather.city) = (:city)) AND ((weather.low) > (:low))) AND "
+        "((weather.high) < ((:high) + (weather.low))));")
+
+    # servers cache the compiled statement with the query
+    sql, names = server.compile(query=measurements)
+    assert server.compile(query=measurements)[0] is sql
+    assert names == ("city", "low", "high")
+    # and bind the values by name
+    assert server.bind(
+        names=names, parameters=dict(high=10, low=pyre.db.null, city="Chicago")) == (
+            "Chicago", None, 10)
+    # missing values are an error
+    try:
+        server.bind(names=names, parameters=dict(city="Chicago"))
+        assert False
+    except server.exceptions.InterfaceError:
+        pass
+
+    # queries without parameters compile as well
+    class cities(pyre.db.query, weather=Weather):
+        city = weather.city
+    # check
+    sql, names = server.compile(query=cities)
+    assert names == ()
+    assert sql == "\n".join(server.sql.select(cities))
+    # but the cache is not inherited
+    assert measurements.pyre_statements is not cities.pyre_statements
+
+    # all done
+    return Weather
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
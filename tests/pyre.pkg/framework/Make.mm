@@ -26,6 +26,7 @@ nameserver:
 	${PYTHON} ./nameserver.py
 	${PYTHON} ./nameserver_access.py
 	${PYTHON} ./nameserver_aliases.py
+	${PYTHON} ./nameserver_batch.py
 
 fileserver:
 	${PYTHON} ./fileserver.py
@@ -39,6 +40,8 @@ linker:
 	${PYTHON} ./linker.py
 	${PYTHON} ./linker_codecs.py
 	${PYTHON} ./linker_shelves.py
+	${PYTHON} ./linker_resolutions.py
+	${PYTHON} ./linker_resolutions_persist.py
 
 externals:
 	${PYTHON} ./externals.py
@@ -50,6 +53,7 @@ executive:
 	${PYTHON} ./executive_resolve_duplicate.py
 	${PYTHON} ./executive_resolve_badImport.py
 	${PYTHON} ./executive_resolve_syntaxError.py
+	${PYTHON} ./executive_lazy.py
 
 
 # end of file
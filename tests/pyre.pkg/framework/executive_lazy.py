@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that a lazy boot defers the discovery of the host and the loading of the subsystems
+"""
+
+
+def test():
+    # externals
+    import sys
+    # access the framework
+    import pyre
+    # and the executive
+    executive = pyre.executive
+
+    # the runtime environment has not been discovered yet
+    assert not executive.discovered
+    # and the subsystems were left alone
+    assert "pyre.nexus" not in sys.modules
+    assert "pyre.shells" not in sys.modules
+
+    # asking for a subsystem loads it
+    assert pyre.nexus is sys.modules["pyre.nexus"]
+    # as does asking for an application shell
+    assert pyre.application is sys.modules["pyre.shells"].application
+    # but the host is still unknown
+    assert not executive.discovered
+
+    # until somebody asks for it
+    host = pyre.host
+    # which triggers the discovery
+    assert executive.discovered
+    # and attaches it to the executive and the dashboard
+    assert executive.host is host
+    assert executive.dashboard.pyre_host.pyre_name == "pyre.host"
+    # along with the rest of the runtime environment
+    assert executive.user.pyre_name == "pyre.user"
+
+    # all done
+    return executive
+
+
+# main
+if __name__ == "__main__":
+    # ask for a lazy boot
+    pyre_lazy = True
+    # do...
+    test()
+
+
+# end of file
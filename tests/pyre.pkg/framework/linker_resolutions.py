@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the linker remembers the outcome of previous attempts to locate shelves
+"""
+
+
+def test():
+    # framework
+    import pyre
+    # and its parts
+    executive = pyre.executive
+    linker = executive.linker
+    cache = linker.resolutions
+
+    # a helper that looks up the tally of a request
+    def tally(context):
+        # go through the records
+        for key, record in cache.records():
+            # look for the one that matches the importer and {context}
+            if key[:3] == ("Importer", "import", tuple(context)):
+                # and return it
+                return record
+        # if we get this far, something is wrong
+        assert False, f"no record for {context}"
+
+    # resolve a request that fails
+    assert tuple(executive.resolve(uri="import:nomodule.sub.nosymbol")) == ()
+    # get its tally
+    record = tally(["nomodule", "sub", "nosymbol"])
+    # every load failed; the candidates that show up more than once are loaded only once
+    assert record.resolutions == 1
+    assert record.loads == record.misses > 0
+    assert record.probes == record.loads + record.skips
+    # and the search was exhausted, so the request is known to have no shelves
+    assert record.hits == ()
+    # try again
+    assert tuple(executive.resolve(uri="import:nomodule.sub.nosymbol")) == ()
+    # this time, nothing was probed
+    assert record.resolutions == 2
+    assert record.loads == record.misses
+    assert record.probes == record.loads + record.skips
+
+    # a new request that shares candidates with the first one
+    assert tuple(executive.resolve(uri="import:nomodule.nosymbol")) == ()
+    # skips the candidates that are known to fail
+    record = tally(["nomodule", "nosymbol"])
+    assert record.skips > 0
+    assert record.probes == record.skips + record.loads
+
+    # resolve one that works
+    component, *_ = executive.resolve(uri="import:pyre.component")
+    assert component is pyre.component
+    # check that the tally recorded the shelf
+    record = tally(["pyre", "component"])
+    assert record.hits
+    # save the tally
+    probes, loads = record.probes, record.loads
+    # resolve it again
+    component, *_ = executive.resolve(uri="import:pyre.component")
+    assert component is pyre.component
+    # and verify that the shelf came straight from the record
+    assert record.resolutions == 2
+    assert record.probes == probes + len(record.hits)
+    assert record.loads == loads
+
+    # stop at the first shelf of a new request
+    resolutions = executive.resolve(uri="import:pyre.shells.application")
+    assert next(resolutions) is pyre.application
+    resolutions.close()
+    # the shelves found so far are recorded
+    record = tally(["pyre", "shells", "application"])
+    assert record.hits
+    assert not record.complete
+    # save the tally
+    found, probes, loads = record.hits, record.probes, record.loads
+    # so stopping at the first shelf again
+    resolutions = executive.resolve(uri="import:pyre.shells.application")
+    assert next(resolutions) is pyre.application
+    resolutions.close()
+    # gets it straight from the record
+    assert record.resolutions == 2
+    assert record.probes == probes + len(found)
+    assert record.loads == loads
+    # while asking for all of them resumes the search past the recorded shelves
+    assert tuple(executive.resolve(uri="import:pyre.shells.application"))[0] is pyre.application
+    assert record.complete
+    assert record.probes > probes + 2 * len(found)
+    assert record.hits[:len(found)] == found
+
+    # changing the search path
+    import sys
+    sys.path.append("nonexistent-folder")
+    # makes the linker forget what it knows
+    try:
+        assert tuple(executive.resolve(uri="import:nomodule.sub.nosymbol")) == ()
+        record = tally(["nomodule", "sub", "nosymbol"])
+        assert record.resolutions == 1
+        assert record.loads > 0
+    # no matter what happens
+    finally:
+        # restore the search path
+        sys.path.remove("nonexistent-folder")
+
+    # all done
+    return executive
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the misses saved across runs are the right ones, and that they are forgotten when
+their location changes
+"""
+
+
+def test():
+    # externals
+    import importlib
+    import os
+    import shutil
+    import sys
+    import tempfile
+    # framework
+    import pyre
+    # and its parts
+    linker = pyre.executive.linker
+    cache = linker.resolutions
+
+    # make a folder
+    root = tempfile.mkdtemp()
+    # with a package
+    package = os.path.join(root, "probe")
+    os.mkdir(package)
+    # that is empty
+    open(os.path.join(package, "__init__.py"), "w").close()
+    # except for a module that fails while it is being imported
+    with open(os.path.join(package, "broken.py"), "w") as stream:
+        stream.write("import probe_nomodule\n")
+    # and a place for the persistent store
+    store = os.path.join(root, "resolutions.pickle")
+
+    # put the folder on the python path
+    sys.path.insert(0, root)
+    # carefully
+    try:
+        # resolve a request for a module that doesn't exist
+        assert tuple(pyre.executive.resolve(uri="import:probe.new.nosymbol")) == ()
+        # and one for a module that fails to import
+        assert tuple(pyre.executive.resolve(uri="import:probe.broken.nosymbol")) == ()
+        # both are known to fail
+        section = cache.sections["Importer"]
+        assert "import:probe.new" in section.misses
+        assert "import:probe.broken" in section.misses
+        # but only the missing module may be remembered across runs
+        assert "import:probe.new" in section.absent
+        assert "import:probe.broken" not in section.absent
+
+        # save the misses
+        cache.path = store
+        cache.save(loaders=linker.codecs)
+        # and load them back
+        saved = cache.__class__(path=store).load(loaders=linker.codecs)
+        # only the missing module is there
+        section = saved.sections["Importer"]
+        assert "import:probe.new" in section.misses
+        assert "import:probe.broken" not in section.misses
+
+        # add the module to the existing package
+        with open(os.path.join(package, "new.py"), "w") as stream:
+            stream.write("import pyre\nclass nosymbol(pyre.component): pass\n")
+        # make sure the package folder looks modified
+        stat = os.stat(package)
+        os.utime(package, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        # make sure the import system notices
+        importlib.invalidate_caches()
+
+        # load the misses again
+        saved = cache.__class__(path=store).load(loaders=linker.codecs)
+        # the missing module is forgotten, since its package changed
+        assert "import:probe.new" not in saved.sections["Importer"].misses
+        # so a linker that uses the store
+        linker.resolutions = saved
+        # finds it
+        component, *_ = pyre.executive.resolve(uri="import:probe.new.nosymbol")
+        assert component.__name__ == "nosymbol"
+    # no matter what happens
+    finally:
+        # restore the cache
+        cache.path = None
+        linker.resolutions = cache
+        # and the search path
+        sys.path.remove(root)
+        # and clean up
+        shutil.rmtree(root)
+
+    # all done
+    return linker
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that batches of assignments are inserted in the namespace correctly
+"""
+
+
+def test():
+    # access the package
+    import pyre
+    # and the nameserver
+    nameserver = pyre.executive.nameserver
+    # make a locator
+    locator = pyre.tracking.here()
+    # and a priority factory
+    priority = nameserver.priority.user
+
+    # an existing setting with higher priority than the batch
+    nameserver["batch.user.affiliation"] = "orthologue"
+    # and one with lower priority
+    nameserver.insert(name="batch.user.email", value="nobody@nowhere",
+                      priority=nameserver.priority.defaults(), locator=locator,
+                      factory=pyre.properties.str().instanceSlot)
+    # a reference to a node that is part of the batch
+    nameserver["batch.signature"] = "{batch.user.name}"
+
+    # build the batch; references to other members of the batch appear before their targets
+    batch = [
+        ("batch.user.alias", "{batch.user.name}"),
+        ("batch.user.name", "Michael Aïvázis"),
+        ("batch.user.name", "michael aïvázis"),
+        ("batch.user.email", "michael.aivazis@orthologue.com"),
+        ("batch.user.affiliation", "caltech"),
+        ]
+    # convert into assignments
+    assignments = [
+        (name.split(nameserver.separator), value, locator, priority())
+        for name, value in batch
+        ]
+    # insert them
+    results = nameserver.insertBatch(assignments=assignments)
+    # only the winners built slots
+    assert len(results) == 3
+
+    # check the values
+    assert nameserver["batch.user.name"] == "michael aïvázis"
+    assert nameserver["batch.user.alias"] == "michael aïvázis"
+    assert nameserver["batch.user.email"] == "michael.aivazis@orthologue.com"
+    assert nameserver["batch.user.affiliation"] == "orthologue"
+    # the existing reference got rewired
+    assert nameserver["batch.signature"] == "michael aïvázis"
+
+    # changes propagate through references that were resolved inside the batch
+    nameserver["batch.user.name"] = "michael"
+    assert nameserver["batch.user.alias"] == "michael"
+    assert nameserver["batch.signature"] == "michael"
+
+    # and return the nameserver
+    return nameserver
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
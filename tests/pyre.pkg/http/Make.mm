@@ -0,0 +1,24 @@
+# -*- Makefile -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+# project defaults
+include pyre.def
+
+all: test
+
+test: requests servers clean
+
+requests:
+	${PYTHON} ./request_incremental.py
+
+servers:
+	${PYTHON} ./server_keepalive.py
+	${PYTHON} ./server_files.py
+
+
+# end of file
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that requests can be assembled from arbitrarily small pieces, and that pipelined
+requests are separated correctly
+"""
+
+
+# the requests
+get = b"GET /index.html HTTP/1.1\r\nHost: localhost\r\nConnection: keep-alive\r\n\r\n"
+post = (
+    b"POST /query HTTP/1.1\r\nHost: localhost\r\nContent-Length: 11\r\n\r\n" +
+    b"hello world")
+old = b"GET / HTTP/1.0\r\n\r\n"
+
+
+def test():
+    # access the package
+    from pyre.http.Server import Server
+    # make a server; the requests need it to build error responses
+    server = Server(name="tests.http.server")
+
+    # feed a request one byte at a time
+    request = server.request()
+    for index in range(len(post)):
+        # hand it the next byte
+        complete = request.extract(server=server, chunk=post[index:index+1])
+        # it should be complete only after the last one
+        assert complete == (index == len(post) - 1)
+    # check what we got
+    assert request.command == "POST"
+    assert request.url == "/query"
+    assert request.version == (1,1)
+    assert request.header("content-length") == "11"
+    assert b"".join(request.payload) == b"hello world"
+    assert request.leftover == b""
+    assert request.keepalive
+
+    # now, send a few requests in one chunk
+    chunk = get + post + old + get[:10]
+    # pull them out
+    requests = []
+    while True:
+        # make a request
+        request = server.request()
+        # hand it the chunk
+        if not request.extract(server=server, chunk=chunk): break
+        # save it
+        requests.append(request)
+        # and move on to the leftover bytes
+        chunk = request.leftover
+    # check
+    assert [ request.command for request in requests ] == ["GET", "POST", "GET"]
+    assert b"".join(requests[1].payload) == b"hello world"
+    # the last one is incomplete; give it the rest
+    assert request.extract(server=server, chunk=get[10:])
+    assert request.url == "/index.html"
+
+    # HTTP/1.0 connections don't persist by default
+    assert not requests[2].keepalive
+
+    # verify that garbage is rejected
+    request = server.request()
+    try:
+        request.extract(server=server, chunk=b"garbage\r\n\r\n")
+        assert False, "unreachable"
+    except server.responses.BadRequestSyntax:
+        pass
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the web server streams files, validates cached copies and honors byte ranges
+
+The server runs in a child process and serves files from a local directory and from a zip
+archive; the parent acts as the client, and shuts the server down when it is done
+"""
+
+
+# externals
+import http.client
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import zipfile
+# support
+import pyre
+
+
+# the application
+class Files(pyre.application, family="tests.http.files"):
+    """
+    An application that responds to every request with the file that was requested
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Fulfill a request from an HTTP {server}
+        """
+        # serve the file
+        return server.documents.File(uri=request.url, server=server, application=self)
+
+
+# the file contents
+small = b"a small file"
+large = bytes(range(256)) * 4096
+
+
+def serve(root):
+    """
+    Start a server for the files in {root} and return its address, along with the process id
+    of the server
+    """
+    # access the server
+    from pyre.http.Server import Server
+    # make an application
+    app = Files(name="tests.http.files")
+    # give it the files
+    app.pfs["www"] = pyre.filesystem.local(root=root).discover()
+    app.pfs["bundle"] = pyre.filesystem.zip(root=os.path.join(root, "bundle.zip")).discover()
+    # a dispatcher
+    dispatcher = pyre.ipc.newSelector(name="tests.http.files.dispatcher")
+    # and a server
+    server = Server(name="tests.http.files")
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # serve until killed
+        dispatcher.watch()
+        # just in case
+        os._exit(0)
+    # in the parent, return the port and the server process id
+    return server.address.port, pid
+
+
+def get(connection, url, **headers):
+    """
+    Request {url} over {connection}; return the status, the headers and the body of the response
+    """
+    # send the request
+    connection.request("GET", url, headers=headers)
+    # get the response
+    answer = connection.getresponse()
+    # and return its pieces
+    return answer.status, answer, answer.read()
+
+
+def test():
+    # make a directory with the files to serve
+    root = tempfile.mkdtemp()
+    # populate it
+    with open(os.path.join(root, "small.txt"), "wb") as stream: stream.write(small)
+    with open(os.path.join(root, "large.bin"), "wb") as stream: stream.write(large)
+    # and make an archive with the large file in it
+    with zipfile.ZipFile(os.path.join(root, "bundle.zip"), "w") as archive:
+        archive.writestr("large.bin", large, compress_type=zipfile.ZIP_DEFLATED)
+
+    # start the server
+    port, pid = serve(root=root)
+    # carefully
+    try:
+        # open a connection
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+
+        # get the small file
+        status, answer, body = get(connection, "/www/small.txt")
+        # check it
+        assert status == 200
+        assert body == small
+        assert answer.getheader("Accept-Ranges") == "bytes"
+        # get its validators
+        tag = answer.getheader("ETag")
+        modified = answer.getheader("Last-Modified")
+        assert tag and modified
+
+        # revalidate it using its tag
+        status, answer, body = get(connection, "/www/small.txt", **{"If-None-Match": tag})
+        # check that it wasn't sent again
+        assert status == 304
+        assert body == b""
+        assert answer.getheader("ETag") == tag
+        # revalidate it using its modification time
+        status, _, body = get(connection, "/www/small.txt", **{"If-Modified-Since": modified})
+        assert status == 304
+        assert body == b""
+        # a stale tag gets the whole file
+        status, _, body = get(connection, "/www/small.txt", **{"If-None-Match": '"stale"'})
+        assert status == 200
+        assert body == small
+
+        # the large files are streamed, both from disk and from the archive
+        for url in ("/www/large.bin", "/bundle/large.bin"):
+            # get the whole file
+            status, answer, body = get(connection, url)
+            assert status == 200
+            assert body == large
+            # get a range in the middle
+            status, answer, body = get(connection, url, Range="bytes=100000-899999")
+            assert status == 206
+            assert body == large[100000:900000]
+            assert answer.getheader("Content-Range") == f"bytes 100000-899999/{len(large)}"
+            # get the tail
+            status, _, body = get(connection, url, Range="bytes=-10")
+            assert status == 206
+            assert body == large[-10:]
+            # ask for bytes that aren't there
+            status, answer, body = get(connection, url, Range=f"bytes={len(large)}-")
+            assert status == 416
+            assert body == b""
+            assert answer.getheader("Content-Range") == f"bytes */{len(large)}"
+            # a range conditioned on a stale tag gets the whole file
+            status, _, body = get(
+                connection, url, Range="bytes=0-9", **{"If-Range": '"stale"'})
+            assert status == 200
+            assert body == large
+
+        # missing files
+        status, answer, _ = get(connection, "/www/missing.txt")
+        assert status == 404
+        # close the connection, since the server hung up anyway
+        connection.close()
+
+        # pipeline a streamed response in front of small ones through a raw socket
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            # send the requests all at once
+            sock.sendall(
+                b"GET /www/large.bin HTTP/1.1\r\nHost: localhost\r\n\r\n" +
+                b"GET /www/small.txt HTTP/1.1\r\nHost: localhost\r\n\r\n" +
+                b"GET /bundle/large.bin HTTP/1.1\r\nHost: localhost\r\n" +
+                b"Connection: close\r\n\r\n")
+            # read everything until the server hangs up
+            data = b""
+            while True:
+                packet = sock.recv(1024*1024)
+                if not packet: break
+                data += packet
+            # verify that the responses arrived in order
+            first = data.index(large)
+            second = data.index(small, first + len(large))
+            third = data.index(large, second + len(small))
+            # and nothing else followed
+            assert data.endswith(large)
+    # either way
+    finally:
+        # shut the server down
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        # and clean up
+        shutil.rmtree(root)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the web server keeps connections alive and handles pipelined requests
+
+The server runs in a child process; the parent acts as the client, and shuts the server down
+when it is done
+"""
+
+
+# externals
+import http.client
+import os
+import signal
+import socket
+# support
+import pyre
+
+
+# the application
+class Echo(pyre.application, family="tests.http.echo"):
+    """
+    An application that responds to every request with the url that was requested
+    """
+
+    # interface
+    def pyre_respond(self, server, request):
+        """
+        Fulfill a request from an HTTP {server}
+        """
+        # echo the url and the payload
+        value = request.url + "".join(portion.decode() for portion in request.payload)
+        # build the response
+        return server.documents.Literal(server=server, value=value)
+
+
+def serve():
+    """
+    Start the server and return its address, along with the process id of the server
+    """
+    # access the server
+    from pyre.http.Server import Server
+    # make an application
+    app = Echo(name="tests.http.echo")
+    # a dispatcher
+    dispatcher = pyre.ipc.newSelector(name="tests.http.dispatcher")
+    # and a server
+    server = Server(name="tests.http.keepalive")
+    # activate it
+    server.activate(application=app, dispatcher=dispatcher)
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # serve until killed
+        dispatcher.watch()
+        # just in case
+        os._exit(0)
+    # in the parent, return the port and the server process id
+    return server.address.port, pid
+
+
+def response(stream):
+    """
+    Read a response from {stream}; return its status, its headers and its body
+    """
+    # get the status line
+    status = stream.readline().decode().split(maxsplit=2)
+    # the headers
+    headers = {}
+    # read them
+    while True:
+        # get a line
+        line = stream.readline().decode().strip()
+        # if it's blank, we are done
+        if not line: break
+        # otherwise, split it
+        key, value = line.split(":", 1)
+        # and save it
+        headers[key.strip()] = value.strip()
+    # get the body
+    body = stream.read(int(headers["Content-Length"]))
+    # and return everything
+    return int(status[1]), headers, body.decode()
+
+
+def test():
+    # start the server
+    port, pid = serve()
+    # carefully
+    try:
+        # open a connection
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        # make a few requests
+        for path in ("/a", "/b", "/c"):
+            # send
+            connection.request("GET", path)
+            # get the response
+            answer = connection.getresponse()
+            # check it
+            assert answer.status == 200
+            assert answer.read().decode() == path
+            assert answer.getheader("Connection") == "keep-alive"
+            # remember the socket after the first request
+            if path == "/a": sock = connection.sock
+            # and make sure the connection was reused
+            assert connection.sock is sock
+        # done with this one
+        connection.close()
+
+        # now, pipeline a few requests through a raw socket
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            # send them all at once
+            sock.sendall(
+                b"GET /one HTTP/1.1\r\nHost: localhost\r\n\r\n" +
+                b"POST /two HTTP/1.1\r\nHost: localhost\r\nContent-Length: 4\r\n\r\n+ham" +
+                b"GET /three HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+            # read the responses
+            stream = sock.makefile("rb")
+            answers = [ response(stream) for _ in range(3) ]
+            # check them
+            assert [ body for _, _, body in answers ] == ["/one", "/two+ham", "/three"]
+            assert answers[-1][1]["Connection"] == "close"
+            # and verify that the server hung up
+            assert stream.read() == b""
+    # either way
+    finally:
+        # shut the server down
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -11,22 +11,27 @@ include pyre.def
 
 all: test
 
-test: sanity channels scheduler selector clean
+test: sanity channels scheduler selector epoll clean
 
 sanity:
 	${PYTHON} ./sanity.py
 	${PYTHON} ./pickler.py
 	${PYTHON} ./pipe.py
+	${PYTHON} ./pipe_offer.py
 	${PYTHON} ./tcp.py
 
 channels:
 	${PYTHON} ./pickler_over_pipe.py
 	${PYTHON} ./pickler_over_tcp.py
+	${PYTHON} ./framer_over_pipe.py
+	${PYTHON} ./framer_over_tcp.py
+	${PYTHON} ./sharer_over_pipe.py
 
 scheduler:
 	${PYTHON} ./scheduler.py
 	${PYTHON} ./scheduler_instantiation.py
 	${PYTHON} ./scheduler_alarms.py
+	${PYTHON} ./scheduler_cancel.py
 
 selector:
 	${PYTHON} ./selector.py
@@ -36,5 +41,10 @@ selector:
 	${PYTHON} ./selector_pickler_over_pipe.py
 	${PYTHON} ./selector_pickler_over_tcp.py
 
+epoll:
+	${PYTHON} ./epoll.py
+	${PYTHON} ./epoll_pipes.py
+	${PYTHON} ./epoll_pickler_over_pipe.py
+
 
 # end of file
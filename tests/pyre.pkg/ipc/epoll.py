@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Sanity check: verify that the epoll dispatcher is accessible and can be instantiated
+"""
+
+
+def test():
+    # access the package
+    import pyre.ipc
+    # get the component class record
+    poller = pyre.ipc.epoll()
+    # verify it is a dispatcher
+    assert poller.pyre_isCompatible(pyre.ipc.dispatcher)
+    # instantiate one
+    p = pyre.ipc.newPoller()
+    # and return it
+    return p
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
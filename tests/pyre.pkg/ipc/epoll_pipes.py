@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise a poller watching over many pipes at once
+"""
+
+
+def test():
+    # externals
+    import os
+    # access the package
+    import pyre.ipc
+    # instantiate a poller
+    p = pyre.ipc.newPoller()
+
+    # the number of pipes
+    pipes = 64
+    # the number of messages sent through each one
+    messages = 3
+    # the tally of received messages
+    received = {}
+
+    # the read handler
+    def get(channel, **kwds):
+        # get the message
+        message = os.read(channel.infd, 1)
+        # record it
+        received[channel.infd] = received.get(channel.infd, 0) + 1
+        # if this is not the last one, keep watching
+        return received[channel.infd] < messages
+
+    # the write handler
+    def put(channel, **kwds):
+        # send a message
+        os.write(channel.outfd, b'x')
+        # and stop watching
+        return False
+
+    # build the channels
+    channels = []
+    for _ in range(pipes):
+        # make a pair of descriptors
+        infd, outfd = os.pipe()
+        # wrap a channel around them
+        channel = pyre.ipc.pipe(descriptors=(infd, outfd))
+        # register the handlers
+        p.whenReadReady(channel=channel, call=get)
+        # schedule all the writes; the handlers retire after each one
+        for _ in range(messages):
+            p.whenWriteReady(channel=channel, call=put)
+        # save it
+        channels.append(channel)
+
+    # watch; the loop exits when all handlers have retired
+    p.watch()
+
+    # verify that every message was delivered
+    assert len(received) == pipes
+    assert all(count == messages for count in received.values())
+    # and that the poller has unregistered all the descriptors
+    assert not p._interest
+    assert not p._read and not p._write
+
+    # clean up
+    for channel in channels:
+        channel.close()
+
+    # all done
+    return p
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
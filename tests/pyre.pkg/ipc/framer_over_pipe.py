@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Build two processes that communicate using framer over a pair of pipes
+"""
+
+
+def test():
+    # externals
+    import os
+    # access the package
+    import pyre.ipc
+
+    # make a framer
+    m = pyre.ipc.newFramer()
+    # and a pair of pipes
+    parent, child = pyre.ipc.pipe()
+
+    # fork
+    pid = os.fork()
+    # in the parent process
+    if pid > 0:
+        # invoke the parent behavior
+        return onParent(marshaler=m, pipe=parent)
+    # in the child
+    return onChild(marshaler=m, pipe=child)
+
+
+# the messages; large enough to overflow the pipe buffer, so that the scatter/gather writes
+# complete in several steps
+size = 1024 * 1024
+hello = ("hello", bytearray(b"x" * size), [bytearray(b"small")] * 3)
+goodbye = ("goodbye", bytearray(b"y" * size))
+
+
+def onParent(marshaler, pipe):
+    """Send a simple message and wait for the response"""
+    # send a message
+    marshaler.send(hello, pipe)
+    # get the response
+    response = marshaler.recv(pipe)
+    # check it
+    assert response == goodbye
+    # and return
+    return
+
+
+def onChild(marshaler, pipe):
+    """Wait for a message and send a response"""
+    # get the message
+    message = marshaler.recv(pipe)
+    # check it
+    assert message == hello
+    # send the response
+    marshaler.send(goodbye, pipe)
+    # and return
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that offering bytes to a full pipe doesn't block
+"""
+
+
+def test():
+    # get the package
+    import pyre.ipc
+    # make a pair of pipes
+    parent, child = pyre.ipc.pipe()
+
+    # a message that is larger than the buffer of the pipe
+    message = bytes(range(256)) * 1024
+    # offer it
+    sent = parent.offer(bstr=message)
+    # some of it made it, but not all
+    assert 0 < sent < len(message)
+    # now that the pipe is full, nothing else fits
+    assert parent.offer(bstr=message[sent:]) == 0
+    # the bytes that were sent can be read on the other side
+    assert child.read(minlen=sent, maxlen=sent) == message[:sent]
+    # which makes room for the rest
+    assert parent.offer(bstr=message[sent:]) > 0
+
+    # all done
+    return parent, child
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
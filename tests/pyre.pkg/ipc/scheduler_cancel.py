@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that alarms can be cancelled
+"""
+
+
+def test():
+    # externals
+    import select
+    # access the package
+    import pyre.ipc
+    # get the units of time
+    from pyre.units.SI import second
+    # instantiate a scheduler
+    s = pyre.ipc.newScheduler()
+
+    # the log of raised alarms
+    log = []
+    # a handler factory
+    def handler(name, period=None):
+        # the handler
+        def ring(timestamp):
+            # record the event
+            log.append(name)
+            # and reschedule, if necessary
+            return period
+        # all done
+        return ring
+
+    # schedule a few alarms
+    first = s.alarm(interval=0.01*second, call=handler("first"))
+    second_ = s.alarm(interval=0.02*second, call=handler("second"))
+    third = s.alarm(interval=0.03*second, call=handler("third"))
+    # and a periodic one
+    periodic = s.alarm(interval=0.01*second, call=handler("periodic", period=0.01*second))
+
+    # cancel one before it rings
+    second_.cancel()
+    # cancelling twice is harmless
+    second_.cancel()
+
+    # raise alarms until the periodic one has gone off a few times
+    while log.count("periodic") < 3:
+        # wait for the next one
+        select.select([], [], [], s.poll())
+        # and raise it
+        s.awaken()
+    # now cancel the periodic one
+    periodic.cancel()
+
+    # drain the rest
+    while 1:
+        # get the timeout
+        timeout = s.poll()
+        # if there are no more alarms scheduled
+        if timeout is None:
+            # bail out
+            break
+        # otherwise, go to sleep
+        select.select([], [], [], timeout)
+        # and raise any overdue alarms
+        s.awaken()
+
+    # verify the cancelled alarm never rang
+    assert "second" not in log
+    # that the others did, exactly once
+    assert log.count("first") == 1
+    assert log.count("third") == 1
+    # that the periodic one stopped ringing
+    assert log.count("periodic") == 3
+    # and that the heap was drained
+    assert not s._alarms
+    # cancelling an alarm that has rung already is harmless
+    first.cancel()
+
+    # an alarm that cancels itself while it is ringing
+    def selfish(timestamp):
+        # record the event
+        log.append("selfish")
+        # cancel the alarm
+        alarm.cancel()
+        # and ask to be rescheduled anyway
+        return 0.01*second
+    alarm = s.alarm(interval=0*second, call=selfish)
+    # schedule a few more for later
+    later = [s.alarm(interval=60*second, call=handler("later")) for _ in range(3)]
+    # raise it
+    s.awaken()
+    # it rang once
+    assert log.count("selfish") == 1
+    # and was not rescheduled
+    assert len(s._alarms) == len(later)
+    # nor counted as a dead entry, since it was not in the heap
+    assert s._alarms.cancelled == 0
+    # clean up
+    for handle in later: handle.cancel()
+    assert s.poll() is None
+
+    # schedule lots of alarms far in the future
+    handles = [s.alarm(interval=60*second, call=handler("late")) for _ in range(100)]
+    # cancel most of them
+    for handle in handles[:90]:
+        handle.cancel()
+    # verify the heap was compacted along the way
+    assert len(s._alarms) < 100
+    # and the next alarm is still the right one
+    assert s.poll() > 59
+
+    # alarms don't keep their scheduler alive
+    import gc
+    import weakref
+    # so once the last reference to it is gone
+    ref = weakref.ref(s)
+    del s
+    # and it has been collected
+    gc.collect()
+    assert ref() is None
+    # cancelling the ones that are still around is harmless
+    handles[-1].cancel()
+    assert handles[-1].handler is None
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
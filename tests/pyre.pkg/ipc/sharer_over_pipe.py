@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Build two processes that exchange large buffers through shared memory over a pair of pipes
+"""
+
+
+def test():
+    # externals
+    import os
+    import tempfile
+    # access the package
+    import pyre.ipc
+
+    # make a directory for the shared memory segments
+    arena = tempfile.mkdtemp()
+    # make a sharer that places them there
+    m = pyre.ipc.newSharer(name="tests.ipc.sharer")
+    m.arena = arena
+    m.threshold = 1024
+    # and a pair of pipes
+    parent, child = pyre.ipc.pipe()
+
+    # fork
+    pid = os.fork()
+    # in the parent process
+    if pid > 0:
+        # invoke the parent behavior
+        onParent(marshaler=m, pipe=parent)
+        # wait for the child to finish
+        _, status = os.waitpid(pid, 0)
+        # check that it was successful
+        assert status == 0
+        # and that there are no segments left behind
+        assert os.listdir(arena) == []
+        # clean up
+        os.rmdir(arena)
+        # and return
+        return
+    # in the child
+    try:
+        onChild(marshaler=m, pipe=child)
+    # if anything goes wrong
+    except BaseException:
+        # let the parent know
+        os._exit(1)
+    # otherwise, exit without running any clean up that belongs to the parent
+    os._exit(0)
+
+
+# the messages
+size = 1024 * 1024
+hello = ("hello", bytearray(b"x" * size), bytearray(b"small"))
+goodbye = "goodbye"
+
+
+def onParent(marshaler, pipe):
+    """Send a message with a large buffer and wait for the response"""
+    # send a message
+    marshaler.send(hello, pipe)
+    # get the response
+    word, buffer = marshaler.recv(pipe)
+    # check it
+    assert word == goodbye
+    assert len(buffer) == size
+    assert buffer[0] == ord("y") and buffer[-1] == ord("x")
+    # and return
+    return
+
+
+def onChild(marshaler, pipe):
+    """Wait for a message and send a response"""
+    # get the message
+    message = marshaler.recv(pipe)
+    # check it
+    assert message == hello
+    # unpack
+    _, buffer, _ = message
+    # modify the large buffer
+    buffer[0] = ord("y")
+    # send the response
+    marshaler.send((goodbye, buffer), pipe)
+    # and return
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
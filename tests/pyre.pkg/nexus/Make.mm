@@ -24,5 +24,8 @@ nodes:
 teams:
 	${PYTHON} ./pool.py
 	${PYTHON} ./pool.py --tasks=4 --team.size=2
+	${PYTHON} ./pool_prefetch.py
+	${PYTHON} ./pool_payloads.py
+	${PYTHON} ./workplan.py
 
 # end of file
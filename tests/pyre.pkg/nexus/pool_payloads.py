@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that a team with several tasks in flight per crew member can exchange messages that are
+larger than the buffers of the channels in both directions
+"""
+
+
+# externals
+import os
+# support
+import pyre
+
+
+# my task
+class Task(pyre.nexus.task):
+    """
+    A task that carries a large payload and produces an equally large result; the task whose
+    number is {nasty} fails in a way that damages the crew member that executes it
+    """
+
+    # the number of the task that damages its crew member
+    nasty = None
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # if i'm the nasty one
+        if self.n == self.nasty:
+            # damage my crew member
+            raise Exception(f"task {self.n}: a nasty error")
+        # otherwise, report the process that did the work, along with a reversed copy of the
+        # payload
+        return self.n, os.getpid(), self.payload[::-1]
+
+    # meta-methods
+    def __init__(self, n, size, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my number
+        self.n = n
+        # and build my payload
+        self.payload = bytes([n % 256]) * size
+        # all done
+        return
+
+
+# my team manager
+from pyre.nexus.Pool import Pool as pool
+class Pool(pool, family='samples.teams.payloads'):
+    """
+    A team manager that collects the results
+    """
+
+    # interface
+    def harvest(self, task, result):
+        """
+        Record the {result} of {task}
+        """
+        # save it
+        self.results.append(result)
+        # all done
+        return self
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # start out with no results
+        self.results = []
+        # all done
+        return
+
+
+def test(tasks=24, size=2, prefetch=4, batch=2, payload=256*1024, nasty=None):
+    # make a team; components with the same name are the same instance, so give it a name
+    # that is unique to this configuration
+    team = Pool(name=f"tests.nexus.payloads.{prefetch}.{batch}.{payload}.{nasty}")
+    # configure it
+    team.size = size
+    team.prefetch = prefetch
+    team.batch = batch
+    # mark the nasty task
+    Task.nasty = nasty
+    # make a workplan
+    workplan = [ Task(n=n, size=payload) for n in range(tasks) ]
+    # set it up for execution
+    team.assemble(workplan=workplan)
+    # and enter the event loop
+    team.run()
+
+    # verify that every task completed exactly once, except the nasty one that is abandoned
+    assert sorted(n for n, _, _ in team.results) == [n for n in range(tasks) if n != nasty]
+    # that the work was done by the crew
+    assert os.getpid() not in { pid for _, pid, _ in team.results }
+    # that the payloads made it across intact, in both directions
+    assert all(result == bytes([n % 256]) * payload for n, _, result in team.results)
+    # and that the team is wound down
+    assert not team.workplan
+    assert not team.active
+    assert len(team.retired) == size
+
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    # single tasks in flight
+    test(prefetch=4, batch=1)
+    # batches in flight
+    test(prefetch=6, batch=3)
+    # the tasks in flight in a damaged crew member are handed to the rest of the team
+    test(prefetch=6, batch=2, nasty=5)
+
+
+# end of file
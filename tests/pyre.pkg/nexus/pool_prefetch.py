@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that a team with several tasks in flight per crew member completes its workplan
+"""
+
+
+# externals
+import os
+# support
+import pyre
+
+
+# my task
+class Task(pyre.nexus.task):
+    """
+    A task that fails once, in a recoverable way, when its number is a multiple of five; the
+    task whose number is {nasty} fails in a way that damages the crew member that executes it
+    """
+
+    # the number of the task that damages its crew member
+    nasty = None
+
+    # interface
+    def execute(self):
+        """
+        The body of the task
+        """
+        # if i'm the nasty one
+        if self.n == self.nasty:
+            # damage my crew member
+            raise Exception(f"task {self.n}: a nasty error")
+        # if this is my first attempt and i'm unlucky
+        if self.n % 5 == 0 and self.attempts == 0:
+            # complain; tasks are copied to the workers, so the next attempt starts over with
+            # a fresh copy, but the team side knows it has been attempted
+            raise self.RecoverableError(f"task {self.n}: a temporary error")
+        # otherwise, report the process that did the work
+        return self.n, os.getpid()
+
+    # meta-methods
+    def __init__(self, n, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my number
+        self.n = n
+        # and the number of times i've been attempted
+        self.attempts = 0
+        # all done
+        return
+
+
+# my team manager
+from pyre.nexus.Pool import Pool as pool
+class Pool(pool, family='samples.teams.prefetch'):
+    """
+    A team manager that collects the results
+    """
+
+    # interface
+    def harvest(self, task, result):
+        """
+        Record the {result} of {task}
+        """
+        # save it
+        self.results.append(result)
+        # all done
+        return self
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # start out with no results
+        self.results = []
+        # all done
+        return
+
+
+# the crew
+from pyre.nexus.Crew import Crew as crew
+class Crew(crew):
+    """
+    A crew member that marks the tasks that failed, so they succeed the next time around
+    """
+
+    def reportRecoverableError(self, team, task, error, **kwds):
+        """
+        A task failed in a recoverable way
+        """
+        # mark it
+        task.attempts += 1
+        # chain up
+        return super().reportRecoverableError(team=team, task=task, error=error, **kwds)
+
+
+def test(tasks=100, size=2, prefetch=4, batch=3, nasty=None, policy="fifo", marshaler=None):
+    # make a team; components with the same name are the same instance, so give it a name
+    # that is unique to this configuration
+    team = Pool(
+        name=f"tests.nexus.prefetch.{prefetch}.{batch}.{nasty}.{policy}.{marshaler}", crew=Crew)
+    # configure it
+    team.size = size
+    team.prefetch = prefetch
+    team.batch = batch
+    team.policy = policy
+    # if i were given a marshaler
+    if marshaler is not None:
+        # use it
+        team.marshaler = marshaler
+    # mark the nasty task
+    Task.nasty = nasty
+    # make a workplan
+    workplan = [ Task(n=n) for n in range(tasks) ]
+    # set it up for execution
+    team.assemble(workplan=workplan)
+    # and enter the event loop
+    team.run()
+
+    # verify that every task completed exactly once, except the nasty one that is abandoned
+    assert sorted(n for n, _ in team.results) == [n for n in range(tasks) if n != nasty]
+    # that the work was done by the crew
+    assert os.getpid() not in { pid for _, pid in team.results }
+    # and that the team is wound down
+    assert not team.workplan
+    assert not team.active
+    assert len(team.retired) == size
+    # and that the workplan kept track of the completed tasks, and then forgot them
+    assert not team.workplan.timings
+    assert sum(count for count, _ in team.workplan.history.values()) == len(team.results)
+    assert sum(count for count, _, _ in team.workplan.latency.values()) == len(team.results)
+    assert all(
+        attempts >= count for count, _, attempts in team.workplan.latency.values())
+
+    # all done
+    return team
+
+
+# main
+if __name__ == "__main__":
+    # the default exchange
+    test(prefetch=1, batch=1)
+    # one batch in flight at a time
+    test(prefetch=3, batch=3)
+    # several batches in flight
+    test(prefetch=8, batch=2)
+    # the tasks in flight in a damaged crew member are handed to the rest of the team
+    test(prefetch=8, batch=2, nasty=7)
+    # other scheduling policies
+    test(prefetch=4, batch=2, policy="lpt")
+    test(prefetch=4, batch=2, policy="affinity")
+    # the crew members use the marshaler of the team
+    test(prefetch=4, batch=2, marshaler="sharer")
+
+
+# end of file
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Verify that the workplan hands out tasks in the order its policy prescribes
+"""
+
+
+# support
+import pyre
+
+
+# a task
+class Task(pyre.nexus.task):
+    """
+    A task with a name and some scheduling hints
+    """
+
+    # meta-methods
+    def __init__(self, name, priority=0, deadline=None, kind=None, affinity=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my name
+        self.name = name
+        # and my hints
+        self.priority = priority
+        self.deadline = deadline
+        self.kind = kind
+        self.affinity = affinity
+        # all done
+        return
+
+
+def drain(workplan, crew=None):
+    """
+    Pop all the tasks from {workplan} and return their names
+    """
+    # easy enough
+    return [ workplan.pop(crew=crew).name for _ in range(len(workplan)) ]
+
+
+def fifo():
+    # make some tasks
+    tasks = [ Task(name=n) for n in "abcde" ]
+    # and a workplan
+    workplan = pyre.nexus.workplan(tasks=tasks)
+    # verify the order
+    assert drain(workplan) == list("abcde")
+    # and that it's empty
+    assert not workplan
+    # popping from an empty workplan is an error
+    try:
+        workplan.pop()
+        assert False, "unreachable"
+    except KeyError:
+        pass
+    # all done
+    return
+
+
+def priority():
+    # make some tasks
+    tasks = [
+        Task(name="a", priority=0),
+        Task(name="b", priority=2, deadline=20),
+        Task(name="c", priority=2, deadline=10),
+        Task(name="d", priority=1),
+        Task(name="e", priority=2),
+        ]
+    # and a workplan
+    workplan = pyre.nexus.workplan(policy="priority", tasks=tasks)
+    # verify the order
+    assert drain(workplan) == list("cbeda")
+    # all done
+    return
+
+
+def lpt():
+    # make a workplan
+    workplan = pyre.nexus.workplan(policy="lpt")
+    # teach it about some kinds of tasks
+    workplan.complete(task=Task(name="x", kind="short"), elapsed=1)
+    workplan.complete(task=Task(name="y", kind="long"), elapsed=10)
+    workplan.complete(task=Task(name="z", kind="long"), elapsed=20)
+    # check the history
+    assert workplan.history["long"] == (2, 30)
+    # add some tasks
+    workplan.update([
+        Task(name="a", kind="short"),
+        Task(name="b", kind="long"),
+        Task(name="c", kind="unknown"),
+        Task(name="d", kind="long"),
+        ])
+    # the unknown kind is expected to take the average of the known ones
+    assert workplan.expected(task=Task(name="w", kind="unknown")) == (1 + 15) / 2
+    # verify the order
+    assert drain(workplan) == list("bdca")
+
+    # the ranking is revisited as tasks complete
+    workplan = pyre.nexus.workplan(policy="lpt")
+    # add a few tasks of kinds it knows nothing about
+    workplan.update([
+        Task(name="f1", kind="fast"), Task(name="s1", kind="slow"),
+        Task(name="f2", kind="fast"), Task(name="s2", kind="slow"),
+        ])
+    # run them one at a time
+    order = []
+    while workplan:
+        # get the next one
+        task = workplan.pop()
+        # record it
+        order.append(task.name)
+        # and complete it
+        workplan.complete(task=task, elapsed=1 if task.kind == "slow" else 0.01)
+    # once a slow task has completed, the other slow task goes first
+    assert order == ["f1", "s1", "s2", "f2"]
+    # all done
+    return
+
+
+def affinity():
+    # make a workplan
+    workplan = pyre.nexus.workplan(policy="affinity")
+    # a couple of stand-ins for crew members
+    left, right = "left", "right"
+    # add some tasks
+    workplan.update([ Task(name="a", affinity="A"), Task(name="b", affinity="B") ])
+    # hand them out
+    assert workplan.pop(crew=left).name == "a"
+    assert workplan.pop(crew=right).name == "b"
+    # add some more that touch the same data, in the opposite order
+    workplan.update([
+        Task(name="c", affinity="B"),
+        Task(name="d"),
+        Task(name="e", affinity="A"),
+        ])
+    # each crew member gets the task that touches its data
+    assert workplan.pop(crew=left).name == "e"
+    assert workplan.pop(crew=right).name == "c"
+    # and the rest go in order
+    assert workplan.pop(crew=left).name == "d"
+    assert not workplan
+    # once a crew member retires
+    workplan.retire(crew=left)
+    # its data is up for grabs
+    workplan.add(Task(name="f", affinity="A"))
+    workplan.add(Task(name="g", affinity="B"))
+    assert drain(workplan, crew=left) == list("fg")
+
+    # tasks added before anybody claimed their data go to the crew member that claims it
+    workplan = pyre.nexus.workplan(policy="affinity")
+    workplan.update([
+        Task(name="a1", affinity="A"), Task(name="a2", affinity="A"),
+        Task(name="b1", affinity="B"), Task(name="b2", affinity="B"),
+        ])
+    # hand them out alternately
+    order = [ workplan.pop(crew=crew).name for crew in (left, right, left, right) ]
+    # check
+    assert order == ["a1", "b1", "a2", "b2"]
+
+    # crew members without claims get the oldest task whose data nobody has claimed
+    workplan = pyre.nexus.workplan(policy="affinity")
+    workplan.update([
+        Task(name="a1", affinity="A"), Task(name="b1", affinity="B"),
+        Task(name="c1", affinity="C"), Task(name="a2", affinity="A"),
+        Task(name="b2", affinity="B"), Task(name="a3", affinity="A"),
+        ])
+    # hand out one task to each of three crew members
+    order = [ workplan.pop(crew=crew).name for crew in (left, right, "other") ]
+    # check
+    assert order == ["a1", "b1", "c1"]
+    # once a crew member with pending tasks retires
+    workplan.retire(crew=right)
+    # its data goes to the next crew member that runs out of tasks of its own
+    assert workplan.pop(crew="other").name == "b2"
+    # while the rest stay with their owner
+    assert drain(workplan, crew=left) == ["a2", "a3"]
+    # all done
+    return
+
+
+def timings():
+    # make a workplan
+    workplan = pyre.nexus.workplan()
+    # and a task
+    task = Task(name="a")
+    # add it
+    workplan.add(task)
+    # get it; it fails, so put it back and get it again
+    assert workplan.pop() is task
+    workplan.add(task)
+    assert workplan.pop() is task
+    # check the record
+    timing = workplan.timings[task]
+    assert timing.attempts == 2
+    assert timing.waiting >= 0
+    # it succeeds this time
+    workplan.complete(task=task, elapsed=0.5)
+    # so its record is folded into the totals of its kind
+    assert task not in workplan.timings
+    count, waiting, attempts = workplan.latency[task.kind or Task]
+    assert (count, attempts) == (1, 2)
+    assert waiting == timing.waiting
+    assert workplan.history[Task] == (1, 0.5)
+    # tasks that are abandoned are forgotten as well
+    other = Task(name="b")
+    workplan.add(other)
+    workplan.pop()
+    workplan.abandon(other)
+    assert not workplan.timings
+    # all done
+    return
+
+
+def adopt():
+    # make some tasks
+    tasks = [ Task(name="a", priority=0), Task(name="b", priority=1), Task(name="c") ]
+    # and a workplan
+    workplan = pyre.nexus.workplan(tasks=tasks)
+    # switch policies
+    workplan.adopt(policy="priority")
+    # verify the order
+    assert drain(workplan) == list("bac")
+    # bad policies are rejected
+    try:
+        workplan.adopt(policy="random")
+        assert False, "unreachable"
+    except ValueError:
+        pass
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    fifo()
+    priority()
+    lpt()
+    affinity()
+    timings()
+    adopt()
+
+
+# end of file
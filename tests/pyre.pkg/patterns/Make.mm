@@ -27,6 +27,7 @@ patterns:
 	${PYTHON} ./named.py
 	${PYTHON} ./observable.py
 	${PYTHON} ./pathhash.py
+	${PYTHON} ./prefixtree.py
 	${PYTHON} ./singleton.py
 
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Check that prefix trees work as advertised
+"""
+
+
+def test():
+    # access the package
+    import pyre.patterns
+    # build a prefix tree
+    tree = pyre.patterns.newPrefixTree()
+    # and a path hash to generate keys
+    pathhash = pyre.patterns.newPathHash()
+
+    # some names
+    separator = '.'
+    names = [ "pyre", "pyre.patterns", "pyre.patterns.PathHash", "pyre.calc", "pyrex" ]
+    # index them
+    for name in names:
+        # split
+        split = name.split(separator)
+        # hash and register
+        tree.insert(key=pathhash.hash(items=split), split=split)
+    # check
+    assert len(tree) == len(names)
+
+    # convenience
+    find = lambda *split, partial='': set(tree.find(split=split, partial=partial))
+    key = lambda name: pathhash.hash(items=name.split(separator))
+    # everything
+    assert find() == set(map(key, names))
+    # everything under {pyre}, including itself
+    assert find("pyre") == set(map(key, names[:4]))
+    # the children of {pyre} whose name starts with "pat"
+    assert find("pyre", partial="pat") == { key("pyre.patterns"), key("pyre.patterns.PathHash") }
+    # top level names that start with "pyre"
+    assert find(partial="pyre") == set(map(key, names))
+    # nothing under a name that isn't there
+    assert find("journal") == set()
+
+    # move a key to a new location
+    tree.insert(key=key("pyrex"), split=("pyre", "x"))
+    # and verify it shows up there
+    assert key("pyrex") in find("pyre", partial="x")
+    # remove a key
+    tree.remove(key=key("pyre.calc"))
+    # and verify it's gone
+    assert key("pyre.calc") not in tree
+    assert find("pyre", "calc") == set()
+
+    # return the tree
+    return tree
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -13,7 +13,7 @@ PROJECT = pyre
 
 all: test
 
-test: sanity host
+test: sanity host facts
 
 sanity:
 	${PYTHON} ./sanity.py
@@ -21,5 +21,8 @@ sanity:
 host:
 	${PYTHON} ./host.py
 
+facts:
+	${PYTHON} ./facts.py
+
 
 # end of file
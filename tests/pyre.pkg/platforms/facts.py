@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Exercise the persistent store of host facts
+"""
+
+
+def test():
+    # externals
+    import os
+    # support
+    import pyre
+
+    # get the host
+    host = pyre.host
+    # and its store of facts
+    facts = host.facts
+    # verify it is shared
+    assert facts is pyre.platforms.Facts.Facts()
+
+    # the store was redirected to a scratch area before the framework booted
+    assert facts.path == os.path.abspath(os.environ["PYRE_HOST_FACTS"])
+    # attempt to
+    try:
+        # start from scratch
+        host.refresh()
+
+        # keep track of the surveys
+        surveys = []
+        # make one
+        def survey():
+            # record the invocation
+            surveys.append(None)
+            # and return something
+            return len(surveys)
+
+        # the first lookup performs the survey
+        assert facts.lookup(section="test", key=("state", 0), survey=survey) == 1
+        # and saves the answer
+        assert os.path.exists(facts.path)
+        # the second one doesn't
+        assert facts.lookup(section="test", key=("state", 0), survey=survey) == 1
+        # but it does when the state of the host changes
+        assert facts.lookup(section="test", key=("state", 1), survey=survey) == 2
+        assert len(surveys) == 2
+        # facts without a key are not stored
+        assert facts.lookup(section="volatile", key=None, survey=survey) == 3
+        assert facts.lookup(section="volatile", key=None, survey=survey) == 4
+        assert "volatile" not in dict(facts.sections())
+
+        # the cpu survey goes through the store
+        cpus = host.cpus
+        # so if the host has a boot id
+        if facts.boot() is not None:
+            # it was recorded
+            assert dict(facts.sections())["cpus"] == facts.boot()
+            # forget the cpu info
+            host.refresh()
+            # and verify that it comes back the same
+            assert host.cpus.cores == cpus.cores
+            assert host.cpus.cpus == cpus.cpus
+
+        # refreshing forgets everything
+        facts.refresh()
+        assert not os.path.exists(facts.path)
+        assert not dict(facts.sections())
+        # while refreshing the host also rediscovers what it needs to identify itself
+        host.refresh()
+        assert set(dict(facts.sections())) <= {"distribution"}
+    # no matter what happens
+    finally:
+        # clean up
+        host.refresh()
+
+    # all done
+    return host
+
+
+def test_disabled():
+    # externals
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    # in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # make an environment without a store, and with its home and cache in the scratch area
+        env = dict(os.environ, HOME=scratch, XDG_CACHE_HOME=scratch)
+        env.pop("PYRE_HOST_FACTS", None)
+        # boot the framework and survey the host
+        script = "import pyre; pyre.host.cpus; print(pyre.host.facts.path)"
+        output = subprocess.run(
+            [sys.executable, "-c", script], env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        # verify there is no store
+        assert output.strip() == "None"
+        # and that nothing was written
+        assert not os.listdir(scratch)
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # externals
+    import os
+    import tempfile
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # redirect the store of host facts there, so we don't disturb the user's
+        os.environ["PYRE_HOST_FACTS"] = os.path.join(scratch, "host.facts")
+        # do...
+        test()
+    # without a store, nothing is written
+    test_disabled()
+
+
+# end of file
@@ -24,6 +24,11 @@ components:
 	${PYTHON} ./sqlite_attach.py
 	${PYTHON} ./sqlite_table.py
 	${PYTHON} ./sqlite_references.py
+	${PYTHON} ./sqlite_insert.py
+	${PYTHON} ./sqlite_fetch.py
+	${PYTHON} ./sqlite_pool.py
+	${PYTHON} ./sqlite_select.py
+	${PYTHON} ./sqlite_pool_select.py
 
 
 # end of file
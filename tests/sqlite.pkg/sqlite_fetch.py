@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Retrieve the results of a query a batch at a time
+"""
+
+
+import pyre.db
+
+class Sample(pyre.db.table, id="samples"):
+
+    id = pyre.db.int().primary()
+    label = pyre.db.str()
+    value = pyre.db.float()
+
+
+class Labels(pyre.db.query, sample=Sample):
+
+    id = sample.id
+    label = sample.label
+
+
+def test():
+    # build a database component and connect to the in-memory database
+    db = pyre.db.sqlite(name="test.stream").attach()
+    # retrieve the rows a few at a time
+    db.batch = 7
+
+    # in a transaction block
+    with db:
+        # create the table
+        db.createTable(Sample)
+        # populate it
+        db.insert(*(
+            Sample.pyre_immutable(id=index, label=f"sample-{index}", value=index/2)
+            for index in range(100)))
+
+        # start a query
+        rows = db.select(Labels)
+        # get the first few records
+        first = [ next(rows) for _ in range(10) ]
+        assert [ record.id for record in first ] == list(range(10))
+        # execute another statement while the query is still open
+        assert tuple(db.execute("SELECT COUNT(*) FROM samples")) == ((100,),)
+        # and get the rest of the records
+        rest = list(rows)
+        assert [ record.id for record in rest ] == list(range(10, 100))
+        assert rest[-1].label == "sample-99"
+
+        # raw statements can be streamed too
+        assert sum(1 for _ in db.fetch("SELECT * FROM samples WHERE id < 20")) == 20
+
+        # drop the table
+        db.dropTable(Sample)
+
+    # and return the connection
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
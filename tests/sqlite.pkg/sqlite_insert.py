@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Insert records using parameterized statements and read them back
+"""
+
+
+import pyre.db
+
+class Person(pyre.db.table, id="persons"):
+
+    id = pyre.db.int().primary()
+    name = pyre.db.str().notNull()
+    phone = pyre.db.str(maxlen=16)
+    weight = pyre.db.float().notNull()
+
+
+class Customer(pyre.db.table, id="customers"):
+
+    cid = pyre.db.int().primary()
+    pid = pyre.db.reference(key=Person.id)
+    balance = pyre.db.decimal(precision=7, scale=2).setDefault(0)
+
+
+class Server(pyre.db.sqlite, family="test.insert.server"):
+    """
+    A server that counts the parameterized statements it executes
+    """
+
+    @pyre.export
+    def executemany(self, sql, rows):
+        # save the statement
+        self.statements.append(sql)
+        # and execute it
+        return super().executemany(sql, rows)
+
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # start out with no statements
+        self.statements = []
+        # all done
+        return
+
+
+def test():
+    # build a database component and connect to the in-memory database
+    db = Server(name="test.insert").attach()
+
+    # the records
+    records = [
+        Person.pyre_immutable(id=107, name="Bit Twiddle", phone="+1 800 555 1114", weight=185),
+        Person.pyre_immutable(id=108, name="Eva Lu Ator", phone=Person.null, weight=112),
+        Person.pyre_immutable(id=109, name="O'Hare", phone="+1 800 555 6787", weight=142),
+        Person.pyre_immutable(id=110, name="Ni Hilist", phone=None, weight=162),
+        Customer.pyre_immutable(cid=1023, pid=107, balance=1000),
+        Customer.pyre_immutable(cid=1024, pid=108, balance=Customer.default),
+        Customer.pyre_immutable(cid=1025, pid=109, balance=1000),
+        Customer.pyre_immutable(cid=1026, pid=109, balance=Customer.null),
+        Customer.pyre_immutable(cid=1027, pid=110, balance=Customer.default),
+        ]
+
+    # servers bind statement parameters only if they say so
+    assert pyre.db.server.providesParameters is False
+    assert db.providesParameters is True
+
+    # in a transaction block
+    with db:
+        # create the tables
+        db.createTable(Person)
+        db.createTable(Customer)
+        # insert the records
+        db.insert(*records)
+        # records with the same layout are inserted together, even when they are not adjacent
+        assert len(db.statements) == 3
+        # and one more as literal SQL
+        db.execute(*db.sql.insertRecords(
+            Person.pyre_immutable(id=111, name="Al Gorithm", phone=None, weight=170)))
+
+        # read the persons back
+        persons = tuple(db.execute("SELECT * FROM persons ORDER BY id"))
+        # check them
+        assert persons == (
+            (107, "Bit Twiddle", "+1 800 555 1114", 185.0),
+            (108, "Eva Lu Ator", None, 112.0),
+            (109, "O'Hare", "+1 800 555 6787", 142.0),
+            # strings set to {None} are {NULL}, both as parameters and as literals
+            (110, "Ni Hilist", None, 162.0),
+            (111, "Al Gorithm", None, 170.0),
+            )
+        # read the customers back
+        customers = tuple(db.execute("SELECT * FROM customers ORDER BY cid"))
+        # check them
+        assert customers == (
+            (1023, 107, 1000),
+            (1024, 108, 0),
+            (1025, 109, 1000),
+            (1026, 109, None),
+            (1027, 110, 0),
+            )
+
+        # the statements were built with placeholders, once for each table layout
+        layouts = { (table, mask) for table, mask in db._templates }
+        assert layouts == {
+            (Person, (True, True, True, True)),
+            (Customer, (True, True, True)),
+            (Customer, (True, True, False)),
+            }
+        # the one with the default balance leaves it out
+        _, sql = db._templates[(Customer, (True, True, False))]
+        assert sql == "\n".join((
+            "INSERT INTO customers",
+            "    (cid, pid)",
+            "  VALUES",
+            "    (?, ?);",
+            ))
+
+        # drop the tables
+        db.dropTable(Customer)
+        db.dropTable(Person)
+
+    # and return the connection
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Share a database among threads through a connection pool
+"""
+
+
+import os
+import tempfile
+import threading
+import time
+import pyre.db
+
+class Sample(pyre.db.table, id="samples"):
+
+    id = pyre.db.int().primary()
+    label = pyre.db.str()
+
+
+def test():
+    # make a database file, since in-memory databases are private to their connection
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+
+    # carefully
+    try:
+        # build a pool
+        pool = pyre.db.pool(name="test.pool")
+        # point its server to the database
+        pool.server = pyre.db.sqlite(name="test.pool.server")
+        pool.server.database = path
+        # and size it
+        pool.minimum = 1
+        pool.maximum = 2
+
+        # warm it up
+        pool.fill()
+        assert pool.size == 1
+        # create the table
+        with pool.connection() as db:
+            # the connection is a sqlite server configured like the template
+            assert isinstance(db, pyre.db.sqlite)
+            assert db.database == path
+            db.createTable(Sample)
+            db.connection.commit()
+
+        # have a few threads insert records at the same time
+        def work(first):
+            # a few times
+            for index in range(first, first+10):
+                # get a connection
+                with pool.connection() as db:
+                    # insert a record
+                    db.insert(Sample.pyre_immutable(id=index, label=f"sample-{index}"))
+                    db.connection.commit()
+        # make the threads
+        workers = [
+            threading.Thread(target=work, args=(first,)) for first in range(0, 40, 10) ]
+        # start them
+        for worker in workers: worker.start()
+        # and wait for them to finish
+        for worker in workers: worker.join()
+
+        # the pool never grew past its maximum
+        assert pool.size <= 2
+        assert pool.busy == 0
+        # and all the records made it
+        with pool.connection() as db:
+            assert tuple(db.execute("SELECT COUNT(*) FROM samples")) == ((40,),)
+
+        # check out all the connections
+        first = pool.checkout()
+        second = pool.checkout()
+        assert first is not second
+        # the next request times out
+        try:
+            pool.checkout(timeout=0.05)
+            assert False
+        except pool.PoolTimeoutError as error:
+            assert error.timeout == 0.05
+        # return one from another thread while a request is waiting
+        timer = threading.Timer(0.05, pool.checkin, kwargs={"server": second})
+        timer.start()
+        assert pool.checkout(timeout=5) is second
+        timer.join()
+
+        # break a connection and return both of them
+        second.detach()
+        pool.checkin(server=first)
+        pool.checkin(server=second)
+        # probe connections before every use
+        pool.check = 0
+        # the broken connection is replaced
+        third = pool.checkout()
+        assert third is not first and third is not second
+        assert tuple(third.execute("SELECT COUNT(*) FROM samples")) == ((40,),)
+        pool.checkin(server=third)
+        # returning it twice is an error
+        try:
+            pool.checkin(server=third)
+            assert False
+        except pool.InterfaceError:
+            pass
+
+        # connections that fail are closed
+        try:
+            with pool.connection() as db:
+                raise pool.OperationalError(description="lost the connection")
+        except pool.OperationalError:
+            pass
+        assert pool.size == 1
+
+        # evict the idle connections, but keep the minimum
+        pool.idle = 0
+        time.sleep(0.01)
+        pool.evict()
+        assert pool.size == 1
+
+        # check the statistics
+        metrics = pool.statistics
+        assert metrics.checkouts == 47
+        assert metrics.timeouts == 1
+        assert metrics.waits >= 2
+        assert metrics.discarded == 2
+        assert metrics.longest >= 0.05
+        assert 0 < metrics.utilization <= 1
+
+        # hold on to a connection
+        held = pool.checkout()
+        # while the pool is shut down
+        pool.shutdown()
+        # the idle connections are closed
+        assert pool.size == 1
+        # further checkouts are refused
+        try:
+            pool.checkout(timeout=0)
+            assert False
+        except pool.InterfaceError:
+            pass
+        # and the connection is closed when it is returned
+        pool.checkin(server=held)
+        assert held.connection is None
+        assert pool.size == 0
+
+        # build another pool
+        fresh = pyre.db.pool(name="test.pool.fresh")
+        fresh.server = pool.server
+        # that keeps a couple of connections open
+        fresh.minimum = 2
+        # its first checkout opens all of them
+        with fresh.connection() as db:
+            assert fresh.size == 2
+        # and wind it down
+        fresh.shutdown()
+        assert fresh.size == 0
+    # either way
+    finally:
+        # clean up
+        os.remove(path)
+
+    # all done
+    return pool
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
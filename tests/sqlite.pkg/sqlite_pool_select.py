@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2020 all rights reserved
+#
+
+
+"""
+Compile and run a parameterized query from pooled connections in several threads at once
+"""
+
+
+import os
+import tempfile
+import threading
+import pyre.db
+
+class Sample(pyre.db.table, id="samples"):
+
+    id = pyre.db.int().primary()
+    label = pyre.db.str()
+
+
+class Window(pyre.db.query, sample=Sample):
+
+    id = sample.id
+    label = sample.label
+
+    where = (
+        (sample.id >= pyre.db.parameter("x")) &
+        (sample.id < pyre.db.parameter("y")) &
+        (sample.label != pyre.db.parameter("z")))
+
+
+def test():
+    # make a database file, since in-memory databases are private to their connection
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+
+    # carefully
+    try:
+        # build a pool
+        pool = pyre.db.pool(name="test.pool.select")
+        # point its server to the database
+        pool.server = pyre.db.sqlite(name="test.pool.select.server")
+        pool.server.database = path
+        # and size it
+        pool.maximum = 4
+
+        # create and populate the table
+        with pool.connection() as db:
+            db.createTable(Sample)
+            db.insert(*(Sample.pyre_immutable(id=index, label=f"sample-{index}")
+                        for index in range(100)))
+            db.connection.commit()
+
+        # the pooled connections share the SQL generator
+        first = pool.checkout()
+        second = pool.checkout()
+        assert first.sql is second.sql
+        pool.checkin(server=first)
+        pool.checkin(server=second)
+
+        # the problems
+        errors = []
+        # make the threads start at the same time
+        barrier = threading.Barrier(4)
+        # the work
+        def work(offset):
+            # wait for the others
+            barrier.wait()
+            # a few times
+            for iteration in range(50):
+                # get a connection
+                with pool.connection() as db:
+                    # carefully
+                    try:
+                        # compile the query from scratch
+                        Window.pyre_statements.clear()
+                        sql, names = db.compile(query=Window)
+                        # check the binding plan
+                        assert names == ("x", "y", "z"), names
+                        assert sql.count("?") == 3, sql
+                        # run the query
+                        rows = list(db.select(Window, x=offset, y=offset+10, z="sample-0"))
+                        # check
+                        assert [row.id for row in rows] == [
+                            index for index in range(offset, offset+10) if index], rows
+                    # if anything goes wrong
+                    except Exception as error:
+                        # save it
+                        errors.append(error)
+        # make the threads
+        workers = [
+            threading.Thread(target=work, args=(offset,)) for offset in range(0, 40, 10) ]
+        # start them
+        for worker in workers: worker.start()
+        # and wait for them to finish
+        for worker in workers: worker.join()
+        # check
+        assert not errors, errors
+        # and the cached plan is the right one
+        assert db.compile(query=Window)[1] == ("x", "y", "z")
+
+        # close the connections
+        pool.shutdown()
+    # either way
+    finally:
+        # clean up
+        os.remove(path)
+
+    # all done
+    return pool
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file